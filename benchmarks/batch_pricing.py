@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""
+Batch Cart Pricing Benchmark
+
+Compares carts/sec of DiscountService.calculate_cart_discounts_batch against
+a plain loop awaiting DiscountService.calculate_cart_discounts per cart, and
+checks that both produce identical results.
+
+Usage:
+    python benchmarks/batch_pricing.py [--carts 20000] [--lines 8] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+from typing import List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.pricing_request import CartPricingRequest
+
+
+BRANDS = ["PUMA", "NIKE", "ADIDAS", "ZARA", "H&M"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Accessories", "Jackets"]
+TIERS = ["premium", "regular", "budget"]
+BANKS = ["ICICI", "HDFC", "SBI", "AXIS"]
+VOUCHERS = [None, "SUPER69", "PREMIUM20", "NEWUSER15", "BRAND_EXCLUSION", "CATEGORY_RESTRICTION", "TIER_DISCOUNT"]
+
+
+def build_requests(carts: int, lines: int, seed: int = 7) -> List[CartPricingRequest]:
+    """Build a reproducible mix of carts, customers, payments and vouchers"""
+    rng = random.Random(seed)
+    products = [
+        Product(
+            id=f"P{i:04d}",
+            brand=BRANDS[i % len(BRANDS)],
+            brand_tier=BrandTier.REGULAR,
+            category=CATEGORIES[(i // len(BRANDS)) % len(CATEGORIES)],
+            base_price=Decimal(rng.randrange(200, 6000)),
+            current_price=Decimal(rng.randrange(200, 6000))
+        )
+        for i in range(200)
+    ]
+    customers = [
+        CustomerProfile(id=f"C{i}", name=f"Customer {i}", email=f"c{i}@example.com", tier=tier, loyalty_points=0)
+        for i, tier in enumerate(TIERS)
+    ]
+    payments = [None] + [PaymentInfo(method="CARD", bank_name=bank, card_type="CREDIT") for bank in BANKS]
+
+    requests = []
+    for _ in range(carts):
+        cart_items = []
+        for product in rng.sample(products, lines):
+            cart_items.append(CartItem(product=product, quantity=rng.randint(1, 3), size="M", price=product.base_price))
+        requests.append(CartPricingRequest(
+            cart_items=cart_items,
+            customer=rng.choice(customers),
+            payment_info=rng.choice(payments),
+            voucher_code=rng.choice(VOUCHERS)
+        ))
+    return requests
+
+
+async def run_loop(service: DiscountService, requests: List[CartPricingRequest]):
+    return [
+        await service.calculate_cart_discounts(
+            cart_items=request.cart_items,
+            customer=request.customer,
+            payment_info=request.payment_info,
+            voucher_code=request.voucher_code
+        )
+        for request in requests
+    ]
+
+
+async def run_batch(service: DiscountService, requests: List[CartPricingRequest]):
+    return await service.calculate_cart_discounts_batch(requests)
+
+
+async def best_time(runner, service: DiscountService, requests: List[CartPricingRequest], repeat: int):
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = await runner(service, requests)
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--carts", type=int, default=20000)
+    parser.add_argument("--lines", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    service = DiscountService()
+    requests = build_requests(args.carts, args.lines)
+
+    loop_time, loop_results = await best_time(run_loop, service, requests, args.repeat)
+    batch_time, batch_results = await best_time(run_batch, service, requests, args.repeat)
+
+    if loop_results != batch_results:
+        raise SystemExit("Batch results differ from the single-cart path")
+
+    print(f"Carts: {args.carts}, lines per cart: {args.lines}")
+    print(f"Loop over calculate_cart_discounts: {args.carts / loop_time:,.0f} carts/sec")
+    print(f"calculate_cart_discounts_batch:     {args.carts / batch_time:,.0f} carts/sec")
+    print(f"Speedup: {loop_time / batch_time:.2f}x")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
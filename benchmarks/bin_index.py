@@ -0,0 +1,86 @@
+#!/usr/bin/env python3
+"""
+BIN Index Benchmark
+
+Writes a CSV range file with --ranges disjoint 8-digit BIN ranges (one
+bank offer each, split between credit and debit cards) plus --networks
+overlapping 4-digit ranges for any card type, loads it into a BinIndex,
+and times lookups of random card prefixes against a linear scan of the
+ranges.
+
+Usage:
+    python benchmarks/bin_index.py [--ranges 1000000] [--networks 100] [--lookups 200000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.bin_index import FIELDS, BinIndex, load_bin_ranges
+
+BANKS = ["HDFC", "ICICI", "SBI", "AXIS", "KOTAK", "YES", "RBL", "IDFC"]
+
+
+def write_ranges(path: str, args, rng: random.Random):
+    # Disjoint ranges: split the 8-digit space into --ranges slots and take
+    # a random sub-range of each
+    slot = 100_000_000 // args.ranges
+    with open(path, "w", encoding="utf-8") as range_file:
+        range_file.write(",".join(FIELDS) + "\n")
+        for i in range(args.ranges):
+            start = i * slot + rng.randrange(slot // 2)
+            end = start + rng.randrange(slot // 2)
+            bank = BANKS[i % len(BANKS)]
+            card_type = "CREDIT" if i % 3 else "DEBIT"
+            percentage = 5 + i % 4 * 5
+            range_file.write(f"{start:08d},{end:08d},{card_type},{bank}{card_type[0]}{percentage},"
+                             f"{bank},{percentage}\n")
+        for i in range(args.networks):
+            prefix = rng.randrange(1000, 10000)
+            range_file.write(f"{prefix},{prefix},,NETWORK{i},NETWORK{i},{1 + i % 5}\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ranges", type=int, default=1_000_000)
+    parser.add_argument("--networks", type=int, default=100)
+    parser.add_argument("--lookups", type=int, default=200_000)
+    parser.add_argument("--scan-lookups", type=int, default=10, help="Lookups timed for the linear scan")
+    args = parser.parse_args()
+
+    rng = random.Random(5)
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "bins.csv")
+        write_ranges(path, args, rng)
+        started = time.perf_counter()
+        index = BinIndex.from_file(path)
+        load_seconds = time.perf_counter() - started
+        print(f"Ranges: {index.ranges:,} -> {len(index):,} disjoint intervals, loaded in {load_seconds:.1f} s")
+
+        keys = [(f"{rng.randrange(100_000_000):08d}", rng.choice(["CREDIT", "DEBIT"])) for _ in range(args.lookups)]
+        started = time.perf_counter()
+        matched = 0
+        for card_prefix, card_type in keys:
+            if index.lookup(card_prefix, card_type):
+                matched += 1
+        elapsed = time.perf_counter() - started
+        print(f"BinIndex lookup:    {elapsed / len(keys) * 1e6:10.2f} us   ({matched / len(keys):.0%} of cards have offers)")
+
+        ranges = [(int(r.bin_start.ljust(8, "0")), int(r.bin_end.ljust(8, "9")), r.card_type, r.offer)
+                  for r in load_bin_ranges(path)]
+        started = time.perf_counter()
+        for card_prefix, card_type in keys[:args.scan_lookups]:
+            key = int(card_prefix)
+            [offer for start, end, range_card_type, offer in ranges
+             if start <= key <= end and range_card_type in (None, card_type)]
+        elapsed = time.perf_counter() - started
+        print(f"Linear scan lookup: {elapsed / args.scan_lookups * 1e6:10.2f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Seasonal Campaign Scheduler Benchmark
+
+Compares finding the campaigns active today among --campaigns
+SeasonalDiscount campaigns by scanning all of them per request (checking
+each one's dates, as evaluating every campaign does) against
+CampaignScheduler.active(), which only does work at activation and expiry
+dates.
+
+Usage:
+    python benchmarks/campaign_scheduler.py [--campaigns 5000] [--requests 20000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.services.campaign_scheduler import CampaignScheduler
+
+
+def build_campaigns(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    today = date.today()
+    campaigns = []
+    for i in range(count):
+        start = today + timedelta(days=rng.randrange(-60, 60))
+        campaigns.append(SeasonalDiscount(f"Campaign{i}", start, start + timedelta(days=rng.randrange(1, 14)),
+                                          Decimal(rng.randrange(5, 50))))
+    return campaigns
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--campaigns", type=int, default=5000)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    campaigns = build_campaigns(args.campaigns)
+
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        today = date.today()
+        scanned = [campaign for campaign in campaigns if campaign.is_active(today)]
+    scan_time = time.perf_counter() - start
+
+    scheduler = CampaignScheduler(campaigns)
+    start = time.perf_counter()
+    for _ in range(args.requests):
+        active = scheduler.active()
+    scheduler_time = time.perf_counter() - start
+
+    if sorted(active, key=id) != sorted(scanned, key=id):
+        raise SystemExit("Scheduler disagrees with the scan")
+
+    print(f"Campaigns: {args.campaigns:,}, active today: {len(active):,}, requests: {args.requests:,}")
+    print(f"Scan per request:   {scan_time / args.requests * 1e6:10.2f} us/request")
+    print(f"CampaignScheduler:  {scheduler_time / args.requests * 1e6:10.2f} us/request "
+          f"({scheduler.refreshes} refresh)")
+
+
+if __name__ == "__main__":
+    main()
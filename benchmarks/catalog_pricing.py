@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""
+Catalog Listing Pricing Benchmark
+
+Prices a catalog of --products products with CatalogPricingEngine and
+compares it with the per-product alternative: one-unit carts run through
+DiscountFactory.apply_multiple_discounts, timed on --sample products and
+extrapolated to the full catalog. Requires numpy.
+
+Usage:
+    python benchmarks/catalog_pricing.py [--products 1000000] [--sample 5000] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+import numpy as np
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.catalog_pricing import CatalogPricingEngine
+from src.models.product_table import ProductTable
+from src.models.product import BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.money import MoneyMode
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.category_discount import CategoryDiscount
+from src.discount_types.discount_factory import DiscountFactory
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.discount_types.tier_discount import TierDiscount
+
+
+BRANDS = ("PUMA", "NIKE", "ADIDAS", "ZARA", "H&M")
+CATEGORIES = ("T-shirts", "Jeans", "Shoes", "Accessories", "Jackets")
+
+
+def build_columns(products: int, seed: int = 7) -> ProductTable:
+    """Random catalog built directly as columns"""
+    rng = np.random.default_rng(seed)
+    base_price = rng.integers(20000, 900000, products, dtype=np.int64)
+    current_price = base_price - rng.integers(0, 10000, products, dtype=np.int64)
+    return ProductTable(
+        ids=[f"P{i}" for i in range(products)],
+        base_price_paise=base_price,
+        current_price_paise=current_price,
+        brand_codes=rng.integers(0, len(BRANDS), products, dtype=np.int32),
+        brands=BRANDS,
+        category_codes=rng.integers(0, len(CATEGORIES), products, dtype=np.int32),
+        categories=CATEGORIES,
+        brand_tier_codes=rng.integers(0, len(BrandTier), products, dtype=np.int32)
+    )
+
+
+def build_rules():
+    today = date.today()
+    return [
+        CategoryDiscount("Shoes", Decimal("10")),
+        BrandDiscount("PUMA", Decimal("40")),
+        BrandDiscount("NIKE", Decimal("15"), max_discount=Decimal("300")),
+        TierDiscount("premium", Decimal("5"), max_discount=Decimal("250"), min_cart_value=Decimal("1500")),
+        SeasonalDiscount("Summer", today - timedelta(days=1), today + timedelta(days=1),
+                         Decimal("10"), applicable_categories=["Shoes", "Jackets"], max_discount=Decimal("400"))
+    ]
+
+
+async def price_one_unit_carts(columns: ProductTable, rules, customer, count: int):
+    """Price the first count products one cart at a time"""
+    factory = DiscountFactory()
+    cart_rules = [rule for rule in rules if not isinstance(rule, CategoryDiscount)]
+    display_prices = []
+    for i in range(count):
+        product = columns.product(i)
+        for rule in rules:
+            if isinstance(rule, CategoryDiscount):
+                rule.apply_discount_paise([product])
+        cart_items = [CartItem(product=product, quantity=1, size="M", price=product.current_price)]
+        applied = await factory.apply_multiple_discounts(
+            cart_rules, cart_items, customer, money_mode=MoneyMode.FIXED_POINT
+        )
+        display_prices.append(max(product.current_price_paise - sum(applied.values()), 0))
+    return display_prices
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--sample", type=int, default=5000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    customer = CustomerProfile(id="C1", name="Customer", email="c1@example.com", tier="premium", loyalty_points=0)
+    rules = build_rules()
+    columns = build_columns(args.products)
+    engine = CatalogPricingEngine(rules)
+
+    engine_time = float("inf")
+    for _ in range(args.repeat):
+        start = time.perf_counter()
+        prices = engine.price(columns, customer)
+        brand_badges = prices.brand_badges()
+        engine_time = min(engine_time, time.perf_counter() - start)
+
+    sample = min(args.sample, args.products)
+    start = time.perf_counter()
+    expected = asyncio.run(price_one_unit_carts(columns, rules, customer, sample))
+    loop_time = (time.perf_counter() - start) * args.products / sample
+
+    if prices.display_price_paise[:sample].tolist() != expected:
+        raise SystemExit("Engine prices differ from one-unit cart pricing")
+
+    print(f"Products: {args.products:,}")
+    print(f"CatalogPricingEngine:           {engine_time:.3f}s ({args.products / engine_time:,.0f} products/sec)")
+    print(f"One-unit carts (extrapolated):  {loop_time:.1f}s ({args.products / loop_time:,.0f} products/sec)")
+    print(f"Speedup: {loop_time / engine_time:,.0f}x")
+    print(f"Brand badges: {brand_badges}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+Catalog Snapshot Startup Benchmark
+
+Compares how worker processes get a catalog of --products products:
+  - objects: unpickling a list of Product objects, as workers load today
+  - snapshot: open_catalog_snapshot on a memory-mapped snapshot file
+Each of --workers processes loads the catalog, then reads every price and
+looks up --lookups ids. Reported per worker: load time, and on Linux the
+private memory (not shared with other processes) and proportional set
+size read from /proc/self/smaps_rollup. Requires numpy.
+
+Usage:
+    python benchmarks/catalog_snapshot.py [--products 500000] [--workers 4] [--lookups 100000]
+"""
+
+import argparse
+import multiprocessing
+import os
+import pickle
+import sys
+import tempfile
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.catalog_snapshot import open_catalog_snapshot, write_catalog_snapshot
+from src.models.product import Product, BrandTier
+from src.models.product_table import ProductTable
+
+
+BRANDS = ("PUMA", "NIKE", "ADIDAS", "ZARA", "H&M")
+CATEGORIES = ("T-shirts", "Jeans", "Shoes", "Accessories", "Jackets")
+
+
+def build_products(count: int):
+    tiers = list(BrandTier)
+    return [
+        Product(
+            id=f"P{i:07d}",
+            brand=BRANDS[i % len(BRANDS)],
+            brand_tier=tiers[i % len(tiers)],
+            category=CATEGORIES[(i // 7) % len(CATEGORIES)],
+            base_price=Decimal(20000 + i % 80000).scaleb(-2),
+            current_price=Decimal(15000 + i % 80000).scaleb(-2)
+        )
+        for i in range(count)
+    ]
+
+
+def memory_kb():
+    """(private, pss) in kB from /proc/self/smaps_rollup, or None where unavailable"""
+    try:
+        with open("/proc/self/smaps_rollup") as rollup:
+            fields = dict(line.split(":", 1) for line in rollup if ":" in line)
+    except OSError:
+        return None
+    kb = {name: int(value.split()[0]) for name, value in fields.items() if value.strip().endswith("kB")}
+    return kb["Private_Clean"] + kb["Private_Dirty"], kb["Pss"]
+
+
+def worker(kind: str, path: str, lookups: int, start, results):
+    start.wait()
+    began = time.perf_counter()
+    if kind == "objects":
+        with open(path, "rb") as source:
+            products = pickle.load(source)
+        index = {product.id: product for product in products}
+        loaded = time.perf_counter() - began
+        total = sum(product.current_price for product in products)
+        for i in range(lookups):
+            index[f"P{(i * 7919) % len(products):07d}"]
+    else:
+        table = open_catalog_snapshot(path).table
+        loaded = time.perf_counter() - began
+        total = int(table.current_price_paise.sum())
+        for i in range(lookups):
+            table.row(f"P{(i * 7919) % len(table):07d}")
+    elapsed = time.perf_counter() - began
+    results.put((kind, loaded, elapsed, memory_kb(), total))
+
+
+def run(kind: str, path: str, workers: int, lookups: int):
+    context = multiprocessing.get_context("spawn")
+    start = context.Event()
+    results = context.Queue()
+    processes = [context.Process(target=worker, args=(kind, path, lookups, start, results)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    time.sleep(1.0)  # Let every interpreter finish importing before timing
+    start.set()
+    reports = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return reports
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=500_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--lookups", type=int, default=100_000)
+    args = parser.parse_args()
+
+    products = build_products(args.products)
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_path = os.path.join(directory, "catalog.pickle")
+        snapshot_path = os.path.join(directory, "catalog.snapshot")
+        with open(pickle_path, "wb") as target:
+            pickle.dump(products, target, protocol=pickle.HIGHEST_PROTOCOL)
+
+        began = time.perf_counter()
+        write_catalog_snapshot(ProductTable.from_products(products), snapshot_path, version=1)
+        print(f"Products: {args.products:,}  workers: {args.workers}")
+        print(f"Snapshot written in {time.perf_counter() - began:.2f}s, "
+              f"{os.path.getsize(snapshot_path) / 2**20:.1f} MiB "
+              f"(pickle {os.path.getsize(pickle_path) / 2**20:.1f} MiB)")
+        del products
+
+        print(f"{'load':>9} {'load s':>8} {'total s':>8} {'private MiB':>12} {'PSS MiB':>8}")
+        for kind, path in (("objects", pickle_path), ("snapshot", snapshot_path)):
+            reports = run(kind, path, args.workers, args.lookups)
+            loaded = max(report[1] for report in reports)
+            elapsed = max(report[2] for report in reports)
+            memory = [report[3] for report in reports]
+            if all(memory):
+                private = f"{sum(m[0] for m in memory) / len(memory) / 1024:>12.1f}"
+                pss = f"{sum(m[1] for m in memory) / len(memory) / 1024:>8.1f}"
+            else:
+                private, pss = f"{'n/a':>12}", f"{'n/a':>8}"
+            print(f"{kind:>9} {loaded:>8.4f} {elapsed:>8.3f} {private} {pss}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Discount Allocation Benchmark
+
+Prices the same requests through calculate_cart_discounts and
+apply_advanced_discounts with the DiscountFactory interning pool disabled
+(pool_size=0) and enabled, and reports per request:
+  - discount objects constructed
+  - tracemalloc allocations and bytes attributed to the discount types
+    (measured by keeping every object built during the run alive)
+  - time per request (measured without tracemalloc)
+
+Usage:
+    python benchmarks/discount_allocation.py [--requests 5000]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.discount_service import DiscountService
+from src.discount_types.base_discount import BaseDiscount
+from src.discount_types.bank_discount import BankDiscount
+from src.discount_types.discount_factory import DiscountFactory
+
+from batch_pricing import build_requests
+
+
+ADVANCED_CONFIGS = [
+    {"type": "brand", "brand": "NIKE", "discount_percentage": Decimal("25"), "max_discount": Decimal("1000")},
+    {"type": "tier", "required_tier": "regular", "discount_percentage": Decimal("15"), "max_discount": Decimal("500")},
+    {"type": "loyalty", "points_threshold": 0, "discount_percentage": Decimal("2")},
+]
+
+DISCOUNT_TYPES_DIR = os.path.join("src", "discount_types")
+
+
+class ConstructionLog:
+    """Keeps every discount object built while installed, so tracemalloc still sees it"""
+
+    def __init__(self):
+        self.built = []
+        self._originals = {}
+
+    def __enter__(self):
+        for cls in (BaseDiscount, BankDiscount):
+            original = cls.__init__
+            self._originals[cls] = original
+
+            def logging_init(instance, *args, _original=original, **kwargs):
+                _original(instance, *args, **kwargs)
+                self.built.append(instance)
+
+            cls.__init__ = logging_init
+        return self
+
+    def __exit__(self, *exc):
+        for cls, original in self._originals.items():
+            cls.__init__ = original
+
+
+async def price(service: DiscountService, requests):
+    for request in requests:
+        await service.calculate_cart_discounts(
+            request.cart_items, request.customer, request.payment_info, request.voucher_code
+        )
+        await service.apply_advanced_discounts(
+            request.cart_items, request.customer, request.payment_info, discount_configs=ADVANCED_CONFIGS
+        )
+
+
+def measure(pool_size: int, requests):
+    service = DiscountService()
+    service.discount_factory = DiscountFactory(pool_size=pool_size)
+    service._register_custom_discounts()
+    asyncio.run(price(service, requests[:100]))  # Warm up the pool and caches
+
+    start = time.perf_counter()
+    asyncio.run(price(service, requests))
+    elapsed = time.perf_counter() - start
+
+    with ConstructionLog() as log:
+        tracemalloc.start()
+        before = tracemalloc.take_snapshot()
+        asyncio.run(price(service, requests))
+        after = tracemalloc.take_snapshot()
+        tracemalloc.stop()
+
+    path_filter = [tracemalloc.Filter(True, f"*{os.sep}{DISCOUNT_TYPES_DIR}{os.sep}*")]
+    diff = after.filter_traces(path_filter).compare_to(before.filter_traces(path_filter), "filename")
+    blocks = sum(stat.count_diff for stat in diff)
+    size = sum(stat.size_diff for stat in diff)
+    return len(log.built), blocks, size, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+
+    requests = build_requests(args.requests, lines=6)
+    print(f"Requests: {args.requests} (calculate_cart_discounts + apply_advanced_discounts each)")
+    print(f"{'pool':>8} {'objects/req':>12} {'allocs/req':>11} {'bytes/req':>10} {'us/req':>8}")
+    for label, pool_size in (("off", 0), ("on", DiscountFactory.DEFAULT_POOL_SIZE)):
+        built, blocks, size, elapsed = measure(pool_size, requests)
+        print(
+            f"{label:>8} {built / args.requests:>12.2f} {blocks / args.requests:>11.2f} "
+            f"{size / args.requests:>10.1f} {elapsed / args.requests * 1e6:>8.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
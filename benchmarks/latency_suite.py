@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Latency Benchmark Suite
+
+Measures p50/p95/p99 latency and throughput of the DiscountService entry
+points (calculate_cart_discounts, apply_advanced_discounts,
+validate_discount_code) and of calculate_discount on every built-in
+BaseDiscount subclass, for carts of --sizes lines. Everything runs in
+process on generated data; no network access is needed.
+
+Every scenario runs with and without payment info and with and without a
+voucher, where the entry point takes them: validate_discount_code always
+gets a voucher code and no payment info, and apply_advanced_discounts
+varies a voucher entry in its discount configs.
+
+Results are written as JSON with --output. With --baseline, each scenario
+is compared against a stored results file and the run exits with status 1
+if any percentile is slower than the baseline by more than --tolerance
+(and by more than --min-delta-us, so sub-microsecond noise is ignored).
+
+Usage:
+    python benchmarks/latency_suite.py [--sizes 1,10,100,1000,10000] [--min-time 0.2]
+        [--output results.json] [--baseline baseline.json] [--tolerance 0.15]
+        [--filter calculate_cart] [--money-mode decimal]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import random
+import sys
+import time
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode
+from src.discount_types.base_discount import BaseDiscount
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.loyalty_discount import LoyaltyDiscount
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.discount_types.tier_discount import TierDiscount
+from src.discount_types.voucher_discount import VoucherDiscount
+
+
+SCHEMA_VERSION = 1
+DEFAULT_SIZES = (1, 10, 100, 1000, 10000)
+PERCENTILES = (50, 95, 99)
+
+BRANDS = ["PUMA", "NIKE", "ADIDAS", "ZARA", "H&M"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Accessories", "Jackets"]
+VOUCHER_CODE = "SUPER69"
+PAYMENT_INFO = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+CUSTOMER = CustomerProfile(id="C1", name="Customer", email="c1@example.com", tier="premium", loyalty_points=1500)
+
+ADVANCED_CONFIGS = [
+    {"type": "brand", "brand": "NIKE", "discount_percentage": Decimal("25"), "max_discount": Decimal("1000")},
+    {"type": "tier", "required_tier": "premium", "discount_percentage": Decimal("5"), "max_discount": Decimal("500")},
+    {"type": "loyalty", "points_threshold": 1000, "discount_percentage": Decimal("2")},
+]
+VOUCHER_CONFIG = {"type": "voucher", "code": VOUCHER_CODE, "discount_percentage": Decimal("69"),
+                  "max_discount_amount": Decimal("1000")}
+
+
+def build_discounts() -> List[BaseDiscount]:
+    """One instance of every built-in BaseDiscount subclass"""
+    today = date.today()
+    return [
+        BrandDiscount("PUMA", Decimal("40"), max_discount=Decimal("2000")),
+        TierDiscount("premium", Decimal("7.5"), max_discount=Decimal("500"), min_cart_value=Decimal("1000")),
+        LoyaltyDiscount(points_threshold=1000, discount_percentage=Decimal("2")),
+        SeasonalDiscount("Summer", today - timedelta(days=1), today + timedelta(days=1), Decimal("10"),
+                         applicable_categories=["Shoes", "Jackets"], max_discount=Decimal("400")),
+        VoucherDiscount(VOUCHER_CODE, Decimal("69"), Decimal("1000")),
+    ]
+
+
+def build_cart(lines: int, seed: int = 7) -> List[CartItem]:
+    """Reproducible cart of distinct products"""
+    rng = random.Random(seed + lines)
+    tiers = list(BrandTier)
+    cart_items = []
+    for i in range(lines):
+        base_price = Decimal(rng.randrange(20000, 600000)).scaleb(-2)
+        product = Product(
+            id=f"P{i:05d}",
+            brand=BRANDS[i % len(BRANDS)],
+            brand_tier=tiers[i % len(tiers)],
+            category=CATEGORIES[(i // len(BRANDS)) % len(CATEGORIES)],
+            base_price=base_price,
+            current_price=base_price
+        )
+        cart_items.append(CartItem(product=product, quantity=rng.randint(1, 3), size="M", price=base_price))
+    return cart_items
+
+
+@dataclass
+class Scenario:
+    name: str
+    entry_point: str
+    lines: int
+    payment: bool
+    voucher: bool
+    call: Callable[[], Awaitable]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    entry_point: str
+    lines: int
+    payment: bool
+    voucher: bool
+    calls: int
+    p50_us: float
+    p95_us: float
+    p99_us: float
+    mean_us: float
+    calls_per_sec: float
+    lines_per_sec: float
+
+
+def build_scenarios(service: DiscountService, sizes) -> List[Scenario]:
+    scenarios = []
+
+    def add(entry_point: str, lines: int, payment: bool, voucher: bool, call):
+        name = f"{entry_point}[lines={lines},payment={'yes' if payment else 'no'},voucher={'yes' if voucher else 'no'}]"
+        scenarios.append(Scenario(name, entry_point, lines, payment, voucher, call))
+
+    for lines in sizes:
+        cart_items = build_cart(lines)
+        for payment in (False, True):
+            payment_info = PAYMENT_INFO if payment else None
+            for voucher in (False, True):
+                voucher_code = VOUCHER_CODE if voucher else None
+                configs = ADVANCED_CONFIGS + [VOUCHER_CONFIG] if voucher else ADVANCED_CONFIGS
+
+                add("calculate_cart_discounts", lines, payment, voucher,
+                    lambda c=cart_items, p=payment_info, v=voucher_code:
+                        service.calculate_cart_discounts(c, CUSTOMER, p, v))
+                add("apply_advanced_discounts", lines, payment, voucher,
+                    lambda c=cart_items, p=payment_info, d=configs:
+                        service.apply_advanced_discounts(c, CUSTOMER, p, discount_configs=d))
+                for discount in build_discounts():
+                    kwargs = {"voucher_code": voucher_code} if voucher else {}
+                    add(type(discount).__name__, lines, payment, voucher,
+                        lambda c=cart_items, p=payment_info, d=discount, k=kwargs:
+                            d.calculate_discount(c, CUSTOMER, p, **k))
+        add("validate_discount_code", lines, False, True,
+            lambda c=cart_items: service.validate_discount_code(VOUCHER_CODE, c, CUSTOMER))
+    return scenarios
+
+
+def percentile(sorted_values: List[float], percent: float) -> float:
+    """Nearest-rank percentile of already sorted values"""
+    if not sorted_values:
+        raise ValueError("No samples")
+    rank = max(1, -(-len(sorted_values) * percent // 100))
+    return sorted_values[int(rank) - 1]
+
+
+async def measure(scenario: Scenario, min_time: float, min_calls: int, max_calls: int, warmup: int) -> ScenarioResult:
+    for _ in range(warmup):
+        await scenario.call()
+
+    samples = []
+    started = time.perf_counter()
+    while len(samples) < max_calls and (len(samples) < min_calls or time.perf_counter() - started < min_time):
+        call_started = time.perf_counter_ns()
+        await scenario.call()
+        samples.append((time.perf_counter_ns() - call_started) / 1000)
+
+    samples.sort()
+    busy_seconds = sum(samples) / 1e6
+    return ScenarioResult(
+        name=scenario.name,
+        entry_point=scenario.entry_point,
+        lines=scenario.lines,
+        payment=scenario.payment,
+        voucher=scenario.voucher,
+        calls=len(samples),
+        p50_us=percentile(samples, 50),
+        p95_us=percentile(samples, 95),
+        p99_us=percentile(samples, 99),
+        mean_us=busy_seconds * 1e6 / len(samples),
+        calls_per_sec=len(samples) / busy_seconds if busy_seconds else float("inf"),
+        lines_per_sec=len(samples) * scenario.lines / busy_seconds if busy_seconds else float("inf")
+    )
+
+
+async def run_suite(
+    sizes=DEFAULT_SIZES,
+    min_time: float = 0.2,
+    min_calls: int = 20,
+    max_calls: int = 100000,
+    warmup: int = 3,
+    name_filter: Optional[str] = None,
+    money_mode: MoneyMode = MoneyMode.DECIMAL
+) -> Dict:
+    """Run every scenario and return the results document written by --output"""
+    service = DiscountService(money_mode=money_mode)
+    results = []
+    for scenario in build_scenarios(service, sizes):
+        if name_filter and name_filter not in scenario.name:
+            continue
+        results.append(await measure(scenario, min_time, min_calls, max_calls, warmup))
+    return {
+        "schema": SCHEMA_VERSION,
+        "created_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "money_mode": money_mode.value,
+        "scenarios": [asdict(result) for result in results]
+    }
+
+
+@dataclass
+class Regression:
+    name: str
+    metric: str
+    baseline_us: float
+    current_us: float
+
+    @property
+    def ratio(self) -> float:
+        return self.current_us / self.baseline_us if self.baseline_us else float("inf")
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float = 0.15, min_delta_us: float = 5.0) -> Dict:
+    """
+    Compare two results documents scenario by scenario.
+
+    A percentile regresses when it is more than tolerance (a fraction)
+    and more than min_delta_us slower than in the baseline.
+
+    Returns:
+        {"regressions": [Regression], "missing": [...], "new": [...]}
+    """
+    baseline_by_name = {scenario["name"]: scenario for scenario in baseline["scenarios"]}
+    current_by_name = {scenario["name"]: scenario for scenario in current["scenarios"]}
+    regressions = []
+    for name, scenario in current_by_name.items():
+        previous = baseline_by_name.get(name)
+        if previous is None:
+            continue
+        for metric in (f"p{p}_us" for p in PERCENTILES):
+            baseline_us, current_us = previous[metric], scenario[metric]
+            if current_us > baseline_us * (1 + tolerance) and current_us - baseline_us > min_delta_us:
+                regressions.append(Regression(name, metric, baseline_us, current_us))
+    return {
+        "regressions": regressions,
+        "missing": sorted(set(baseline_by_name) - set(current_by_name)),
+        "new": sorted(set(current_by_name) - set(baseline_by_name))
+    }
+
+
+def print_results(document: Dict):
+    print(f"{'scenario':<78} {'calls':>7} {'p50 us':>10} {'p95 us':>10} {'p99 us':>10} {'calls/s':>11}")
+    for scenario in document["scenarios"]:
+        print(
+            f"{scenario['name']:<78} {scenario['calls']:>7} {scenario['p50_us']:>10.1f} "
+            f"{scenario['p95_us']:>10.1f} {scenario['p99_us']:>10.1f} {scenario['calls_per_sec']:>11,.0f}"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="Comma-separated cart line counts")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Seconds to sample each scenario")
+    parser.add_argument("--min-calls", type=int, default=20)
+    parser.add_argument("--max-calls", type=int, default=100000)
+    parser.add_argument("--filter", help="Only run scenarios whose name contains this text")
+    parser.add_argument("--money-mode", choices=[mode.value for mode in MoneyMode], default=MoneyMode.DECIMAL.value)
+    parser.add_argument("--output", help="Write results JSON to this path")
+    parser.add_argument("--baseline", help="Compare against this results JSON and fail on regressions")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="Allowed slowdown as a fraction")
+    parser.add_argument("--min-delta-us", type=float, default=5.0, help="Ignore slowdowns smaller than this")
+    args = parser.parse_args()
+
+    document = asyncio.run(run_suite(
+        sizes=[int(size) for size in args.sizes.split(",")],
+        min_time=args.min_time,
+        min_calls=args.min_calls,
+        max_calls=args.max_calls,
+        name_filter=args.filter,
+        money_mode=MoneyMode(args.money_mode)
+    ))
+    print_results(document)
+
+    if args.output:
+        with open(args.output, "w") as output:
+            json.dump(document, output, indent=2)
+        print(f"\nResults written to {args.output}")
+
+    if args.baseline:
+        with open(args.baseline) as baseline_file:
+            report = compare(document, json.load(baseline_file), args.tolerance, args.min_delta_us)
+        for name in report["missing"]:
+            print(f"Missing from this run: {name}")
+        for name in report["new"]:
+            print(f"Not in baseline: {name}")
+        if report["regressions"]:
+            print(f"\n{len(report['regressions'])} regression(s) beyond {args.tolerance:.0%}:")
+            for regression in report["regressions"]:
+                print(f"  {regression.name} {regression.metric}: "
+                      f"{regression.baseline_us:.1f} -> {regression.current_us:.1f} us ({regression.ratio:.2f}x)")
+            sys.exit(1)
+        print("\nNo regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Loyalty Ledger Benchmark
+
+Appends --events earn/burn events for --customers customers to a
+LoyaltyLedger in a temporary directory, then measures balance lookups and
+startup time: replaying the whole log (no snapshots) against loading a
+compacted snapshot plus the events logged after it.
+
+Usage:
+    python benchmarks/loyalty_ledger.py [--events 1000000] [--customers 100000] [--snapshot-every 100000]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.loyalty_ledger import InsufficientPoints, LoyaltyLedger
+
+
+def fill(directory: str, args, snapshot_every) -> float:
+    rng = random.Random(11)
+    ledger = LoyaltyLedger(directory, snapshot_every=snapshot_every)
+    started = time.perf_counter()
+    for _ in range(args.events):
+        customer_id = f"C{rng.randrange(args.customers)}"
+        if rng.random() < 0.7:
+            ledger.earn(customer_id, rng.randrange(1, 500))
+        else:
+            try:
+                ledger.burn(customer_id, rng.randrange(1, 300))
+            except InsufficientPoints:
+                ledger.earn(customer_id, 100)
+    elapsed = time.perf_counter() - started
+    ledger.close()
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--events", type=int, default=1_000_000)
+    parser.add_argument("--customers", type=int, default=100_000)
+    parser.add_argument("--snapshot-every", type=int, default=100_000)
+    args = parser.parse_args()
+
+    print(f"Events: {args.events:,}, customers: {args.customers:,}")
+    with tempfile.TemporaryDirectory() as directory:
+        log_only = os.path.join(directory, "log_only")
+        compacted = os.path.join(directory, "compacted")
+        elapsed = fill(log_only, args, None)
+        print(f"{'Appends':>36}: {args.events / elapsed:12,.0f} events/s")
+        fill(compacted, args, args.snapshot_every)
+
+        for label, path in [("full log", log_only), (f"snapshot every {args.snapshot_every:,}", compacted)]:
+            started = time.perf_counter()
+            ledger = LoyaltyLedger(path, snapshot_every=None)
+            elapsed = time.perf_counter() - started
+            print(f"{'Startup, ' + label:>36}: {elapsed * 1000:12,.1f} ms ({ledger.replayed:,} events replayed)")
+
+        customer_ids = [f"C{i}" for i in range(args.customers)]
+        started = time.perf_counter()
+        for customer_id in customer_ids:
+            ledger.available(customer_id)
+        elapsed = time.perf_counter() - started
+        print(f"{'Balance lookup':>36}: {elapsed / len(customer_ids) * 1e9:12,.0f} ns")
+        ledger.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Metrics Overhead Benchmark
+
+Compares microseconds per calculate_cart_discounts call with metrics
+disabled (the default) and enabled through DiscountService(metrics=...),
+and checks that both produce identical results.
+
+Usage:
+    python benchmarks/metrics_overhead.py [--carts 5000] [--lines 8] [--repeat 3]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.batch_pricing import build_requests, run_loop
+from src.services.discount_service import DiscountService
+from src.services.metrics import DiscountMetrics
+
+
+async def best_time(service: DiscountService, requests, repeat: int):
+    best = float("inf")
+    results = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = await run_loop(service, requests)
+        best = min(best, time.perf_counter() - start)
+    return best, results
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--carts", type=int, default=5000)
+    parser.add_argument("--lines", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    requests = build_requests(args.carts, args.lines)
+    metrics = DiscountMetrics()
+    disabled_time, disabled_results = await best_time(DiscountService(), requests, args.repeat)
+    enabled_time, enabled_results = await best_time(DiscountService(metrics=metrics), requests, args.repeat)
+
+    if disabled_results != enabled_results:
+        raise SystemExit("Results differ with metrics enabled")
+
+    print(f"Carts: {args.carts}, lines per cart: {args.lines}")
+    print(f"Metrics disabled: {disabled_time / args.carts * 1e6:8.1f} us/cart")
+    print(f"Metrics enabled:  {enabled_time / args.carts * 1e6:8.1f} us/cart "
+          f"({enabled_time / disabled_time - 1:+.1%})")
+    print(f"Exposition size:  {len(metrics.render()):,} bytes")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
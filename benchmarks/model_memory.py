@@ -0,0 +1,101 @@
+#!/usr/bin/env python3
+"""
+Model Memory Benchmark
+
+Builds the same products and cart lines as the dataclass models (Product,
+CartItem) and as the compact variants (CompactProduct/CompactCartItem and
+FrozenProduct/FrozenCartItem), and reports tracemalloc bytes per object.
+
+Brand, category and size strings are decoded from bytes per row, as they
+would be when loading a catalog, so the interned variants have repeated
+strings to share. Decimal prices are shared between the variants and not
+counted, since every variant holds the same Decimal objects.
+
+Usage:
+    python benchmarks/model_memory.py [--objects 200000]
+"""
+
+import argparse
+import gc
+import os
+import sys
+import tracemalloc
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.compact import CompactCartItem, CompactProduct, FrozenCartItem, FrozenProduct
+
+
+BRANDS = [b"PUMA", b"NIKE", b"ADIDAS", b"ZARA", b"H&M"]
+CATEGORIES = [b"T-shirts", b"Jeans", b"Shoes", b"Accessories", b"Jackets"]
+SIZES = [b"S", b"M", b"L", b"XL"]
+PRICES = [Decimal(price) for price in range(200, 6000, 7)]
+
+VARIANTS = [
+    ("dataclass", Product, CartItem),
+    ("compact", CompactProduct, CompactCartItem),
+    ("frozen", FrozenProduct, FrozenCartItem),
+]
+
+
+def build(count: int, product_type, item_type):
+    """Products and one cart line per product, with freshly decoded strings"""
+    tiers = list(BrandTier)
+    products = [
+        product_type(
+            f"P{i:07d}",
+            BRANDS[i % len(BRANDS)].decode(),
+            tiers[i % len(tiers)],
+            CATEGORIES[(i // 3) % len(CATEGORIES)].decode(),
+            PRICES[i % len(PRICES)],
+            PRICES[(i * 7) % len(PRICES)]
+        )
+        for i in range(count)
+    ]
+    items = [
+        item_type(product, 1 + i % 3, SIZES[i % len(SIZES)].decode(), product.base_price)
+        for i, product in enumerate(products)
+    ]
+    return products, items
+
+
+def measure(count: int, product_type, item_type):
+    """Bytes per product and per cart line, excluding the ids and the lists holding them"""
+    ids = [f"P{i:07d}" for i in range(count)]
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    products, _ = build(count, product_type, lambda *args: None)
+    after_products = tracemalloc.get_traced_memory()[0]
+    del products
+    gc.collect()
+    base = tracemalloc.get_traced_memory()[0]
+    products, items = build(count, product_type, item_type)
+    after_items = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    # Each run builds its own id strings; subtract their size so only the model objects remain
+    id_bytes = sum(sys.getsizeof(product_id) for product_id in ids)
+    list_bytes = sys.getsizeof(products)
+    product_bytes = after_products - before - id_bytes - 2 * list_bytes
+    item_bytes = after_items - base - id_bytes - 2 * list_bytes - product_bytes
+    return product_bytes / count, item_bytes / count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--objects", type=int, default=200000)
+    args = parser.parse_args()
+
+    print(f"Objects: {args.objects}")
+    print(f"{'variant':>10} {'bytes/product':>14} {'bytes/cart line':>16}")
+    for label, product_type, item_type in VARIANTS:
+        product_bytes, item_bytes = measure(args.objects, product_type, item_type)
+        print(f"{label:>10} {product_bytes:>14.1f} {item_bytes:>16.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""
+Fixed-Point Money Microbenchmark
+
+Compares the Decimal money path with the fixed-point (integer paise, basis
+point) path, both for the raw discount arithmetic and for end-to-end
+DiscountService pricing calls on the same carts.
+
+Usage:
+    python benchmarks/money_arithmetic.py [--carts 5000] [--lines 8]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+import timeit
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.discount_service import DiscountService
+from src.models.money import MoneyMode, apply_bps, cap_paise, to_bps, to_paise
+
+from batch_pricing import build_requests
+
+
+def arithmetic(number: int):
+    """Time one percentage-of-total-with-cap computation in each representation"""
+    total = Decimal("12345.67")
+    percentage = Decimal("69")
+    cap = Decimal("1000")
+
+    def decimal_discount():
+        amount = total * (percentage / Decimal("100"))
+        return cap if amount > cap else amount
+
+    total_paise = to_paise(total)
+    bps = to_bps(percentage)
+    cap_amount = to_paise(cap)
+
+    def fixed_discount():
+        return cap_paise(apply_bps(total_paise, bps), cap_amount)
+
+    decimal_time = min(timeit.repeat(decimal_discount, number=number, repeat=5))
+    fixed_time = min(timeit.repeat(fixed_discount, number=number, repeat=5))
+    return decimal_time / number * 1e9, fixed_time / number * 1e9
+
+
+async def price_all(service: DiscountService, requests):
+    start = time.perf_counter()
+    for request in requests:
+        await service.calculate_cart_discounts(
+            request.cart_items, request.customer, request.payment_info, request.voucher_code
+        )
+    return time.perf_counter() - start
+
+
+async def price_batch(service: DiscountService, requests):
+    start = time.perf_counter()
+    await service.calculate_cart_discounts_batch(requests)
+    return time.perf_counter() - start
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--carts", type=int, default=5000)
+    parser.add_argument("--lines", type=int, default=8)
+    args = parser.parse_args()
+
+    decimal_ns, fixed_ns = arithmetic(200000)
+    print(f"Discount arithmetic: Decimal {decimal_ns:.0f} ns/op, fixed-point {fixed_ns:.0f} ns/op "
+          f"({decimal_ns / fixed_ns:.2f}x)")
+
+    requests = build_requests(args.carts, args.lines)
+    decimal_service = DiscountService()
+    fixed_service = DiscountService(money_mode=MoneyMode.FIXED_POINT)
+    for name, runner in (("calculate_cart_discounts", price_all), ("calculate_cart_discounts_batch", price_batch)):
+        decimal_time = min([await runner(decimal_service, requests) for _ in range(3)])
+        fixed_time = min([await runner(fixed_service, requests) for _ in range(3)])
+        print(f"{name} ({args.carts} carts x {args.lines} lines): "
+              f"Decimal {args.carts / decimal_time:,.0f} carts/sec, "
+              f"fixed-point {args.carts / fixed_time:,.0f} carts/sec ({decimal_time / fixed_time:.2f}x)")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
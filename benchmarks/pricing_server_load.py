@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Pricing Server Load Test
+
+Starts a PricingServer on localhost (or targets --port of one already
+running with --external) and drives POST /v1/cart-discounts from
+--connections keep-alive connections, each sending its next request as
+soon as the previous response arrives. Reports throughput, latency
+percentiles and the mean micro-batch size, first with batching off
+(max batch size 1) and then with --max-batch-size / --max-wait-ms.
+
+Usage:
+    python benchmarks/pricing_server_load.py [--connections 64] [--requests 20000]
+        [--max-batch-size 64] [--max-wait-ms 0.5] [--external --port 8080]
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.discount_service import DiscountService
+from src.services.pricing_server import PricingClient, PricingServer
+from benchmarks.latency_suite import percentile
+
+BRANDS = ["PUMA", "NIKE", "ADIDAS", "ZARA", "H&M"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Accessories", "Jackets"]
+VOUCHERS = [None, "SUPER69", "PREMIUM20", "NEWUSER15", "BRAND_EXCLUSION"]
+
+
+def build_bodies(count: int, seed: int = 7) -> List[Dict]:
+    rng = random.Random(seed)
+    bodies = []
+    for i in range(count):
+        items = []
+        for j in range(rng.randrange(1, 6)):
+            price = str(rng.randrange(300, 5000))
+            items.append({
+                "product": {"id": f"P{j}", "brand": rng.choice(BRANDS), "brand_tier": "regular",
+                            "category": rng.choice(CATEGORIES), "base_price": price, "current_price": price},
+                "quantity": rng.randrange(1, 3),
+                "size": "M"
+            })
+        body = {"order_id": i, "customer": {"id": f"C{i}", "tier": rng.choice(["premium", "regular", "budget"])},
+                "items": items, "voucher_code": rng.choice(VOUCHERS)}
+        if rng.random() < 0.4:
+            body["payment"] = {"method": "CARD", "bank_name": "ICICI", "card_type": "CREDIT"}
+        bodies.append(body)
+    return bodies
+
+
+async def drive(port: int, bodies: List[Dict], connections: int) -> Dict:
+    latencies = []
+    queue = iter(bodies)
+
+    async def connection():
+        async with PricingClient(port=port) as client:
+            for body in queue:
+                started = time.perf_counter()
+                status, _ = await client.request("POST", "/v1/cart-discounts", body)
+                latencies.append(time.perf_counter() - started)
+                if status != 200:
+                    raise SystemExit(f"Request failed with status {status}")
+
+    started = time.perf_counter()
+    await asyncio.gather(*(connection() for _ in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "rps": len(latencies) / elapsed,
+        "p50_ms": percentile(latencies, 50) * 1000,
+        "p99_ms": percentile(latencies, 99) * 1000,
+    }
+
+
+async def run(args, max_batch_size: int) -> Dict:
+    bodies = build_bodies(args.requests)
+    if args.external:
+        return await drive(args.port, bodies, args.connections)
+    server = PricingServer(DiscountService(), port=0, max_batch_size=max_batch_size, max_wait=args.max_wait_ms / 1000)
+    async with server:
+        result = await drive(server.port, bodies, args.connections)
+    result["mean_batch"] = server.cart_batcher.mean_batch_size
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--connections", type=int, default=64)
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--max-batch-size", type=int, default=64)
+    parser.add_argument("--max-wait-ms", type=float, default=0.5)
+    parser.add_argument("--external", action="store_true", help="Load a server already listening on --port")
+    parser.add_argument("--port", type=int, default=8080)
+    args = parser.parse_args()
+
+    configurations = [args.max_batch_size] if args.external else [1, args.max_batch_size]
+    print(f"Connections: {args.connections}, requests: {args.requests:,}")
+    for max_batch_size in configurations:
+        result = asyncio.run(run(args, max_batch_size))
+        label = "external server" if args.external else f"max batch {max_batch_size:>3}"
+        line = (f"{label}: {result['rps']:10,.0f} req/s   p50 {result['p50_ms']:7.2f} ms   "
+                f"p99 {result['p99_ms']:7.2f} ms")
+        if "mean_batch" in result:
+            line += f"   mean batch {result['mean_batch']:.1f}"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
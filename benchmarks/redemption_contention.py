@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Redemption Limit Contention Benchmark
+
+Runs --tasks concurrent asyncio checkouts, each reserving a redemption of
+one of --codes vouchers (a global and a per-customer cap), yielding to the
+event loop as if taking payment, then committing or (one in --release-every)
+releasing it. Compares:
+
+    global lock   one asyncio.Lock around the counters and a synchronous
+                  SQLite write per commit, the way limits are enforced
+                  outside the library
+    sharded       RedemptionLimiter with a write-behind SQLiteRedemptionStore
+
+Reports checkouts per second and checks that no cap was exceeded.
+
+Usage:
+    python benchmarks/redemption_contention.py [--tasks 2000] [--checkouts 20000] [--codes 16]
+"""
+
+import argparse
+import asyncio
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+from typing import Dict, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.redemption_limits import RedemptionLimiter, RedemptionLimitReached, SQLiteRedemptionStore
+
+MAX_PER_CUSTOMER = 5
+
+
+class GlobalLockLimiter:
+    """One lock for every code, and a disk write inside it per commit"""
+
+    def __init__(self, path: str):
+        self.lock = asyncio.Lock()
+        self.counts: Dict[str, int] = {}
+        self.customer_counts: Dict[Tuple[str, str], int] = {}
+        self.connection = sqlite3.connect(path)
+        self.connection.execute(
+            "CREATE TABLE redemptions (code TEXT, customer_id TEXT, count INTEGER, PRIMARY KEY (code, customer_id))"
+        )
+
+    async def reserve(self, code: str, customer_id: str, max_total: int) -> bool:
+        async with self.lock:
+            key = (code, customer_id)
+            if self.counts.get(code, 0) >= max_total or self.customer_counts.get(key, 0) >= MAX_PER_CUSTOMER:
+                return False
+            self.counts[code] = self.counts.get(code, 0) + 1
+            self.customer_counts[key] = self.customer_counts.get(key, 0) + 1
+            return True
+
+    async def commit(self, code: str, customer_id: str):
+        async with self.lock:
+            with self.connection:
+                self.connection.execute(
+                    "INSERT INTO redemptions VALUES (?, ?, 1) "
+                    "ON CONFLICT (code, customer_id) DO UPDATE SET count = count + 1",
+                    (code, customer_id)
+                )
+
+    async def release(self, code: str, customer_id: str):
+        async with self.lock:
+            self.counts[code] -= 1
+            self.customer_counts[(code, customer_id)] -= 1
+
+
+async def run_global_lock(args, path: str) -> Dict:
+    limiter = GlobalLockLimiter(path)
+    work = iter(range(args.checkouts))
+    committed = rejected = 0
+
+    async def worker():
+        nonlocal committed, rejected
+        for i in work:
+            code, customer_id = f"CODE{i % args.codes}", f"C{i % args.customers}"
+            if not await limiter.reserve(code, customer_id, args.max_total):
+                rejected += 1
+                continue
+            await asyncio.sleep(0)
+            if i % args.release_every == 0:
+                await limiter.release(code, customer_id)
+            else:
+                await limiter.commit(code, customer_id)
+                committed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.tasks)))
+    elapsed = time.perf_counter() - started
+    limiter.connection.close()
+    return {"rate": args.checkouts / elapsed, "committed": committed, "rejected": rejected,
+            "max_used": max(limiter.counts.values())}
+
+
+async def run_sharded(args, path: str) -> Dict:
+    limiter = RedemptionLimiter(SQLiteRedemptionStore(path))
+    work = iter(range(args.checkouts))
+    committed = rejected = 0
+
+    async def worker():
+        nonlocal committed, rejected
+        for i in work:
+            try:
+                reservation = limiter.reserve(f"CODE{i % args.codes}", f"C{i % args.customers}",
+                                              args.max_total, MAX_PER_CUSTOMER)
+            except RedemptionLimitReached:
+                rejected += 1
+                continue
+            await asyncio.sleep(0)
+            if i % args.release_every == 0:
+                limiter.release(reservation)
+            else:
+                limiter.commit(reservation)
+                committed += 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(args.tasks)))
+    elapsed = time.perf_counter() - started
+    limiter.close()
+    return {"rate": args.checkouts / elapsed, "committed": committed, "rejected": rejected,
+            "max_used": max(limiter.redemptions(f"CODE{code}")[0] for code in range(args.codes))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tasks", type=int, default=2000, help="Concurrent checkout tasks")
+    parser.add_argument("--checkouts", type=int, default=20000)
+    parser.add_argument("--codes", type=int, default=16)
+    parser.add_argument("--customers", type=int, default=5000)
+    parser.add_argument("--max-total", type=int, default=1000, help="Global cap per code")
+    parser.add_argument("--release-every", type=int, default=10)
+    args = parser.parse_args()
+
+    print(f"Tasks: {args.tasks:,}, checkouts: {args.checkouts:,}, codes: {args.codes}, "
+          f"cap {args.max_total:,} per code / {MAX_PER_CUSTOMER} per customer")
+    with tempfile.TemporaryDirectory() as directory:
+        for label, run in [("global lock", run_global_lock), ("sharded", run_sharded)]:
+            result = asyncio.run(run(args, os.path.join(directory, f"{label.replace(' ', '_')}.db")))
+            if result["max_used"] > args.max_total:
+                raise SystemExit(f"{label}: cap exceeded ({result['max_used']} > {args.max_total})")
+            print(f"{label:>12}: {result['rate']:10,.0f} checkouts/s   committed {result['committed']:,}   "
+                  f"rejected {result['rejected']:,}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Bulk Voucher Eligibility Benchmark
+
+Compares finding which of --codes discount codes a cart qualifies for by
+calling explain_discount_code once per code against one
+check_discount_codes call, which evaluates every code as integer bitmaps.
+
+Usage:
+    python benchmarks/voucher_eligibility.py [--codes 500] [--carts 500]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from src.services.discount_registry import DiscountCodeRegistry
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+BRANDS = ["PUMA", "NIKE", "ZARA", "H&M", "LEVIS", "ADIDAS", "GAP", "UNIQLO"]
+CATEGORIES = ["Shoes", "Jackets", "T-shirts", "Jeans", "Shirts", "Shorts"]
+TIERS = ["budget", "regular", "premium", "gold", "platinum"]
+
+
+def build_codes(count: int, rng: random.Random):
+    return {
+        f"CODE{i}": {
+            "discount_percentage": str(rng.randrange(5, 50)),
+            "max_discount": str(rng.randrange(100, 1000)),
+            "tier_requirement": rng.choice([None, None] + TIERS),
+            "excluded_brands": rng.sample(BRANDS, rng.choice([0, 0, 1, 2])),
+            "allowed_categories": rng.sample(CATEGORIES, rng.choice([0, 0, 1, 3])),
+            "min_cart_value": str(rng.choice([0, 500, 1000, 2000, 5000]))
+        }
+        for i in range(count)
+    }
+
+
+def build_carts(count: int, rng: random.Random):
+    carts = []
+    for _ in range(count):
+        items = []
+        for i in range(rng.randrange(1, 6)):
+            price = Decimal(rng.randrange(200, 3000))
+            product = Product(id=f"P{i}", brand=rng.choice(BRANDS), brand_tier=BrandTier.REGULAR,
+                              category=rng.choice(CATEGORIES), base_price=price, current_price=price)
+            items.append(CartItem(product=product, quantity=1, size="M", price=price))
+        customer = CustomerProfile(id="C", name="C", email="c@example.com", tier=rng.choice(TIERS),
+                                   loyalty_points=0)
+        carts.append((items, customer))
+    return carts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--codes", type=int, default=500)
+    parser.add_argument("--carts", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(18)
+    registry = DiscountCodeRegistry(build_codes(args.codes, rng))
+    service = DiscountService(discount_registry=registry)
+    carts = build_carts(args.carts, rng)
+    codes = list(registry.rules)
+
+    start = time.perf_counter()
+    per_code = [{code: service.explain_discount_code(code, items, customer) for code in codes}
+                for items, customer in carts]
+    per_code_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bulk = [service.check_discount_codes(items, customer) for items, customer in carts]
+    bulk_time = time.perf_counter() - start
+
+    if [result.reasons() for result in bulk] != per_code:
+        raise SystemExit("Bulk eligibility disagrees with per-code validation")
+
+    eligible = sum(bin(result.eligible).count("1") for result in bulk)
+    print(f"Codes: {args.codes:,}, carts: {args.carts:,}, eligible pairs: {eligible:,}")
+    print(f"Per-code validation:   {per_code_time / args.carts * 1e6:10.2f} us/cart")
+    print(f"check_discount_codes:  {bulk_time / args.carts * 1e6:10.2f} us/cart "
+          f"({per_code_time / bulk_time:.0f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,24 +2,27 @@ from decimal import Decimal
 from typing import List, Dict
 from src.models.discount import DiscountedPrice
 from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot
 from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode, apply_bps, to_bps
 
 class BankDiscount:
     def __init__(self, bank_name: str, discount_percentage: Decimal):
         self.bank_name = bank_name
         self.discount_percentage = discount_percentage
+        self.discount_bps = to_bps(discount_percentage)
 
     def apply_discount(self, cart_items: List[CartItem], payment_info: PaymentInfo) -> DiscountedPrice:
+        original_price = self.calculate_original_price(cart_items)
         if payment_info.bank_name != self.bank_name:
             return DiscountedPrice(
-                original_price=self.calculate_original_price(cart_items),
-                final_price=self.calculate_original_price(cart_items),
+                original_price=original_price,
+                final_price=original_price,
                 applied_discounts={},
                 message="No bank discount applied."
             )
 
-        original_price = self.calculate_original_price(cart_items)
-        discount_amount = self.calculate_discount(original_price)
+        discount_amount = self.discount_for_total(original_price)
         final_price = original_price - discount_amount
 
         return DiscountedPrice(
@@ -31,7 +34,17 @@ class BankDiscount:
 
     async def calculate_discount(self, cart_items: List[CartItem], customer) -> Decimal:
         original_price = self.calculate_original_price(cart_items)
+        return self.discount_for_total(original_price)
+
+    def discount_for_total(self, original_price: Decimal) -> Decimal:
         return (Decimal(str(self.discount_percentage)) / Decimal(100)) * original_price
 
+    async def calculate_discount_paise(self, cart_items: List[CartItem], customer) -> int:
+        original_price = CartSnapshot.of(cart_items, MoneyMode.FIXED_POINT).paise.total
+        return self.discount_for_total_paise(original_price)
+
+    def discount_for_total_paise(self, original_price: int) -> int:
+        return apply_bps(original_price, self.discount_bps)
+
     def calculate_original_price(self, cart_items: List[CartItem]) -> Decimal:
-        return sum(item.product.current_price * item.quantity for item in cart_items)
\ No newline at end of file
+        return CartSnapshot.of(cart_items).total
\ No newline at end of file
@@ -1,9 +1,11 @@
 from abc import ABC, abstractmethod
 from decimal import Decimal
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Union
 from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot, CartTotals
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode, to_paise
 
 class BaseDiscount(ABC):
     """
@@ -59,6 +61,71 @@ class BaseDiscount(ABC):
         """
         pass
     
+    async def calculate_discount_paise(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> int:
+        """
+        Calculate the discount amount in integer paise for fixed-point money mode.
+        
+        The default converts calculate_discount's result, rounding half-up to
+        the paisa. Built-in discount types override it with integer arithmetic.
+        
+        Returns:
+            int: The discount amount in paise
+        """
+        return to_paise(await self.calculate_discount(cart_items, customer, payment_info, **kwargs))
+    
+    async def check_applicable(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> bool:
+        """
+        Applicability check for calculate_discount implementations.
+        
+        Returns the caller's precomputed `applicable` keyword argument when
+        given, so callers that already awaited is_applicable do not run it
+        again, and otherwise calls is_applicable.
+        
+        Returns:
+            bool: True if discount can be applied, False otherwise
+        """
+        applicable = kwargs.pop("applicable", None)
+        if applicable is not None:
+            return applicable
+        return await self.is_applicable(cart_items, customer, payment_info, **kwargs)
+    
+    async def evaluate(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        money_mode: MoneyMode = MoneyMode.DECIMAL
+    ) -> Optional[Union[Decimal, int]]:
+        """
+        Check applicability once and calculate the discount amount.
+        
+        Args:
+            cart_items: List of items in the cart
+            customer: Customer profile
+            payment_info: Optional payment information
+            money_mode: FIXED_POINT returns the amount as integer paise
+            
+        Returns:
+            The discount amount, or None if the discount is not applicable
+        """
+        if not await self.is_applicable(cart_items, customer, payment_info):
+            return None
+        if money_mode is MoneyMode.FIXED_POINT:
+            return await self.calculate_discount_paise(cart_items, customer, payment_info, applicable=True)
+        return await self.calculate_discount(cart_items, customer, payment_info, applicable=True)
+    
     def get_discount_info(self) -> Dict[str, str]:
         """
         Get basic information about this discount type.
@@ -71,6 +138,30 @@ class BaseDiscount(ABC):
             "name": self.discount_name
         }
     
+    def get_cart_snapshot(self, cart_items: List[CartItem]) -> CartSnapshot:
+        """
+        Helper method to get the precomputed aggregates of the cart.
+        
+        Args:
+            cart_items: List of cart items or an existing CartSnapshot
+            
+        Returns:
+            CartSnapshot: Reused as-is when cart_items already is a snapshot
+        """
+        return CartSnapshot.of(cart_items)
+    
+    def get_cart_paise(self, cart_items: List[CartItem]) -> CartTotals:
+        """
+        Helper method to get the cart aggregates in integer paise.
+        
+        Args:
+            cart_items: List of cart items or an existing CartSnapshot
+            
+        Returns:
+            CartTotals: Fixed-point totals of the cart snapshot
+        """
+        return CartSnapshot.of(cart_items, MoneyMode.FIXED_POINT).paise
+    
     def calculate_cart_total(self, cart_items: List[CartItem]) -> Decimal:
         """
         Helper method to calculate total cart value.
@@ -81,7 +172,7 @@ class BaseDiscount(ABC):
         Returns:
             Decimal: Total cart value using current prices
         """
-        return sum(item.product.current_price * item.quantity for item in cart_items)
+        return self.get_cart_snapshot(cart_items).total
     
     def get_cart_brands(self, cart_items: List[CartItem]) -> set:
         """
@@ -93,7 +184,7 @@ class BaseDiscount(ABC):
         Returns:
             Set of brand names
         """
-        return {item.product.brand for item in cart_items}
+        return self.get_cart_snapshot(cart_items).brands
     
     def get_cart_categories(self, cart_items: List[CartItem]) -> set:
         """
@@ -105,4 +196,4 @@ class BaseDiscount(ABC):
         Returns:
             Set of category names
         """
-        return {item.product.category for item in cart_items}
\ No newline at end of file
+        return self.get_cart_snapshot(cart_items).categories
\ No newline at end of file
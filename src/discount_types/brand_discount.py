@@ -4,6 +4,7 @@ from src.discount_types.base_discount import BaseDiscount
 from src.models.cart import CartItem
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
+from src.models.money import apply_bps, cap_paise, to_bps, to_paise
 
 class BrandDiscount(BaseDiscount):
     """
@@ -17,8 +18,11 @@ class BrandDiscount(BaseDiscount):
             discount_name=f"{brand} Brand Discount"
         )
         self.brand = brand
+        self.brand_key = brand.upper()
         self.discount_percentage = discount_percentage
         self.max_discount = max_discount
+        self.discount_bps = to_bps(discount_percentage)
+        self.max_discount_paise = to_paise(max_discount) if max_discount else 0
 
     async def calculate_discount(
         self, 
@@ -28,16 +32,16 @@ class BrandDiscount(BaseDiscount):
         **kwargs
     ) -> Decimal:
         """Calculate brand-specific discount amount"""
-        if not await self.is_applicable(cart_items, customer, payment_info, **kwargs):
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
             return Decimal("0")
         
         # Calculate discount only for items from the specific brand
-        brand_items_total = sum(
-            item.product.current_price * item.quantity
-            for item in cart_items
-            if item.product.brand.upper() == self.brand.upper()
-        )
+        brand_items_total = self.get_cart_snapshot(cart_items).brand_total(self.brand_key)
         
+        return self.discount_for_total(brand_items_total)
+
+    def discount_for_total(self, brand_items_total: Decimal) -> Decimal:
+        """Discount amount for a precomputed subtotal of this brand's items"""
         discount_amount = brand_items_total * (self.discount_percentage / Decimal("100"))
         
         # Apply maximum discount limit if specified
@@ -46,6 +50,23 @@ class BrandDiscount(BaseDiscount):
         
         return discount_amount
 
+    async def calculate_discount_paise(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> int:
+        """Calculate brand-specific discount amount in paise"""
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
+            return 0
+        
+        return self.discount_for_total_paise(self.get_cart_paise(cart_items).brand_total(self.brand_key))
+
+    def discount_for_total_paise(self, brand_items_total: int) -> int:
+        """Fixed-point counterpart of discount_for_total"""
+        return cap_paise(apply_bps(brand_items_total, self.discount_bps), self.max_discount_paise)
+
     async def is_applicable(
         self, 
         cart_items: List[CartItem], 
@@ -54,12 +75,11 @@ class BrandDiscount(BaseDiscount):
         **kwargs
     ) -> bool:
         """Check if cart contains items from the specific brand"""
-        cart_brands = self.get_cart_brands(cart_items)
-        return self.brand.upper() in {brand.upper() for brand in cart_brands}
+        return self.brand_key in self.get_cart_snapshot(cart_items).normalized_brands
 
     def apply_discount(self, product) -> Decimal:
         """Legacy method for backward compatibility"""
-        if product.brand.upper() == self.brand.upper():
+        if product.brand.upper() == self.brand_key:
             discount_amount = product.base_price * (self.discount_percentage / Decimal(100))
             return discount_amount
         return Decimal(0)
@@ -3,6 +3,7 @@ from decimal import Decimal
 from typing import List, Dict
 from src.models.product import Product
 from src.models.discount import DiscountedPrice
+from src.models.money import apply_bps, from_paise, to_bps
 
 @dataclass
 class CategoryDiscount:
@@ -11,13 +12,36 @@ class CategoryDiscount:
 
     def apply_discount(self, products: List[Product]) -> Dict[str, Decimal]:
         applied_discounts = {}
-        for product in products:
+        for index, product in enumerate(products):
             if product.category == self.category:
                 discount_amount = product.base_price * (self.discount_percentage / Decimal(100))
-                product.current_price -= discount_amount
+                _set_current_price(products, index, product.current_price - discount_amount)
                 applied_discounts[f"{self.category} discount"] = discount_amount
         return applied_discounts
 
+    def apply_discount_paise(self, products: List[Product]) -> Dict[str, int]:
+        """Fixed-point counterpart of apply_discount, with amounts in paise"""
+        discount_bps = to_bps(self.discount_percentage)
+        applied_discounts = {}
+        for index, product in enumerate(products):
+            if product.category == self.category:
+                discount_amount = apply_bps(product.base_price_paise, discount_bps)
+                _set_current_price(products, index, product.current_price - from_paise(discount_amount))
+                applied_discounts[f"{self.category} discount"] = discount_amount
+        return applied_discounts
+
+def _set_current_price(products: List[Product], index: int, current_price: Decimal):
+    """
+    Reprice products[index]. Mutable products are updated in place; immutable
+    ones (src.models.compact.FrozenProduct) are replaced in the list by a
+    repriced copy.
+    """
+    product = products[index]
+    if hasattr(product, "with_current_price"):
+        products[index] = product.with_current_price(current_price)
+    else:
+        product.current_price = current_price
+
 def calculate_category_discount(products: List[Product], category_discounts: List[CategoryDiscount]) -> DiscountedPrice:
     original_price = sum(product.base_price for product in products)
     applied_discounts = {}
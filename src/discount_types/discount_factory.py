@@ -1,18 +1,82 @@
-from typing import Dict, Type, List, Optional
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Hashable, Type, List, Optional, Union
 from decimal import Decimal
 from src.discount_types.base_discount import BaseDiscount
 from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode
+from src.models.pricing_trace import CLAMPED, NOT_SELECTED, PricingTrace
+from src.discount_types.stacking_solver import StackingSolver
+
+@dataclass
+class PoolStats:
+    """Counters for the DiscountFactory interning pool"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+
+
+def _freeze(value) -> Hashable:
+    """
+    Hashable, type-tagged form of a constructor argument for the pool key.
+    
+    Values are tagged with their type so that, e.g., 10.0 and Decimal("10")
+    get separate instances. Raises TypeError for values that cannot be frozen.
+    """
+    if isinstance(value, (list, tuple)):
+        return (type(value), tuple(_freeze(item) for item in value))
+    if isinstance(value, (set, frozenset)):
+        return (type(value), frozenset(_freeze(item) for item in value))
+    if isinstance(value, dict):
+        return (dict, tuple(sorted((key, _freeze(item)) for key, item in value.items())))
+    hash(value)
+    return (type(value), value)
+
+
+# Argument types that are hashable, immutable and need no freezing
+_SCALAR_TYPES = frozenset({str, int, float, bool, Decimal, date, type(None)})
+
+
+def _pool_key(kwargs: Dict) -> Hashable:
+    """Pool key for constructor keyword arguments, independent of their order"""
+    key = []
+    for name, value in sorted(kwargs.items()):
+        value_type = type(value)
+        if value_type in _SCALAR_TYPES:
+            key.append((name, value_type, value))
+        else:
+            key.append((name, _freeze(value)))
+    return tuple(key)
+
 
 class DiscountFactory:
     """
     Factory class for creating and managing different discount types.
     Provides a clean interface for adding new discount types to the system.
+    
+    create_discount interns instances: asking twice for the same type with
+    equal parameters returns the same object from a bounded LRU pool, so
+    the steady-state pricing path does not allocate discount objects. The
+    discount types keep no per-request state; treat instances from the
+    factory as read-only.
     """
     
-    def __init__(self):
+    DEFAULT_POOL_SIZE = 1024
+    
+    def __init__(self, pool_size: int = DEFAULT_POOL_SIZE):
         self._discount_types: Dict[str, Type[BaseDiscount]] = {}
+        self.version = 0  # Bumped whenever a discount type is registered
+        # Interned instances keyed by (type name, class, frozen kwargs); 0 disables pooling
+        self.pool_size = pool_size
+        self.pool_stats = PoolStats()
+        self._pool: "OrderedDict[Hashable, BaseDiscount]" = OrderedDict()
+        # Optional src.services.metrics.DiscountMetrics timing every evaluation
+        self.metrics = None
         self._register_default_discounts()
     
     def _register_default_discounts(self):
@@ -46,10 +110,13 @@ class DiscountFactory:
             raise ValueError(f"Discount class must inherit from BaseDiscount")
         
         self._discount_types[discount_type] = discount_class
+        self.version += 1
+        self.clear_pool()
     
     def create_discount(self, discount_type: str, **kwargs) -> BaseDiscount:
         """
-        Create a discount instance of the specified type.
+        Create a discount instance of the specified type, or return the
+        interned instance created earlier with equal parameters.
         
         Args:
             discount_type: Type of discount to create
@@ -62,7 +129,37 @@ class DiscountFactory:
             raise ValueError(f"Unknown discount type: {discount_type}")
         
         discount_class = self._discount_types[discount_type]
-        return discount_class(**kwargs)
+        if not self.pool_size:
+            return discount_class(**kwargs)
+        
+        try:
+            key = (discount_type, discount_class, _pool_key(kwargs))
+        except TypeError:
+            # Unhashable parameters: build a private instance
+            return discount_class(**kwargs)
+        
+        discount = self._pool.get(key)
+        if discount is not None:
+            self._pool.move_to_end(key)
+            self.pool_stats.hits += 1
+            return discount
+        
+        self.pool_stats.misses += 1
+        # Copy list arguments so later changes to the caller's lists cannot
+        # reach the shared instance
+        discount = discount_class(**{
+            name: list(value) if isinstance(value, list) else value
+            for name, value in kwargs.items()
+        })
+        self._pool[key] = discount
+        if len(self._pool) > self.pool_size:
+            self._pool.popitem(last=False)
+            self.pool_stats.evictions += 1
+        return discount
+    
+    def clear_pool(self):
+        """Drop every interned instance"""
+        self._pool.clear()
     
     def get_available_discount_types(self) -> List[str]:
         """
@@ -78,7 +175,13 @@ class DiscountFactory:
         discounts: List[BaseDiscount],
         cart_items: List[CartItem],
         customer: CustomerProfile,
-        payment_info: Optional[PaymentInfo] = None
+        payment_info: Optional[PaymentInfo] = None,
+        money_mode: MoneyMode = MoneyMode.DECIMAL,
+        stacking_solver: Optional[StackingSolver] = None,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        trace: Optional[PricingTrace] = None
     ) -> Dict[str, Decimal]:
         """
         Apply multiple discounts and return the results.
@@ -88,18 +191,126 @@ class DiscountFactory:
             cart_items: List of cart items
             customer: Customer profile
             payment_info: Optional payment information
+            money_mode: FIXED_POINT returns amounts as integer paise
+            stacking_solver: Optional solver that picks the best combination
+                under its exclusivity groups and caps instead of stacking
+                every applicable discount
+            concurrent: Evaluate the discounts concurrently, see evaluate_discounts
+            max_concurrency: Most discounts evaluated at once when concurrent
+            timeout: Seconds each discount may take before it is skipped
+            trace: Optional trace recording each evaluation and the solver's
+                choices and cap clamps
             
         Returns:
             Dict mapping discount names to discount amounts
         """
+        cart_items = CartSnapshot.of(cart_items, money_mode)
+        amounts = await self.evaluate_discounts(
+            discounts, cart_items, customer, payment_info, money_mode,
+            concurrent=concurrent, max_concurrency=max_concurrency, timeout=timeout, trace=trace
+        )
+        
+        if stacking_solver is not None:
+            cart_total = cart_items.paise.total if money_mode is MoneyMode.FIXED_POINT else cart_items.total
+            candidates = [
+                (discount, discount_amount)
+                for discount, discount_amount in zip(discounts, amounts)
+                if discount_amount is not None
+            ]
+            result = stacking_solver.choose(candidates, cart_total)
+            if trace is not None:
+                for name, discount_amount in result.rejected.items():
+                    trace.record(name, NOT_SELECTED, amount=discount_amount)
+                if result.total_discount != result.uncapped_discount:
+                    trace.record(
+                        "Stacking caps", CLAMPED,
+                        amount=result.total_discount, uncapped=result.uncapped_discount, cap=result.total_discount
+                    )
+            return result.applied_discounts
+        
         applied_discounts = {}
+        for discount, discount_amount in zip(discounts, amounts):
+            if discount_amount is not None and discount_amount > 0:
+                applied_discounts[discount.discount_name] = discount_amount
+                
+        return applied_discounts
+    
+    async def evaluate_discounts(
+        self,
+        discounts: List[BaseDiscount],
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        money_mode: MoneyMode = MoneyMode.DECIMAL,
+        concurrent: bool = False,
+        max_concurrency: Optional[int] = None,
+        timeout: Optional[float] = None,
+        trace: Optional[PricingTrace] = None
+    ) -> List[Optional[Union[Decimal, int]]]:
+        """
+        Evaluate each discount once with BaseDiscount.evaluate.
+        
+        Serially by default. With concurrent=True the discounts run together
+        under asyncio.gather, at most max_concurrency at a time (unlimited
+        when None), which pays off when discounts await remote data. A
+        discount that takes longer than timeout seconds is treated as not
+        applicable; any other exception propagates.
         
-        for discount in discounts:
-            if await discount.is_applicable(cart_items, customer, payment_info):
-                discount_amount = await discount.calculate_discount(
-                    cart_items, customer, payment_info
+        Args:
+            discounts: List of discount instances to evaluate
+            cart_items: List of cart items
+            customer: Customer profile
+            payment_info: Optional payment information
+            money_mode: FIXED_POINT returns amounts as integer paise
+            concurrent: Evaluate the discounts concurrently
+            max_concurrency: Most discounts evaluated at once when concurrent
+            timeout: Seconds each discount may take before it is skipped
+            trace: Optional trace recording each evaluation as it finishes
+            
+        Returns:
+            Amount per discount, None where not applicable, in the order of discounts
+        """
+        if max_concurrency is not None and max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1")
+        
+        # Build the snapshot up front so concurrent evaluations share it
+        cart_items = CartSnapshot.of(cart_items, money_mode)
+        
+        if not concurrent:
+            return [
+                await self._evaluate_within(
+                    self._evaluation(discount, cart_items, customer, payment_info, money_mode, trace), timeout
                 )
-                if discount_amount > 0:
-                    applied_discounts[discount.discount_name] = discount_amount
-                
-        return applied_discounts
\ No newline at end of file
+                for discount in discounts
+            ]
+        
+        semaphore = asyncio.Semaphore(max_concurrency) if max_concurrency is not None else None
+        
+        async def evaluate(discount: BaseDiscount):
+            evaluation = self._evaluation(discount, cart_items, customer, payment_info, money_mode, trace)
+            if semaphore is None:
+                return await self._evaluate_within(evaluation, timeout)
+            async with semaphore:
+                return await self._evaluate_within(evaluation, timeout)
+        
+        # gather keeps results in the order of discounts, whatever order they finish in
+        return await asyncio.gather(*(evaluate(discount) for discount in discounts))
+    
+    def _evaluation(self, discount: BaseDiscount, cart_items, customer, payment_info, money_mode, trace):
+        """discount.evaluate(...), timed by metrics and recorded by trace when they are enabled"""
+        evaluation = discount.evaluate(cart_items, customer, payment_info, money_mode)
+        if self.metrics is not None:
+            evaluation = self.metrics.observe_evaluation(discount, evaluation)
+        if trace is not None:
+            evaluation = trace.observe_evaluation(discount, evaluation)
+        return evaluation
+    
+    @staticmethod
+    async def _evaluate_within(evaluation, timeout: Optional[float]):
+        """Await a discount evaluation, giving up after timeout seconds"""
+        if timeout is None:
+            return await evaluation
+        try:
+            return await asyncio.wait_for(evaluation, timeout)
+        except asyncio.TimeoutError:
+            return None
@@ -8,18 +8,56 @@ from src.models.cart import CartItem
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
 from src.discount_types.base_discount import BaseDiscount
+from src.models.money import apply_bps, to_bps
+from src.services.loyalty_ledger import LoyaltyLedger, PointsReservation
 
 # Example: Create a custom loyalty discount
 class LoyaltyDiscount(BaseDiscount):
-    """Custom loyalty points discount implementation"""
+    """
+    Custom loyalty points discount implementation.
     
-    def __init__(self, points_threshold: int, discount_percentage: Decimal):
+    Applies when the customer has at least points_threshold points (and at
+    least points_cost, the points redeeming it burns). With a ledger the
+    points are the customer's live available balance there, instead of the
+    CustomerProfile.loyalty_points snapshot, and reserve_points holds the
+    points_cost for an order until the ledger commits or releases it.
+    """
+    
+    def __init__(
+        self,
+        points_threshold: int,
+        discount_percentage: Decimal,
+        ledger: Optional[LoyaltyLedger] = None,
+        points_cost: Optional[Decimal] = None
+    ):
         super().__init__(
             discount_id="LOYALTY_POINTS",
             discount_name="Loyalty Points Discount"
         )
         self.points_threshold = points_threshold
         self.discount_percentage = discount_percentage
+        self.discount_bps = to_bps(discount_percentage)
+        self.ledger = ledger
+        self.points_cost = points_cost
+    
+    def points(self, customer: CustomerProfile) -> Decimal:
+        """Points the customer can use: available in the ledger, else the profile's"""
+        if self.ledger is not None:
+            return self.ledger.available(customer.id)
+        return customer.loyalty_points
+    
+    def reserve_points(self, customer: CustomerProfile) -> PointsReservation:
+        """
+        Hold points_cost points of the customer's for an order redeeming
+        this discount; commit or release it through the ledger.
+        
+        Raises:
+            ValueError: Without a ledger or a points_cost
+            InsufficientPoints: If the customer has fewer points available
+        """
+        if self.ledger is None or not self.points_cost:
+            raise ValueError("Reserving points needs a ledger and a points_cost")
+        return self.ledger.reserve(customer.id, self.points_cost)
     
     async def calculate_discount(
         self, 
@@ -28,12 +66,24 @@ class LoyaltyDiscount(BaseDiscount):
         payment_info: Optional[PaymentInfo] = None,
         **kwargs
     ) -> Decimal:
-        if not await self.is_applicable(cart_items, customer, payment_info, **kwargs):
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
             return Decimal("0")
         
         cart_total = self.calculate_cart_total(cart_items)
         return cart_total * (self.discount_percentage / Decimal("100"))
     
+    async def calculate_discount_paise(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> int:
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
+            return 0
+        
+        return apply_bps(self.get_cart_paise(cart_items).total, self.discount_bps)
+    
     async def is_applicable(
         self, 
         cart_items: List[CartItem], 
@@ -41,4 +91,5 @@ class LoyaltyDiscount(BaseDiscount):
         payment_info: Optional[PaymentInfo] = None,
         **kwargs
     ) -> bool:
-        return customer.loyalty_points >= self.points_threshold
\ No newline at end of file
+        points = self.points(customer)
+        return points >= self.points_threshold and (not self.points_cost or points >= self.points_cost)
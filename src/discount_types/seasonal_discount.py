@@ -1,10 +1,11 @@
 from decimal import Decimal
-from typing import List, Optional
-from datetime import datetime, date
+from typing import Callable, List, Optional
+from datetime import date
 from src.discount_types.base_discount import BaseDiscount
 from src.models.cart import CartItem
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
+from src.models.money import apply_bps, cap_paise, to_bps, to_paise
 
 class SeasonalDiscount(BaseDiscount):
     """
@@ -19,7 +20,8 @@ class SeasonalDiscount(BaseDiscount):
         end_date: date,
         discount_percentage: Decimal,
         applicable_categories: Optional[List[str]] = None,
-        max_discount: Optional[Decimal] = None
+        max_discount: Optional[Decimal] = None,
+        clock: Optional[Callable[[], date]] = None
     ):
         super().__init__(
             discount_id=f"SEASONAL_{season_name.upper()}",
@@ -31,6 +33,10 @@ class SeasonalDiscount(BaseDiscount):
         self.discount_percentage = discount_percentage
         self.applicable_categories = applicable_categories or []
         self.max_discount = max_discount
+        self.discount_bps = to_bps(discount_percentage)
+        self.max_discount_paise = to_paise(max_discount) if max_discount else 0
+        # Source of today's date; date.today unless injected (e.g. in tests)
+        self.clock = clock or date.today
     
     async def calculate_discount(
         self, 
@@ -40,16 +46,12 @@ class SeasonalDiscount(BaseDiscount):
         **kwargs
     ) -> Decimal:
         """Calculate seasonal discount amount"""
-        if not await self.is_applicable(cart_items, customer, payment_info, **kwargs):
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
             return Decimal("0")
         
         # Calculate discount only for applicable categories (if specified)
         if self.applicable_categories:
-            applicable_total = sum(
-                item.product.current_price * item.quantity
-                for item in cart_items
-                if item.product.category in self.applicable_categories
-            )
+            applicable_total = self.get_cart_snapshot(cart_items).categories_total(self.applicable_categories)
         else:
             applicable_total = self.calculate_cart_total(cart_items)
         
@@ -61,6 +63,25 @@ class SeasonalDiscount(BaseDiscount):
         
         return discount_amount
     
+    async def calculate_discount_paise(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> int:
+        """Calculate seasonal discount amount in paise"""
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
+            return 0
+        
+        cart_paise = self.get_cart_paise(cart_items)
+        if self.applicable_categories:
+            applicable_total = cart_paise.categories_total(self.applicable_categories)
+        else:
+            applicable_total = cart_paise.total
+        
+        return cap_paise(apply_bps(applicable_total, self.discount_bps), self.max_discount_paise)
+    
     async def is_applicable(
         self, 
         cart_items: List[CartItem], 
@@ -69,10 +90,8 @@ class SeasonalDiscount(BaseDiscount):
         **kwargs
     ) -> bool:
         """Check if seasonal discount is currently active"""
-        current_date = datetime.now().date()
-        
         # Check if we're within the discount period
-        if not (self.start_date <= current_date <= self.end_date):
+        if not self.is_active(self.clock()):
             return False
         
         # Check if cart has applicable categories (if specified)
@@ -81,4 +100,8 @@ class SeasonalDiscount(BaseDiscount):
             if not cart_categories.intersection(self.applicable_categories):
                 return False
         
-        return True
\ No newline at end of file
+        return True
+    
+    def is_active(self, on_date: date) -> bool:
+        """Check if on_date falls within the discount period, both ends included"""
+        return self.start_date <= on_date <= self.end_date
\ No newline at end of file
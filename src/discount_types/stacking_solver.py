@@ -0,0 +1,253 @@
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from src.discount_types.base_discount import BaseDiscount
+from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode, apply_bps, to_bps, to_paise
+
+Amount = Union[Decimal, int]
+
+
+@dataclass(frozen=True)
+class ExclusivityGroup:
+    """At most max_selected of the discounts with these discount_ids can stack"""
+    name: str
+    discount_ids: Tuple[str, ...]
+    max_selected: int = 1
+
+    def __post_init__(self):
+        object.__setattr__(self, "discount_ids", tuple(self.discount_ids))
+        if self.max_selected < 1:
+            raise ValueError(f"Exclusivity group {self.name} must allow at least one discount")
+
+
+@dataclass
+class StackingResult:
+    """The discount combination the solver chose"""
+    applied_discounts: Dict[str, Amount]  # discount_name -> amount, in input order
+    selected_ids: List[str]  # discount_id of each chosen discount, in input order
+    total_discount: Amount  # Sum of applied_discounts, after the global caps
+    uncapped_discount: Amount  # Sum of the chosen discounts before the global caps
+    candidates: int = 0  # Applicable discounts with a positive amount
+    nodes_explored: int = 0  # Search tree nodes visited
+    rejected: Dict[str, Amount] = field(default_factory=dict)  # Applicable but not chosen
+
+
+class StackingSolver:
+    """
+    Picks the combination of discounts that saves the most while respecting
+    exclusivity groups and global caps.
+
+    Each discount's amount is calculated once on the whole cart, as
+    DiscountFactory.apply_multiple_discounts does, and a combination saves
+    the sum of its amounts limited by the caps:
+      - max_total_discount: absolute limit on the combined discount
+      - max_discount_percentage: limit as a percentage of the cart total
+      - max_discounts: limit on how many discounts can stack
+
+    The search is a depth-first branch-and-bound over candidates sorted by
+    amount, trying "take" before "skip". A branch is pruned when the best
+    amounts still reachable from it, capped, cannot beat the incumbent, so
+    once a combination reaches the cap only branches with fewer discounts
+    are explored. Ties go to the combination with fewer discounts, then to
+    larger individual amounts.
+    When the caps trim a combination, the trimmed amount comes off the
+    smallest chosen discounts first.
+    """
+
+    def __init__(
+        self,
+        groups: Iterable[ExclusivityGroup] = (),
+        max_total_discount: Optional[Decimal] = None,
+        max_discount_percentage: Optional[Decimal] = None,
+        max_discounts: Optional[int] = None
+    ):
+        self.groups = list(groups)
+        self.max_total_discount = max_total_discount
+        self.max_discount_percentage = max_discount_percentage
+        self.max_discounts = max_discounts
+
+    async def solve(
+        self,
+        discounts: List[BaseDiscount],
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        money_mode: MoneyMode = MoneyMode.DECIMAL
+    ) -> StackingResult:
+        """
+        Evaluate every discount on the cart and choose the best combination.
+
+        Args:
+            discounts: Candidate discount instances
+            cart_items: List of cart items
+            customer: Customer profile
+            payment_info: Optional payment information
+            money_mode: FIXED_POINT works in, and returns, integer paise
+
+        Returns:
+            StackingResult describing the chosen combination
+        """
+        fixed_point = money_mode is MoneyMode.FIXED_POINT
+        cart_items = CartSnapshot.of(cart_items, money_mode)
+        cart_total = cart_items.paise.total if fixed_point else cart_items.total
+
+        candidates = []
+        for discount in discounts:
+            discount_amount = await discount.evaluate(cart_items, customer, payment_info, money_mode)
+            if discount_amount is not None:
+                candidates.append((discount, discount_amount))
+
+        return self.choose(candidates, cart_total)
+
+    def choose(
+        self,
+        candidates: Sequence[Tuple[BaseDiscount, Amount]],
+        cart_total: Amount
+    ) -> StackingResult:
+        """
+        Choose the best combination of already-priced discounts.
+
+        Args:
+            candidates: (discount, amount) pairs; amounts in Decimal rupees,
+                or integer paise when cart_total is in paise
+            cart_total: Cart total the percentage cap is taken from
+
+        Returns:
+            StackingResult describing the chosen combination
+        """
+        fixed_point = isinstance(cart_total, int)
+        zero = 0 if fixed_point else Decimal("0")
+        cap = self._cap(cart_total)
+
+        # Positions into candidates, largest amount first; equal amounts keep input order
+        order = [position for position, (_, amount) in enumerate(candidates) if amount > 0]
+        order.sort(key=lambda position: -candidates[position][1])
+        amounts = [candidates[position][1] for position in order]
+
+        # Group indexes each candidate counts against, and how many each group allows
+        group_limits = [group.max_selected for group in self.groups]
+        memberships = []
+        for position in order:
+            discount_id = candidates[position][0].discount_id
+            memberships.append(tuple(
+                group_index for group_index, group in enumerate(self.groups)
+                if discount_id in group.discount_ids
+            ))
+
+        size = len(order)
+        slots = self.max_discounts if self.max_discounts is not None else size
+        group_counts = [0] * len(self.groups)
+        chosen: List[int] = []
+        best = {"savings": zero, "chosen": [], "nodes": 0}
+
+        def capped(amount):
+            return amount if cap is None or amount < cap else cap
+
+        def fits(index):
+            return all(group_counts[group_index] < group_limits[group_index] for group_index in memberships[index])
+
+        def upper_bound(start, current, remaining_slots):
+            # Best additions when each candidate only has to respect its first
+            # group and the slot limit; greedy is exact for that relaxation
+            bound = current
+            used = {}
+            for index in range(start, size):
+                if remaining_slots == 0:
+                    break
+                if not fits(index):
+                    continue
+                if memberships[index]:
+                    group_index = memberships[index][0]
+                    taken = used.get(group_index, 0)
+                    if group_counts[group_index] + taken >= group_limits[group_index]:
+                        continue
+                    used[group_index] = taken + 1
+                bound += amounts[index]
+                remaining_slots -= 1
+            return capped(bound)
+
+        def improves(savings, count):
+            return savings > best["savings"] or (savings == best["savings"] and count < len(best["chosen"]))
+
+        def search(start, current):
+            best["nodes"] += 1
+            savings = capped(current)
+            if improves(savings, len(chosen)):
+                best["savings"] = savings
+                best["chosen"] = list(chosen)
+            if start == size or len(chosen) == slots:
+                return
+            bound = upper_bound(start, current, slots - len(chosen))
+            if bound < best["savings"] or (bound == best["savings"] and len(chosen) + 1 >= len(best["chosen"])):
+                return
+
+            for index in range(start, size):
+                if not fits(index):
+                    continue
+                for group_index in memberships[index]:
+                    group_counts[group_index] += 1
+                chosen.append(index)
+                search(index + 1, current + amounts[index])
+                chosen.pop()
+                for group_index in memberships[index]:
+                    group_counts[group_index] -= 1
+                # Skipping index: what is left must still be able to win
+                bound = upper_bound(index + 1, current, slots - len(chosen))
+                if bound < best["savings"] or (bound == best["savings"] and len(chosen) + 1 >= len(best["chosen"])):
+                    return
+
+        search(0, zero)
+
+        chosen_indexes = set(best["chosen"])
+        uncapped = sum((amounts[index] for index in best["chosen"]), zero)
+        trimmed = {index: amounts[index] for index in best["chosen"]}
+        excess = uncapped - best["savings"]
+        for index in sorted(chosen_indexes, reverse=True):
+            if excess <= 0:
+                break
+            cut = min(excess, trimmed[index])
+            trimmed[index] -= cut
+            excess -= cut
+
+        applied_discounts: Dict[str, Amount] = {}
+        selected_ids = []
+        rejected: Dict[str, Amount] = {}
+        position_to_index = {position: index for index, position in enumerate(order)}
+        for position, (discount, amount) in enumerate(candidates):
+            index = position_to_index.get(position)
+            if index in chosen_indexes:
+                selected_ids.append(discount.discount_id)
+                if trimmed[index] > 0:
+                    applied_discounts[discount.discount_name] = trimmed[index]
+            elif index is not None:
+                rejected[discount.discount_name] = amount
+
+        return StackingResult(
+            applied_discounts=applied_discounts,
+            selected_ids=selected_ids,
+            total_discount=best["savings"],
+            uncapped_discount=uncapped,
+            candidates=size,
+            nodes_explored=best["nodes"],
+            rejected=rejected
+        )
+
+    def _cap(self, cart_total: Amount) -> Optional[Amount]:
+        """Tightest of the global amount caps, in the cart total's form"""
+        caps = []
+        if isinstance(cart_total, int):
+            if self.max_total_discount is not None:
+                caps.append(to_paise(self.max_total_discount))
+            if self.max_discount_percentage is not None:
+                caps.append(apply_bps(cart_total, to_bps(self.max_discount_percentage)))
+        else:
+            if self.max_total_discount is not None:
+                caps.append(Decimal(str(self.max_total_discount)))
+            if self.max_discount_percentage is not None:
+                caps.append(cart_total * Decimal(str(self.max_discount_percentage)) / Decimal("100"))
+        return max(min(caps), 0) if caps else None
@@ -4,6 +4,7 @@ from src.discount_types.base_discount import BaseDiscount
 from src.models.cart import CartItem
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
+from src.models.money import apply_bps, cap_paise, to_bps, to_paise
 
 class TierDiscount(BaseDiscount):
     """
@@ -26,6 +27,8 @@ class TierDiscount(BaseDiscount):
         self.discount_percentage = discount_percentage
         self.max_discount = max_discount
         self.min_cart_value = min_cart_value or Decimal("0")
+        self.discount_bps = to_bps(discount_percentage)
+        self.max_discount_paise = to_paise(max_discount) if max_discount else 0
     
     async def calculate_discount(
         self, 
@@ -35,7 +38,7 @@ class TierDiscount(BaseDiscount):
         **kwargs
     ) -> Decimal:
         """Calculate tier-based discount amount"""
-        if not await self.is_applicable(cart_items, customer, payment_info, **kwargs):
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
             return Decimal("0")
         
         cart_total = self.calculate_cart_total(cart_items)
@@ -47,6 +50,20 @@ class TierDiscount(BaseDiscount):
         
         return discount_amount
     
+    async def calculate_discount_paise(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> int:
+        """Calculate tier-based discount amount in paise"""
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
+            return 0
+        
+        cart_total = self.get_cart_paise(cart_items).total
+        return cap_paise(apply_bps(cart_total, self.discount_bps), self.max_discount_paise)
+    
     async def is_applicable(
         self, 
         cart_items: List[CartItem], 
@@ -56,18 +73,17 @@ class TierDiscount(BaseDiscount):
     ) -> bool:
         """Check if customer meets tier requirements"""
         # Check customer tier
-        if not self._check_customer_tier(customer):
+        if not self.applies_to(customer):
             return False
         
         # Check minimum cart value
-        cart_total = self.calculate_cart_total(cart_items)
-        if cart_total < self.min_cart_value:
+        if not self.get_cart_snapshot(cart_items).meets_minimum(self.min_cart_value):
             return False
         
         return True
     
-    def _check_customer_tier(self, customer: CustomerProfile) -> bool:
-        """Check if customer meets the tier requirement"""
+    def applies_to(self, customer: CustomerProfile) -> bool:
+        """Check if customer meets the tier requirement, whatever the cart"""
         tier_hierarchy = {
             "budget": 1,
             "regular": 2,
@@ -6,6 +6,7 @@ from src.discount_types.base_discount import BaseDiscount
 from src.models.cart import CartItem
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
+from src.models.money import apply_bps, to_bps, to_paise
 
 class VoucherDiscount(BaseDiscount):
     """
@@ -22,6 +23,8 @@ class VoucherDiscount(BaseDiscount):
         # Ensure discount_percentage and max_discount_amount are Decimal
         self.discount_percentage = Decimal(str(discount_percentage))
         self.max_discount_amount = Decimal(str(max_discount_amount))
+        self.discount_bps = to_bps(self.discount_percentage)
+        self.max_discount_paise = to_paise(self.max_discount_amount)
 
     async def is_applicable(
         self, 
@@ -49,10 +52,14 @@ class VoucherDiscount(BaseDiscount):
         **kwargs
     ) -> Decimal:
         """Calculate voucher discount amount"""
-        if not await self.is_applicable(cart_items, customer, payment_info, **kwargs):
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
             return Decimal("0")
             
         original_price = self.calculate_original_price(cart_items)
+        return self.discount_for_total(original_price)
+
+    def discount_for_total(self, original_price: Decimal) -> Decimal:
+        """Voucher discount amount for a precomputed cart total"""
         discount_amount = (original_price * self.discount_percentage) / Decimal("100")
         
         # Apply maximum discount limit
@@ -60,9 +67,29 @@ class VoucherDiscount(BaseDiscount):
             discount_amount = self.max_discount_amount
             
         return discount_amount
+
+    async def calculate_discount_paise(
+        self, 
+        cart_items: List[CartItem], 
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        **kwargs
+    ) -> int:
+        """Calculate voucher discount amount in paise"""
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
+            return 0
+        
+        return self.discount_for_total_paise(self.get_cart_paise(cart_items).total)
+
+    def discount_for_total_paise(self, original_price: int) -> int:
+        """Fixed-point counterpart of discount_for_total"""
+        discount_amount = apply_bps(original_price, self.discount_bps)
+        if discount_amount > self.max_discount_paise:
+            discount_amount = self.max_discount_paise
+        return discount_amount
     
     def calculate_original_price(self, cart_items: List[CartItem]) -> Decimal:
-        return sum(item.product.current_price * item.quantity for item in cart_items)
+        return self.calculate_cart_total(cart_items)
 
     def validate_code(self, code: str) -> bool:
         return self.code == code
\ No newline at end of file
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from typing import List
 from decimal import Decimal
 
+from src.models.money import cached_paise
+
 @dataclass
 class CartItem:
     product: 'Product'  # Forward declaration for Product type
@@ -9,6 +11,15 @@ class CartItem:
     size: str
     price: Decimal
 
+    @property
+    def price_paise(self) -> int:
+        return cached_paise(self, "price")
+
+    @property
+    def line_total_paise(self) -> int:
+        """Line total at the product's current price, in paise"""
+        return self.product.current_price_paise * self.quantity
+
 @dataclass
 class Cart:
     items: List[CartItem]
@@ -0,0 +1,206 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, Iterator, Mapping, Optional, Tuple, Union
+
+from src.models.cart import CartItem
+from src.models.money import MoneyMode, to_paise
+
+
+@dataclass(frozen=True)
+class CartTotals:
+    """Cart totals in one money representation (Decimal rupees or integer paise)"""
+    total: Union[Decimal, int]  # Sum of product.current_price * quantity
+    listed_total: Union[Decimal, int]  # Sum of the price captured on each cart line * quantity
+    brand_totals: Mapping[str, Union[Decimal, int]]  # Upper-cased brand -> subtotal
+    category_totals: Mapping[str, Union[Decimal, int]]  # Category -> subtotal
+
+    @property
+    def zero(self) -> Union[Decimal, int]:
+        return 0 if isinstance(self.total, int) else Decimal("0")
+
+    def brand_total(self, brand: str) -> Union[Decimal, int]:
+        """Subtotal of items from brand, matched case-insensitively"""
+        return self.brand_totals.get(brand.upper(), self.zero)
+
+    def categories_total(self, categories: Iterable[str]) -> Union[Decimal, int]:
+        """Subtotal of items whose category is one of categories"""
+        category_totals = self.category_totals
+        return sum(
+            (category_totals[category] for category in set(categories) if category in category_totals),
+            self.zero
+        )
+
+
+@dataclass(frozen=True, eq=False)
+class CartSnapshot:
+    """
+    Immutable view of a cart with every aggregate the discount types need,
+    computed in a single pass over the cart lines.
+
+    Iterating a snapshot yields its cart items, so it can be passed anywhere
+    a list of cart items is expected. Discount types call CartSnapshot.of on
+    whatever they receive, which is free when it already is a snapshot.
+
+    Totals exist in Decimal (decimal) and integer paise (paise) form. The
+    pass that builds the snapshot fills the form for the requested money
+    mode; the other one is computed on first use.
+    """
+    items: Tuple[CartItem, ...]
+    brands: FrozenSet[str]
+    normalized_brands: FrozenSet[str]  # Upper-cased brands
+    categories: FrozenSet[str]
+    money_mode: MoneyMode = MoneyMode.DECIMAL  # Form of the totals built with the snapshot
+
+    @classmethod
+    def from_items(
+        cls,
+        cart_items: Iterable[CartItem],
+        money_mode: MoneyMode = MoneyMode.DECIMAL
+    ) -> 'CartSnapshot':
+        """Build a snapshot from cart items in one pass"""
+        items = tuple(cart_items)
+        brands = set()
+        totals = _sum_lines(items, money_mode, brands)
+        snapshot = cls(
+            items=items,
+            brands=frozenset(brands),
+            normalized_brands=frozenset(totals.brand_totals),
+            categories=frozenset(totals.category_totals),
+            money_mode=money_mode
+        )
+        # Seed the totals for this mode so they are not summed again
+        snapshot.__dict__["_paise" if money_mode is MoneyMode.FIXED_POINT else "_decimal"] = totals
+        return snapshot
+
+    @classmethod
+    def from_totals(
+        cls,
+        totals: CartTotals,
+        brands: Iterable[str],
+        money_mode: MoneyMode = MoneyMode.DECIMAL
+    ) -> 'CartSnapshot':
+        """
+        Snapshot of aggregates maintained elsewhere (e.g. updated line by
+        line), without the cart items.
+
+        totals must be in money_mode's form. Only for checks that read the
+        aggregates: brands, categories, the money_mode totals and
+        meets_minimum. Iterating it yields no items.
+        """
+        snapshot = cls(
+            items=(),
+            brands=frozenset(brands),
+            normalized_brands=frozenset(totals.brand_totals),
+            categories=frozenset(totals.category_totals),
+            money_mode=money_mode
+        )
+        snapshot.__dict__["_paise" if money_mode is MoneyMode.FIXED_POINT else "_decimal"] = totals
+        return snapshot
+
+    @classmethod
+    def of(
+        cls,
+        cart_items: Union['CartSnapshot', Iterable[CartItem]],
+        money_mode: MoneyMode = MoneyMode.DECIMAL
+    ) -> 'CartSnapshot':
+        """Return cart_items if it already is a snapshot, otherwise build one"""
+        if isinstance(cart_items, cls):
+            return cart_items
+        return cls.from_items(cart_items, money_mode)
+
+    # Memoized by hand rather than with functools.cached_property, which takes
+    # a lock on every access before Python 3.12
+
+    @property
+    def decimal(self) -> CartTotals:
+        """Totals in Decimal rupees"""
+        totals = self.__dict__.get("_decimal")
+        if totals is None:
+            totals = self.__dict__["_decimal"] = _sum_lines(self.items, MoneyMode.DECIMAL)
+        return totals
+
+    @property
+    def paise(self) -> CartTotals:
+        """Totals in integer paise, each price rounded half-up to the paisa"""
+        totals = self.__dict__.get("_paise")
+        if totals is None:
+            totals = self.__dict__["_paise"] = _sum_lines(self.items, MoneyMode.FIXED_POINT)
+        return totals
+
+    @property
+    def total(self) -> Decimal:
+        return self.decimal.total
+
+    @property
+    def listed_total(self) -> Decimal:
+        return self.decimal.listed_total
+
+    @property
+    def brand_totals(self) -> Mapping[str, Decimal]:
+        return self.decimal.brand_totals
+
+    @property
+    def category_totals(self) -> Mapping[str, Decimal]:
+        return self.decimal.category_totals
+
+    def meets_minimum(self, amount: Union[Decimal, int], listed: bool = False) -> bool:
+        """
+        Check the cart total (or listed_total) against a minimum rupee amount,
+        comparing in the form the snapshot was built with.
+        """
+        if self.money_mode is MoneyMode.FIXED_POINT:
+            totals = self.paise
+            amount = to_paise(amount)
+        else:
+            totals = self.decimal
+        return (totals.listed_total if listed else totals.total) >= amount
+
+    def brand_total(self, brand: str) -> Decimal:
+        """Subtotal of items from brand, matched case-insensitively"""
+        return self.decimal.brand_total(brand)
+
+    def categories_total(self, categories: Iterable[str]) -> Decimal:
+        """Subtotal of items whose category is one of categories"""
+        return self.decimal.categories_total(categories)
+
+    def __iter__(self) -> Iterator[CartItem]:
+        return iter(self.items)
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+
+def _sum_lines(items: Tuple[CartItem, ...], money_mode: MoneyMode, brands: Optional[set] = None) -> CartTotals:
+    """Sum every cart line once into totals for the given money mode, collecting raw brands if asked"""
+    fixed_point = money_mode is MoneyMode.FIXED_POINT
+    zero = 0 if fixed_point else Decimal("0")
+    total = zero
+    listed_total = zero
+    brand_totals: Dict[str, Union[Decimal, int]] = {}
+    category_totals: Dict[str, Union[Decimal, int]] = {}
+
+    for item in items:
+        product = item.product
+        if fixed_point:
+            line_total = product.current_price_paise * item.quantity
+            listed_total += item.price_paise * item.quantity
+        else:
+            line_total = product.current_price * item.quantity
+            listed_total += item.price * item.quantity
+        total += line_total
+        if brands is not None:
+            brands.add(product.brand)
+        brand_key = product.brand.upper()
+        brand_totals[brand_key] = brand_totals.get(brand_key, zero) + line_total
+        category_totals[product.category] = category_totals.get(product.category, zero) + line_total
+
+    return CartTotals(
+        total=total,
+        listed_total=listed_total,
+        brand_totals=MappingProxyType(brand_totals),
+        category_totals=MappingProxyType(category_totals)
+    )
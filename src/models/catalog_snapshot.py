@@ -0,0 +1,288 @@
+"""
+Memory-mapped catalog snapshots.
+
+A snapshot is one file holding a ProductTable: its price and code columns,
+its brand, category and brand tier vocabularies, the product ids and a
+hash index over them. Workers open it with mmap, so the columns are
+zero-copy, read-only NumPy views of the page cache and every worker on the
+host shares one copy of the catalog.
+
+File layout (native byte order, recorded in the metadata):
+
+    magic (8 bytes) | format version (u32) | metadata length (u32)
+    metadata        JSON: catalog version, row count, vocabularies and
+                    the offset, dtype and length of every section
+    sections        each aligned to SECTION_ALIGNMENT bytes:
+                    base_price_paise, current_price_paise (int64)
+                    brand_codes, category_codes, brand_tier_codes (int32)
+                    id_offsets (uint64, rows + 1), id_bytes (UTF-8)
+                    id_slots (int64 open-addressing table of row + 1,
+                    probed linearly from crc32(id) & (len - 1))
+
+write_catalog_snapshot writes to a temporary file in the target directory
+and renames it over the path, so a snapshot is replaced atomically.
+Readers that already mapped the old file keep reading it until they drop
+it; MappedCatalog.refresh switches a worker to the new one.
+"""
+
+import json
+import mmap
+import os
+import struct
+import sys
+import uuid
+import zlib
+from collections.abc import Mapping as MappingABC, Sequence as SequenceABC
+from dataclasses import dataclass
+from typing import Iterator, Tuple
+
+import numpy as np
+
+from src.models.product import BrandTier
+from src.models.product_table import ProductTable
+
+MAGIC = b"CATSNAP\x00"
+FORMAT_VERSION = 1
+SECTION_ALIGNMENT = 64
+
+_HEADER = struct.Struct("=8sII")
+_COLUMNS = (
+    ("base_price_paise", "=i8"),
+    ("current_price_paise", "=i8"),
+    ("brand_codes", "=i4"),
+    ("category_codes", "=i4"),
+    ("brand_tier_codes", "=i4"),
+)
+
+
+class _MappedIds(SequenceABC):
+    """Product ids decoded from the snapshot's id_bytes section on access"""
+
+    def __init__(self, offsets: memoryview, blob: memoryview):
+        self._offsets = offsets
+        self._blob = blob
+
+    def __len__(self) -> int:
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        if isinstance(row, slice):
+            return [self[position] for position in range(*row.indices(len(self)))]
+        return str(self.raw(row), "utf-8")
+
+    def raw(self, row: int) -> memoryview:
+        """Encoded id at row, without copying"""
+        if row < 0:
+            row += len(self)
+        if not 0 <= row < len(self):
+            raise IndexError(row)
+        return self._blob[self._offsets[row]:self._offsets[row + 1]]
+
+
+class _MappedIdIndex(MappingABC):
+    """Product id -> row lookups in the snapshot's id_slots hash table"""
+
+    def __init__(self, ids: _MappedIds, slots: memoryview):
+        self._ids = ids
+        self._slots = slots
+        self._mask = len(slots) - 1
+
+    def __getitem__(self, product_id: str) -> int:
+        if not isinstance(product_id, str):
+            raise KeyError(product_id)
+        key = product_id.encode()
+        slots, mask = self._slots, self._mask
+        position = zlib.crc32(key) & mask
+        while True:
+            slot = slots[position]
+            if not slot:
+                raise KeyError(product_id)
+            if self._ids.raw(slot - 1) == key:
+                return slot - 1
+            position = (position + 1) & mask
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._ids)
+
+
+def _build_id_slots(encoded_ids) -> np.ndarray:
+    """Open-addressing table of row + 1 at least twice the size of encoded_ids"""
+    capacity = 8
+    while capacity < 2 * len(encoded_ids):
+        capacity *= 2
+    mask = capacity - 1
+    slots = [0] * capacity
+    for row, key in enumerate(encoded_ids):
+        position = zlib.crc32(key) & mask
+        while slots[position]:
+            if encoded_ids[slots[position] - 1] == key:
+                raise ValueError(f"Duplicate product id in snapshot: {key.decode()}")
+            position = (position + 1) & mask
+        slots[position] = row + 1
+    return np.asarray(slots, dtype="=i8")
+
+
+def _align(offset: int) -> int:
+    return -(-offset // SECTION_ALIGNMENT) * SECTION_ALIGNMENT
+
+
+@dataclass(frozen=True)
+class CatalogSnapshot:
+    """An opened snapshot: its catalog version and the ProductTable mapped from it"""
+    path: str
+    version: int
+    table: ProductTable
+    identity: Tuple[int, int]  # (st_dev, st_ino) of the mapped file
+
+
+def write_catalog_snapshot(table: ProductTable, path: str, version: int, mode: int = 0o644):
+    """
+    Write table as a snapshot at path, atomically replacing any previous one.
+
+    Args:
+        table: Catalog to write
+        path: Snapshot file path
+        version: Catalog version recorded in the snapshot
+        mode: Permission bits of the snapshot, less the process umask
+    """
+    encoded_ids = [product_id.encode() for product_id in table.ids]
+    id_offsets = np.zeros(len(encoded_ids) + 1, dtype="=u8")
+    np.cumsum([len(key) for key in encoded_ids], out=id_offsets[1:])
+    sections = [(name, np.ascontiguousarray(getattr(table, name), dtype=dtype)) for name, dtype in _COLUMNS]
+    sections += [
+        ("id_offsets", id_offsets),
+        ("id_bytes", np.frombuffer(b"".join(encoded_ids), dtype="=u1")),
+        ("id_slots", _build_id_slots(encoded_ids)),
+    ]
+
+    descriptors = {}
+    metadata = {}
+    # Section offsets depend on the metadata length, which depends on the offsets; settle both
+    metadata_length = 0
+    while True:
+        offset = _align(_HEADER.size + metadata_length)
+        for name, array in sections:
+            descriptors[name] = {"offset": offset, "dtype": array.dtype.str, "count": len(array)}
+            offset = _align(offset + array.nbytes)
+        metadata = json.dumps({
+            "version": version,
+            "rows": len(table),
+            "byteorder": sys.byteorder,
+            "brands": list(table.brands),
+            "categories": list(table.categories),
+            "brand_tiers": [tier.value for tier in table.brand_tiers],
+            "sections": descriptors
+        }).encode()
+        if len(metadata) == metadata_length:
+            break
+        metadata_length = len(metadata)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    temporary_path = os.path.join(directory, f".catalog-{uuid.uuid4().hex}.tmp")
+    # The kernel applies the umask to mode; the rename keeps the result
+    fd = os.open(temporary_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_BINARY", 0), mode)
+    try:
+        with os.fdopen(fd, "wb") as snapshot_file:
+            snapshot_file.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(metadata)))
+            snapshot_file.write(metadata)
+            for name, array in sections:
+                snapshot_file.write(b"\0" * (descriptors[name]["offset"] - snapshot_file.tell()))
+                snapshot_file.write(array.tobytes())
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.unlink(temporary_path)
+        raise
+    _fsync_directory(directory)
+
+
+def _fsync_directory(directory: str):
+    """Persist the rename; not supported on every platform"""
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(directory, os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def open_catalog_snapshot(path: str) -> CatalogSnapshot:
+    """
+    Map the snapshot at path read-only.
+
+    The returned table's columns are read-only NumPy arrays over the
+    mapping and its ids and id index read the mapping directly, so opening
+    does not depend on the catalog size beyond the vocabularies. The file
+    stays mapped while the table or any of its arrays is referenced.
+
+    Raises:
+        ValueError: If the file is not a snapshot in this format version
+    """
+    with open(path, "rb") as snapshot_file:
+        stat = os.fstat(snapshot_file.fileno())
+        if stat.st_size < _HEADER.size:
+            raise ValueError(f"{path} is not a catalog snapshot")
+        mapping = mmap.mmap(snapshot_file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    magic, format_version, metadata_length = _HEADER.unpack_from(mapping, 0)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a catalog snapshot")
+    if format_version != FORMAT_VERSION:
+        raise ValueError(f"{path} has snapshot format {format_version}, expected {FORMAT_VERSION}")
+    metadata = json.loads(mapping[_HEADER.size:_HEADER.size + metadata_length])
+    if metadata["byteorder"] != sys.byteorder:
+        raise ValueError(f"{path} was written on a {metadata['byteorder']}-endian machine")
+
+    def section(name: str) -> np.ndarray:
+        descriptor = metadata["sections"][name]
+        return np.frombuffer(mapping, np.dtype(descriptor["dtype"]), descriptor["count"], descriptor["offset"])
+
+    def view(name: str, format_code: str) -> memoryview:
+        return memoryview(section(name)).cast("B").cast(format_code)
+
+    ids = _MappedIds(view("id_offsets", "Q"), view("id_bytes", "B"))
+    table = ProductTable(
+        ids=ids,
+        brands=tuple(metadata["brands"]),
+        categories=tuple(metadata["categories"]),
+        brand_tiers=tuple(BrandTier(value) for value in metadata["brand_tiers"]),
+        id_index=_MappedIdIndex(ids, view("id_slots", "q")),
+        **{name: section(name) for name, _ in _COLUMNS}
+    )
+    return CatalogSnapshot(path=path, version=metadata["version"], table=table, identity=(stat.st_dev, stat.st_ino))
+
+
+class MappedCatalog:
+    """
+    A worker's view of the snapshot at a path, following atomic swaps.
+
+    refresh() maps the file again if a new snapshot was renamed over the
+    path. Tables handed out earlier keep reading the snapshot they came
+    from, so a swap never changes data under a request in flight.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.snapshot = open_catalog_snapshot(path)
+
+    @property
+    def table(self) -> ProductTable:
+        return self.snapshot.table
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    def refresh(self) -> bool:
+        """Switch to the snapshot now at path if it was replaced; returns True on a switch"""
+        stat = os.stat(self.path)
+        if (stat.st_dev, stat.st_ino) == self.snapshot.identity:
+            return False
+        self.snapshot = open_catalog_snapshot(self.path)
+        return True
@@ -0,0 +1,349 @@
+"""
+Compact variants of the model dataclasses for processes that hold millions
+of products and cart lines.
+
+Every class here uses __slots__, so instances carry no per-instance
+__dict__. The Frozen* classes are also immutable and cache their hash on
+first use, so they can key dicts and sets cheaply. Brand, category, size
+and tier strings are interned, so repeated values share one string object.
+Enum fields (BrandTier) are stored as references to the enum singletons,
+which cost one pointer per instance, the same as a small integer code.
+
+CompactProduct and CompactCartItem are mutable drop-ins for Product and
+CartItem, including price assignment as CategoryDiscount.apply_discount
+does. FrozenProduct cannot be changed in place; with_current_price returns
+a repriced copy, and CategoryDiscount.apply_discount swaps the repriced
+copy into the products list it was given.
+"""
+
+import sys
+from dataclasses import MISSING, dataclass, field, fields, replace
+from functools import wraps
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Mapping, Optional, Tuple, Union
+
+from src.models.cart import Cart, CartItem
+from src.models.customer import CustomerProfile
+from src.models.discount import DiscountedPrice
+from src.models.money import to_paise
+from src.models.payment import PaymentInfo, PaymentMethod
+from src.models.product import BrandTier, Product
+
+AnyProduct = Union[Product, 'CompactProduct', 'FrozenProduct']
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+def _slotted(cls):
+    """
+    Rebuild a dataclass with __slots__ for its fields, as
+    @dataclass(slots=True) does on Python 3.10+.
+    """
+    names = tuple(f.name for f in fields(cls))
+    # Defaults are class attributes, which would clash with the slots. The
+    # generated __init__ passes init fields' defaults itself; set the rest
+    namespace = {key: value for key, value in cls.__dict__.items()
+                 if key not in names and key not in ("__dict__", "__weakref__")}
+    namespace["__slots__"] = names
+    defaults = {f.name: f.default for f in fields(cls) if not f.init and f.default is not MISSING}
+    if defaults:
+        init = cls.__init__
+
+        @wraps(init)
+        def __init__(self, *args, **kwargs):
+            for name, value in defaults.items():
+                object.__setattr__(self, name, value)
+            init(self, *args, **kwargs)
+
+        namespace["__init__"] = __init__
+    if cls.__dataclass_params__.frozen:
+        # Without a __dict__, pickle and copy restore state through
+        # setattr, which frozen classes refuse
+        def __getstate__(self):
+            return [getattr(self, name) for name in names]
+
+        def __setstate__(self, state):
+            for name, value in zip(names, state):
+                object.__setattr__(self, name, value)
+
+        namespace["__getstate__"] = __getstate__
+        namespace["__setstate__"] = __setstate__
+    return type(cls)(cls.__name__, cls.__bases__, namespace)
+
+
+@_slotted
+@dataclass
+class CompactProduct:
+    """Slotted, mutable Product that keeps its paise prices in sync on assignment"""
+    id: str
+    brand: str
+    brand_tier: BrandTier
+    category: str
+    base_price: Decimal
+    current_price: Decimal
+    base_price_paise: int = field(init=False, repr=False, compare=False)
+    current_price_paise: int = field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name in ("brand", "category"):
+            value = _intern(value)
+        object.__setattr__(self, name, value)
+        if name == "base_price":
+            object.__setattr__(self, "base_price_paise", to_paise(value))
+        elif name == "current_price":
+            object.__setattr__(self, "current_price_paise", to_paise(value))
+
+    @classmethod
+    def from_model(cls, product: AnyProduct) -> 'CompactProduct':
+        return cls(product.id, product.brand, product.brand_tier, product.category,
+                   product.base_price, product.current_price)
+
+    def to_model(self) -> Product:
+        return Product(self.id, self.brand, self.brand_tier, self.category, self.base_price, self.current_price)
+
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenProduct:
+    """Slotted, immutable Product with a cached hash"""
+    id: str
+    brand: str
+    brand_tier: BrandTier
+    category: str
+    base_price: Decimal
+    current_price: Decimal
+    base_price_paise: int = field(init=False, repr=False, compare=False, default=0)
+    current_price_paise: int = field(init=False, repr=False, compare=False, default=0)
+    _hash: Optional[int] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "brand", _intern(self.brand))
+        object.__setattr__(self, "category", _intern(self.category))
+        object.__setattr__(self, "base_price_paise", to_paise(self.base_price))
+        object.__setattr__(self, "current_price_paise", to_paise(self.current_price))
+
+    def __hash__(self) -> int:
+        cached = self._hash
+        if cached is None:
+            cached = hash((self.id, self.brand, self.brand_tier, self.category, self.base_price, self.current_price))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    def with_current_price(self, current_price: Decimal) -> 'FrozenProduct':
+        """Copy of this product at a new current price"""
+        return replace(self, current_price=current_price)
+
+    @classmethod
+    def from_model(cls, product: AnyProduct) -> 'FrozenProduct':
+        return cls(product.id, product.brand, product.brand_tier, product.category,
+                   product.base_price, product.current_price)
+
+    def to_model(self) -> Product:
+        return Product(self.id, self.brand, self.brand_tier, self.category, self.base_price, self.current_price)
+
+
+@_slotted
+@dataclass
+class CompactCartItem:
+    """Slotted, mutable CartItem that keeps price_paise in sync on assignment"""
+    product: AnyProduct
+    quantity: int
+    size: str
+    price: Decimal
+    price_paise: int = field(init=False, repr=False, compare=False)
+
+    def __setattr__(self, name, value):
+        if name == "size":
+            value = _intern(value)
+        object.__setattr__(self, name, value)
+        if name == "price":
+            object.__setattr__(self, "price_paise", to_paise(value))
+
+    @property
+    def line_total_paise(self) -> int:
+        """Line total at the product's current price, in paise"""
+        return self.product.current_price_paise * self.quantity
+
+    @classmethod
+    def from_model(cls, item: CartItem) -> 'CompactCartItem':
+        return cls(CompactProduct.from_model(item.product), item.quantity, item.size, item.price)
+
+    def to_model(self) -> CartItem:
+        return CartItem(self.product.to_model(), self.quantity, self.size, self.price)
+
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenCartItem:
+    """Slotted, immutable CartItem with a cached hash"""
+    product: FrozenProduct
+    quantity: int
+    size: str
+    price: Decimal
+    price_paise: int = field(init=False, repr=False, compare=False, default=0)
+    _hash: Optional[int] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "size", _intern(self.size))
+        object.__setattr__(self, "price_paise", to_paise(self.price))
+
+    def __hash__(self) -> int:
+        cached = self._hash
+        if cached is None:
+            cached = hash((self.product, self.quantity, self.size, self.price))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    @property
+    def line_total_paise(self) -> int:
+        """Line total at the product's current price, in paise"""
+        return self.product.current_price_paise * self.quantity
+
+    @classmethod
+    def from_model(cls, item: CartItem) -> 'FrozenCartItem':
+        return cls(FrozenProduct.from_model(item.product), item.quantity, item.size, item.price)
+
+    def to_model(self) -> CartItem:
+        return CartItem(self.product.to_model(), self.quantity, self.size, self.price)
+
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenCart:
+    """Slotted, immutable Cart holding its items as a tuple"""
+    items: Tuple[FrozenCartItem, ...]
+    _hash: Optional[int] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "items", tuple(self.items))
+
+    def __hash__(self) -> int:
+        cached = self._hash
+        if cached is None:
+            cached = hash(self.items)
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    def total_price(self) -> Decimal:
+        return sum(item.price * item.quantity for item in self.items)
+
+    @classmethod
+    def from_model(cls, cart: Cart) -> 'FrozenCart':
+        return cls(tuple(FrozenCartItem.from_model(item) for item in cart.items))
+
+    def to_model(self) -> Cart:
+        return Cart([item.to_model() for item in self.items])
+
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenCustomerProfile:
+    """Slotted, immutable CustomerProfile with a cached hash"""
+    id: str
+    name: str
+    email: str
+    tier: str
+    loyalty_points: Decimal
+    _hash: Optional[int] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "tier", _intern(self.tier))
+
+    def __hash__(self) -> int:
+        cached = self._hash
+        if cached is None:
+            cached = hash((self.id, self.name, self.email, self.tier, self.loyalty_points))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    @classmethod
+    def from_model(cls, customer: CustomerProfile) -> 'FrozenCustomerProfile':
+        return cls(customer.id, customer.name, customer.email, customer.tier, customer.loyalty_points)
+
+    def to_model(self) -> CustomerProfile:
+        return CustomerProfile(self.id, self.name, self.email, self.tier, self.loyalty_points)
+
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenPaymentInfo:
+    """Slotted, immutable PaymentInfo with a cached hash"""
+    method: str
+    bank_name: Optional[str] = None
+    card_type: Optional[str] = None
+    card_bin: Optional[str] = None
+    _hash: Optional[int] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        """Validate payment information"""
+        if self.method == PaymentMethod.CARD.value and not self.bank_name:
+            raise ValueError("Bank name is required for card payments")
+
+        if self.method == PaymentMethod.CARD.value and not self.card_type:
+            raise ValueError("Card type is required for card payments")
+
+        if self.card_bin is not None and not (6 <= len(self.card_bin) <= 8 and self.card_bin.isdigit()):
+            raise ValueError("Card BIN must be 6 to 8 digits")
+
+        for name in ("method", "bank_name", "card_type"):
+            object.__setattr__(self, name, _intern(getattr(self, name)))
+
+    def __hash__(self) -> int:
+        cached = self._hash
+        if cached is None:
+            cached = hash((self.method, self.bank_name, self.card_type, self.card_bin))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    @classmethod
+    def from_model(cls, payment_info: PaymentInfo) -> 'FrozenPaymentInfo':
+        return cls(payment_info.method, payment_info.bank_name, payment_info.card_type, payment_info.card_bin)
+
+    def to_model(self) -> PaymentInfo:
+        return PaymentInfo(self.method, self.bank_name, self.card_type, self.card_bin)
+
+
+@_slotted
+@dataclass(frozen=True)
+class FrozenDiscountedPrice:
+    """Slotted, immutable DiscountedPrice with a read-only applied_discounts mapping"""
+    original_price: Decimal
+    final_price: Decimal
+    applied_discounts: Mapping[str, Decimal]  # discount_name -> amount
+    message: str
+    _hash: Optional[int] = field(init=False, repr=False, compare=False, default=None)
+
+    def __post_init__(self):
+        object.__setattr__(self, "applied_discounts", MappingProxyType(dict(self.applied_discounts)))
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenDiscountedPrice):
+            return NotImplemented
+        return (self.original_price, self.final_price, dict(self.applied_discounts), self.message) == \
+            (other.original_price, other.final_price, dict(other.applied_discounts), other.message)
+
+    def __hash__(self) -> int:
+        cached = self._hash
+        if cached is None:
+            cached = hash((self.original_price, self.final_price,
+                           frozenset(self.applied_discounts.items()), self.message))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    @property
+    def original_price_paise(self) -> int:
+        return to_paise(self.original_price)
+
+    @property
+    def final_price_paise(self) -> int:
+        return to_paise(self.final_price)
+
+    @classmethod
+    def from_model(cls, result: DiscountedPrice) -> 'FrozenDiscountedPrice':
+        return cls(result.original_price, result.final_price, result.applied_discounts, result.message)
+
+    def to_model(self) -> DiscountedPrice:
+        return DiscountedPrice(self.original_price, self.final_price, dict(self.applied_discounts), self.message)
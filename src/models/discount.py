@@ -1,10 +1,39 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from decimal import Decimal
-from typing import Dict
+from typing import Dict, Optional
+
+from src.models.money import from_paise, to_paise
+from src.models.pricing_trace import PricingTrace
 
 @dataclass
 class DiscountedPrice:
     original_price: Decimal
     final_price: Decimal
     applied_discounts: Dict[str, Decimal]  # discount_name -> amount
-    message: str
\ No newline at end of file
+    message: str
+    # Set on traced calls, see src/models/pricing_trace.py; not part of equality
+    trace: Optional[PricingTrace] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def from_paise(
+        cls,
+        original_paise: int,
+        final_paise: int,
+        applied_discounts_paise: Dict[str, int],
+        message: str
+    ) -> 'DiscountedPrice':
+        """Build a result from fixed-point amounts in paise"""
+        return cls(
+            original_price=from_paise(original_paise),
+            final_price=from_paise(final_paise),
+            applied_discounts={name: from_paise(amount) for name, amount in applied_discounts_paise.items()},
+            message=message
+        )
+
+    @property
+    def original_price_paise(self) -> int:
+        return to_paise(self.original_price)
+
+    @property
+    def final_price_paise(self) -> int:
+        return to_paise(self.final_price)
\ No newline at end of file
@@ -0,0 +1,90 @@
+from decimal import Decimal, ROUND_HALF_UP
+from enum import Enum
+from functools import lru_cache
+from typing import Union
+
+# Fixed-point money helpers.
+#
+# Amounts are held as integer paise (1 rupee = 100 paise) and percentages as
+# integer basis points (1% = 100 bps). Rounding rules:
+#   - Decimal prices are rounded half-up to the nearest paisa when converted.
+#   - Percentages are rounded half-up to the nearest basis point.
+#   - Each discount amount is rounded half-up to the nearest paisa on its own,
+#     before caps are applied; the final price is the cart total minus the sum
+#     of those rounded amounts.
+# For prices in whole paise and percentages in whole basis points every
+# discount equals the Decimal path's amount rounded half-up to the paisa.
+
+PAISE_PER_RUPEE = 100
+BPS_PER_PERCENT = 100
+BPS_SCALE = 100 * BPS_PER_PERCENT  # 10000 bps == 100%
+
+_ONE_PAISA = Decimal("0.01")
+_ONE_BP = Decimal("1")
+
+
+class MoneyMode(Enum):
+    DECIMAL = "decimal"
+    FIXED_POINT = "fixed_point"
+
+
+def to_paise(amount: Union[Decimal, int, float, str]) -> int:
+    """Convert a rupee amount to integer paise, rounding half-up"""
+    if not isinstance(amount, Decimal):
+        amount = Decimal(str(amount))
+    if amount.is_finite():
+        # Fast path for amounts already in whole paise
+        numerator, denominator = amount.as_integer_ratio()
+        if PAISE_PER_RUPEE % denominator == 0:
+            return numerator * (PAISE_PER_RUPEE // denominator)
+    return int((amount * PAISE_PER_RUPEE).quantize(_ONE_BP, rounding=ROUND_HALF_UP))
+
+
+def cached_paise(owner, attribute: str) -> int:
+    """
+    Paise value of a Decimal attribute, memoized on the owner's instance dict.
+
+    The memo is keyed on the identity of the Decimal object, so reassigning
+    the attribute (e.g. CategoryDiscount updating current_price) refreshes it.
+    """
+    amount = getattr(owner, attribute)
+    memo_key = "_paise_" + attribute
+    cached = owner.__dict__.get(memo_key)
+    if cached is None or cached[0] is not amount:
+        cached = (amount, to_paise(amount))
+        owner.__dict__[memo_key] = cached
+    return cached[1]
+
+
+def from_paise(paise: int) -> Decimal:
+    """Convert integer paise back to a two-place rupee Decimal"""
+    return Decimal(paise).scaleb(-2)
+
+
+@lru_cache(maxsize=1024)
+def to_bps(percentage: Union[Decimal, int, float, str]) -> int:
+    """Convert a percentage to integer basis points, rounding half-up"""
+    if not isinstance(percentage, Decimal):
+        percentage = Decimal(str(percentage))
+    return int((percentage * BPS_PER_PERCENT).quantize(_ONE_BP, rounding=ROUND_HALF_UP))
+
+
+def round_to_paisa(amount: Decimal) -> Decimal:
+    """Round a Decimal amount half-up to the paisa, as the fixed-point path does"""
+    return amount.quantize(_ONE_PAISA, rounding=ROUND_HALF_UP)
+
+
+def apply_bps(paise: int, bps: int) -> int:
+    """Return bps of an amount in paise, rounded half-up (away from zero on ties)"""
+    numerator = paise * bps
+    quotient, remainder = divmod(abs(numerator), BPS_SCALE)
+    if 2 * remainder >= BPS_SCALE:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def cap_paise(amount: int, max_paise: int) -> int:
+    """Clamp a discount to its maximum when a maximum is configured"""
+    if max_paise and amount > max_paise:
+        return max_paise
+    return amount
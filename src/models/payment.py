@@ -22,6 +22,7 @@ class PaymentInfo:
     method: str  # PaymentMethod enum value as string
     bank_name: Optional[str] = None
     card_type: Optional[str] = None  # CardType enum value as string
+    card_bin: Optional[str] = None  # First 6-8 card number digits (never the full number), for BIN-keyed offers
     
     def __post_init__(self):
         """Validate payment information"""
@@ -29,4 +30,7 @@ class PaymentInfo:
             raise ValueError("Bank name is required for card payments")
         
         if self.method == PaymentMethod.CARD.value and not self.card_type:
-            raise ValueError("Card type is required for card payments")
\ No newline at end of file
+            raise ValueError("Card type is required for card payments")
+        
+        if self.card_bin is not None and not (6 <= len(self.card_bin) <= 8 and self.card_bin.isdigit()):
+            raise ValueError("Card BIN must be 6 to 8 digits")
\ No newline at end of file
@@ -0,0 +1,15 @@
+from dataclasses import dataclass
+from typing import List, Optional
+
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+
+
+@dataclass
+class CartPricingRequest:
+    """A single cart to price as part of a batch call"""
+    cart_items: List[CartItem]
+    customer: CustomerProfile
+    payment_info: Optional[PaymentInfo] = None
+    voucher_code: Optional[str] = None
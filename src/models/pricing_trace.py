@@ -0,0 +1,220 @@
+"""
+Pricing decision traces.
+
+A PricingTrace records every rule evaluated while pricing one cart: whether
+it applied, the predicate that rejected it, the subtotal its percentage was
+taken from, and any cap that clamped its amount. DiscountService builds one
+when a call is traced (explain=True, or picked by its TraceSampler) and
+hands it to the sampler's sink and/or attaches it to DiscountedPrice.trace.
+Untraced calls never create a trace.
+
+Amounts are in the money mode of the service that priced the cart:
+Decimal rupees, or integer paise for MoneyMode.FIXED_POINT.
+"""
+
+import asyncio
+import random
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import Awaitable, Callable, Dict, List, Optional, Union
+
+from src.models.money import MoneyMode, apply_bps, from_paise
+
+Amount = Union[Decimal, int]
+
+# TraceStep outcomes
+APPLIED = "applied"  # Positive amount, added to the result
+ZERO = "zero"  # Applicable, but worth nothing on this cart
+NOT_APPLICABLE = "not_applicable"  # is_applicable returned False
+REJECTED = "rejected"  # Voucher code failed validation; reason names the check
+TIMEOUT = "timeout"  # Evaluation exceeded the factory timeout
+NOT_SELECTED = "not_selected"  # Applicable, but left out by the stacking solver
+CLAMPED = "clamped"  # A combined amount was limited (stacking caps, price floor)
+
+
+@dataclass(frozen=True)
+class TraceStep:
+    """One rule evaluated while pricing a cart"""
+    rule: str  # Name the rule's amount appears under in applied_discounts
+    outcome: str
+    reason: Optional[str] = None  # Failed predicate for rejected / not_applicable
+    amount: Optional[Amount] = None  # Amount after caps
+    base: Optional[Amount] = None  # Subtotal the percentage was taken from
+    percentage: Optional[Decimal] = None
+    uncapped: Optional[Amount] = None  # Amount before the cap, when a cap clamped it
+    cap: Optional[Amount] = None  # Cap that clamped the amount
+
+
+def _rule_cap(discount, fixed_point: bool) -> Optional[Amount]:
+    """Per-discount maximum of the built-in percentage discounts, or None"""
+    if fixed_point:
+        return getattr(discount, "max_discount_paise", 0) or None
+    cap = getattr(discount, "max_discount", None)
+    if cap is None:
+        cap = getattr(discount, "max_discount_amount", None)
+    return cap or None
+
+
+def _percentage_amount(discount, base: Amount, fixed_point: bool) -> Optional[Amount]:
+    """Uncapped percentage of base, computed the way the discount types do"""
+    if fixed_point:
+        bps = getattr(discount, "discount_bps", None)
+        return None if bps is None else apply_bps(base, bps)
+    percentage = getattr(discount, "discount_percentage", None)
+    return None if percentage is None else base * (Decimal(str(percentage)) / Decimal("100"))
+
+
+@dataclass
+class PricingTrace:
+    """Every decision made while pricing one cart, in evaluation order"""
+    entry_point: str
+    money_mode: MoneyMode = MoneyMode.DECIMAL
+    steps: List[TraceStep] = field(default_factory=list)
+    original_price: Optional[Amount] = None
+    total_discount: Optional[Amount] = None
+    final_price: Optional[Amount] = None
+
+    def record(self, rule: str, outcome: str, **details) -> TraceStep:
+        step = TraceStep(rule, outcome, **details)
+        self.steps.append(step)
+        return step
+
+    def record_discount(
+        self,
+        discount,
+        amount: Optional[Amount],
+        rule: Optional[str] = None,
+        base: Optional[Amount] = None
+    ) -> TraceStep:
+        """
+        Record a discount's evaluation.
+
+        amount is None when the discount was not applicable. With base, the
+        subtotal the discount's percentage applies to, the step also carries
+        the uncapped amount; without it a cap clamp is recognised by the
+        amount equalling the discount's maximum.
+        """
+        rule = rule if rule is not None else discount.discount_name
+        if amount is None:
+            return self.record(rule, NOT_APPLICABLE, reason="is_applicable")
+
+        fixed_point = self.money_mode is MoneyMode.FIXED_POINT
+        cap = _rule_cap(discount, fixed_point)
+        uncapped = _percentage_amount(discount, base, fixed_point) if base is not None else None
+        if cap is None or (amount != cap if uncapped is None else uncapped <= cap):
+            cap = uncapped = None
+        return self.record(
+            rule,
+            APPLIED if amount > 0 else ZERO,
+            amount=amount,
+            base=base,
+            percentage=getattr(discount, "discount_percentage", None) if base is not None else None,
+            uncapped=uncapped,
+            cap=cap
+        )
+
+    async def observe_evaluation(self, discount, evaluation: Awaitable):
+        """Await a factory evaluation and record it; cancellation is recorded as a timeout and re-raised"""
+        try:
+            amount = await evaluation
+        except asyncio.CancelledError:
+            self.record(discount.discount_name, TIMEOUT)
+            raise
+        self.record_discount(discount, amount)
+        return amount
+
+    def finish(self, original_price: Amount, total_discount: Amount, final_price: Amount):
+        """Record the result's totals, and the zero floor if it clamped the final price"""
+        self.original_price = original_price
+        self.total_discount = total_discount
+        self.final_price = final_price
+        unclamped = original_price - total_discount
+        if unclamped != final_price:
+            self.record("Final price", CLAMPED, amount=final_price, uncapped=unclamped, cap=final_price)
+
+    def step(self, rule: str) -> Optional[TraceStep]:
+        """Last step recorded for rule, or None"""
+        for step in reversed(self.steps):
+            if step.rule == rule:
+                return step
+        return None
+
+    def to_dict(self) -> Dict:
+        """JSON-serializable form, amounts as strings of rupees"""
+        def rupees(amount):
+            if amount is None:
+                return None
+            return str(from_paise(amount) if self.money_mode is MoneyMode.FIXED_POINT else amount)
+
+        return {
+            "entry_point": self.entry_point,
+            "original_price": rupees(self.original_price),
+            "total_discount": rupees(self.total_discount),
+            "final_price": rupees(self.final_price),
+            "steps": [
+                {
+                    "rule": step.rule,
+                    "outcome": step.outcome,
+                    "reason": step.reason,
+                    "amount": rupees(step.amount),
+                    "base": rupees(step.base),
+                    "percentage": None if step.percentage is None else str(step.percentage),
+                    "uncapped": rupees(step.uncapped),
+                    "cap": rupees(step.cap)
+                }
+                for step in self.steps
+            ]
+        }
+
+    def explain(self) -> str:
+        """One line per step, for support tooling and logs"""
+        data = self.to_dict()
+        lines = [f"{data['entry_point']}: {data['original_price']} -> {data['final_price']}"]
+        for step in data["steps"]:
+            line = f"  {step['rule']}: {step['outcome']}"
+            if step["reason"]:
+                line += f" ({step['reason']})"
+            if step["amount"] is not None:
+                line += f" {step['amount']}"
+            if step["base"] is not None and step["percentage"] is not None:
+                line += f", {step['percentage']}% of {step['base']}"
+            if step["uncapped"] is not None:
+                line += f", clamped from {step['uncapped']} to {step['cap']}"
+            elif step["cap"] is not None:
+                line += f", at cap {step['cap']}"
+            lines.append(line)
+        return "\n".join(lines)
+
+
+class TraceSampler:
+    """
+    Decides which pricing calls are traced and where their traces go.
+
+    Args:
+        rate: Fraction of calls to trace, from 0 to 1
+        sink: Called with every finished trace, e.g. to log trace.to_dict()
+        attach: Attach sampled traces to DiscountedPrice.trace
+        rng: Random source for sampling (default: a private random.Random)
+    """
+
+    def __init__(
+        self,
+        rate: float = 1.0,
+        sink: Optional[Callable[[PricingTrace], None]] = None,
+        attach: bool = True,
+        rng: Optional[random.Random] = None
+    ):
+        if not 0 <= rate <= 1:
+            raise ValueError("Trace sampling rate must be between 0 and 1")
+        self.rate = rate
+        self.sink = sink
+        self.attach = attach
+        self._random = (rng or random.Random()).random
+
+    def sample(self) -> bool:
+        rate = self.rate
+        return rate >= 1 or (rate > 0 and self._random() < rate)
+
+    def emit(self, trace: PricingTrace):
+        if self.sink is not None:
+            self.sink(trace)
@@ -2,6 +2,8 @@ from dataclasses import dataclass
 from decimal import Decimal
 from enum import Enum
 
+from src.models.money import cached_paise
+
 
 class BrandTier(Enum):
     PREMIUM = "premium"
@@ -16,4 +18,13 @@ class Product:
     brand_tier: BrandTier
     category: str
     base_price: Decimal
-    current_price: Decimal  # After brand/category discount
\ No newline at end of file
+    current_price: Decimal  # After brand/category discount
+
+    @property
+    def base_price_paise(self) -> int:
+        return cached_paise(self, "base_price")
+
+    @property
+    def current_price_paise(self) -> int:
+        """Price in paise for fixed-point money mode, refreshed when current_price is reassigned"""
+        return cached_paise(self, "current_price")
@@ -0,0 +1,230 @@
+from collections.abc import Sequence as SequenceABC
+from dataclasses import dataclass, field
+from decimal import Decimal
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot, CartTotals
+from src.models.money import MoneyMode, PAISE_PER_RUPEE, from_paise
+from src.models.product import BrandTier, Product
+
+
+def _encode(values: Iterable[str]) -> Tuple[np.ndarray, Tuple[str, ...]]:
+    """Dictionary-encode values into int32 codes and the vocabulary they index"""
+    vocabulary: Dict[str, int] = {}
+    codes = [vocabulary.setdefault(value, len(vocabulary)) for value in values]
+    return np.asarray(codes, dtype=np.int32), tuple(vocabulary)
+
+
+def _exact_paise(amount: Decimal, product_id: str) -> int:
+    """Price in paise, refusing amounts that are not whole paise so from_paise gives them back"""
+    numerator, denominator = amount.as_integer_ratio()
+    if PAISE_PER_RUPEE % denominator:
+        raise ValueError(f"Price {amount} of product {product_id} is not a whole number of paise")
+    return numerator * (PAISE_PER_RUPEE // denominator)
+
+
+@dataclass(frozen=True, eq=False)
+class ProductTable:
+    """
+    Products stored column by column instead of as Product objects.
+
+    Prices are int64 paise. Brand, category and brand tier are stored as
+    int32 codes into the brands, categories and brand_tiers vocabularies.
+    Rows are found by product id in O(1) through id_index (a dict built with
+    the table unless another mapping is given, such as the hash index of a
+    memory-mapped catalog snapshot), and brand/category filters compare
+    codes instead of strings.
+
+    from_products and to_products round-trip: every Product comes back
+    equal to the one stored. Prices must therefore be whole paise.
+    """
+    ids: Sequence[str]
+    base_price_paise: np.ndarray
+    current_price_paise: np.ndarray
+    brand_codes: np.ndarray
+    brands: Tuple[str, ...]
+    category_codes: np.ndarray
+    categories: Tuple[str, ...]
+    brand_tier_codes: np.ndarray
+    brand_tiers: Tuple[BrandTier, ...] = tuple(BrandTier)
+    id_index: Optional[Mapping[str, int]] = field(default=None, repr=False)  # product id -> row, built if not given
+
+    def __post_init__(self):
+        if self.id_index is None:
+            id_index = {product_id: row for row, product_id in enumerate(self.ids)}
+            if len(id_index) != len(self.ids):
+                raise ValueError("Product ids must be unique")
+            object.__setattr__(self, "id_index", id_index)
+        for name in ("base_price_paise", "current_price_paise", "brand_codes", "category_codes", "brand_tier_codes"):
+            if len(getattr(self, name)) != len(self.ids):
+                raise ValueError(f"Column {name} has {len(getattr(self, name))} rows, expected {len(self.ids)}")
+
+    @classmethod
+    def from_products(cls, products: Sequence[Product]) -> 'ProductTable':
+        """Build a table from Product objects"""
+        brand_codes, brands = _encode(product.brand for product in products)
+        category_codes, categories = _encode(product.category for product in products)
+        tier_positions = {tier: position for position, tier in enumerate(BrandTier)}
+        return cls(
+            ids=[product.id for product in products],
+            base_price_paise=np.fromiter(
+                (_exact_paise(product.base_price, product.id) for product in products), np.int64, len(products)
+            ),
+            current_price_paise=np.fromiter(
+                (_exact_paise(product.current_price, product.id) for product in products), np.int64, len(products)
+            ),
+            brand_codes=brand_codes,
+            brands=brands,
+            category_codes=category_codes,
+            categories=categories,
+            brand_tier_codes=np.fromiter(
+                (tier_positions[product.brand_tier] for product in products), np.int32, len(products)
+            )
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def __contains__(self, product_id: str) -> bool:
+        return product_id in self.id_index
+
+    def row(self, product_id: str) -> int:
+        """Row holding product_id; raises KeyError for unknown ids"""
+        return self.id_index[product_id]
+
+    def product(self, row: int) -> Product:
+        """Materialize the Product stored at row"""
+        return Product(
+            id=self.ids[row],
+            brand=self.brands[self.brand_codes[row]],
+            brand_tier=self.brand_tiers[self.brand_tier_codes[row]],
+            category=self.categories[self.category_codes[row]],
+            base_price=from_paise(int(self.base_price_paise[row])),
+            current_price=from_paise(int(self.current_price_paise[row]))
+        )
+
+    def get(self, product_id: str) -> Optional[Product]:
+        """Product with product_id, or None"""
+        row = self.id_index.get(product_id)
+        return None if row is None else self.product(row)
+
+    def to_products(self, rows: Optional[Iterable[int]] = None) -> List[Product]:
+        """Materialize the products at rows (default every row) as Product objects"""
+        return [self.product(row) for row in (range(len(self)) if rows is None else rows)]
+
+    def brand_mask(self, brand: str) -> np.ndarray:
+        """Products whose brand matches brand case-insensitively"""
+        brand_key = brand.upper()
+        codes = [code for code, name in enumerate(self.brands) if name.upper() == brand_key]
+        return np.isin(self.brand_codes, codes)
+
+    def category_mask(self, categories: Iterable[str]) -> np.ndarray:
+        """Products whose category is one of categories"""
+        wanted = set(categories)
+        codes = [code for code, name in enumerate(self.categories) if name in wanted]
+        return np.isin(self.category_codes, codes)
+
+    def brand_tier_mask(self, brand_tier: BrandTier) -> np.ndarray:
+        """Products of brands in brand_tier"""
+        return self.brand_tier_codes == self.brand_tiers.index(brand_tier)
+
+    def cart(
+        self,
+        product_ids: Sequence[str],
+        quantities: Optional[Sequence[int]] = None,
+        money_mode: MoneyMode = MoneyMode.DECIMAL
+    ) -> CartSnapshot:
+        """
+        Cart of the given products, aggregated from the columns.
+
+        The snapshot carries Decimal and paise totals, so discount types
+        evaluate it without creating Product or CartItem objects. Cart lines
+        are priced at base_price, and are only materialized if the snapshot
+        is iterated.
+
+        Args:
+            product_ids: Products in the cart, one line each
+            quantities: Quantity per line (default 1)
+            money_mode: Money mode recorded on the snapshot
+
+        Returns:
+            CartSnapshot usable wherever cart items are expected
+        """
+        rows = np.fromiter((self.id_index[product_id] for product_id in product_ids), np.int64, len(product_ids))
+        if quantities is None:
+            quantities = np.ones(len(rows), dtype=np.int64)
+        else:
+            quantities = np.asarray(quantities, dtype=np.int64)
+            if len(quantities) != len(rows):
+                raise ValueError("Expected one quantity per product id")
+
+        line_totals = self.current_price_paise[rows] * quantities
+        brand_codes = self.brand_codes[rows]
+        category_codes = self.category_codes[rows]
+
+        brand_sums = np.zeros(len(self.brands), dtype=np.int64)
+        np.add.at(brand_sums, brand_codes, line_totals)
+        category_sums = np.zeros(len(self.categories), dtype=np.int64)
+        np.add.at(category_sums, category_codes, line_totals)
+
+        brands = set()
+        brand_totals: Dict[str, int] = {}
+        for code in np.unique(brand_codes).tolist():
+            brand = self.brands[code]
+            brands.add(brand)
+            brand_key = brand.upper()
+            brand_totals[brand_key] = brand_totals.get(brand_key, 0) + int(brand_sums[code])
+        category_totals = {
+            self.categories[code]: int(category_sums[code]) for code in np.unique(category_codes).tolist()
+        }
+
+        paise = CartTotals(
+            total=int(line_totals.sum()),
+            listed_total=int((self.base_price_paise[rows] * quantities).sum()),
+            brand_totals=MappingProxyType(brand_totals),
+            category_totals=MappingProxyType(category_totals)
+        )
+        snapshot = CartSnapshot(
+            items=_TableCartLines(self, rows, quantities),
+            brands=frozenset(brands),
+            normalized_brands=frozenset(brand_totals),
+            categories=frozenset(category_totals),
+            money_mode=money_mode
+        )
+        # Seed both forms; prices are whole paise, so the Decimal totals are exact
+        snapshot.__dict__["_paise"] = paise
+        snapshot.__dict__["_decimal"] = _to_decimal(paise)
+        return snapshot
+
+
+class _TableCartLines(SequenceABC):
+    """Cart lines of a ProductTable cart, materialized as CartItem objects on access"""
+
+    def __init__(self, table: ProductTable, rows: np.ndarray, quantities: np.ndarray):
+        self.table = table
+        self.rows = rows
+        self.quantities = quantities
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in range(*index.indices(len(self)))]
+        product = self.table.product(int(self.rows[index]))
+        return CartItem(product=product, quantity=int(self.quantities[index]), size="", price=product.base_price)
+
+
+def _to_decimal(paise: CartTotals) -> CartTotals:
+    return CartTotals(
+        total=from_paise(paise.total),
+        listed_total=from_paise(paise.listed_total),
+        brand_totals=MappingProxyType({brand: from_paise(total) for brand, total in paise.brand_totals.items()}),
+        category_totals=MappingProxyType(
+            {category: from_paise(total) for category, total in paise.category_totals.items()}
+        )
+    )
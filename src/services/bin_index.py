@@ -0,0 +1,246 @@
+"""
+Card BIN index: which bank offers a card is eligible for.
+
+Bank offers are keyed by ranges of BINs (the leading digits of a card
+number) and optionally by card type. A range file is CSV with a header:
+
+    bin_start,bin_end,card_type,offer_id,bank_name,discount_percentage
+    45145000,45145999,CREDIT,HDFC10,HDFC,10
+    4514,4514,,VISA5,VISA Bank,5
+
+bin_start and bin_end are 1 to 8 digits, inclusive; shorter ones cover
+every 8-digit BIN they prefix. An empty card_type matches any card type.
+Rows with the same offer_id must agree on the offer's bank and percentage.
+
+Ranges may overlap. The index flattens them into disjoint intervals, each
+carrying the offers of every range covering it, stored per card type as a
+sorted array of interval starts with a parallel array of offer-set ids. A
+lookup is one bisect, so its cost is O(log ranges) whatever the overlap.
+"""
+
+import csv
+import heapq
+import itertools
+from array import array
+from bisect import bisect_right
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+
+KEY_DIGITS = 8  # BINs are keyed as 8-digit numbers
+MIN_PREFIX_DIGITS = 6
+FIELDS = ("bin_start", "bin_end", "card_type", "offer_id", "bank_name", "discount_percentage")
+
+# Shared across instances, so a replaced BinIndex never repeats a version
+_versions = itertools.count(1)
+
+
+@dataclass(frozen=True)
+class BankOffer:
+    """A bank offer: discount_percentage off the cart total"""
+    offer_id: str
+    bank_name: str
+    discount_percentage: Decimal
+
+
+class BinRange(NamedTuple):
+    """Inclusive BIN range (1 to 8 digits each end) eligible for an offer"""
+    bin_start: str
+    bin_end: str
+    offer: BankOffer
+    card_type: Optional[str] = None  # None for any card type
+
+
+def _bounds(bin_start: str, bin_end: str) -> Tuple[int, int]:
+    if not (0 < len(bin_start) <= KEY_DIGITS and bin_start.isdigit()
+            and 0 < len(bin_end) <= KEY_DIGITS and bin_end.isdigit()):
+        raise ValueError(f"BINs must be 1 to {KEY_DIGITS} digits, got {bin_start!r}-{bin_end!r}")
+    start = int(bin_start) * _SCALE[len(bin_start)]
+    end = (int(bin_end) + 1) * _SCALE[len(bin_end)] - 1
+    if start > end:
+        raise ValueError(f"BIN range {bin_start}-{bin_end} is empty")
+    return start, end
+
+
+# Multiplier that pads a BIN of each length to KEY_DIGITS digits
+_SCALE = [10 ** (KEY_DIGITS - length) for length in range(KEY_DIGITS + 1)]
+
+
+class BinIndex:
+    """
+    Bank offers by card BIN and card type.
+
+    Build one from BinRange objects or load one with from_file. The index
+    is immutable; to change the offers, build a new one and assign it to
+    DiscountService.bin_index (its version changes config_version, which
+    invalidates cached results).
+
+    Args:
+        ranges: BIN ranges with their offers
+    """
+
+    def __init__(self, ranges: Iterable[BinRange]):
+        self._build(
+            (*_bounds(bin_range.bin_start, bin_range.bin_end), bin_range.card_type, bin_range.offer)
+            for bin_range in ranges
+        )
+
+    @classmethod
+    def from_file(cls, path: str) -> 'BinIndex':
+        """
+        Load a CSV range file, see the module docstring.
+
+        Raises:
+            ValueError: If a row is malformed or an offer_id is redefined
+        """
+        index = cls.__new__(cls)
+        index._build((start, end, card_type, offer) for _, _, start, end, card_type, offer in _read_ranges(path))
+        return index
+
+    def _build(self, ranges: Iterable[Tuple[int, int, Optional[str], BankOffer]]):
+        self.version = next(_versions)
+        by_card_type: Dict[Optional[str], List[Tuple[int, int, BankOffer]]] = {None: []}
+        distinct: Dict[int, BankOffer] = {}  # id(offer) -> offer
+        count = 0
+        for start, end, card_type, offer in ranges:
+            card_type = card_type.upper() if card_type else None
+            distinct[id(offer)] = offer
+            by_card_type.setdefault(card_type, []).append((start, end, offer))
+            count += 1
+        self.ranges = count  # Ranges loaded
+
+        # Rank the offers best (highest percentage) first, so the sweep can
+        # track small ints and sorting ranks orders a set's offers
+        offers = sorted(set(distinct.values()), key=lambda offer: (-offer.discount_percentage, offer.offer_id))
+        rank_of_value = {offer: rank for rank, offer in enumerate(offers)}
+        rank_of_id = {object_id: rank_of_value[offer] for object_id, offer in distinct.items()}
+        self._offers = offers
+        self._offer_sets: List[Tuple[BankOffer, ...]] = [()]
+        self._offer_set_ids: Dict[Tuple[int, ...], int] = {(): 0}
+        # Card type -> (interval starts, offer set id of each interval); the
+        # None entry holds the ranges for any card type, which every other
+        # card type's intervals include too
+        ranked = {
+            card_type: [(start, end, rank_of_id[id(offer)]) for start, end, offer in typed]
+            for card_type, typed in by_card_type.items()
+        }
+        self._intervals: Dict[Optional[str], Tuple[array, array]] = {
+            card_type: self._flatten(typed if card_type is None else typed + ranked[None])
+            for card_type, typed in ranked.items()
+        }
+
+    def __len__(self) -> int:
+        """Disjoint intervals across every card type"""
+        return sum(len(starts) for starts, _ in self._intervals.values())
+
+    def lookup(self, card_prefix: str, card_type: Optional[str] = None) -> Tuple[BankOffer, ...]:
+        """
+        Offers a card is eligible for, best (highest percentage) first.
+
+        card_prefix is the card number or at least its first 6 digits; a
+        6 or 7 digit prefix is looked up as its lowest 8-digit BIN. Card
+        types without ranges of their own only match untyped ranges.
+        """
+        if len(card_prefix) < MIN_PREFIX_DIGITS or not card_prefix[:KEY_DIGITS].isdigit():
+            raise ValueError(f"Card prefixes need at least {MIN_PREFIX_DIGITS} digits, got {card_prefix!r}")
+        key = int(card_prefix[:KEY_DIGITS].ljust(KEY_DIGITS, "0"))
+        intervals = self._intervals.get(card_type.upper() if card_type else None)
+        if intervals is None:
+            intervals = self._intervals[None]
+        starts, offer_set_ids = intervals
+        position = bisect_right(starts, key) - 1
+        if position < 0:
+            return ()
+        return self._offer_sets[offer_set_ids[position]]
+
+    def best_offer(self, card_prefix: str, card_type: Optional[str] = None) -> Optional[BankOffer]:
+        """The card's highest-percentage offer, or None"""
+        offers = self.lookup(card_prefix, card_type)
+        return offers[0] if offers else None
+
+    def _flatten(self, ranges: List[Tuple[int, int, int]]) -> Tuple[array, array]:
+        """Disjoint (start, offer set id) intervals covering ranked ranges, sweeping them by start"""
+        ranges.sort()
+        starts = array("L")
+        offer_set_ids = array("L")
+        active: Dict[int, int] = {}  # Offer rank -> ranges covering the sweep position
+        ending: List[Tuple[int, int]] = []  # Heap of (end + 1, offer rank)
+        index = 0
+        total = len(ranges)
+        while index < total or ending:
+            next_start = ranges[index][0] if index < total else None
+            if ending and (next_start is None or ending[0][0] <= next_start):
+                position = ending[0][0]
+                while ending and ending[0][0] == position:
+                    rank = heapq.heappop(ending)[1]
+                    remaining = active[rank] - 1
+                    if remaining:
+                        active[rank] = remaining
+                    else:
+                        del active[rank]
+                if position != next_start:
+                    self._emit(starts, offer_set_ids, position, active)
+                    continue
+            position = next_start
+            while index < total and ranges[index][0] == position:
+                _, end, rank = ranges[index]
+                active[rank] = active.get(rank, 0) + 1
+                heapq.heappush(ending, (end + 1, rank))
+                index += 1
+            self._emit(starts, offer_set_ids, position, active)
+        return starts, offer_set_ids
+
+    def _emit(self, starts: array, offer_set_ids: array, position: int, active: Dict[int, int]):
+        ranks = tuple(sorted(active))
+        offer_set_id = self._offer_set_ids.get(ranks)
+        if offer_set_id is None:
+            offer_set_id = self._offer_set_ids[ranks] = len(self._offer_sets)
+            self._offer_sets.append(tuple(self._offers[rank] for rank in ranks))
+        if offer_set_ids and offer_set_ids[-1] == offer_set_id:
+            return  # Same offers as the interval before: extend it
+        if not offer_set_ids and offer_set_id == 0:
+            return  # Nothing below the first range
+        starts.append(position)
+        offer_set_ids.append(offer_set_id)
+
+
+def load_bin_ranges(path: str) -> Iterator[BinRange]:
+    """
+    Read and validate a CSV BIN range file.
+
+    Raises:
+        ValueError: If a row is malformed or an offer_id is redefined
+    """
+    for bin_start, bin_end, _, _, card_type, offer in _read_ranges(path):
+        yield BinRange(bin_start, bin_end, offer, card_type)
+
+
+def _read_ranges(path: str) -> Iterator[Tuple[str, str, int, int, Optional[str], BankOffer]]:
+    """(bin_start, bin_end, start key, end key, card_type, offer) of each row"""
+    offers: Dict[str, BankOffer] = {}
+    with open(path, newline="", encoding="utf-8") as range_file:
+        reader = csv.reader(range_file)
+        header = next(reader, None)
+        if header is None or tuple(name.strip() for name in header) != FIELDS:
+            raise ValueError(f"{path}: header must be {','.join(FIELDS)}")
+        for line, row in enumerate(reader, start=2):
+            if len(row) != len(FIELDS):
+                raise ValueError(f"{path}:{line}: expected {len(FIELDS)} fields, got {len(row)}")
+            bin_start, bin_end, card_type, offer_id, bank_name, percentage = row
+            offer = offers.get(offer_id)
+            if offer is None or offer.bank_name != bank_name or str(offer.discount_percentage) != percentage:
+                try:
+                    discount_percentage = Decimal(percentage)
+                except InvalidOperation:
+                    raise ValueError(f"{path}:{line}: discount_percentage must be a number") from None
+                if not offer_id or not bank_name or not (0 <= discount_percentage <= 100):
+                    raise ValueError(f"{path}:{line}: offer needs an offer_id, bank_name and a 0-100 percentage")
+                candidate = BankOffer(offer_id, bank_name, discount_percentage)
+                if offer is not None and offer != candidate:
+                    raise ValueError(f"{path}:{line}: offer {offer_id} redefined")
+                offer = offers[offer_id] = candidate
+            try:
+                start, end = _bounds(bin_start, bin_end)
+            except ValueError as error:
+                raise ValueError(f"{path}:{line}: {error}") from None
+            yield bin_start, bin_end, start, end, card_type or None, offer
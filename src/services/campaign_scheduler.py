@@ -0,0 +1,191 @@
+import heapq
+from datetime import date, timedelta
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from src.discount_types.seasonal_discount import SeasonalDiscount
+
+# Event kinds; on the same date expiries are applied before activations
+_EXPIRE = 0
+_ACTIVATE = 1
+
+_ONE_DAY = timedelta(days=1)
+
+# (start_date, end_date, registration number, campaign)
+_Interval = Tuple[date, date, int, SeasonalDiscount]
+
+
+class _IntervalNode:
+    """Node of a centered interval tree over campaign date ranges"""
+
+    __slots__ = ("center", "by_start", "by_end", "left", "right")
+
+    def __init__(self, intervals: List[_Interval]):
+        endpoints = sorted([interval[0] for interval in intervals] + [interval[1] for interval in intervals])
+        self.center = endpoints[len(endpoints) // 2]
+        left, right, overlapping = [], [], []
+        for interval in intervals:
+            if interval[1] < self.center:
+                left.append(interval)
+            elif interval[0] > self.center:
+                right.append(interval)
+            else:
+                overlapping.append(interval)
+        # Intervals containing center, by ascending start and by descending end
+        self.by_start = sorted(overlapping, key=lambda interval: interval[0])
+        self.by_end = sorted(overlapping, key=lambda interval: interval[1], reverse=True)
+        self.left = _IntervalNode(left) if left else None
+        self.right = _IntervalNode(right) if right else None
+
+
+def _stab(root: Optional[_IntervalNode], day: date) -> List[_Interval]:
+    """Intervals containing day, in O(log n + matches)"""
+    found = []
+    node = root
+    while node is not None:
+        if day < node.center:
+            for interval in node.by_start:
+                if interval[0] > day:
+                    break
+                found.append(interval)
+            node = node.left
+        elif day > node.center:
+            for interval in node.by_end:
+                if interval[1] < day:
+                    break
+                found.append(interval)
+            node = node.right
+        else:
+            found.extend(node.by_start)
+            break
+    return found
+
+
+class CampaignScheduler:
+    """
+    Index of SeasonalDiscount campaigns answering "which are active today".
+
+    Campaigns are kept in a centered interval tree over their date ranges
+    and a min-heap of upcoming activation (start_date) and expiry (the day
+    after end_date) events. active() returns a cached tuple and only does
+    work when the clock has reached the next event, so reading it costs one
+    clock call and a date comparison between transitions. Moving the clock
+    forward applies the due events in date order; moving it backwards
+    rebuilds the active set from the interval tree.
+
+    The clock is injectable for deterministic tests. Campaigns still check
+    their own dates in is_applicable, so give them the same clock when it
+    is not date.today.
+    """
+
+    def __init__(self, campaigns: Iterable[SeasonalDiscount] = (), clock: Callable[[], date] = date.today):
+        self.clock = clock
+        self._registered: Dict[SeasonalDiscount, int] = {}  # campaign -> registration number
+        self._sequence = 0
+        self._tree: Optional[_IntervalNode] = None
+        self._tree_stale = False
+        self._events: List[Tuple[date, int, int, SeasonalDiscount]] = []  # (when, kind, registration, campaign)
+        self._active: Dict[SeasonalDiscount, int] = {}
+        self._active_view: Tuple[SeasonalDiscount, ...] = ()
+        self._as_of: Optional[date] = None  # Date the active set was computed for
+        self.refreshes = 0  # Times the active set was brought up to date
+        for campaign in campaigns:
+            self.add(campaign)
+
+    def __len__(self) -> int:
+        return len(self._registered)
+
+    def __contains__(self, campaign: SeasonalDiscount) -> bool:
+        return campaign in self._registered
+
+    def add(self, campaign: SeasonalDiscount):
+        """Schedule campaign; adding a scheduled campaign again replaces it"""
+        if campaign.end_date < campaign.start_date:
+            raise ValueError(f"Campaign {campaign.season_name} ends before it starts")
+        self._sequence += 1
+        registration = self._registered[campaign] = self._sequence
+        self._active.pop(campaign, None)
+        self._tree_stale = True
+        if self._as_of is None:
+            return  # Nothing computed yet; the first read builds everything
+        if campaign.is_active(self._as_of):
+            self._active[campaign] = registration
+        if campaign.start_date > self._as_of:
+            heapq.heappush(self._events, (campaign.start_date, _ACTIVATE, registration, campaign))
+        if campaign.end_date + _ONE_DAY > self._as_of:
+            heapq.heappush(self._events, (campaign.end_date + _ONE_DAY, _EXPIRE, registration, campaign))
+        self._publish()
+
+    def remove(self, campaign: SeasonalDiscount):
+        """Unschedule campaign; its pending events are skipped when they come due"""
+        del self._registered[campaign]
+        self._tree_stale = True
+        if self._active.pop(campaign, None) is not None:
+            self._publish()
+
+    def active(self) -> Tuple[SeasonalDiscount, ...]:
+        """Campaigns active on the clock's date, in the order they were added"""
+        today = self.clock()
+        if self._as_of is None or today < self._as_of or (self._events and today >= self._events[0][0]):
+            self._refresh(today)
+        return self._active_view
+
+    def active_on(self, day: date) -> Tuple[SeasonalDiscount, ...]:
+        """Campaigns active on day, in the order they were added; does not move the scheduler"""
+        found = [interval for interval in _stab(self._interval_tree(), day) if self._is_current(interval)]
+        found.sort(key=lambda interval: interval[2])
+        return tuple(interval[3] for interval in found)
+
+    @property
+    def next_transition(self) -> Optional[date]:
+        """Date of the next pending activation or expiry, or None"""
+        return self._events[0][0] if self._events else None
+
+    def _refresh(self, today: date):
+        self.refreshes += 1
+        if self._as_of is None or today < self._as_of:
+            self._rebuild(today)
+            return
+        events = self._events
+        while events and events[0][0] <= today:
+            _, kind, registration, campaign = heapq.heappop(events)
+            if self._registered.get(campaign) != registration:
+                continue  # Removed or re-added since this event was scheduled
+            if kind == _ACTIVATE:
+                self._active[campaign] = registration
+            else:
+                self._active.pop(campaign, None)
+        self._as_of = today
+        self._publish()
+
+    def _rebuild(self, today: date):
+        """Recompute the active set and pending events for today from scratch"""
+        self._active = {
+            interval[3]: interval[2]
+            for interval in _stab(self._interval_tree(), today) if self._is_current(interval)
+        }
+        events = []
+        for campaign, registration in self._registered.items():
+            if campaign.start_date > today:
+                events.append((campaign.start_date, _ACTIVATE, registration, campaign))
+            if campaign.end_date + _ONE_DAY > today:
+                events.append((campaign.end_date + _ONE_DAY, _EXPIRE, registration, campaign))
+        heapq.heapify(events)
+        self._events = events
+        self._as_of = today
+        self._publish()
+
+    def _publish(self):
+        self._active_view = tuple(sorted(self._active, key=self._active.__getitem__))
+
+    def _interval_tree(self) -> Optional[_IntervalNode]:
+        if self._tree_stale:
+            intervals = [
+                (campaign.start_date, campaign.end_date, registration, campaign)
+                for campaign, registration in self._registered.items()
+            ]
+            self._tree = _IntervalNode(intervals) if intervals else None
+            self._tree_stale = False
+        return self._tree
+
+    def _is_current(self, interval: _Interval) -> bool:
+        return self._registered.get(interval[3]) == interval[2]
@@ -0,0 +1,140 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.category_discount import CategoryDiscount
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.discount_types.tier_discount import TierDiscount
+from src.models.customer import CustomerProfile
+from src.models.money import BPS_SCALE, to_bps, to_paise
+from src.models.product_table import ProductTable
+
+
+@dataclass(frozen=True)
+class ListingPrices:
+    """Display prices for a ProductTable batch, position by position"""
+    columns: ProductTable
+    display_price_paise: np.ndarray  # Price after every discount, never below zero
+    discount_paise: np.ndarray  # current_price_paise - display_price_paise
+    percent_off: np.ndarray  # Whole percent off base_price, rounded down
+
+    def product_badges(self, min_percent: int = 1) -> List[str]:
+        """Badge per product such as "40% off", empty below min_percent"""
+        labels = {percent: f"{percent}% off" for percent in np.unique(self.percent_off).tolist()}
+        return [labels[percent] if percent >= min_percent else "" for percent in self.percent_off.tolist()]
+
+    def brand_badges(self) -> Dict[str, str]:
+        """Badges such as "Min 40% off on PUMA" for brands where every product is discounted"""
+        return self._group_badges(self.columns.brand_codes, self.columns.brands)
+
+    def category_badges(self) -> Dict[str, str]:
+        """Badges such as "Min 25% off on Shoes" for categories where every product is discounted"""
+        return self._group_badges(self.columns.category_codes, self.columns.categories)
+
+    def _group_badges(self, codes: np.ndarray, vocabulary: Tuple[str, ...]) -> Dict[str, str]:
+        minimums = np.full(len(vocabulary), np.iinfo(np.int64).max, dtype=np.int64)
+        np.minimum.at(minimums, codes, self.percent_off.astype(np.int64))
+        present = np.bincount(codes, minlength=len(vocabulary)) > 0
+        return {
+            vocabulary[code]: f"Min {minimum}% off on {vocabulary[code]}"
+            for code, minimum in enumerate(minimums.tolist())
+            if present[code] and minimum > 0
+        }
+
+
+def _apply_bps(paise: np.ndarray, bps: int) -> np.ndarray:
+    """Vectorized money.apply_bps: bps of each amount, rounded half-up away from zero"""
+    numerator = paise * bps
+    quotient = (np.abs(numerator) + BPS_SCALE // 2) // BPS_SCALE
+    return np.where(numerator < 0, -quotient, quotient)
+
+
+def _cap(amounts: np.ndarray, max_paise: int) -> np.ndarray:
+    """Vectorized money.cap_paise"""
+    return np.minimum(amounts, max_paise) if max_paise else amounts
+
+
+class CatalogPricingEngine:
+    """
+    Prices whole catalog pages at once with NumPy array operations.
+
+    Each product is priced as a one-unit cart in fixed-point money mode, so
+    amounts match DiscountFactory.apply_multiple_discounts on that cart to
+    the paisa:
+      - CategoryDiscount lowers the current price first, by its percentage
+        of base_price, as CategoryDiscount.apply_discount does
+      - BrandDiscount, TierDiscount and SeasonalDiscount are then each taken
+        on that lowered price, with their max_discount caps applied per
+        product, and stack
+    Tier rules use the customer context; seasonal rules use the pricing date.
+    """
+
+    SUPPORTED_TYPES = (BrandDiscount, CategoryDiscount, TierDiscount, SeasonalDiscount)
+
+    def __init__(self, discounts: Iterable):
+        self.discounts = list(discounts)
+        for discount in self.discounts:
+            if not isinstance(discount, self.SUPPORTED_TYPES):
+                raise ValueError(f"Unsupported discount for catalog pricing: {type(discount).__name__}")
+
+    def price(
+        self,
+        columns: ProductTable,
+        customer: CustomerProfile,
+        on_date: Optional[date] = None
+    ) -> ListingPrices:
+        """
+        Compute display prices for every product in columns.
+
+        Args:
+            columns: Products to price
+            customer: Customer the page is shown to
+            on_date: Date seasonal rules are checked against (default each
+                rule's clock, today unless one was injected)
+
+        Returns:
+            ListingPrices with per-product prices and badge helpers
+        """
+        price = columns.current_price_paise.copy()
+
+        for discount in self.discounts:
+            if isinstance(discount, CategoryDiscount):
+                mask = columns.category_mask([discount.category])
+                price -= np.where(mask, _apply_bps(columns.base_price_paise, to_bps(discount.discount_percentage)), 0)
+
+        discount_total = np.zeros(len(columns), dtype=np.int64)
+        for discount in self.discounts:
+            if isinstance(discount, BrandDiscount):
+                mask = columns.brand_mask(discount.brand_key)
+            elif isinstance(discount, TierDiscount):
+                if not discount.applies_to(customer):
+                    continue
+                mask = price >= to_paise(discount.min_cart_value)
+            elif isinstance(discount, SeasonalDiscount):
+                if not discount.is_active(on_date or discount.clock()):
+                    continue
+                if discount.applicable_categories:
+                    mask = columns.category_mask(discount.applicable_categories)
+                else:
+                    mask = None
+            else:
+                continue
+            amounts = _cap(_apply_bps(price, discount.discount_bps), discount.max_discount_paise)
+            discount_total += amounts if mask is None else np.where(mask, amounts, 0)
+
+        display_price = np.maximum(price - discount_total, 0)
+        base_price = columns.base_price_paise
+        percent_off = np.where(
+            base_price > 0,
+            (base_price - display_price) * 100 // np.maximum(base_price, 1),
+            0
+        )
+        return ListingPrices(
+            columns=columns,
+            display_price_paise=display_price,
+            discount_paise=columns.current_price_paise - display_price,
+            percent_off=np.maximum(percent_off, 0)
+        )
@@ -0,0 +1,58 @@
+import itertools
+from typing import Dict
+
+# Shared across instances, so a replaced DiscountCodes never repeats a version
+_versions = itertools.count(1)
+
+
+class DiscountCodes(dict):
+    """
+    Discount code configurations (code -> rules) with a change version.
+
+    Adding, replacing or removing a code takes a new version number. Edits
+    made inside a code's rules dict are not seen; call touch() after them.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = next(_versions)
+
+    def touch(self):
+        """Take a new version after an edit this dict cannot see"""
+        self.version = next(_versions)
+
+    def __setitem__(self, code: str, rules: Dict):
+        super().__setitem__(code, rules)
+        self.touch()
+
+    def __delitem__(self, code: str):
+        super().__delitem__(code)
+        self.touch()
+
+    def __ior__(self, other):
+        result = super().__ior__(other)
+        self.touch()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self.touch()
+
+    def setdefault(self, code: str, rules: Dict = None):
+        if code not in self:
+            self.touch()
+        return super().setdefault(code, rules)
+
+    def pop(self, code: str, *default):
+        if code in self:
+            self.touch()
+        return super().pop(code, *default)
+
+    def popitem(self):
+        item = super().popitem()
+        self.touch()
+        return item
+
+    def clear(self):
+        super().clear()
+        self.touch()
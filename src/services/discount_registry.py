@@ -0,0 +1,309 @@
+"""
+Discount code registry loaded from a JSON or TOML file.
+
+The file holds a "codes" table mapping each code to its rules:
+
+    {"codes": {"SUPER69": {"discount_percentage": "69", "max_discount": "1000",
+                           "tier_requirement": null, "excluded_brands": [],
+                           "allowed_categories": [], "min_cart_value": "0"}}}
+
+    [codes.SUPER69]
+    discount_percentage = "69"
+    max_discount = "1000"
+
+Only discount_percentage and max_discount are required. max_redemptions
+and max_redemptions_per_customer optionally cap how often a code can be
+redeemed in total and by one customer (see RedemptionLimiter). Amounts may be
+strings, integers or floats; they are converted to Decimal through their
+string form. Each load is validated into immutable VoucherRule objects and
+published as one RegistrySnapshot, so a reader that holds a snapshot sees
+one consistent set of rules however many reloads happen meanwhile.
+"""
+
+import asyncio
+import itertools
+import json
+import os
+import time
+from collections.abc import Mapping as MappingABC
+from dataclasses import dataclass, fields
+from decimal import Decimal, InvalidOperation
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Iterator, Mapping, Optional, Tuple
+
+from src.services.voucher_index import TIER_HIERARCHY
+
+DEFAULT_CODES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "default_discount_codes.json")
+
+
+def _decimal(value: Any, name: str, code: str) -> Decimal:
+    if isinstance(value, bool) or not isinstance(value, (int, float, str, Decimal)):
+        raise ValueError(f"Discount code {code}: {name} must be a number, got {value!r}")
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value))
+    except InvalidOperation:
+        raise ValueError(f"Discount code {code}: {name} must be a number, got {value!r}") from None
+    if not amount.is_finite() or amount < 0:
+        raise ValueError(f"Discount code {code}: {name} must be a non-negative number, got {value!r}")
+    return amount
+
+
+def _count(value: Any, name: str, code: str) -> Optional[int]:
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise ValueError(f"Discount code {code}: {name} must be a non-negative integer, got {value!r}")
+    return value
+
+
+def _names(value: Any, name: str, code: str) -> Tuple[str, ...]:
+    if value is None:
+        return ()
+    if isinstance(value, str) or not all(isinstance(item, str) for item in value):
+        raise ValueError(f"Discount code {code}: {name} must be a list of strings")
+    return tuple(value)
+
+
+@dataclass(frozen=True)
+class VoucherRule:
+    """
+    Validated rules of one discount code.
+
+    Also readable as a read-only mapping of its rule fields (rule["max_discount"],
+    rule.get(...), dict(rule)), the shape discount code rules have always had.
+    """
+    code: str
+    discount_percentage: Decimal
+    max_discount: Decimal
+    tier_requirement: Optional[str] = None
+    excluded_brands: Tuple[str, ...] = ()
+    allowed_categories: Tuple[str, ...] = ()
+    min_cart_value: Decimal = Decimal("0")
+    max_redemptions: Optional[int] = None  # Redemptions of the code in total
+    max_redemptions_per_customer: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, code: str, config: Mapping[str, Any]) -> 'VoucherRule':
+        """Validate one code's rules as read from a config file"""
+        if not isinstance(code, str) or not code:
+            raise ValueError(f"Discount codes must be non-empty strings, got {code!r}")
+        if not isinstance(config, Mapping):
+            raise ValueError(f"Discount code {code}: rules must be a table")
+        unknown = set(config) - set(RULE_FIELDS)
+        if unknown:
+            raise ValueError(f"Discount code {code}: unknown rules {sorted(unknown)}")
+        for required in ("discount_percentage", "max_discount"):
+            if required not in config:
+                raise ValueError(f"Discount code {code}: missing {required}")
+
+        discount_percentage = _decimal(config["discount_percentage"], "discount_percentage", code)
+        if discount_percentage > 100:
+            raise ValueError(f"Discount code {code}: discount_percentage must be at most 100")
+        tier_requirement = config.get("tier_requirement")
+        if tier_requirement is not None and (
+            not isinstance(tier_requirement, str) or tier_requirement.lower() not in TIER_HIERARCHY
+        ):
+            raise ValueError(f"Discount code {code}: unknown tier_requirement {tier_requirement!r}")
+
+        return cls(
+            code=code,
+            discount_percentage=discount_percentage,
+            max_discount=_decimal(config["max_discount"], "max_discount", code),
+            tier_requirement=tier_requirement or None,
+            excluded_brands=_names(config.get("excluded_brands"), "excluded_brands", code),
+            allowed_categories=_names(config.get("allowed_categories"), "allowed_categories", code),
+            min_cart_value=_decimal(config.get("min_cart_value", 0), "min_cart_value", code),
+            max_redemptions=_count(config.get("max_redemptions"), "max_redemptions", code),
+            max_redemptions_per_customer=_count(
+                config.get("max_redemptions_per_customer"), "max_redemptions_per_customer", code
+            )
+        )
+
+    def __getitem__(self, name: str):
+        if name not in RULE_FIELDS:
+            raise KeyError(name)
+        return getattr(self, name)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(RULE_FIELDS)
+
+    def __len__(self) -> int:
+        return len(RULE_FIELDS)
+
+    def __contains__(self, name) -> bool:
+        return name in RULE_FIELDS
+
+    def keys(self):
+        return RULE_FIELDS
+
+    def get(self, name: str, default=None):
+        return getattr(self, name) if name in RULE_FIELDS else default
+
+
+# Mapping keys of a VoucherRule: every field but the code itself
+RULE_FIELDS = tuple(field.name for field in fields(VoucherRule) if field.name != "code")
+MappingABC.register(VoucherRule)
+
+
+@dataclass(frozen=True)
+class RegistrySnapshot:
+    """One loaded version of the registry"""
+    version: int  # Counts successful loads of this registry, from 1
+    rules: Mapping[str, VoucherRule]  # Read-only, in file order
+    source: Optional[str] = None  # Path it was loaded from
+
+
+def parse_discount_codes(data: Mapping[str, Any]) -> Dict[str, VoucherRule]:
+    """Validate the parsed contents of a discount code file"""
+    if not isinstance(data, Mapping) or not isinstance(data.get("codes"), Mapping):
+        raise ValueError("Discount code file must have a 'codes' table")
+    return {code: VoucherRule.from_config(code, config) for code, config in data["codes"].items()}
+
+
+def load_discount_codes(path: str) -> Dict[str, VoucherRule]:
+    """
+    Read and validate a .json or .toml discount code file.
+
+    Raises:
+        ValueError: If the file cannot be parsed or a rule is invalid
+    """
+    with open(path, "rb") as config_file:
+        content = config_file.read()
+    if path.endswith(".toml"):
+        try:
+            import tomllib
+        except ImportError:  # Python < 3.11
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("Reading TOML discount codes needs Python 3.11+ or the tomli package") from None
+        try:
+            data = tomllib.loads(content.decode())
+        except (tomllib.TOMLDecodeError, UnicodeDecodeError) as error:
+            raise ValueError(f"{path}: {error}") from None
+    else:
+        try:
+            data = json.loads(content, parse_float=Decimal)
+        except ValueError as error:
+            raise ValueError(f"{path}: {error}") from None
+    return parse_discount_codes(data)
+
+
+class DiscountCodeRegistry:
+    """
+    The discount code rules every service reads, optionally hot-reloaded.
+
+    current() returns the latest RegistrySnapshot. For a registry loaded
+    from a file with a poll_interval, current() also checks the file's
+    modification time, size and inode at most once per poll_interval
+    seconds and reloads it when they change. A reload that fails
+    validation keeps the previous snapshot and is kept in last_error.
+    Snapshots are swapped by a single assignment, so readers never see a
+    partly loaded file.
+
+    Args:
+        rules: Initial rules as code -> rules mapping (ignored with path)
+        path: JSON or TOML file to load rules from
+        poll_interval: Seconds between file checks in current(); None to
+            only reload on refresh() or reload()
+        clock: Monotonic time source for polling (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        rules: Optional[Mapping[str, Mapping[str, Any]]] = None,
+        path: Optional[str] = None,
+        poll_interval: Optional[float] = 1.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        self.path = path
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.last_error: Optional[Exception] = None
+        self._versions = itertools.count(1)
+        self._file_identity = None
+        self._next_poll = clock() + poll_interval if poll_interval is not None else None
+        if path is not None:
+            self.reload()
+        else:
+            self._publish({code: VoucherRule.from_config(code, config) for code, config in (rules or {}).items()})
+
+    @classmethod
+    def from_file(cls, path: str, poll_interval: Optional[float] = 1.0) -> 'DiscountCodeRegistry':
+        return cls(path=path, poll_interval=poll_interval)
+
+    @property
+    def snapshot(self) -> RegistrySnapshot:
+        """Latest snapshot, without checking the file"""
+        return self._snapshot
+
+    @property
+    def rules(self) -> Mapping[str, VoucherRule]:
+        return self.current().rules
+
+    def current(self) -> RegistrySnapshot:
+        """Latest snapshot, reloading the file first if a poll is due and it changed"""
+        next_poll = self._next_poll
+        if next_poll is not None and self.path is not None and self.clock() >= next_poll:
+            self._next_poll = self.clock() + self.poll_interval
+            self.refresh()
+        return self._snapshot
+
+    def refresh(self) -> bool:
+        """
+        Reload the file if it changed since the last load.
+
+        Returns:
+            True if a new snapshot was published; a file that fails
+            validation is recorded in last_error and leaves the snapshot as is
+        """
+        try:
+            if self._stat() == self._file_identity:
+                return False
+            self.reload()
+        except (OSError, ValueError) as error:
+            self.last_error = error
+            return False
+        return True
+
+    def reload(self) -> RegistrySnapshot:
+        """
+        Load the file and publish it as a new snapshot.
+
+        Raises:
+            ValueError: If the file is invalid; the current snapshot stays
+        """
+        identity = self._stat()
+        rules = load_discount_codes(self.path)
+        self._file_identity = identity
+        self.last_error = None
+        return self._publish(rules, self.path)
+
+    def replace(self, rules: Mapping[str, Mapping[str, Any]]) -> RegistrySnapshot:
+        """Validate rules and publish them as a new snapshot"""
+        return self._publish({code: VoucherRule.from_config(code, config) for code, config in rules.items()})
+
+    async def watch(self, interval: float = 1.0):
+        """Check the file for changes every interval seconds until cancelled"""
+        while True:
+            self.refresh()
+            await asyncio.sleep(interval)
+
+    def _stat(self):
+        stat = os.stat(self.path)
+        return (stat.st_ino, stat.st_size, stat.st_mtime_ns)
+
+    def _publish(self, rules: Dict[str, VoucherRule], source: Optional[str] = None) -> RegistrySnapshot:
+        self._snapshot = RegistrySnapshot(next(self._versions), MappingProxyType(rules), source)
+        return self._snapshot
+
+
+_default_registry: Optional[DiscountCodeRegistry] = None
+
+
+def default_registry() -> DiscountCodeRegistry:
+    """Process-wide registry of the built-in discount codes, loaded once"""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = DiscountCodeRegistry.from_file(DEFAULT_CODES_PATH, poll_interval=None)
+    return _default_registry
@@ -1,76 +1,140 @@
-from typing import List, Optional, Dict
+import asyncio
+import heapq
+import time
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Mapping, Optional, Dict, Tuple, Union
 from decimal import Decimal
 
-from src.models.cart import CartItem
+from src.models.cart import Cart, CartItem
+from src.models.cart_snapshot import CartSnapshot
 from src.models.customer import CustomerProfile
 from src.models.discount import DiscountedPrice
+from src.models.money import MoneyMode, from_paise
+from src.discount_types.base_discount import BaseDiscount
 from src.discount_types.brand_discount import BrandDiscount
 from src.discount_types.category_discount import CategoryDiscount
 from src.discount_types.bank_discount import BankDiscount
 from src.discount_types.voucher_discount import VoucherDiscount
 from src.discount_types.discount_factory import DiscountFactory
+from src.discount_types.stacking_solver import StackingSolver
 from src.discount_types.tier_discount import TierDiscount
 from src.discount_types.seasonal_discount import SeasonalDiscount
 from src.models.payment import PaymentInfo
+from src.models.pricing_request import CartPricingRequest
+from src.models.pricing_trace import REJECTED, PricingTrace, TraceSampler
 from src.services.validation_service import ValidationService
+from src.services.voucher_index import VoucherIndex
+from src.services.voucher_eligibility import EligibilityResult, VoucherEligibility
+from src.services.campaign_scheduler import CampaignScheduler
+from src.services.discount_codes import DiscountCodes
+from src.services.discount_registry import DiscountCodeRegistry, RegistrySnapshot, default_registry
+from src.services.metrics import DiscountMetrics
+from src.services.result_cache import PricingResultCache, cart_fingerprint, copy_result
+from src.services.single_flight import SingleFlight
+from src.services.redemption_limits import RedemptionLimiter, Reservation
+from src.services.loyalty_ledger import LoyaltyLedger
+from src.services.bin_index import BinIndex
+from src.services.pricing_session import CartPricingSession
+
+
+async def _aiter_sync(iterable: Iterable) -> AsyncIterator:
+    for item in iterable:
+        yield item
+
 
 class DiscountService:
-    def __init__(self):
-        self.validation_service = ValidationService()
+    # Brands that get an automatic brand discount in calculate_cart_discounts
+    PREMIUM_BRANDS = ["NIKE", "ADIDAS", "PUMA"]
+    PREMIUM_BRAND_DISCOUNT_PERCENTAGE = Decimal("10")
+    PREMIUM_BRAND_MAX_DISCOUNT = Decimal("200")
+    BANK_OFFER_PERCENTAGE = 10.0
+
+    def __init__(
+        self,
+        money_mode: MoneyMode = MoneyMode.DECIMAL,
+        result_cache: Optional[PricingResultCache] = None,
+        metrics: Optional[DiscountMetrics] = None,
+        tracer: Optional[TraceSampler] = None,
+        campaign_scheduler: Optional[CampaignScheduler] = None,
+        discount_registry: Optional[DiscountCodeRegistry] = None,
+        single_flight: Optional[SingleFlight] = None,
+        redemption_limiter: Optional[RedemptionLimiter] = None,
+        loyalty_ledger: Optional[LoyaltyLedger] = None,
+        bin_index: Optional[BinIndex] = None
+    ):
+        # FIXED_POINT prices in integer paise with basis-point percentages,
+        # see src/models/money.py for the rounding rules
+        self.money_mode = money_mode
+        # Optional cache of calculate_cart_discounts results, invalidated
+        # whenever config_version changes
+        self.result_cache = result_cache
+        # Discount code rules shared with the validation service; the
+        # built-in codes unless a (possibly hot-reloaded) registry is given
+        self.discount_registry = discount_registry if discount_registry is not None else default_registry()
+        self.validation_service = ValidationService(self.discount_registry)
         self.discount_factory = DiscountFactory()
         self._register_custom_discounts()
+        # Optional instrumentation; also times the factory's evaluations
+        self.metrics = metrics
+        self.discount_factory.metrics = metrics
+        # Optional sampling of calls to trace, see src/models/pricing_trace.py
+        self.tracer = tracer
+        # Optional seasonal campaigns that apply_advanced_discounts evaluates
+        # alongside the configured discounts while they are active
+        self.campaign_scheduler = campaign_scheduler
+        # Optional sharing of one calculate_cart_discounts evaluation among
+        # concurrent calls for the same cart, see src/services/single_flight.py
+        self.single_flight = single_flight
+        if single_flight is not None:
+            single_flight.metrics = metrics
+            if single_flight.copy is None:
+                # Joined calls get their own applied_discounts, as cache hits do
+                single_flight.copy = copy_result
+        # Optional enforcement of the codes' redemption caps at checkout,
+        # see reserve_discount_code
+        self.redemption_limiter = redemption_limiter
+        # Optional live loyalty balances, given to "loyalty" discount configs
+        # that do not name a ledger of their own
+        self.loyalty_ledger = loyalty_ledger
+        # Optional BIN-keyed bank offers for payments that carry a card_bin,
+        # see _bank_offer
+        self.bin_index = bin_index
         
-        # Define available discount codes with their properties
-        self.discount_codes = {
-            "SUPER69": {
-                "discount_percentage": Decimal("69"),
-                "max_discount": Decimal("1000"),
-                "tier_requirement": None,
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": Decimal("0")
-            },
-            "PREMIUM20": {
-                "discount_percentage": Decimal("20"),
-                "max_discount": Decimal("500"),
-                "tier_requirement": "premium",
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": Decimal("1000")
-            },
-            "NEWUSER15": {
-                "discount_percentage": Decimal("15"),
-                "max_discount": Decimal("300"),
-                "tier_requirement": None,
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": Decimal("500")
-            },
-            "BRAND_EXCLUSION": {
-                "discount_percentage": Decimal("10"),
-                "max_discount": Decimal("200"),
-                "tier_requirement": None,
-                "excluded_brands": ["PUMA", "NIKE"],
-                "allowed_categories": [],
-                "min_cart_value": Decimal("0")
-            },
-            "CATEGORY_RESTRICTION": {
-                "discount_percentage": Decimal("25"),
-                "max_discount": Decimal("600"),
-                "tier_requirement": None,
-                "excluded_brands": [],
-                "allowed_categories": ["Shoes", "Jackets"],
-                "min_cart_value": Decimal("0")
-            },
-            "TIER_DISCOUNT": {
-                "discount_percentage": Decimal("30"),
-                "max_discount": Decimal("800"),
-                "tier_requirement": "regular",
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": Decimal("2000")
-            }
-        }
+        # Discount codes come from the registry unless assigned directly
+        self._pinned_codes: Optional[DiscountCodes] = None
+        self._registry_codes: Optional[DiscountCodes] = None
+        self._registry_snapshot: Optional[RegistrySnapshot] = None
+        self._voucher_index: Optional[VoucherIndex] = None
+        self._voucher_index_version: Optional[int] = None
+        self._voucher_eligibility: Optional[VoucherEligibility] = None
+        self._voucher_eligibility_version: Optional[int] = None
+
+    @property
+    def discount_codes(self) -> DiscountCodes:
+        """
+        Discount code rules (code -> rules) for the next request.
+        
+        Follows discount_registry: each registry snapshot is wrapped once and
+        a reload publishes a new DiscountCodes with a new version. Codes
+        assigned directly replace the registry's for this service.
+        """
+        if self._pinned_codes is not None:
+            return self._pinned_codes
+        snapshot = self.discount_registry.current()
+        if snapshot is not self._registry_snapshot:
+            self._registry_codes = DiscountCodes(snapshot.rules)
+            self._registry_snapshot = snapshot
+        return self._registry_codes
+
+    @discount_codes.setter
+    def discount_codes(self, discount_codes: Dict[str, Dict]):
+        self._pinned_codes = DiscountCodes(discount_codes)
+
+    @property
+    def config_version(self) -> tuple:
+        """Changes whenever discount_codes, the factory's registrations or bin_index change"""
+        bin_index_version = self.bin_index.version if self.bin_index is not None else None
+        return (self.discount_codes.version, self.discount_factory.version, bin_index_version)
 
     def _register_custom_discounts(self):
         """Register custom discount types with the factory"""
@@ -93,58 +157,515 @@ class DiscountService:
         cart_items: List[CartItem],
         customer: CustomerProfile,
         payment_info: Optional[PaymentInfo] = None,
-        voucher_code: Optional[str] = None
+        voucher_code: Optional[str] = None,
+        explain: bool = False
+    ) -> DiscountedPrice:
+        """
+        Price a cart with the premium brand, bank offer and voucher discounts.
+        
+        With explain=True, or when the service's tracer samples the call, the
+        result carries a PricingTrace of every rule evaluated in its trace
+        attribute. Traced calls bypass the result cache.
+        """
+        metrics = self.metrics
+        trace = None
+        if explain or self.tracer is not None:
+            trace = self._start_trace("calculate_cart_discounts", explain)
+        if metrics is None and trace is None:
+            return await self._cached_cart_discounts(cart_items, customer, payment_info, voucher_code)
+        
+        started = time.perf_counter()
+        if trace is None:
+            result = await self._cached_cart_discounts(cart_items, customer, payment_info, voucher_code)
+        else:
+            result = await self._calculate_cart_discounts(cart_items, customer, payment_info, voucher_code, trace)
+            self._finish_trace(trace, result, explain)
+        if metrics is not None:
+            metrics.observe_request("calculate_cart_discounts", cart_items, time.perf_counter() - started)
+        return result
+
+    def _start_trace(self, entry_point: str, explain: bool) -> Optional[PricingTrace]:
+        """New trace if this call is explained or sampled, else None"""
+        if explain or self.tracer.sample():
+            return PricingTrace(entry_point, self.money_mode)
+        return None
+
+    def _finish_trace(self, trace: PricingTrace, result: DiscountedPrice, explain: bool):
+        """Hand a finished trace to the tracer's sink and attach it to result if wanted"""
+        if self.tracer is not None:
+            self.tracer.emit(trace)
+        if explain or (self.tracer is not None and self.tracer.attach):
+            result.trace = trace
+
+    async def _cached_cart_discounts(
+        self,
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo],
+        voucher_code: Optional[str]
     ) -> DiscountedPrice:
+        if self.result_cache is None and self.single_flight is None:
+            return await self._calculate_cart_discounts(cart_items, customer, payment_info, voucher_code)
+        
+        key = cart_fingerprint(cart_items, customer, payment_info, voucher_code)
+        version = self.config_version
+        if self.result_cache is not None:
+            result = self.result_cache.get(key, version)
+            if result is not None:
+                return result
+        
+        async def evaluate() -> DiscountedPrice:
+            result = await self._calculate_cart_discounts(cart_items, customer, payment_info, voucher_code)
+            if self.result_cache is not None:
+                self.result_cache.put(key, version, result)
+            return result
+        
+        if self.single_flight is None:
+            return await evaluate()
+        # Calls under different configurations never share an evaluation
+        return await self.single_flight.do((key, version), evaluate)
+
+    async def _calculate_cart_discounts(
+        self,
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo],
+        voucher_code: Optional[str],
+        trace: Optional[PricingTrace] = None
+    ) -> DiscountedPrice:
+        fixed_point = self.money_mode is MoneyMode.FIXED_POINT
+        
+        # Aggregate the cart once; every discount below reads from the snapshot
+        cart_items = CartSnapshot.of(cart_items, self.money_mode)
+        
         # Initialize with cart total from current prices
-        original_price = sum(item.product.current_price * item.quantity for item in cart_items)
+        original_price = cart_items.paise.total if fixed_point else cart_items.total
         applied_discounts = {}
         
         # Apply brand discounts for premium brands automatically
-        premium_brands = ["NIKE", "ADIDAS", "PUMA"]  # Example premium brands
-        cart_brands = {item.product.brand for item in cart_items}
-        
-        for brand in cart_brands:
-            if brand in premium_brands:
-                brand_discount = BrandDiscount(brand, Decimal("10"), Decimal("200"))
-                if await brand_discount.is_applicable(cart_items, customer, payment_info):
-                    brand_result = await brand_discount.calculate_discount(cart_items, customer, payment_info)
-                    if brand_result > 0:
-                        applied_discounts[f"{brand} Brand Discount"] = brand_result
+        for brand in cart_items.brands:
+            if brand in self.PREMIUM_BRANDS:
+                brand_discount = self._create_premium_brand_discount(brand)
+                brand_result = await self._calculate_discount(brand_discount, cart_items, customer, payment_info)
+                if brand_result is not None and brand_result > 0:
+                    applied_discounts[f"{brand} Brand Discount"] = brand_result
+                if trace is not None:
+                    totals = cart_items.paise if fixed_point else cart_items.decimal
+                    trace.record_discount(
+                        brand_discount, brand_result, f"{brand} Brand Discount", totals.brand_total(brand)
+                    )
         
         # Apply bank discount if payment info provided
-        if payment_info:
-            bank_discount = BankDiscount(payment_info.bank_name, 10.0)  # Example: 10% discount
-            bank_result = await bank_discount.calculate_discount(cart_items, customer)
+        bank_offer = self._bank_offer(payment_info) if payment_info else None
+        if bank_offer is not None:
+            bank_label, bank_discount = bank_offer
+            if fixed_point:
+                bank_evaluation = bank_discount.calculate_discount_paise(cart_items, customer)
+            else:
+                bank_evaluation = bank_discount.calculate_discount(cart_items, customer)
+            if self.metrics is not None:
+                bank_evaluation = self.metrics.observe_evaluation(bank_discount, bank_evaluation)
+            bank_result = await bank_evaluation
             if bank_result > 0:
-                applied_discounts[f"{payment_info.bank_name} Bank Offer"] = bank_result
+                applied_discounts[bank_label] = bank_result
+            if trace is not None:
+                trace.record_discount(bank_discount, bank_result, bank_label, original_price)
         
         # Apply voucher discount if voucher code provided and valid
         if voucher_code:
-            is_valid = await self.validate_discount_code(voucher_code, cart_items, customer)
-            if is_valid:
-                discount_config = self.discount_codes.get(voucher_code, {})
-                discount_percentage = float(discount_config.get("discount_percentage", Decimal("15")))
-                max_discount_amount = float(discount_config.get("max_discount", Decimal("100")))
-                voucher_discount = self.discount_factory.create_discount(
-                    "voucher",
-                    code=voucher_code,
-                    discount_percentage=discount_percentage,
-                    max_discount_amount=max_discount_amount
+            # One set of rules for validating and pricing the voucher
+            discount_codes = self.discount_codes
+            failure_reason = self._validate_voucher(voucher_code, cart_items, customer, discount_codes)
+            if failure_reason is None:
+                voucher_discount = self._create_voucher_discount(voucher_code, discount_codes)
+                voucher_result = await self._calculate_discount(
+                    voucher_discount, cart_items, customer, payment_info, voucher_code=voucher_code
+                )
+                if voucher_result is not None and voucher_result > 0:
+                    applied_discounts[f"Voucher {voucher_code}"] = voucher_result
+                if trace is not None:
+                    trace.record_discount(voucher_discount, voucher_result, f"Voucher {voucher_code}", original_price)
+            elif trace is not None:
+                trace.record(f"Voucher {voucher_code}", REJECTED, reason=failure_reason)
+        
+        return self._build_result(original_price, applied_discounts, "Discounts applied successfully", trace)
+
+    async def calculate_cart_discounts_batch(
+        self,
+        requests: List[CartPricingRequest]
+    ) -> List[DiscountedPrice]:
+        """
+        Price many carts in one call.
+        
+        Produces exactly the same results as calling calculate_cart_discounts
+        for each request, but builds each brand, bank and voucher discount once
+        per batch and reuses voucher validation results between carts with
+        identical validation inputs.
+        
+        Args:
+            requests: Carts to price
+            
+        Returns:
+            List of DiscountedPrice, in the same order as requests
+        """
+        brand_discounts: Dict[str, BrandDiscount] = {}
+        bank_offers: Dict[tuple, Optional[Tuple[str, BankDiscount]]] = {}
+        voucher_discounts: Dict[str, VoucherDiscount] = {}
+        voucher_validity: Dict[tuple, bool] = {}
+        # The whole batch is priced against one set of discount code rules
+        discount_codes = self.discount_codes
+        fixed_point = self.money_mode is MoneyMode.FIXED_POINT
+        metrics = self.metrics
+        started = time.perf_counter() if metrics is not None else None
+        results = []
+        
+        for request in requests:
+            payment_info = request.payment_info
+            voucher_code = request.voucher_code
+            
+            snapshot = CartSnapshot.of(request.cart_items, self.money_mode)
+            if metrics is not None:
+                metrics.observe_cart("calculate_cart_discounts_batch", snapshot)
+            totals = snapshot.paise if fixed_point else snapshot.decimal
+            original_price = totals.total
+            applied_discounts = {}
+            
+            for brand in snapshot.brands:
+                if brand in self.PREMIUM_BRANDS:
+                    brand_discount = brand_discounts.get(brand)
+                    if brand_discount is None:
+                        brand_discount = self._create_premium_brand_discount(brand)
+                        brand_discounts[brand] = brand_discount
+                    brand_total = totals.brand_total(brand)
+                    if fixed_point:
+                        brand_result = brand_discount.discount_for_total_paise(brand_total)
+                    else:
+                        brand_result = brand_discount.discount_for_total(brand_total)
+                    if brand_result > 0:
+                        applied_discounts[f"{brand} Brand Discount"] = brand_result
+            
+            if payment_info:
+                bank_key = (payment_info.bank_name, payment_info.card_bin, payment_info.card_type)
+                if bank_key in bank_offers:
+                    bank_offer = bank_offers[bank_key]
+                else:
+                    bank_offer = bank_offers[bank_key] = self._bank_offer(payment_info)
+                if bank_offer is not None:
+                    bank_label, bank_discount = bank_offer
+                    if fixed_point:
+                        bank_result = bank_discount.discount_for_total_paise(original_price)
+                    else:
+                        bank_result = bank_discount.discount_for_total(original_price)
+                    if bank_result > 0:
+                        applied_discounts[bank_label] = bank_result
+            
+            if voucher_code:
+                # Validation only looks at the customer tier, the cart's brand and
+                # category sets and its totals, so carts sharing those share the result
+                validity_key = (
+                    voucher_code,
+                    request.customer.tier,
+                    snapshot.brands,
+                    snapshot.categories,
+                    totals.total,
+                    totals.listed_total
                 )
-                if await voucher_discount.is_applicable(cart_items, customer, payment_info, voucher_code=voucher_code):
-                    voucher_result = await voucher_discount.calculate_discount(cart_items, customer, payment_info, voucher_code=voucher_code)
+                is_valid = voucher_validity.get(validity_key)
+                if is_valid is None:
+                    is_valid = self._validate_voucher(voucher_code, snapshot, request.customer, discount_codes) is None
+                    voucher_validity[validity_key] = is_valid
+                if is_valid:
+                    voucher_discount = voucher_discounts.get(voucher_code)
+                    if voucher_discount is None:
+                        voucher_discount = self._create_voucher_discount(voucher_code, discount_codes)
+                        voucher_discounts[voucher_code] = voucher_discount
+                    if fixed_point:
+                        voucher_result = voucher_discount.discount_for_total_paise(original_price)
+                    else:
+                        voucher_result = voucher_discount.discount_for_total(original_price)
                     if voucher_result > 0:
                         applied_discounts[f"Voucher {voucher_code}"] = voucher_result
+            
+            results.append(
+                self._build_result(original_price, applied_discounts, "Discounts applied successfully")
+            )
+        
+        if metrics is not None:
+            metrics.observe_latency("calculate_cart_discounts_batch", time.perf_counter() - started)
+        return results
+
+    def pricing_session(
+        self,
+        customer: CustomerProfile,
+        cart: Optional[Cart] = None,
+        payment_info: Optional[PaymentInfo] = None,
+        voucher_code: Optional[str] = None
+    ) -> CartPricingSession:
+        """
+        Start an incremental pricing session for a cart (empty by default).
+        
+        The session's price() equals calculate_cart_discounts for the cart,
+        but after a line is added, removed or changed it only recomputes the
+        discounts that line affects. See CartPricingSession.
+        """
+        return CartPricingSession(self, customer, cart, payment_info, voucher_code)
+
+    async def stream_cart_discounts(
+        self,
+        requests: Union[AsyncIterable[CartPricingRequest], Iterable[CartPricingRequest]],
+        concurrency: int = 8,
+        return_exceptions: bool = False
+    ) -> AsyncIterator[Union[DiscountedPrice, Exception]]:
+        """
+        Price a stream of carts, yielding results in input order.
+        
+        At most concurrency carts are priced at once, and the next request is
+        only pulled from requests when a slot frees up and the consumer has
+        taken the oldest result. Memory therefore stays bounded by
+        concurrency however long the stream is, and a slow consumer slows the
+        source down instead of piling up results. If pricing a cart raises,
+        the carts still in flight are cancelled and the error propagates,
+        unless return_exceptions is set.
+        
+        Args:
+            requests: Carts to price, as an async or plain iterable
+            concurrency: Maximum number of carts priced at once
+            return_exceptions: Yield the exception raised pricing a cart in
+                place of its result and carry on, as asyncio.gather does
+            
+        Yields:
+            DiscountedPrice for each request, as calculate_cart_discounts returns it
+        """
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1")
+        if isinstance(requests, AsyncIterable):
+            source = requests.__aiter__()
+        else:
+            source = _aiter_sync(requests)
+        
+        in_flight = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(in_flight) < concurrency:
+                    try:
+                        request = await source.__anext__()
+                    except StopAsyncIteration:
+                        exhausted = True
+                        break
+                    in_flight.append(asyncio.ensure_future(self.calculate_cart_discounts(
+                        request.cart_items, request.customer, request.payment_info, request.voucher_code
+                    )))
+                if not in_flight:
+                    return
+                task = in_flight.popleft()
+                if return_exceptions:
+                    try:
+                        result = await task
+                    except Exception as error:
+                        result = error
+                    yield result
+                else:
+                    yield await task
+        finally:
+            for task in in_flight:
+                if task.done() and not task.cancelled():
+                    task.exception()  # Retrieved, so asyncio does not log it as lost
+                else:
+                    task.cancel()
+
+    async def rank_vouchers(
+        self,
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo] = None,
+        top_k: int = 5
+    ) -> List[Tuple[str, Decimal]]:
+        """
+        Rank the discount codes a customer could use on a cart by savings.
+        
+        Only codes that validate_discount_code accepts are ranked, and each
+        code's savings is the voucher amount calculate_cart_discounts would
+        apply. An inverted index skips codes whose tier, brand, category or
+        minimum cart value rules rule them out, and codes are visited in
+        descending order of max_discount so the scan stops once no remaining
+        code can beat the current top_k.
+        
+        Args:
+            cart_items: List of items in the cart
+            customer: Customer profile
+            payment_info: Optional payment information (voucher savings do
+                not depend on it)
+            top_k: Maximum number of codes to return
+            
+        Returns:
+            List of (code, savings) tuples, highest savings first; ties keep
+            the higher max_discount, then the order codes were defined in
+        """
+        if top_k <= 0:
+            return []
         
-        # Calculate final price
+        fixed_point = self.money_mode is MoneyMode.FIXED_POINT
+        snapshot = CartSnapshot.of(cart_items, self.money_mode)
+        original_price = snapshot.paise.total if fixed_point else snapshot.total
+        discount_codes = self.discount_codes
+        
+        # Min-heap of the best top_k entries as (savings, -visit order, code)
+        ranked = []
+        candidates = self._get_voucher_index(discount_codes).candidates(snapshot, customer.tier)
+        for order, (code, max_discount) in enumerate(candidates):
+            if len(ranked) == top_k and ranked[0][0] >= max_discount:
+                break
+            if self._validate_voucher(code, snapshot, customer, discount_codes) is not None:
+                continue
+            
+            voucher_discount = self._create_voucher_discount(code, discount_codes)
+            if fixed_point:
+                savings = from_paise(voucher_discount.discount_for_total_paise(original_price))
+            else:
+                savings = voucher_discount.discount_for_total(original_price)
+            
+            entry = (savings, -order, code)
+            if len(ranked) < top_k:
+                heapq.heappush(ranked, entry)
+            elif entry > ranked[0]:
+                heapq.heapreplace(ranked, entry)
+        
+        return [(code, savings) for savings, _, code in sorted(ranked, reverse=True)]
+
+    def check_discount_codes(
+        self,
+        cart_items: List[CartItem],
+        customer: CustomerProfile
+    ) -> EligibilityResult:
+        """
+        Check every discount code against a cart at once.
+        
+        Gives the same answer and failure reason as validate_discount_code
+        for each code, from one bit-parallel pass over all codes (see
+        VoucherEligibility). The codes are compiled once per discount_codes
+        version.
+        
+        Args:
+            cart_items: List of items in the cart
+            customer: Customer profile
+            
+        Returns:
+            EligibilityResult with the eligible codes as a bitmap and the
+            reason each other code failed
+        """
+        discount_codes = self.discount_codes
+        if self._voucher_eligibility_version != discount_codes.version:
+            self._voucher_eligibility = VoucherEligibility(discount_codes)
+            self._voucher_eligibility_version = discount_codes.version
+        return self._voucher_eligibility.evaluate(CartSnapshot.of(cart_items, self.money_mode), customer.tier)
+
+    def refresh_voucher_index(self):
+        """
+        Pick up edits made inside a code's rules dict, e.g.
+        discount_codes["SUPER69"]["max_discount"] = ..., by rebuilding the
+        voucher index and invalidating cached results.
+        """
+        self.discount_codes.touch()
+
+    def _get_voucher_index(self, discount_codes: DiscountCodes) -> VoucherIndex:
+        """Voucher index for discount_codes, rebuilt when they change"""
+        if self._voucher_index_version != discount_codes.version:
+            self._voucher_index = VoucherIndex(discount_codes)
+            self._voucher_index_version = discount_codes.version
+        return self._voucher_index
+
+    async def _calculate_discount(self, discount: BaseDiscount, cart_items, customer, payment_info, **kwargs):
+        """Discount amount in the service's money mode, or None when the discount does not apply"""
+        evaluation = self._calculate_applicable_discount(discount, cart_items, customer, payment_info, **kwargs)
+        if self.metrics is not None:
+            return await self.metrics.observe_evaluation(discount, evaluation)
+        return await evaluation
+
+    async def _calculate_applicable_discount(self, discount: BaseDiscount, cart_items, customer, payment_info, **kwargs):
+        if not await discount.is_applicable(cart_items, customer, payment_info, **kwargs):
+            return None
+        if self.money_mode is MoneyMode.FIXED_POINT:
+            return await discount.calculate_discount_paise(cart_items, customer, payment_info, applicable=True, **kwargs)
+        return await discount.calculate_discount(cart_items, customer, payment_info, applicable=True, **kwargs)
+
+    def _build_result(
+        self,
+        original_price,
+        applied_discounts: Dict,
+        message: str,
+        trace: Optional[PricingTrace] = None
+    ) -> DiscountedPrice:
+        """Total the applied discounts into a DiscountedPrice, never going below zero"""
         total_discount = sum(applied_discounts.values())
+        if self.money_mode is MoneyMode.FIXED_POINT:
+            final_price = max(original_price - total_discount, 0)
+            if trace is not None:
+                trace.finish(original_price, total_discount, final_price)
+            return DiscountedPrice.from_paise(original_price, final_price, applied_discounts, message)
+        
         final_price = max(original_price - total_discount, Decimal('0'))
+        if trace is not None:
+            trace.finish(original_price, total_discount, final_price)
         
         return DiscountedPrice(
             original_price=original_price,
             final_price=final_price,
             applied_discounts=applied_discounts,
-            message="Discounts applied successfully"
+            message=message
+        )
+
+    def _create_premium_brand_discount(self, brand: str) -> BrandDiscount:
+        """Create the automatic discount applied to premium brands"""
+        return self.discount_factory.create_discount(
+            "brand",
+            brand=brand,
+            discount_percentage=self.PREMIUM_BRAND_DISCOUNT_PERCENTAGE,
+            max_discount=self.PREMIUM_BRAND_MAX_DISCOUNT
+        )
+
+    def _create_bank_discount(self, bank_name: str) -> BankDiscount:
+        """Create the bank offer applied when payment info is provided"""
+        return self.discount_factory.create_discount(
+            "bank",
+            bank_name=bank_name,
+            discount_percentage=self.BANK_OFFER_PERCENTAGE
+        )
+
+    def _bank_offer(self, payment_info: PaymentInfo) -> Optional[Tuple[str, BankDiscount]]:
+        """
+        The bank offer for a payment as (applied discount name, discount).
+        
+        With a bin_index and a card_bin, the card's best BIN-keyed offer
+        for its card type, or None when it has none; otherwise the flat
+        offer for payment_info.bank_name.
+        """
+        if self.bin_index is not None and payment_info.card_bin:
+            offer = self.bin_index.best_offer(payment_info.card_bin, payment_info.card_type)
+            if offer is None:
+                return None
+            bank_discount = self.discount_factory.create_discount(
+                "bank", bank_name=offer.bank_name, discount_percentage=offer.discount_percentage
+            )
+            return f"{offer.bank_name} Bank Offer", bank_discount
+        return f"{payment_info.bank_name} Bank Offer", self._create_bank_discount(payment_info.bank_name)
+
+    def _create_voucher_discount(
+        self,
+        voucher_code: str,
+        discount_codes: Optional[Mapping[str, Mapping]] = None
+    ) -> VoucherDiscount:
+        """Create a voucher discount from the configured discount codes"""
+        if discount_codes is None:
+            discount_codes = self.discount_codes
+        discount_config = discount_codes.get(voucher_code, {})
+        discount_percentage = float(discount_config.get("discount_percentage", Decimal("15")))
+        max_discount_amount = float(discount_config.get("max_discount", Decimal("100")))
+        return self.discount_factory.create_discount(
+            "voucher",
+            code=voucher_code,
+            discount_percentage=discount_percentage,
+            max_discount_amount=max_discount_amount
         )
 
     async def apply_advanced_discounts(
@@ -152,7 +673,9 @@ class DiscountService:
         cart_items: List[CartItem],
         customer: CustomerProfile,
         payment_info: Optional[PaymentInfo] = None,
-        discount_configs: Optional[List[Dict]] = None
+        discount_configs: Optional[List[Dict]] = None,
+        stacking_solver: Optional[StackingSolver] = None,
+        explain: bool = False
     ) -> DiscountedPrice:
         """
         Apply multiple discount types using the factory pattern.
@@ -162,36 +685,76 @@ class DiscountService:
             customer: Customer profile
             payment_info: Optional payment information
             discount_configs: List of discount configurations to apply
+            stacking_solver: Optional solver choosing the best combination of
+                the configured discounts under exclusivity groups and caps
+                (and the active campaigns, when the service has a
+                campaign_scheduler)
+            explain: Attach a PricingTrace of every rule evaluated to the
+                result's trace attribute, as a sampled call would
             
         Returns:
             DiscountedPrice with all applicable discounts applied
         """
-        original_price = sum(item.product.current_price * item.quantity for item in cart_items)
+        metrics = self.metrics
+        trace = None
+        if explain or self.tracer is not None:
+            trace = self._start_trace("apply_advanced_discounts", explain)
+        if metrics is None and trace is None:
+            return await self._apply_advanced_discounts(
+                cart_items, customer, payment_info, discount_configs, stacking_solver
+            )
+        
+        started = time.perf_counter()
+        result = await self._apply_advanced_discounts(
+            cart_items, customer, payment_info, discount_configs, stacking_solver, trace
+        )
+        if trace is not None:
+            self._finish_trace(trace, result, explain)
+        if metrics is None:
+            return result
+        metrics.observe_request("apply_advanced_discounts", cart_items, time.perf_counter() - started)
+        return result
+
+    async def _apply_advanced_discounts(
+        self,
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        payment_info: Optional[PaymentInfo],
+        discount_configs: Optional[List[Dict]],
+        stacking_solver: Optional[StackingSolver],
+        trace: Optional[PricingTrace] = None
+    ) -> DiscountedPrice:
+        cart_items = CartSnapshot.of(cart_items, self.money_mode)
+        if self.money_mode is MoneyMode.FIXED_POINT:
+            original_price = cart_items.paise.total
+        else:
+            original_price = cart_items.total
         applied_discounts = {}
         
-        if discount_configs:
-            # Create discount instances from configurations
-            discounts = []
-            for config in discount_configs:
-                discount_type = config.pop("type")
-                discount = self.discount_factory.create_discount(discount_type, **config)
-                discounts.append(discount)
-            
+        # Create discount instances from configurations
+        discounts = []
+        for config in discount_configs or ():
+            # Leave the caller's config intact so it can be reused
+            params = {name: value for name, value in config.items() if name != "type"}
+            if config["type"] == "loyalty" and self.loyalty_ledger is not None:
+                params.setdefault("ledger", self.loyalty_ledger)
+            discount = self.discount_factory.create_discount(config["type"], **params)
+            discounts.append(discount)
+        
+        # Seasonal campaigns running today, without scanning the inactive ones
+        if self.campaign_scheduler is not None:
+            discounts.extend(self.campaign_scheduler.active())
+        
+        if discounts:
             # Apply all configured discounts
             discount_results = await self.discount_factory.apply_multiple_discounts(
-                discounts, cart_items, customer, payment_info
+                discounts, cart_items, customer, payment_info,
+                money_mode=self.money_mode, stacking_solver=stacking_solver, trace=trace
             )
             applied_discounts.update(discount_results)
         
-        # Calculate final price
-        total_discount = sum(applied_discounts.values())
-        final_price = max(original_price - total_discount, Decimal('0'))
-        
-        return DiscountedPrice(
-            original_price=original_price,
-            final_price=final_price,
-            applied_discounts=applied_discounts,
-            message="Advanced discounts applied successfully"
+        return self._build_result(
+            original_price, applied_discounts, "Advanced discounts applied successfully", trace
         )
 
     async def validate_discount_code(
@@ -211,39 +774,121 @@ class DiscountService:
         Returns:
             bool: True if the discount code is valid and can be applied, False otherwise
         """
+        return self._validate_voucher(code, cart_items, customer) is None
+
+    def explain_discount_code(
+        self,
+        code: str,
+        cart_items: List[CartItem],
+        customer: CustomerProfile
+    ) -> Optional[str]:
+        """
+        Why validate_discount_code rejects code for this cart and customer.
+        
+        Returns:
+            None if the code is valid, otherwise one of unknown_code,
+            validation_service, tier_requirement, excluded_brand,
+            category_restriction or min_cart_value
+        """
+        return self._voucher_failure_reason(code, cart_items, customer)
+
+    def reserve_discount_code(self, code: str, customer: CustomerProfile) -> Reservation:
+        """
+        Hold one redemption of code for customer at checkout.
+        
+        Enforces the code's max_redemptions and max_redemptions_per_customer
+        rules through redemption_limiter. Commit the reservation with
+        commit_redemption once the order is placed, or give it back with
+        release_redemption. Whether the code applies to the cart is checked
+        by validate_discount_code as before; redemption counts change
+        without a config_version change, so they are not part of pricing.
+        
+        Raises:
+            ValueError: If the code is unknown or no limiter is configured
+            RedemptionLimitReached: If the code has no redemptions left in
+                total or for this customer
+        """
+        if self.redemption_limiter is None:
+            raise ValueError("No redemption limiter configured")
+        rules = self.discount_codes.get(code)
+        if rules is None:
+            raise ValueError(f"Unknown discount code {code}")
+        return self.redemption_limiter.reserve(
+            code, customer.id, rules.get("max_redemptions"), rules.get("max_redemptions_per_customer")
+        )
+
+    def commit_redemption(self, reservation: Reservation):
+        """Count a reserved redemption once its order is placed"""
+        self.redemption_limiter.commit(reservation)
+
+    def release_redemption(self, reservation: Reservation):
+        """Give back a reserved redemption whose order failed"""
+        self.redemption_limiter.release(reservation)
+
+    def _validate_voucher(
+        self,
+        code: str,
+        cart_items,
+        customer: CustomerProfile,
+        discount_codes: Optional[Mapping[str, Mapping]] = None
+    ) -> Optional[str]:
+        """_voucher_failure_reason, counted by metrics when they are enabled"""
+        if discount_codes is None:
+            discount_codes = self.discount_codes
+        failure_reason = self._voucher_failure_reason(code, cart_items, customer, discount_codes)
+        if self.metrics is not None:
+            self.metrics.observe_validation(code, code in discount_codes, failure_reason)
+        return failure_reason
+
+    def _voucher_failure_reason(
+        self,
+        code: str,
+        cart_items: List[CartItem],
+        customer: CustomerProfile,
+        discount_codes: Optional[Mapping[str, Mapping]] = None
+    ) -> Optional[str]:
+        """
+        Why validate_discount_code rejects code, or None if it is valid.
+        
+        Reasons: unknown_code, validation_service, tier_requirement,
+        excluded_brand, category_restriction, min_cart_value.
+        """
+        if discount_codes is None:
+            discount_codes = self.discount_codes
+        
         # Check if code exists in our system
-        if code not in self.discount_codes:
-            return False
+        discount_config = discount_codes.get(code)
+        if discount_config is None:
+            return "unknown_code"
         
-        discount_config = self.discount_codes[code]
+        cart_items = CartSnapshot.of(cart_items, self.money_mode)
         
-        # Use ValidationService for basic validation
-        if not self.validation_service.validate_discount_code(code, cart_items, customer):
-            return False
+        # Use ValidationService for basic validation, against the same rules
+        if not self.validation_service.validate_discount_code(code, cart_items, customer, discount_codes):
+            return "validation_service"
                 
         # Additional validation checks
         
         # 1. Check customer tier requirement
         if discount_config["tier_requirement"]:
             if not self._check_customer_tier(customer, discount_config["tier_requirement"]):
-                return False
+                return "tier_requirement"
         
         # 2. Check brand exclusions
         if discount_config["excluded_brands"]:
             if self._check_excluded_brands(cart_items, discount_config["excluded_brands"]):
-                return False
+                return "excluded_brand"
         
         # 3. Check category restrictions (if specified, cart must contain allowed categories)
         if discount_config["allowed_categories"]:
             if not self._check_allowed_categories(cart_items, discount_config["allowed_categories"]):
-                return False
+                return "category_restriction"
         
         # 4. Check minimum cart value
-        cart_value = sum(item.product.current_price * item.quantity for item in cart_items)
-        if cart_value < discount_config["min_cart_value"]:
-            return False
+        if not cart_items.meets_minimum(discount_config["min_cart_value"]):
+            return "min_cart_value"
         
-        return True
+        return None
     
     def _check_customer_tier(self, customer: CustomerProfile, required_tier: str) -> bool:
         """Check if customer meets the tier requirement"""
@@ -263,10 +908,8 @@ class DiscountService:
     
     def _check_excluded_brands(self, cart_items: List[CartItem], excluded_brands: List[str]) -> bool:
         """Check if cart contains any excluded brands"""
-        cart_brands = {item.product.brand for item in cart_items}
-        return bool(cart_brands.intersection(excluded_brands))
+        return not CartSnapshot.of(cart_items).brands.isdisjoint(excluded_brands)
     
     def _check_allowed_categories(self, cart_items: List[CartItem], allowed_categories: List[str]) -> bool:
         """Check if cart contains at least one item from allowed categories"""
-        cart_categories = {item.product.category for item in cart_items}
-        return bool(cart_categories.intersection(allowed_categories))
\ No newline at end of file
+        return not CartSnapshot.of(cart_items).categories.isdisjoint(allowed_categories)
\ No newline at end of file
@@ -0,0 +1,337 @@
+"""
+Loyalty points ledger: an append-only log of earn and burn events.
+
+The ledger lives in a directory holding these files:
+
+    ledger.log              one event per line, "<sequence>\\t<earn|burn>\\t<customer id>\\t<points>"
+    ledger.log.compacting   the previous log, while a compaction snapshots it
+    snapshot.json           {"sequence": n, "balances": {customer id: points}} after event n
+
+Every event is appended to the log before its balance changes in memory,
+so balance lookups are a dictionary read. Every snapshot_every events the
+ledger compacts in the background: the appending thread renames the log
+to ledger.log.compacting, starts a new log and copies the balances dict
+(a pause proportional to the number of customers), then a background
+thread writes the copy to a new snapshot (a temporary file renamed into
+place) and deletes the compacting log. Startup loads the snapshot and
+replays the compacting log, if a crash left one, then the log, so replay
+time is bounded by snapshot_every rather than the ledger's history.
+Events the snapshot already covers are skipped by their sequence number,
+and a torn last line from a crash mid-append is dropped.
+
+Points reserved for an order in progress are held in memory only: they
+are not spendable elsewhere until committed (burned) or released.
+"""
+
+import itertools
+import json
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Dict, Optional
+
+LOG_NAME = "ledger.log"
+COMPACTING_NAME = "ledger.log.compacting"
+SNAPSHOT_NAME = "snapshot.json"
+EARN = "earn"
+BURN = "burn"
+_ZERO = Decimal("0")
+
+logger = logging.getLogger(__name__)
+
+
+class InsufficientPoints(Exception):
+    """A burn or reservation asks for more points than the customer has available"""
+
+    def __init__(self, customer_id: str, requested: Decimal, available: Decimal):
+        super().__init__(f"Customer {customer_id}: {requested} points requested, {available} available")
+        self.customer_id = customer_id
+        self.requested = requested
+        self.available = available
+
+
+@dataclass(frozen=True)
+class PointsReservation:
+    """Points held for one order, to be committed or released exactly once"""
+    reservation_id: int
+    customer_id: str
+    points: Decimal
+
+
+def _check_customer_id(customer_id: str):
+    if not isinstance(customer_id, str) or not customer_id or "\t" in customer_id or "\n" in customer_id:
+        raise ValueError(f"Customer ids must be non-empty without tabs or newlines, got {customer_id!r}")
+
+
+def _points(value) -> Decimal:
+    if isinstance(value, bool) or not isinstance(value, (int, str, Decimal)):
+        raise ValueError(f"Points must be an int, str or Decimal, got {value!r}")
+    try:
+        points = value if isinstance(value, Decimal) else Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Points must be a number, got {value!r}") from None
+    if not points.is_finite() or points <= 0:
+        raise ValueError(f"Points must be positive, got {value!r}")
+    return points
+
+
+class LoyaltyLedger:
+    """
+    Loyalty point balances backed by an append-only event log.
+
+    balance() and available() are O(1) lookups in memory. earn(), burn()
+    and commit() append one line to the log (and fsync it with fsync=True)
+    before updating the balance. Methods are thread-safe.
+
+    Args:
+        directory: Directory for the log and snapshot, created if missing
+        snapshot_every: Events between background compactions; None to only
+            compact on snapshot()
+        fsync: fsync the log after every event, so an acknowledged event
+            survives a power loss and not just a process crash
+    """
+
+    def __init__(self, directory: str, snapshot_every: Optional[int] = 100_000, fsync: bool = False):
+        if snapshot_every is not None and snapshot_every < 1:
+            raise ValueError("snapshot_every must be at least 1")
+        self.directory = directory
+        self.snapshot_every = snapshot_every
+        self.fsync = fsync
+        self.sequence = 0  # Sequence number of the last event
+        self.replayed = 0  # Log events applied on startup
+        self._balances: Dict[str, Decimal] = {}
+        self._held: Dict[str, Decimal] = {}
+        self._reservations: Dict[int, PointsReservation] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+        # Held from rotating the log until its snapshot is written, so one
+        # compaction runs at a time; taken before _lock, never after
+        self._compaction_lock = threading.Lock()
+        self._since_snapshot = 0
+        os.makedirs(directory, exist_ok=True)
+        self._log_path = os.path.join(directory, LOG_NAME)
+        self._compacting_path = os.path.join(directory, COMPACTING_NAME)
+        self._snapshot_path = os.path.join(directory, SNAPSHOT_NAME)
+        self._load()
+        self._log = open(self._log_path, "a", encoding="utf-8")
+        if os.path.exists(self._compacting_path):
+            self._snapshot()  # Finish the compaction a crash interrupted
+
+    # Reading
+
+    def balance(self, customer_id: str) -> Decimal:
+        """Points earned minus points burned"""
+        return self._balances.get(customer_id, _ZERO)
+
+    def available(self, customer_id: str) -> Decimal:
+        """Balance less the points held by outstanding reservations"""
+        balance = self._balances.get(customer_id, _ZERO)
+        held = self._held.get(customer_id)
+        return balance - held if held else balance
+
+    def __len__(self) -> int:
+        """Customers with a non-zero balance"""
+        return len(self._balances)
+
+    # Events
+
+    def earn(self, customer_id: str, points) -> Decimal:
+        """Add points; returns the new balance"""
+        _check_customer_id(customer_id)
+        points = _points(points)
+        with self._lock:
+            return self._append(EARN, customer_id, points)
+
+    def burn(self, customer_id: str, points) -> Decimal:
+        """
+        Spend available points; returns the new balance.
+
+        Raises:
+            InsufficientPoints: If the customer has fewer points available
+        """
+        _check_customer_id(customer_id)
+        points = _points(points)
+        with self._lock:
+            available = self.available(customer_id)
+            if points > available:
+                raise InsufficientPoints(customer_id, points, available)
+            return self._append(BURN, customer_id, points)
+
+    def reserve(self, customer_id: str, points) -> PointsReservation:
+        """
+        Hold points for an order without burning them yet.
+
+        Raises:
+            InsufficientPoints: If the customer has fewer points available
+        """
+        _check_customer_id(customer_id)
+        points = _points(points)
+        with self._lock:
+            available = self.available(customer_id)
+            if points > available:
+                raise InsufficientPoints(customer_id, points, available)
+            self._held[customer_id] = self._held.get(customer_id, _ZERO) + points
+            reservation = PointsReservation(next(self._ids), customer_id, points)
+            self._reservations[reservation.reservation_id] = reservation
+        return reservation
+
+    def commit(self, reservation: PointsReservation) -> Decimal:
+        """Burn a reservation's points; returns the new balance"""
+        with self._lock:
+            self._check_outstanding(reservation)
+            # Keep the points held until the burn is logged, so a failed
+            # append leaves the reservation intact
+            balance = self._append(BURN, reservation.customer_id, reservation.points)
+            self._unhold(reservation)
+            return balance
+
+    def release(self, reservation: PointsReservation):
+        """Give a reservation's points back"""
+        with self._lock:
+            self._unhold(reservation)
+
+    # Storage
+
+    def snapshot(self):
+        """Compact now: wait for any background compaction, write the balances to the snapshot and empty the log"""
+        with self._compaction_lock, self._lock:
+            self._snapshot()
+
+    def close(self):
+        """Wait for any background compaction and close the log; the ledger replays it on the next start"""
+        with self._compaction_lock, self._lock:
+            self._log.close()
+
+    def _check_outstanding(self, reservation: PointsReservation):
+        if reservation.reservation_id not in self._reservations:
+            raise ValueError(f"Reservation {reservation.reservation_id} is not outstanding")
+
+    def _unhold(self, reservation: PointsReservation):
+        self._check_outstanding(reservation)
+        del self._reservations[reservation.reservation_id]
+        held = self._held[reservation.customer_id] - reservation.points
+        if held:
+            self._held[reservation.customer_id] = held
+        else:
+            del self._held[reservation.customer_id]
+
+    def _append(self, kind: str, customer_id: str, points: Decimal) -> Decimal:
+        """Log one event, then apply it; call with _lock held"""
+        sequence = self.sequence + 1
+        self._log.write(f"{sequence}\t{kind}\t{customer_id}\t{points}\n")
+        self._log.flush()
+        if self.fsync:
+            os.fsync(self._log.fileno())
+        self.sequence = sequence
+        balance = self._apply(kind, customer_id, points)
+        self._since_snapshot += 1
+        if (self.snapshot_every is not None and self._since_snapshot >= self.snapshot_every
+                and self._compaction_lock.acquire(blocking=False)):
+            # Otherwise a compaction is still running; retry on the next event
+            self._start_compaction()
+        return balance
+
+    def _start_compaction(self):
+        """Rotate the log and snapshot the balances in the background; call with _lock and _compaction_lock held"""
+        try:
+            if os.path.exists(self._compacting_path):
+                # A failed background compaction left its log behind;
+                # leave it for snapshot() or the next start to fold in
+                self._compaction_lock.release()
+                self._since_snapshot = 0
+                return
+            self._log.close()
+            os.replace(self._log_path, self._compacting_path)
+            self._log = open(self._log_path, "w", encoding="utf-8")
+            self._since_snapshot = 0
+            thread = threading.Thread(
+                target=self._compact, args=(self.sequence, dict(self._balances)),
+                name="loyalty-ledger-compaction"
+            )
+            thread.start()
+        except BaseException:
+            self._compaction_lock.release()
+            raise
+
+    def _compact(self, sequence: int, balances: Dict[str, Decimal]):
+        """Background half of a compaction; releases _compaction_lock when done"""
+        try:
+            self._write_snapshot(sequence, balances)
+            os.unlink(self._compacting_path)
+        except Exception:
+            logger.exception("Loyalty ledger compaction failed; %s is kept for replay", self._compacting_path)
+        finally:
+            self._compaction_lock.release()
+
+    def _apply(self, kind: str, customer_id: str, points: Decimal) -> Decimal:
+        balance = self._balances.get(customer_id, _ZERO)
+        balance = balance + points if kind == EARN else balance - points
+        if balance:
+            self._balances[customer_id] = balance
+        else:
+            self._balances.pop(customer_id, None)
+        return balance
+
+    def _snapshot(self):
+        """Compact in the calling thread; call with _lock held and no compaction running"""
+        self._write_snapshot(self.sequence, self._balances)
+        # Events up to self.sequence are now in the snapshot; if we crash
+        # before the logs are emptied, replay skips them by sequence number
+        if os.path.exists(self._compacting_path):
+            os.unlink(self._compacting_path)
+        self._log.close()
+        self._log = open(self._log_path, "w", encoding="utf-8")
+        self._since_snapshot = 0
+
+    def _write_snapshot(self, sequence: int, balances: Dict[str, Decimal]):
+        temporary_path = self._snapshot_path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as snapshot_file:
+            json.dump({
+                "sequence": sequence,
+                "balances": {customer_id: str(points) for customer_id, points in balances.items()}
+            }, snapshot_file)
+            snapshot_file.flush()
+            os.fsync(snapshot_file.fileno())
+        os.replace(temporary_path, self._snapshot_path)
+
+    def _load(self):
+        if os.path.exists(self._snapshot_path):
+            with open(self._snapshot_path, encoding="utf-8") as snapshot_file:
+                snapshot = json.load(snapshot_file)
+            self.sequence = snapshot["sequence"]
+            self._balances = {customer_id: Decimal(points) for customer_id, points in snapshot["balances"].items()}
+        for path in (self._compacting_path, self._log_path):
+            if os.path.exists(path):
+                self._replay(path)
+        self._since_snapshot = self.replayed
+
+    def _replay(self, path: str):
+        with open(path, "rb") as log_file:
+            content = log_file.read()
+        valid_length = 0
+        for line in content.splitlines(keepends=True):
+            try:
+                if not line.endswith(b"\n"):
+                    raise ValueError("incomplete line")
+                sequence, kind, customer_id, points = line.decode("utf-8").rstrip("\n").split("\t")
+                sequence = int(sequence)
+                points = Decimal(points)
+                if kind not in (EARN, BURN):
+                    raise ValueError(f"unknown event {kind!r}")
+            except (ValueError, InvalidOperation) as error:
+                if valid_length + len(line) == len(content):
+                    break  # Torn last append: drop it below
+                raise ValueError(f"{path}: corrupt event at byte {valid_length}: {error}") from None
+            valid_length += len(line)
+            if sequence <= self.sequence:
+                continue  # Already in the snapshot
+            if sequence != self.sequence + 1:
+                raise ValueError(f"{path}: event {sequence} follows event {self.sequence}")
+            self._apply(kind, customer_id, points)
+            self.sequence = sequence
+            self.replayed += 1
+        if valid_length != len(content):
+            with open(path, "r+b") as log_file:
+                log_file.truncate(valid_length)
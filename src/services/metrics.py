@@ -0,0 +1,248 @@
+import asyncio
+import time
+from bisect import bisect_left
+from typing import Awaitable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+# Prometheus text exposition format, version 0.0.4
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds, from 5 microseconds (a cached discount) to 5 seconds (a stalled remote lookup)
+LATENCY_BUCKETS = (
+    0.000005, 0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005,
+    0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0
+)
+CART_LINE_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+CART_UNIT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100, 200, 500, 1000, 5000, 10000, 50000)
+
+
+def _escape_help(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("\n", "\\n")
+
+
+def _escape(value: str) -> str:
+    return _escape_help(value).replace('"', '\\"')
+
+
+def _format_value(value) -> str:
+    if isinstance(value, int):
+        return str(value)
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str]) -> str:
+    if not names:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)) + "}"
+
+
+class Counter:
+    """Monotonic counter per label combination"""
+
+    TYPE = "counter"
+
+    def __init__(self, name: str, help_text: str, label_names: Sequence[str] = ()):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, labels: Tuple[str, ...] = (), amount: float = 1):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[str, ...] = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def samples(self) -> Iterable[str]:
+        for labels, value in sorted(self._values.items()):
+            yield f"{self.name}{_format_labels(self.label_names, labels)} {_format_value(value)}"
+
+
+class Histogram:
+    """Bucketed distribution per label combination, with sum and count"""
+
+    TYPE = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        if list(buckets) != sorted(buckets):
+            raise ValueError("Histogram buckets must be sorted")
+        self.name = name
+        self.help_text = help_text
+        self.label_names = tuple(label_names)
+        self.buckets = tuple(buckets)
+        # labels -> [per-bucket counts (last one is +Inf), sum]
+        self._series: Dict[Tuple[str, ...], list] = {}
+
+    def observe(self, labels: Tuple[str, ...], value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [[0] * (len(self.buckets) + 1), 0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, labels: Tuple[str, ...] = ()) -> int:
+        series = self._series.get(labels)
+        return sum(series[0]) if series else 0
+
+    def total(self, labels: Tuple[str, ...] = ()) -> float:
+        series = self._series.get(labels)
+        return series[1] if series else 0
+
+    def samples(self) -> Iterable[str]:
+        bucket_names = self.label_names + ("le",)
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                yield (f"{self.name}_bucket{_format_labels(bucket_names, labels + (_format_value(bound),))} "
+                       f"{cumulative}")
+            yield f"{self.name}_sum{_format_labels(self.label_names, labels)} {_format_value(total)}"
+            yield f"{self.name}_count{_format_labels(self.label_names, labels)} {cumulative}"
+
+
+class MetricsRegistry:
+    """
+    Named counters and histograms, rendered in the Prometheus text format.
+
+    Not thread-safe: keep one registry per event loop thread, or render
+    from the same thread that records.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+
+    def counter(self, name: str, help_text: str, label_names: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, help_text, label_names))
+
+    def histogram(
+        self,
+        name: str,
+        help_text: str,
+        label_names: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        return self._register(Histogram(name, help_text, label_names, buckets))
+
+    def _register(self, metric):
+        if metric.name in self._metrics:
+            raise ValueError(f"Metric already registered: {metric.name}")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """Every metric in the Prometheus text exposition format"""
+        lines: List[str] = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {_escape_help(metric.help_text)}")
+            lines.append(f"# TYPE {metric.name} {metric.TYPE}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+
+class DiscountMetrics:
+    """
+    Pricing instrumentation for DiscountService and DiscountFactory.
+
+    Pass an instance as DiscountService(metrics=...) to record:
+      - discount_evaluation_seconds{discount_type}: time to check and
+        calculate each discount
+      - discount_evaluations_total{discount_type,outcome}: outcome is
+        applied, zero (applicable but nothing off), not_applicable or
+        timeout; applied over the total is the applicability hit rate
+      - voucher_validations_total{code,result}: result is valid or the
+        reason validate_discount_code rejected the code; codes that are not
+        configured are counted under code="unknown"
+      - pricing_request_seconds{entry_point}: latency of each entry point
+        call (a whole batch for calculate_cart_discounts_batch)
+      - pricing_cart_lines{entry_point} and pricing_cart_units{entry_point}:
+        size of each priced cart
+      - pricing_single_flight_requests_total{result}: with a SingleFlight,
+        calls that started an evaluation (evaluated) or joined an identical
+        one in flight (coalesced)
+    Without metrics the services skip all of this behind one None check.
+    """
+
+    def __init__(self, registry: Optional[MetricsRegistry] = None):
+        self.registry = registry if registry is not None else MetricsRegistry()
+        self.evaluation_seconds = self.registry.histogram(
+            "discount_evaluation_seconds", "Time to check and calculate a discount", ("discount_type",)
+        )
+        self.evaluations = self.registry.counter(
+            "discount_evaluations_total", "Discount evaluations by outcome", ("discount_type", "outcome")
+        )
+        self.voucher_validations = self.registry.counter(
+            "voucher_validations_total", "Voucher code validations by result", ("code", "result")
+        )
+        self.request_seconds = self.registry.histogram(
+            "pricing_request_seconds", "Time spent in a pricing entry point call", ("entry_point",)
+        )
+        self.cart_lines = self.registry.histogram(
+            "pricing_cart_lines", "Lines per priced cart", ("entry_point",), CART_LINE_BUCKETS
+        )
+        self.cart_units = self.registry.histogram(
+            "pricing_cart_units", "Units (sum of quantities) per priced cart", ("entry_point",), CART_UNIT_BUCKETS
+        )
+        self.single_flight_requests = self.registry.counter(
+            "pricing_single_flight_requests_total",
+            "Pricing calls that evaluated or joined an identical call in flight",
+            ("result",)
+        )
+
+    def render(self) -> str:
+        return self.registry.render()
+
+    async def observe_evaluation(self, discount, evaluation: Awaitable):
+        """
+        Await a discount evaluation, recording its latency and outcome.
+
+        evaluation resolves to the amount, or None when the discount does
+        not apply. Cancellation (e.g. a timeout) is recorded and re-raised.
+        """
+        discount_type = (type(discount).__name__,)
+        started = time.perf_counter()
+        try:
+            amount = await evaluation
+        except asyncio.CancelledError:
+            self.evaluations.inc(discount_type + ("timeout",))
+            raise
+        finally:
+            self.evaluation_seconds.observe(discount_type, time.perf_counter() - started)
+        if amount is None:
+            outcome = "not_applicable"
+        elif amount > 0:
+            outcome = "applied"
+        else:
+            outcome = "zero"
+        self.evaluations.inc(discount_type + (outcome,))
+        return amount
+
+    def observe_validation(self, code: str, known: bool, failure_reason: Optional[str]):
+        self.voucher_validations.inc((code if known else "unknown", failure_reason or "valid"))
+
+    def observe_request(self, entry_point: str, cart_items, seconds: float):
+        self.observe_latency(entry_point, seconds)
+        self.observe_cart(entry_point, cart_items)
+
+    def observe_latency(self, entry_point: str, seconds: float):
+        self.request_seconds.observe((entry_point,), seconds)
+
+    def observe_cart(self, entry_point: str, cart_items):
+        labels = (entry_point,)
+        self.cart_lines.observe(labels, len(cart_items))
+        self.cart_units.observe(labels, sum(item.quantity for item in cart_items))
+
+    def observe_single_flight(self, coalesced: bool):
+        self.single_flight_requests.inc(("coalesced" if coalesced else "evaluated",))
+
+    def hit_rate(self, discount_type: str) -> float:
+        """Share of evaluations of discount_type that applied a discount"""
+        outcomes = ("applied", "zero", "not_applicable", "timeout")
+        total = sum(self.evaluations.value((discount_type, outcome)) for outcome in outcomes)
+        return self.evaluations.value((discount_type, "applied")) / total if total else 0.0
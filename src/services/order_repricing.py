@@ -0,0 +1,394 @@
+"""
+Re-price order logs of carts stored as JSON Lines.
+
+Each input line is one order:
+
+    {"order_id": "A1",
+     "customer": {"id": "C1", "name": "...", "email": "...", "tier": "regular", "loyalty_points": 0},
+     "items": [{"product": {"id": "P1", "brand": "PUMA", "brand_tier": "premium", "category": "T-shirts",
+                            "base_price": "1000", "current_price": "600"},
+                "quantity": 2, "size": "M", "price": "1000"}],
+     "payment": {"method": "CARD", "bank_name": "ICICI", "card_type": "CREDIT"},
+     "voucher_code": "SUPER69"}
+
+payment, voucher_code, order_id and an item's price (default: the
+product's base_price) are optional. Each output line is the
+DiscountedPrice of the input line with the same position, amounts as
+strings of rupees, or an error record for a line that could not be read
+or priced:
+
+    {"order_id": "A1", "original_price": "2000", "final_price": "...",
+     "applied_discounts": {...}, "message": "..."}
+    {"order_id": null, "line": 7, "error": "..."}
+
+Run as a script:
+
+    python -m src.services.order_repricing orders.jsonl -o prices.jsonl --checkpoint prices.ckpt
+
+With --checkpoint, the input position and output size are saved every
+--checkpoint-every records (written atomically, after the output is
+flushed to disk). Running the same command again after a crash resumes
+from the last checkpoint: the output is cut back to the size it had at
+the checkpoint and pricing continues at the next input line, so the
+finished output is the same as an uninterrupted run.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, BinaryIO, Callable, Deque, Dict, List, Mapping, Optional, Tuple
+
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.discount import DiscountedPrice
+from src.models.money import MoneyMode
+from src.models.payment import PaymentInfo
+from src.models.pricing_request import CartPricingRequest
+from src.models.product import BrandTier, Product
+from src.services.discount_service import DiscountService
+
+
+_PAISA = Decimal("0.01")
+
+
+def _amount(value: Any, name: str) -> Decimal:
+    try:
+        amount = value if isinstance(value, Decimal) else Decimal(str(value))
+        if amount.is_finite():
+            amount.quantize(_PAISA)  # Raises for amounts too large to round to the paisa
+    except InvalidOperation:
+        raise ValueError(f"{name} must be a decimal amount, got {value!r}") from None
+    if not amount.is_finite() or amount < 0:
+        raise ValueError(f"{name} must be a finite, non-negative amount, got {value!r}")
+    return amount
+
+
+def _string(value: Any, name: str) -> str:
+    if not isinstance(value, str):
+        raise ValueError(f"{name} must be a string, got {value!r}")
+    return value
+
+
+def _quantity(value: Any) -> int:
+    if isinstance(value, bool) or not isinstance(value, int) or value < 1:
+        raise ValueError(f"quantity must be a positive integer, got {value!r}")
+    return value
+
+
+def cart_request_from_dict(data: Mapping[str, Any]) -> CartPricingRequest:
+    """
+    Build a CartPricingRequest from one decoded order line.
+
+    Raises:
+        ValueError: If a required field is missing or has the wrong type
+    """
+    try:
+        customer_data = data["customer"]
+        customer = CustomerProfile(
+            id=_string(customer_data["id"], "customer id"),
+            name=customer_data.get("name", ""),
+            email=customer_data.get("email", ""),
+            tier=_string(customer_data["tier"], "tier"),
+            loyalty_points=_amount(customer_data.get("loyalty_points", 0), "loyalty_points")
+        )
+        cart_items = []
+        for item in data["items"]:
+            product_data = item["product"]
+            product = Product(
+                id=_string(product_data["id"], "product id"),
+                brand=_string(product_data["brand"], "brand"),
+                brand_tier=BrandTier(product_data.get("brand_tier", "regular")),
+                category=_string(product_data["category"], "category"),
+                base_price=_amount(product_data["base_price"], "base_price"),
+                current_price=_amount(
+                    product_data.get("current_price", product_data["base_price"]), "current_price"
+                )
+            )
+            cart_items.append(CartItem(
+                product=product,
+                quantity=_quantity(item.get("quantity", 1)),
+                size=item.get("size", ""),
+                price=_amount(item.get("price", product.base_price), "price")
+            ))
+        payment_data = data.get("payment")
+        payment_info = PaymentInfo(**payment_data) if payment_data else None
+        voucher_code = data.get("voucher_code")
+        if voucher_code is not None:
+            _string(voucher_code, "voucher_code")
+    except KeyError as error:
+        raise ValueError(f"missing field {error.args[0]!r}") from None
+    except (TypeError, ArithmeticError) as error:
+        raise ValueError(str(error) or type(error).__name__) from None
+    return CartPricingRequest(cart_items, customer, payment_info, voucher_code)
+
+
+def discounted_price_to_dict(result: DiscountedPrice, order_id: Any = None) -> Dict[str, Any]:
+    """JSON-serializable form of a result, amounts as strings of rupees"""
+    return {
+        "order_id": order_id,
+        "original_price": str(result.original_price),
+        "final_price": str(result.final_price),
+        "applied_discounts": {name: str(amount) for name, amount in result.applied_discounts.items()},
+        "message": result.message
+    }
+
+
+@dataclass
+class Checkpoint:
+    """How far a repricing run got: input consumed and output written"""
+    records: int = 0  # Input lines consumed, blank lines included
+    input_offset: int = 0  # Bytes of input consumed
+    output_offset: int = 0  # Bytes of output written
+
+    @classmethod
+    def load(cls, path: str) -> Optional['Checkpoint']:
+        """The checkpoint saved at path, or None if there is none yet"""
+        try:
+            with open(path) as checkpoint_file:
+                return cls(**json.load(checkpoint_file))
+        except FileNotFoundError:
+            return None
+
+    def save(self, path: str):
+        """Replace the checkpoint at path atomically"""
+        temporary = f"{path}.tmp"
+        with open(temporary, "w") as checkpoint_file:
+            json.dump(asdict(self), checkpoint_file)
+            checkpoint_file.flush()
+            os.fsync(checkpoint_file.fileno())
+        os.replace(temporary, path)
+
+
+@dataclass
+class RepricingStats:
+    """Progress of a repricing run"""
+    records: int = 0  # Lines consumed by this run
+    priced: int = 0
+    errors: int = 0
+    elapsed: float = 0.0  # Seconds since this run started
+    resumed_from: int = 0  # Lines consumed by earlier runs
+
+    @property
+    def rate(self) -> float:
+        """Lines per second in this run"""
+        return self.records / self.elapsed if self.elapsed > 0 else 0.0
+
+    def describe(self) -> str:
+        return (
+            f"{self.resumed_from + self.records:,} records ({self.priced:,} priced, {self.errors:,} errors), "
+            f"{self.rate:,.0f} records/s"
+        )
+
+
+# (line number, input offset after the line, order id, priced, read error)
+_Pending = Tuple[int, int, Any, bool, Optional[str]]
+
+
+async def _read_orders(
+    input_file: BinaryIO,
+    start: Checkpoint,
+    pending: Deque[_Pending]
+) -> AsyncIterator[CartPricingRequest]:
+    """Yield a request per order line, noting every line in pending; blank and unreadable lines yield nothing"""
+    line_number = start.records
+    offset = start.input_offset
+    for line in input_file:
+        line_number += 1
+        offset += len(line)
+        if not line.strip():
+            pending.append((line_number, offset, None, False, None))
+            continue
+        order_id = None
+        try:
+            data = json.loads(line, parse_float=Decimal)
+            if not isinstance(data, dict):
+                raise ValueError("order must be a JSON object")
+            order_id = data.get("order_id")
+            request = cart_request_from_dict(data)
+        except ValueError as error:
+            pending.append((line_number, offset, order_id, False, str(error)))
+            continue
+        pending.append((line_number, offset, order_id, True, None))
+        yield request
+
+
+async def reprice_order_log(
+    service: DiscountService,
+    input_file: BinaryIO,
+    output_file: BinaryIO,
+    concurrency: int = 8,
+    start: Optional[Checkpoint] = None,
+    checkpoint_path: Optional[str] = None,
+    checkpoint_every: int = 1000,
+    progress: Optional[Callable[[RepricingStats], None]] = None,
+    progress_interval: float = 5.0,
+    clock: Callable[[], float] = time.monotonic
+) -> RepricingStats:
+    """
+    Price every order line of input_file and write one result line per order.
+
+    Carts go through service.stream_cart_discounts, so at most concurrency
+    are priced at once and input is only read as fast as output is written.
+    input_file and output_file must already be positioned at start, as
+    main() does when resuming.
+
+    Args:
+        service: Service to price with
+        input_file: Binary file of order lines
+        output_file: Binary file for result lines
+        concurrency: Maximum number of carts priced at once
+        start: Position input_file and output_file are at (default: the beginning)
+        checkpoint_path: Where to save a Checkpoint every checkpoint_every records
+        checkpoint_every: Records between checkpoints
+        progress: Called with the running stats every progress_interval seconds
+        progress_interval: Seconds between progress calls
+        clock: Monotonic time source (injectable for tests)
+
+    Returns:
+        RepricingStats of this run
+    """
+    start = start or Checkpoint()
+    stats = RepricingStats(resumed_from=start.records)
+    position = Checkpoint(start.records, start.input_offset, start.output_offset)
+    started = clock()
+    next_report = started + progress_interval
+    last_saved = start.records
+    pending: Deque[_Pending] = deque()
+
+    def write(record: Dict[str, Any]):
+        line = json.dumps(record).encode() + b"\n"
+        output_file.write(line)
+        position.output_offset += len(line)
+
+    def consume(entry: _Pending):
+        line_number, offset, order_id, _, error = entry
+        if error is not None:
+            write({"order_id": order_id, "line": line_number, "error": error})
+            stats.errors += 1
+        position.records = line_number
+        position.input_offset = offset
+        stats.records = line_number - start.records
+
+    def skip_unpriced():
+        """Write out the lines before the next priced one"""
+        while pending and not pending[0][3]:
+            consume(pending.popleft())
+
+    def save_checkpoint():
+        nonlocal last_saved
+        output_file.flush()
+        try:
+            os.fsync(output_file.fileno())
+        except (AttributeError, OSError, ValueError):
+            pass  # Not a real file, e.g. a pipe or an in-memory buffer
+        Checkpoint(position.records, position.input_offset, position.output_offset).save(checkpoint_path)
+        last_saved = position.records
+
+    def tick():
+        nonlocal next_report
+        if checkpoint_path is not None and position.records - last_saved >= checkpoint_every:
+            save_checkpoint()
+        if progress is not None:
+            now = clock()
+            if now >= next_report:
+                stats.elapsed = now - started
+                progress(stats)
+                next_report = now + progress_interval
+
+    orders = _read_orders(input_file, start, pending)
+    async for result in service.stream_cart_discounts(orders, concurrency, return_exceptions=True):
+        skip_unpriced()
+        line_number, offset, order_id, _, _ = pending.popleft()
+        if isinstance(result, Exception):
+            # One bad cart becomes an error record instead of ending the run
+            consume((line_number, offset, order_id, False, f"pricing failed: {type(result).__name__}: {result}"))
+        else:
+            consume((line_number, offset, order_id, True, None))
+            write(discounted_price_to_dict(result, order_id))
+            stats.priced += 1
+        tick()
+    skip_unpriced()
+
+    output_file.flush()
+    if checkpoint_path is not None:
+        save_checkpoint()
+    stats.elapsed = clock() - started
+    return stats
+
+
+def _skip_lines(input_file: BinaryIO, start: Checkpoint):
+    """Move input_file to start, by seeking if it can or reading otherwise"""
+    if input_file.seekable():
+        input_file.seek(start.input_offset)
+        return
+    for _ in range(start.records):
+        input_file.readline()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m src.services.order_repricing",
+        description="Re-price a JSON Lines order log with DiscountService."
+    )
+    parser.add_argument("input", nargs="?", default="-", help="Order log, or - for stdin (default)")
+    parser.add_argument("-o", "--output", default="-", help="Result file, or - for stdout (default)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Carts priced at once (default 8)")
+    parser.add_argument("--checkpoint", help="Checkpoint file to save progress to and resume from")
+    parser.add_argument("--checkpoint-every", type=int, default=1000, help="Records between checkpoints")
+    parser.add_argument("--progress-interval", type=float, default=5.0,
+                        help="Seconds between progress reports on stderr; 0 to disable")
+    parser.add_argument("--fixed-point", action="store_true", help="Price in fixed-point money mode")
+    args = parser.parse_args(argv)
+    if args.concurrency < 1 or args.checkpoint_every < 1:
+        parser.error("--concurrency and --checkpoint-every must be at least 1")
+
+    start = Checkpoint.load(args.checkpoint) if args.checkpoint else None
+    if start is not None and args.output == "-" and start.output_offset:
+        parser.error("resuming needs an output file, stdout cannot be cut back to the checkpoint")
+
+    input_file = sys.stdin.buffer if args.input == "-" else open(args.input, "rb")
+    if args.output == "-":
+        output_file = sys.stdout.buffer
+    elif start is not None:
+        output_file = open(args.output, "r+b")
+        output_file.truncate(start.output_offset)
+        output_file.seek(start.output_offset)
+    else:
+        output_file = open(args.output, "wb")
+
+    def report(stats: RepricingStats):
+        print(stats.describe(), file=sys.stderr)
+
+    try:
+        if start is not None:
+            _skip_lines(input_file, start)
+            print(f"Resuming after {start.records:,} records", file=sys.stderr)
+        service = DiscountService(money_mode=MoneyMode.FIXED_POINT if args.fixed_point else MoneyMode.DECIMAL)
+        stats = asyncio.run(reprice_order_log(
+            service,
+            input_file,
+            output_file,
+            concurrency=args.concurrency,
+            start=start,
+            checkpoint_path=args.checkpoint,
+            checkpoint_every=args.checkpoint_every,
+            progress=report if args.progress_interval > 0 else None,
+            progress_interval=args.progress_interval
+        ))
+    finally:
+        if input_file is not sys.stdin.buffer:
+            input_file.close()
+        if output_file is not sys.stdout.buffer:
+            output_file.close()
+    print(f"Done in {stats.elapsed:.1f}s: {stats.describe()}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,458 @@
+"""
+HTTP/JSON pricing server on asyncio, with micro-batching.
+
+Endpoints (request bodies use the order format of
+src/services/order_repricing.py):
+
+    POST /v1/cart-discounts           {"customer", "items", "payment"?, "voucher_code"?}
+    POST /v1/validate-discount-code   {"code", "customer", "items"}
+    POST /v1/advanced-discounts       {"customer", "items", "payment"?, "discount_configs"?}
+    GET  /health
+
+Requests for the same endpoint that arrive within max_wait seconds of each
+other are priced together, up to max_batch_size at a time: cart pricing
+through DiscountService.calculate_cart_discounts_batch, so the batch shares
+discount construction and voucher validation. Connections are kept alive
+(HTTP/1.1 by default, HTTP/1.0 with "Connection: keep-alive") until the
+client closes them or is idle for keep_alive_timeout seconds.
+
+Run as a script:
+
+    python -m src.services.pricing_server --port 8080 --max-batch-size 64 --max-wait-ms 0.5
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from src.models.discount import DiscountedPrice
+from src.models.money import MoneyMode
+from src.models.pricing_request import CartPricingRequest
+from src.services.discount_service import DiscountService
+from src.services.order_repricing import cart_request_from_dict, discounted_price_to_dict
+
+logger = logging.getLogger(__name__)
+
+_REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+    411: "Length Required", 413: "Payload Too Large", 500: "Internal Server Error", 501: "Not Implemented"
+}
+
+
+class HTTPError(Exception):
+    """Ends a request with an error status and a JSON {"error": message} body"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+class MicroBatcher:
+    """
+    Groups items submitted close together into batches for one handler call.
+
+    A batch is run as soon as it holds max_batch_size items, or max_wait
+    seconds after its first item arrived. If the handler raises for a
+    batch of several items, each item is retried on its own so only the
+    items that fail themselves get the error.
+
+    Args:
+        handler: Called with a list of items, returns one result per item in order
+        max_batch_size: Most items handed to the handler at once
+        max_wait: Seconds the first item of a batch waits for company
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[List[Any]], Awaitable[List[Any]]],
+        max_batch_size: int = 64,
+        max_wait: float = 0.0005
+    ):
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size must be at least 1")
+        if max_wait < 0:
+            raise ValueError("max_wait must not be negative")
+        self.handler = handler
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait
+        self.batches = 0  # Handler calls, retries of failed batches excluded
+        self.items = 0
+        self._pending: List[Tuple[Any, asyncio.Future]] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._running = set()
+
+    @property
+    def mean_batch_size(self) -> float:
+        return self.items / self.batches if self.batches else 0.0
+
+    async def submit(self, item: Any) -> Any:
+        """Wait for item's result from the handler"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((item, future))
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    async def drain(self):
+        """Run whatever is pending now and wait for every running batch"""
+        self._flush()
+        while self._running:
+            await asyncio.gather(*self._running, return_exceptions=True)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+        batch, self._pending = self._pending, []
+        self.batches += 1
+        self.items += len(batch)
+        task = asyncio.ensure_future(self._run(batch))
+        self._running.add(task)
+        task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: List[Tuple[Any, asyncio.Future]]):
+        try:
+            results = await self.handler([item for item, _ in batch])
+        except Exception as error:
+            if len(batch) == 1:
+                _resolve(batch[0][1], error=error)
+                return
+            for entry in batch:
+                await self._run([entry])
+            return
+        for (_, future), result in zip(batch, results):
+            _resolve(future, result)
+
+
+def _resolve(future: asyncio.Future, result: Any = None, error: Optional[BaseException] = None):
+    if future.done():
+        return  # The caller went away
+    if error is not None:
+        future.set_exception(error)
+    else:
+        future.set_result(result)
+
+
+@dataclass
+class _Request:
+    method: str
+    path: str
+    keep_alive: bool
+    body: bytes
+
+
+class PricingServer:
+    """
+    Serves a DiscountService over HTTP/JSON.
+
+    Args:
+        service: Service to price with
+        host: Interface to listen on
+        port: Port to listen on; 0 picks a free one (see port after start())
+        max_batch_size: Most requests per endpoint evaluated together
+        max_wait: Seconds a request waits for others to batch with
+        keep_alive_timeout: Seconds an idle connection is kept open
+        max_body_size: Largest request body accepted, in bytes
+    """
+
+    def __init__(
+        self,
+        service: DiscountService,
+        host: str = "127.0.0.1",
+        port: int = 8080,
+        max_batch_size: int = 64,
+        max_wait: float = 0.0005,
+        keep_alive_timeout: float = 5.0,
+        max_body_size: int = 1 << 20
+    ):
+        self.service = service
+        self.host = host
+        self.port = port
+        self.keep_alive_timeout = keep_alive_timeout
+        self.max_body_size = max_body_size
+        self.cart_batcher = MicroBatcher(service.calculate_cart_discounts_batch, max_batch_size, max_wait)
+        self.validation_batcher = MicroBatcher(self._validate_batch, max_batch_size, max_wait)
+        self.advanced_batcher = MicroBatcher(self._advanced_batch, max_batch_size, max_wait)
+        self._routes: Dict[str, Tuple[str, Callable[[Dict], Awaitable[Dict]]]] = {
+            "/v1/cart-discounts": ("POST", self._cart_discounts),
+            "/v1/validate-discount-code": ("POST", self._validate_discount_code),
+            "/v1/advanced-discounts": ("POST", self._advanced_discounts),
+            "/health": ("GET", self._health),
+        }
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections = set()
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def serve_forever(self):
+        if self._server is None:
+            await self.start()
+        await self._server.serve_forever()
+
+    async def close(self):
+        """Stop accepting connections, finish pending batches and close open connections"""
+        if self._server is not None:
+            self._server.close()
+        for batcher in (self.cart_batcher, self.validation_batcher, self.advanced_batcher):
+            await batcher.drain()
+        for connection in list(self._connections):
+            connection.cancel()
+        if self._connections:
+            await asyncio.gather(*self._connections, return_exceptions=True)
+        if self._server is not None:
+            await self._server.wait_closed()
+
+    async def __aenter__(self) -> 'PricingServer':
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    # Endpoints
+
+    async def _cart_discounts(self, body: Dict) -> Dict:
+        request = cart_request_from_dict(body)
+        result = await self.cart_batcher.submit(request)
+        return discounted_price_to_dict(result, body.get("order_id"))
+
+    async def _validate_discount_code(self, body: Dict) -> Dict:
+        code = body.get("code")
+        if not isinstance(code, str):
+            raise HTTPError(400, "code must be a string")
+        reason = await self.validation_batcher.submit((code, cart_request_from_dict(body)))
+        return {"code": code, "valid": reason is None, "reason": reason}
+
+    async def _advanced_discounts(self, body: Dict) -> Dict:
+        discount_configs = body.get("discount_configs") or []
+        if not isinstance(discount_configs, list) or not all(
+            isinstance(config, dict) and isinstance(config.get("type"), str) for config in discount_configs
+        ):
+            raise HTTPError(400, "discount_configs must be a list of objects with a type")
+        result = await self.advanced_batcher.submit((cart_request_from_dict(body), discount_configs))
+        return discounted_price_to_dict(result, body.get("order_id"))
+
+    async def _health(self, body: Dict) -> Dict:
+        return {"status": "ok"}
+
+    async def _validate_batch(self, items: List[Tuple[str, CartPricingRequest]]) -> List[Optional[str]]:
+        return [self.service.explain_discount_code(code, request.cart_items, request.customer)
+                for code, request in items]
+
+    async def _advanced_batch(
+        self,
+        items: List[Tuple[CartPricingRequest, List[Dict]]]
+    ) -> List[DiscountedPrice]:
+        return list(await asyncio.gather(*(
+            self.service.apply_advanced_discounts(
+                request.cart_items, request.customer, request.payment_info, discount_configs
+            )
+            for request, discount_configs in items
+        )))
+
+    # HTTP
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        task = asyncio.current_task()
+        self._connections.add(task)
+        try:
+            while True:
+                try:
+                    request = await asyncio.wait_for(self._read_request(reader), self.keep_alive_timeout)
+                except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+                    break
+                except HTTPError as error:
+                    self._write_response(writer, error.status, {"error": str(error)}, keep_alive=False)
+                    await writer.drain()
+                    break
+                if request is None:
+                    break
+                status, payload = await self._dispatch(request)
+                self._write_response(writer, status, payload, request.keep_alive)
+                await writer.drain()
+                if not request.keep_alive:
+                    break
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._connections.discard(task)
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[_Request]:
+        """Next request on the connection, or None once the client has closed it"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError as error:
+            if error.partial.strip():
+                raise HTTPError(400, "incomplete request")
+            return None
+        except asyncio.LimitOverrunError:
+            raise HTTPError(413, "request headers too large") from None
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, path, version = lines[0].split(" ")
+        except ValueError:
+            raise HTTPError(400, "malformed request line") from None
+        headers = {}
+        for line in lines[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+
+        connection = headers.get("connection", "").lower()
+        if version == "HTTP/1.1":
+            keep_alive = connection != "close"
+        else:
+            keep_alive = connection == "keep-alive"
+
+        if "chunked" in headers.get("transfer-encoding", "").lower():
+            raise HTTPError(501, "chunked request bodies are not supported")
+        length = headers.get("content-length")
+        if length is None:
+            if method == "POST":
+                raise HTTPError(411, "Content-Length required")
+            length = "0"
+        if not length.isdigit():
+            raise HTTPError(400, "invalid Content-Length")
+        if int(length) > self.max_body_size:
+            raise HTTPError(413, "request body too large")
+        body = await reader.readexactly(int(length))
+        return _Request(method, path.split("?", 1)[0], keep_alive, body)
+
+    async def _dispatch(self, request: _Request) -> Tuple[int, Dict]:
+        route = self._routes.get(request.path)
+        if route is None:
+            return 404, {"error": f"no such endpoint {request.path}"}
+        method, endpoint = route
+        if request.method != method:
+            return 405, {"error": f"use {method} for {request.path}"}
+        try:
+            body = json.loads(request.body, parse_float=Decimal) if request.body else {}
+            if not isinstance(body, dict):
+                raise HTTPError(400, "request body must be a JSON object")
+            return 200, await endpoint(body)
+        except HTTPError as error:
+            return error.status, {"error": str(error)}
+        except ValueError as error:
+            return 400, {"error": str(error)}
+        except Exception:
+            # Details stay in the server log; they may expose internals to clients
+            logger.exception("Unhandled error serving %s %s", request.method, request.path)
+            return 500, {"error": "internal server error"}
+
+    def _write_response(self, writer: asyncio.StreamWriter, status: int, payload: Dict, keep_alive: bool):
+        body = json.dumps(payload, default=str).encode()
+        writer.write(
+            f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+            f"\r\n".encode() + body
+        )
+
+
+class PricingClient:
+    """
+    Minimal keep-alive client for PricingServer, one request at a time.
+
+    Used by the load test and the tests; any HTTP client works against the server.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080):
+        self.host = host
+        self.port = port
+        self._reader: Optional[asyncio.StreamReader] = None
+        self._writer: Optional[asyncio.StreamWriter] = None
+
+    async def connect(self):
+        self._reader, self._writer = await asyncio.open_connection(self.host, self.port)
+
+    async def request(self, method: str, path: str, payload: Optional[Dict] = None) -> Tuple[int, Dict]:
+        """Send one request and return (status, decoded JSON body), reconnecting if needed"""
+        if self._writer is None:
+            await self.connect()
+        body = json.dumps(payload, default=str).encode() if payload is not None else b""
+        self._writer.write(
+            f"{method} {path} HTTP/1.1\r\n"
+            f"Host: {self.host}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"\r\n".encode() + body
+        )
+        await self._writer.drain()
+        head = (await self._reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+        status = int(head[0].split(" ")[1])
+        headers = {}
+        for line in head[1:]:
+            if line:
+                name, _, value = line.partition(":")
+                headers[name.strip().lower()] = value.strip()
+        response = await self._reader.readexactly(int(headers.get("content-length", 0)))
+        if headers.get("connection", "").lower() == "close":
+            await self.close()
+        return status, json.loads(response, parse_float=Decimal)
+
+    async def close(self):
+        if self._writer is not None:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except ConnectionError:
+                pass
+            self._reader = self._writer = None
+
+    async def __aenter__(self) -> 'PricingClient':
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+
+def main(argv: Optional[List[str]] = None):
+    parser = argparse.ArgumentParser(
+        prog="python -m src.services.pricing_server",
+        description="Serve DiscountService over HTTP/JSON with micro-batching."
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-batch-size", type=int, default=64, help="Requests evaluated together (default 64)")
+    parser.add_argument("--max-wait-ms", type=float, default=0.5,
+                        help="Milliseconds a request waits for others to batch with (default 0.5)")
+    parser.add_argument("--keep-alive-timeout", type=float, default=5.0, help="Idle connection timeout in seconds")
+    parser.add_argument("--fixed-point", action="store_true", help="Price in fixed-point money mode")
+    args = parser.parse_args(argv)
+
+    service = DiscountService(money_mode=MoneyMode.FIXED_POINT if args.fixed_point else MoneyMode.DECIMAL)
+    server = PricingServer(
+        service, args.host, args.port,
+        max_batch_size=args.max_batch_size,
+        max_wait=args.max_wait_ms / 1000,
+        keep_alive_timeout=args.keep_alive_timeout
+    )
+
+    async def serve():
+        await server.start()
+        print(f"Serving on http://{server.host}:{server.port}")
+        await server.serve_forever()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+from types import MappingProxyType
+from typing import Dict, Optional, Set, Union
+from decimal import Decimal
+
+from src.models.cart import Cart, CartItem
+from src.models.cart_snapshot import CartSnapshot, CartTotals
+from src.models.customer import CustomerProfile
+from src.models.discount import DiscountedPrice
+from src.models.money import MoneyMode
+from src.models.payment import PaymentInfo
+from src.services.result_cache import copy_result
+
+Amount = Union[Decimal, int]
+
+
+def _add(counts: Dict, key, amount, zero):
+    counts[key] = counts.get(key, zero) + amount
+
+
+def _remove(totals: Dict[str, Amount], lines: Dict[str, int], key: str, amount: Amount):
+    """Take one line's amount off key's subtotal, dropping key with its last line"""
+    remaining = lines[key] - 1
+    if remaining:
+        lines[key] = remaining
+        totals[key] -= amount
+    else:
+        del lines[key]
+        del totals[key]
+
+
+class CartPricingSession:
+    """
+    A cart whose calculate_cart_discounts price is kept up to date as its
+    lines change.
+
+    The session keeps running totals (cart, listed, per-brand and
+    per-category subtotals) and the amount of each discount. A line change
+    applies its delta to the totals and marks only the discounts that read
+    them: the premium brand discount of that line's brand, and the bank
+    offer and voucher, which depend on the cart total. price() recomputes
+    just those, so it costs O(affected discounts) instead of a pass over
+    every line per discount. Results equal calculate_cart_discounts on the
+    same cart, in the service's money mode.
+
+    Change lines through the session (add_item, remove_item,
+    set_quantity); it keeps cart.items in step. Edits made to the cart or
+    its items behind its back are not seen until rebuild(). A change to the
+    service's discount codes or discount types (config_version) is picked
+    up on the next price().
+
+    Create one with DiscountService.pricing_session.
+    """
+
+    def __init__(
+        self,
+        service,
+        customer: CustomerProfile,
+        cart: Optional[Cart] = None,
+        payment_info: Optional[PaymentInfo] = None,
+        voucher_code: Optional[str] = None
+    ):
+        self.service = service
+        self.customer = customer
+        self.cart = cart if cart is not None else Cart(items=[])
+        self.payment_info = payment_info
+        self.voucher_code = voucher_code
+        self.evaluations = 0  # Discount amounts computed, for checking the incremental cost
+        self.rebuild()
+
+    def rebuild(self):
+        """Recompute every total and discount from cart.items"""
+        fixed_point = self.service.money_mode is MoneyMode.FIXED_POINT
+        self._fixed_point = fixed_point
+        self._zero = 0 if fixed_point else Decimal("0")
+        self._total = self._zero
+        self._listed_total = self._zero
+        self._brand_totals: Dict[str, Amount] = {}  # Upper-cased brand -> subtotal
+        self._brand_lines: Dict[str, int] = {}
+        self._raw_brand_lines: Dict[str, int] = {}  # Brand as written on the products
+        self._category_totals: Dict[str, Amount] = {}
+        self._category_lines: Dict[str, int] = {}
+        self._brand_discounts: Dict[str, Amount] = {}  # Premium brand -> discount
+        self._bank_discount = self._zero
+        self._bank_label: Optional[str] = None  # Applied discount name of the bank offer
+        self._voucher_discount = self._zero
+        self._stale_brands: Set[str] = set()
+        self._result: Optional[DiscountedPrice] = None
+        for item in self.cart.items:
+            self._apply(item, adding=True)
+        self._refresh_all()
+
+    # Changes
+
+    def add_item(self, item: CartItem):
+        self.cart.items.append(item)
+        self._apply(item, adding=True)
+
+    def remove_item(self, item: CartItem):
+        """Remove the cart line item (matched by identity)"""
+        items = self.cart.items
+        for index in range(len(items) - 1, -1, -1):
+            if items[index] is item:
+                del items[index]
+                break
+        else:
+            raise ValueError("Item is not in the cart")
+        self._apply(item, adding=False)
+
+    def set_quantity(self, item: CartItem, quantity: int):
+        """Change a line's quantity; 0 removes it"""
+        if quantity < 0:
+            raise ValueError("quantity must not be negative")
+        if quantity == 0:
+            self.remove_item(item)
+            return
+        if not any(line is item for line in self.cart.items):
+            raise ValueError("Item is not in the cart")
+        self._apply(item, adding=False)
+        item.quantity = quantity
+        self._apply(item, adding=True)
+
+    def set_voucher_code(self, voucher_code: Optional[str]):
+        self.voucher_code = voucher_code
+        self._voucher_stale = True
+        self._result = None
+
+    def set_payment_info(self, payment_info: Optional[PaymentInfo]):
+        self.payment_info = payment_info
+        self._bank_stale = True
+        self._result = None
+
+    # Reading
+
+    @property
+    def totals(self) -> CartTotals:
+        """Running totals in the service's money mode (a live view, not a copy)"""
+        return CartTotals(
+            total=self._total,
+            listed_total=self._listed_total,
+            brand_totals=MappingProxyType(self._brand_totals),
+            category_totals=MappingProxyType(self._category_totals)
+        )
+
+    def price(self) -> DiscountedPrice:
+        """The cart's DiscountedPrice, recomputing only the discounts changes affected"""
+        service = self.service
+        if self._version != service.config_version:
+            self._refresh_all()
+        if self._result is None:
+            for brand in self._stale_brands:
+                self._refresh_brand(brand)
+            self._stale_brands.clear()
+            if self._bank_stale:
+                self._refresh_bank()
+            if self._voucher_stale:
+                self._refresh_voucher()
+            self._result = self._build()
+        # A copy, so callers cannot change the session's result
+        return copy_result(self._result)
+
+    # Internals
+
+    def _apply(self, item: CartItem, adding: bool):
+        """Add or take off one line's contribution and mark the discounts reading it"""
+        product = item.product
+        if self._fixed_point:
+            line_total = product.current_price_paise * item.quantity
+            listed = item.price_paise * item.quantity
+        else:
+            line_total = product.current_price * item.quantity
+            listed = item.price * item.quantity
+        brand_key = product.brand.upper()
+        if adding:
+            self._total += line_total
+            self._listed_total += listed
+            _add(self._brand_totals, brand_key, line_total, self._zero)
+            _add(self._brand_lines, brand_key, 1, 0)
+            _add(self._raw_brand_lines, product.brand, 1, 0)
+            _add(self._category_totals, product.category, line_total, self._zero)
+            _add(self._category_lines, product.category, 1, 0)
+        else:
+            self._total -= line_total
+            self._listed_total -= listed
+            _remove(self._brand_totals, self._brand_lines, brand_key, line_total)
+            remaining = self._raw_brand_lines[product.brand] - 1
+            if remaining:
+                self._raw_brand_lines[product.brand] = remaining
+            else:
+                del self._raw_brand_lines[product.brand]
+            _remove(self._category_totals, self._category_lines, product.category, line_total)
+        self._stale_brands.add(brand_key)
+        self._bank_stale = True
+        self._voucher_stale = True
+        self._result = None
+
+    def _refresh_all(self):
+        self._version = self.service.config_version
+        self._stale_brands = set(self._brand_totals) | set(self._brand_discounts)
+        self._bank_stale = True
+        self._voucher_stale = True
+        self._result = None
+
+    def _refresh_brand(self, brand_key: str):
+        # calculate_cart_discounts discounts premium brands written in upper
+        # case, over the subtotal of the brand in any case
+        if brand_key in self.service.PREMIUM_BRANDS and brand_key in self._raw_brand_lines:
+            brand_discount = self.service._create_premium_brand_discount(brand_key)
+            brand_total = self._brand_totals[brand_key]
+            if self._fixed_point:
+                self._brand_discounts[brand_key] = brand_discount.discount_for_total_paise(brand_total)
+            else:
+                self._brand_discounts[brand_key] = brand_discount.discount_for_total(brand_total)
+            self.evaluations += 1
+        else:
+            self._brand_discounts.pop(brand_key, None)
+
+    def _refresh_bank(self):
+        self._bank_stale = False
+        self._bank_discount = self._zero
+        self._bank_label = None
+        bank_offer = self.service._bank_offer(self.payment_info) if self.payment_info else None
+        if bank_offer is not None:
+            self._bank_label, bank_discount = bank_offer
+            if self._fixed_point:
+                self._bank_discount = bank_discount.discount_for_total_paise(self._total)
+            else:
+                self._bank_discount = bank_discount.discount_for_total(self._total)
+            self.evaluations += 1
+
+    def _refresh_voucher(self):
+        self._voucher_stale = False
+        self._voucher_discount = self._zero
+        voucher_code = self.voucher_code
+        if not voucher_code:
+            return
+        service = self.service
+        discount_codes = service.discount_codes
+        snapshot = CartSnapshot.from_totals(self.totals, self._raw_brand_lines, service.money_mode)
+        if service._validate_voucher(voucher_code, snapshot, self.customer, discount_codes) is None:
+            voucher_discount = service._create_voucher_discount(voucher_code, discount_codes)
+            if self._fixed_point:
+                self._voucher_discount = voucher_discount.discount_for_total_paise(self._total)
+            else:
+                self._voucher_discount = voucher_discount.discount_for_total(self._total)
+            self.evaluations += 1
+
+    def _build(self) -> DiscountedPrice:
+        applied_discounts = {}
+        for brand, amount in self._brand_discounts.items():
+            if amount > 0:
+                applied_discounts[f"{brand} Brand Discount"] = amount
+        if self._bank_label and self._bank_discount > 0:
+            applied_discounts[self._bank_label] = self._bank_discount
+        if self.voucher_code and self._voucher_discount > 0:
+            applied_discounts[f"Voucher {self.voucher_code}"] = self._voucher_discount
+        return self.service._build_result(self._total, applied_discounts, "Discounts applied successfully")
@@ -0,0 +1,300 @@
+"""
+Voucher redemption limits: a global cap per code and a cap per customer.
+
+A checkout reserves a redemption before taking payment, then commits it
+once the order is placed or releases it if the order fails:
+
+    reservation = limiter.reserve("SUPER69", customer.id, max_total=1000, max_per_customer=1)
+    try:
+        place_order(...)
+    except Exception:
+        limiter.release(reservation)
+        raise
+    limiter.commit(reservation)
+
+Counters live in memory, split into shards by code, each with its own
+lock, so checkouts of different codes never wait on each other and a
+reserve, commit or release is a few dictionary updates under one lock.
+Reserved and committed redemptions both count against the caps, so
+concurrent checkouts can never redeem a code more often than its cap.
+
+Committed redemptions are persisted by a SQLiteRedemptionStore, which
+batches them in memory and writes them from a background thread: commit()
+never waits on disk. Redemptions committed in the last flush_interval
+before a crash are lost; reservations are never persisted.
+"""
+
+import itertools
+import sqlite3
+import threading
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+GLOBAL_LIMIT = "redemption_limit"
+CUSTOMER_LIMIT = "customer_redemption_limit"
+
+
+class RedemptionLimitReached(Exception):
+    """A reservation would take a code past one of its caps"""
+
+    def __init__(self, code: str, reason: str):
+        super().__init__(f"Discount code {code}: {reason}")
+        self.code = code
+        self.reason = reason  # GLOBAL_LIMIT or CUSTOMER_LIMIT
+
+
+@dataclass(frozen=True)
+class Reservation:
+    """One reserved redemption, to be committed or released exactly once"""
+    reservation_id: int
+    code: str
+    customer_id: str
+
+
+class _Counts:
+    """Committed and reserved redemptions of a code, or of a code by one customer"""
+    __slots__ = ("committed", "reserved")
+
+    def __init__(self, committed: int = 0):
+        self.committed = committed
+        self.reserved = 0
+
+    @property
+    def used(self) -> int:
+        return self.committed + self.reserved
+
+
+class _Shard:
+    __slots__ = ("lock", "codes", "customers", "reservations")
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.codes: Dict[str, _Counts] = {}
+        self.customers: Dict[Tuple[str, str], _Counts] = {}
+        self.reservations: Dict[int, Reservation] = {}
+
+
+def _limit_reason(
+    shard: _Shard,
+    code: str,
+    key: Tuple[str, str],
+    max_total: Optional[int],
+    max_per_customer: Optional[int]
+) -> Optional[str]:
+    """Which cap one more redemption would exceed; call with shard.lock held"""
+    if max_total is not None:
+        counts = shard.codes.get(code)
+        if (counts.used if counts else 0) >= max_total:
+            return GLOBAL_LIMIT
+    if max_per_customer is not None:
+        counts = shard.customers.get(key)
+        if (counts.used if counts else 0) >= max_per_customer:
+            return CUSTOMER_LIMIT
+    return None
+
+
+class SQLiteRedemptionStore:
+    """
+    Committed redemption counts in a local SQLite file, written behind.
+
+    record() adds to an in-memory batch; a background thread writes the
+    batch in one transaction every flush_interval seconds, summing repeated
+    redemptions of the same code by the same customer into one row update.
+    A failed write keeps the batch for the next flush and is kept in
+    last_error. close() writes what is left.
+
+    Args:
+        path: SQLite database file, created if missing
+        flush_interval: Seconds between background writes
+    """
+
+    def __init__(self, path: str, flush_interval: float = 0.05):
+        self.path = path
+        self.flush_interval = flush_interval
+        self.flushes = 0  # Transactions written
+        self.last_error: Optional[Exception] = None
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute(
+            "CREATE TABLE IF NOT EXISTS redemptions ("
+            "code TEXT NOT NULL, customer_id TEXT NOT NULL, count INTEGER NOT NULL, "
+            "PRIMARY KEY (code, customer_id))"
+        )
+        self._connection.commit()
+        self._pending: Dict[Tuple[str, str], int] = {}
+        self._pending_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._closed = threading.Event()
+        self._writer = threading.Thread(target=self._run, name="redemption-writer", daemon=True)
+        self._writer.start()
+
+    def load(self) -> Iterator[Tuple[str, str, int]]:
+        """(code, customer_id, committed count) rows, as of the last flush"""
+        with self._write_lock:
+            rows = self._connection.execute("SELECT code, customer_id, count FROM redemptions").fetchall()
+        return iter(rows)
+
+    def record(self, code: str, customer_id: str):
+        """Queue one committed redemption for the next write"""
+        key = (code, customer_id)
+        with self._pending_lock:
+            self._pending[key] = self._pending.get(key, 0) + 1
+
+    @property
+    def pending(self) -> int:
+        """Redemptions recorded but not yet written"""
+        with self._pending_lock:
+            return sum(self._pending.values())
+
+    def flush(self):
+        """Write the recorded redemptions now"""
+        with self._write_lock:
+            with self._pending_lock:
+                batch, self._pending = self._pending, {}
+            if not batch:
+                return
+            try:
+                with self._connection:
+                    self._connection.executemany(
+                        "INSERT INTO redemptions (code, customer_id, count) VALUES (?, ?, ?) "
+                        "ON CONFLICT (code, customer_id) DO UPDATE SET count = count + excluded.count",
+                        [(code, customer_id, count) for (code, customer_id), count in batch.items()]
+                    )
+            except sqlite3.Error as error:
+                self.last_error = error
+                with self._pending_lock:
+                    for key, count in batch.items():
+                        self._pending[key] = self._pending.get(key, 0) + count
+                return
+            self.flushes += 1
+
+    def close(self):
+        """Stop the background writer and write what is left"""
+        if self._closed.is_set():
+            return
+        self._closed.set()
+        self._writer.join()
+        self.flush()
+        self._connection.close()
+
+    def _run(self):
+        while not self._closed.wait(self.flush_interval):
+            self.flush()
+
+
+class RedemptionLimiter:
+    """
+    Sharded redemption counters with reserve/commit/release.
+
+    Caps are passed to reserve() (DiscountService.reserve_discount_code
+    takes them from the code's max_redemptions and
+    max_redemptions_per_customer rules); None leaves that count uncapped.
+    Lowering a cap below the redemptions already counted stops new
+    reservations without undoing existing ones.
+
+    Every method is thread-safe and none blocks on I/O, so they can be
+    called straight from the event loop.
+
+    Args:
+        store: Persists committed redemptions and supplies the counts to
+            start from; None keeps them in memory only
+        shards: Number of independently locked counter shards
+    """
+
+    def __init__(self, store: Optional[SQLiteRedemptionStore] = None, shards: int = 64):
+        if shards < 1:
+            raise ValueError("shards must be at least 1")
+        self.store = store
+        self._shards: List[_Shard] = [_Shard() for _ in range(shards)]
+        self._ids = itertools.count(1)
+        if store is not None:
+            for code, customer_id, count in store.load():
+                shard = self._shard(code)
+                shard.codes.setdefault(code, _Counts()).committed += count
+                shard.customers[(code, customer_id)] = _Counts(count)
+
+    def _shard(self, code: str) -> _Shard:
+        # A code's total and its per-customer counts share a shard, so one
+        # lock covers both checks
+        return self._shards[hash(code) % len(self._shards)]
+
+    def reserve(
+        self,
+        code: str,
+        customer_id: str,
+        max_total: Optional[int] = None,
+        max_per_customer: Optional[int] = None
+    ) -> Reservation:
+        """
+        Hold one redemption of code for customer_id.
+
+        Raises:
+            RedemptionLimitReached: If the code has no redemptions left in
+                total or for this customer
+        """
+        shard = self._shard(code)
+        key = (code, customer_id)
+        with shard.lock:
+            reason = _limit_reason(shard, code, key, max_total, max_per_customer)
+            if reason is not None:
+                raise RedemptionLimitReached(code, reason)
+            code_counts = shard.codes.get(code)
+            if code_counts is None:
+                code_counts = shard.codes[code] = _Counts()
+            customer_counts = shard.customers.get(key)
+            if customer_counts is None:
+                customer_counts = shard.customers[key] = _Counts()
+            code_counts.reserved += 1
+            customer_counts.reserved += 1
+            reservation = Reservation(next(self._ids), code, customer_id)
+            shard.reservations[reservation.reservation_id] = reservation
+        return reservation
+
+    def commit(self, reservation: Reservation):
+        """Turn a reservation into a redemption"""
+        self._settle(reservation, committed=True)
+        if self.store is not None:
+            self.store.record(reservation.code, reservation.customer_id)
+
+    def release(self, reservation: Reservation):
+        """Give a reservation's redemption back"""
+        self._settle(reservation, committed=False)
+
+    def _settle(self, reservation: Reservation, committed: bool):
+        # One critical section, so the redemption is never briefly counted
+        # as neither reserved nor committed
+        shard = self._shard(reservation.code)
+        with shard.lock:
+            if shard.reservations.pop(reservation.reservation_id, None) is None:
+                raise ValueError(f"Reservation {reservation.reservation_id} is not outstanding")
+            for counts in (shard.codes[reservation.code],
+                           shard.customers[(reservation.code, reservation.customer_id)]):
+                counts.reserved -= 1
+                if committed:
+                    counts.committed += 1
+
+    def check(
+        self,
+        code: str,
+        customer_id: str,
+        max_total: Optional[int] = None,
+        max_per_customer: Optional[int] = None
+    ) -> Optional[str]:
+        """Why reserve() would fail right now (GLOBAL_LIMIT or CUSTOMER_LIMIT), or None"""
+        shard = self._shard(code)
+        with shard.lock:
+            return _limit_reason(shard, code, (code, customer_id), max_total, max_per_customer)
+
+    def redemptions(self, code: str, customer_id: Optional[str] = None) -> Tuple[int, int]:
+        """(committed, reserved) redemptions of code, in total or by customer_id"""
+        shard = self._shard(code)
+        with shard.lock:
+            if customer_id is None:
+                counts = shard.codes.get(code)
+            else:
+                counts = shard.customers.get((code, customer_id))
+            return (counts.committed, counts.reserved) if counts else (0, 0)
+
+    def close(self):
+        """Write outstanding redemptions to the store, if any"""
+        if self.store is not None:
+            self.store.close()
@@ -0,0 +1,127 @@
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Callable, Hashable, Iterable, Optional, Tuple
+
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.discount import DiscountedPrice
+from src.models.payment import PaymentInfo
+
+
+def cart_fingerprint(
+    cart_items: Iterable[CartItem],
+    customer: CustomerProfile,
+    payment_info: Optional[PaymentInfo] = None,
+    voucher_code: Optional[str] = None
+) -> Tuple:
+    """
+    Canonical key for the inputs of DiscountService.calculate_cart_discounts.
+
+    Cart lines are sorted, so the same lines in any order share a key. Only
+    the customer's tier is included, since it is the only customer field
+    the cart discounts read.
+    """
+    lines = sorted(
+        (
+            item.product.id,
+            item.product.brand,
+            item.product.category,
+            item.product.base_price,
+            item.product.current_price,
+            item.quantity,
+            item.size,
+            item.price
+        )
+        for item in cart_items
+    )
+    payment = None
+    if payment_info is not None:
+        payment = (payment_info.method, payment_info.bank_name, payment_info.card_type, payment_info.card_bin)
+    return (tuple(lines), customer.tier, payment, voucher_code)
+
+
+@dataclass
+class CacheStats:
+    """Counters for sizing a PricingResultCache"""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0  # Least recently used entries dropped to stay within max_entries
+    expirations: int = 0  # Entries dropped because they outlived the TTL
+    invalidations: int = 0  # Times the cache was cleared by a configuration version change
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PricingResultCache:
+    """
+    Bounded LRU cache of DiscountedPrice results with a TTL.
+
+    Entries belong to a configuration version. Passing a different version
+    to get or put clears the cache, so results priced under old discount
+    codes or factory registrations are never served.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl_seconds: Optional[float] = 60.0,
+        clock: Callable[[], float] = time.monotonic
+    ):
+        if max_entries < 1:
+            raise ValueError("max_entries must be at least 1")
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.clock = clock
+        self.stats = CacheStats()
+        self.version: Optional[Hashable] = None
+        self._entries: "OrderedDict[Hashable, Tuple[float, DiscountedPrice]]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Hashable, version: Hashable) -> Optional[DiscountedPrice]:
+        """Cached result for key under version, or None"""
+        self._check_version(version)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        expires_at, result = entry
+        if expires_at <= self.clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return copy_result(result)
+
+    def put(self, key: Hashable, version: Hashable, result: DiscountedPrice):
+        """Store result for key under version, evicting the least recently used entry if full"""
+        self._check_version(version)
+        expires_at = self.clock() + self.ttl_seconds if self.ttl_seconds is not None else float("inf")
+        self._entries[key] = (expires_at, copy_result(result))
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self):
+        """Drop every entry"""
+        self._entries.clear()
+
+    def _check_version(self, version: Hashable):
+        if version != self.version:
+            if self._entries:
+                self.stats.invalidations += 1
+                self._entries.clear()
+            self.version = version
+
+
+def copy_result(result: DiscountedPrice) -> DiscountedPrice:
+    """Copy with its own applied_discounts, so callers cannot change cached entries"""
+    return replace(result, applied_discounts=dict(result.applied_discounts))
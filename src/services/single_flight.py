@@ -0,0 +1,75 @@
+import asyncio
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for a SingleFlight"""
+    evaluations: int = 0  # Calls that started an evaluation
+    coalesced: int = 0  # Calls that joined one already in flight
+
+    @property
+    def coalesced_rate(self) -> float:
+        calls = self.evaluations + self.coalesced
+        return self.coalesced / calls if calls else 0.0
+
+
+class SingleFlight:
+    """
+    Shares one in-flight evaluation among concurrent calls with the same key.
+
+    The first call for a key starts the evaluation as its own task; calls
+    with that key arriving before it finishes wait for the same task
+    instead of starting another. Every caller gets the result, or the
+    evaluation's exception. Once it finishes the key is forgotten, so
+    nothing is cached: the next call evaluates afresh.
+
+    A caller that is cancelled stops waiting without cancelling the shared
+    evaluation, which the other callers may still be waiting for.
+
+    Args:
+        copy: Applied to the result for every caller but the one that
+            started the evaluation, so callers do not share mutable results
+    """
+
+    def __init__(self, copy: Optional[Callable[[Any], Any]] = None):
+        self.copy = copy
+        self.stats = SingleFlightStats()
+        self.metrics = None  # DiscountMetrics, set by DiscountService
+        self._in_flight: Dict[Hashable, asyncio.Task] = {}
+
+    def __len__(self) -> int:
+        """Evaluations in flight"""
+        return len(self._in_flight)
+
+    async def do(self, key: Hashable, evaluate: Callable[[], Awaitable[Any]]) -> Any:
+        """Result of evaluate(), shared with concurrent calls for the same key"""
+        task = self._in_flight.get(key)
+        coalesced = task is not None
+        if coalesced:
+            self.stats.coalesced += 1
+        else:
+            self.stats.evaluations += 1
+            task = asyncio.ensure_future(self._evaluate(key, evaluate))
+            self._in_flight[key] = task
+            task.add_done_callback(_retrieve_exception)
+        if self.metrics is not None:
+            self.metrics.observe_single_flight(coalesced)
+
+        result = await asyncio.shield(task)
+        if coalesced and self.copy is not None:
+            return self.copy(result)
+        return result
+
+    async def _evaluate(self, key: Hashable, evaluate: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            return await evaluate()
+        finally:
+            del self._in_flight[key]
+
+
+def _retrieve_exception(task: asyncio.Task):
+    """Mark a failure as seen, in case every caller stopped waiting for it"""
+    if not task.cancelled():
+        task.exception()
@@ -1,63 +1,57 @@
-from typing import List
+from typing import List, Mapping, Optional
 from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot
 from src.models.customer import CustomerProfile
+from src.services.discount_registry import DiscountCodeRegistry, default_registry
+
+class _registry_method:
+    """
+    Method that, called on the class rather than an instance, runs on a
+    ValidationService over the built-in codes, so calls written for the
+    old static ValidationService.validate_discount_code keep working.
+    """
+
+    def __init__(self, function):
+        self.function = function
+        self.__doc__ = function.__doc__
+
+    def __get__(self, instance, owner):
+        if instance is None:
+            instance = owner()
+        return self.function.__get__(instance, owner)
+
 
 class ValidationService:
-    @staticmethod
+    def __init__(self, registry: Optional[DiscountCodeRegistry] = None):
+        # Source of the discount code rules; the built-in codes by default
+        self.registry = registry if registry is not None else default_registry()
+
+    @_registry_method
     def validate_discount_code(
+        self,
         code: str,
         cart_items: List[CartItem],
-        customer: CustomerProfile
+        customer: CustomerProfile,
+        discount_codes: Optional[Mapping[str, Mapping]] = None
     ) -> bool:
-        # Define discount codes and their rules
-        discount_codes = {
-            "SUPER69": {
-                "tier_requirement": None,
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": 0
-            },
-            "PREMIUM20": {
-                "tier_requirement": "premium",
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": 1000
-            },
-            "NEWUSER15": {
-                "tier_requirement": None,
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": 500
-            },
-            "BRAND_EXCLUSION": {
-                "tier_requirement": None,
-                "excluded_brands": ["PUMA", "NIKE"],
-                "allowed_categories": [],
-                "min_cart_value": 0
-            },
-            "CATEGORY_RESTRICTION": {
-                "tier_requirement": None,
-                "excluded_brands": [],
-                "allowed_categories": ["Shoes", "Jackets"],
-                "min_cart_value": 0
-            },
-            "TIER_DISCOUNT": {
-                "tier_requirement": "regular",
-                "excluded_brands": [],
-                "allowed_categories": [],
-                "min_cart_value": 2000
-            }
-        }
+        """
+        Basic validation of a discount code.
+        
+        discount_codes are the rules to check against, so a caller holding a
+        registry snapshot validates against that same snapshot; by default
+        the registry's current rules. Called on the class, it checks the
+        built-in codes, as it did when it was a static method.
+        """
+        if discount_codes is None:
+            discount_codes = self.registry.current().rules
         
         # Check if code exists
-        if code not in discount_codes:
+        code_rules = discount_codes.get(code)
+        if code_rules is None:
             return False
         
-        code_rules = discount_codes[code]
-        
         # Check minimum cart value
-        total_cart_value = sum(item.price * item.quantity for item in cart_items)
-        if total_cart_value < code_rules["min_cart_value"]:
+        if not CartSnapshot.of(cart_items).meets_minimum(code_rules["min_cart_value"], listed=True):
             return False
         
         # Check customer tier requirements
@@ -87,4 +81,4 @@ class ValidationService:
     @staticmethod
     def check_customer_tier_requirements(code: str, customer: CustomerProfile) -> bool:
         # Implement logic to check for customer tier requirements
-        return True
\ No newline at end of file
+        return True
@@ -0,0 +1,229 @@
+from bisect import bisect_right
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Dict, Iterator, List, Mapping, Optional, Tuple
+
+from src.models.cart_snapshot import CartSnapshot
+from src.models.money import MoneyMode, to_paise
+from src.services.voucher_index import TIER_HIERARCHY
+
+# Failure reasons, in the order DiscountService._voucher_failure_reason checks them
+FAILURE_REASONS = (
+    "validation_service",  # min_cart_value against the listed prices
+    "tier_requirement",
+    "excluded_brand",
+    "category_restriction",
+    "min_cart_value",  # min_cart_value against the current prices
+)
+
+
+@dataclass(frozen=True)
+class CompiledVoucher:
+    """
+    One code's rules as bitmasks over the compiled vocabularies.
+
+    A cart passes when (tier & required) == required, (brands & forbidden)
+    == 0, and any_of is 0 or (categories & any_of) != 0.
+    """
+    code: str
+    required: int  # Bit of the required tier level, 0 without a requirement
+    forbidden: int  # Bits of the excluded brands
+    any_of: int  # Bits of the allowed categories, 0 when unrestricted
+    min_cart_value: Decimal
+
+    def mask_failure(self, masks: 'CartMasks') -> Optional[str]:
+        """First tier, brand or category check this code fails for masks, or None"""
+        if masks.tier & self.required != self.required:
+            return "tier_requirement"
+        if masks.brands & self.forbidden:
+            return "excluded_brand"
+        if self.any_of and not masks.categories & self.any_of:
+            return "category_restriction"
+        return None
+
+
+@dataclass(frozen=True)
+class CartMasks:
+    """A cart and customer encoded over the compiled vocabularies"""
+    tier: int  # Bits of every tier level up to the customer's
+    brands: int
+    categories: int
+
+
+class _Thresholds:
+    """Codes whose minimum exceeds a total, as one bitmap lookup"""
+
+    def __init__(self, minimums: List):
+        distinct = sorted(set(minimums))
+        position = {minimum: index for index, minimum in enumerate(distinct)}
+        at = [0] * len(distinct)
+        for bit, minimum in enumerate(minimums):
+            at[position[minimum]] |= 1 << bit
+        # above[k]: codes whose minimum is distinct[k] or more
+        above = [0] * (len(distinct) + 1)
+        for index in range(len(distinct) - 1, -1, -1):
+            above[index] = above[index + 1] | at[index]
+        self._distinct = distinct
+        self._above = above
+
+    def failing(self, total) -> int:
+        return self._above[bisect_right(self._distinct, total)]
+
+
+@dataclass(frozen=True)
+class EligibilityResult:
+    """Eligibility of every compiled code for one cart and customer"""
+    codes: Tuple[str, ...]  # Bit i of every bitmap is codes[i]
+    eligible: int  # Bitmap of the codes that pass every check
+    failures: Mapping[str, int]  # Reason -> bitmap of the codes that failed it first
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def is_eligible(self, code: str) -> bool:
+        return bool(self.eligible >> self.codes.index(code) & 1)
+
+    def eligible_codes(self) -> List[str]:
+        """Eligible codes, in definition order"""
+        return [code for code, eligible in zip(self.codes, _bits(self.eligible, len(self.codes))) if eligible]
+
+    def reason(self, code: str) -> Optional[str]:
+        """The check code failed, or None if it is eligible"""
+        bit = 1 << self.codes.index(code)
+        for failure_reason, bitmap in self.failures.items():
+            if bitmap & bit:
+                return failure_reason
+        return None
+
+    def reasons(self) -> Dict[str, Optional[str]]:
+        """Code -> failure reason (None when eligible), in definition order"""
+        reasons = dict.fromkeys(self.codes)
+        for failure_reason, bitmap in self.failures.items():
+            for code, failed in zip(self.codes, _bits(bitmap, len(self.codes))):
+                if failed:
+                    reasons[code] = failure_reason
+        return reasons
+
+
+def _bits(bitmap: int, count: int) -> Iterator[bool]:
+    """The low count bits of bitmap, least significant first"""
+    digits = bin(bitmap)[:1:-1]
+    for index in range(count):
+        yield index < len(digits) and digits[index] == "1"
+
+
+class VoucherEligibility:
+    """
+    Every discount code's eligibility for a cart in one bit-parallel pass.
+
+    Each code is compiled into required/forbidden/any-of masks over the
+    tier levels, the brands codes exclude and the categories codes allow
+    (CompiledVoucher). For evaluation the masks are transposed into one
+    bitmap per tier level, brand and category, with bit i standing for the
+    i-th code, so a cart costs a handful of integer ORs over the cart's
+    brands and categories plus one bisect per minimum-cart-value check,
+    whatever the number of codes. Results and failure reasons match
+    DiscountService.validate_discount_code (with the built-in
+    ValidationService) code for code.
+    """
+
+    def __init__(self, discount_codes: Mapping[str, Mapping]):
+        self.codes: Tuple[str, ...] = tuple(discount_codes)
+        self._all = (1 << len(self.codes)) - 1
+
+        # Bit positions for every brand and category some code mentions
+        self.brand_bits: Dict[str, int] = {}
+        self.category_bits: Dict[str, int] = {}
+        for config in discount_codes.values():
+            for brand in config.get("excluded_brands") or ():
+                self.brand_bits.setdefault(brand, 1 << len(self.brand_bits))
+            for category in config.get("allowed_categories") or ():
+                self.category_bits.setdefault(category, 1 << len(self.category_bits))
+
+        self.compiled: Dict[str, CompiledVoucher] = {}
+        self._excluded_by_brand: Dict[str, int] = {}  # brand -> codes excluding it
+        self._allowed_by_category: Dict[str, int] = {}  # category -> restricted codes allowing it
+        self._restricted = 0
+        self._above_level: Dict[int, int] = {}  # customer level -> codes requiring a higher one
+        required_levels = []
+        minimums = []
+        for bit_index, (code, config) in enumerate(discount_codes.items()):
+            bit = 1 << bit_index
+            tier_requirement = config.get("tier_requirement")
+            level = TIER_HIERARCHY.get(tier_requirement.lower(), 0) if tier_requirement else 0
+            forbidden = 0
+            for brand in config.get("excluded_brands") or ():
+                forbidden |= self.brand_bits[brand]
+                self._excluded_by_brand[brand] = self._excluded_by_brand.get(brand, 0) | bit
+            any_of = 0
+            for category in config.get("allowed_categories") or ():
+                any_of |= self.category_bits[category]
+                self._allowed_by_category[category] = self._allowed_by_category.get(category, 0) | bit
+            if any_of:
+                self._restricted |= bit
+            minimum = config.get("min_cart_value") or Decimal("0")
+            self.compiled[code] = CompiledVoucher(
+                code=code,
+                required=1 << level if level else 0,
+                forbidden=forbidden,
+                any_of=any_of,
+                min_cart_value=minimum
+            )
+            required_levels.append(level)
+            minimums.append(minimum)
+
+        for customer_level in range(max(TIER_HIERARCHY.values()) + 1):
+            above = 0
+            for bit_index, level in enumerate(required_levels):
+                if level > customer_level:
+                    above |= 1 << bit_index
+            self._above_level[customer_level] = above
+        self._minimums = _Thresholds(minimums)
+        self._minimums_paise = _Thresholds([to_paise(minimum) for minimum in minimums])
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def masks(self, snapshot: CartSnapshot, customer_tier: str) -> CartMasks:
+        """Encode a cart and customer tier over the compiled vocabularies"""
+        level = TIER_HIERARCHY.get(customer_tier.lower(), 0)
+        brands = 0
+        for brand in snapshot.brands:
+            brands |= self.brand_bits.get(brand, 0)
+        categories = 0
+        for category in snapshot.categories:
+            categories |= self.category_bits.get(category, 0)
+        return CartMasks(tier=(1 << (level + 1)) - 1, brands=brands, categories=categories)
+
+    def evaluate(self, snapshot: CartSnapshot, customer_tier: str) -> EligibilityResult:
+        """
+        Eligibility of every code for the cart and customer tier.
+
+        Totals are compared in the form the snapshot was built with, as
+        CartSnapshot.meets_minimum does.
+        """
+        if snapshot.money_mode is MoneyMode.FIXED_POINT:
+            totals, thresholds = snapshot.paise, self._minimums_paise
+        else:
+            totals, thresholds = snapshot.decimal, self._minimums
+
+        excluded = 0
+        for brand in snapshot.brands:
+            excluded |= self._excluded_by_brand.get(brand, 0)
+        allowed = 0
+        for category in snapshot.categories:
+            allowed |= self._allowed_by_category.get(category, 0)
+
+        checks = (
+            thresholds.failing(totals.listed_total),
+            self._above_level[TIER_HIERARCHY.get(customer_tier.lower(), 0)],
+            excluded,
+            self._restricted & ~allowed,
+            thresholds.failing(totals.total),
+        )
+        remaining = self._all
+        failures = {}
+        for failure_reason, failing in zip(FAILURE_REASONS, checks):
+            failures[failure_reason] = failing & remaining
+            remaining &= ~failing
+        return EligibilityResult(codes=self.codes, eligible=remaining, failures=failures)
@@ -0,0 +1,91 @@
+import heapq
+from decimal import Decimal
+from typing import Dict, FrozenSet, Iterator, List, Set, Tuple
+
+from src.models.cart_snapshot import CartSnapshot
+
+# Same hierarchy DiscountService._check_customer_tier uses
+TIER_HIERARCHY = {
+    "budget": 1,
+    "regular": 2,
+    "premium": 3,
+    "gold": 4,
+    "platinum": 5
+}
+
+
+class VoucherIndex:
+    """
+    Inverted index over DiscountService.discount_codes for ranking vouchers.
+
+    Codes are grouped by required tier level and kept in descending order
+    of max_discount, which bounds the savings any code can give. For a cart,
+    the brand and category postings give the codes excluded by the cart's
+    brands and the restricted codes allowed by its categories, touching only
+    codes that mention those brands or categories. min_cart_value is checked
+    per code as candidates are visited.
+    """
+
+    def __init__(self, discount_codes: Dict[str, Dict]):
+        self._min_cart_value: Dict[str, Decimal] = {}
+        self._excluded_by_brand: Dict[str, Set[str]] = {}
+        self._allowed_by_category: Dict[str, Set[str]] = {}
+        self._restricted: Set[str] = set()
+        # Required tier level -> [(-max_discount, position, code)] sorted
+        self._by_tier_level: Dict[int, List[Tuple[Decimal, int, str]]] = {}
+
+        for position, (code, config) in enumerate(discount_codes.items()):
+            tier_requirement = config.get("tier_requirement")
+            tier_level = TIER_HIERARCHY.get(tier_requirement.lower(), 0) if tier_requirement else 0
+            self._min_cart_value[code] = config.get("min_cart_value") or Decimal("0")
+            for brand in config.get("excluded_brands") or []:
+                self._excluded_by_brand.setdefault(brand, set()).add(code)
+            allowed_categories = config.get("allowed_categories") or []
+            if allowed_categories:
+                self._restricted.add(code)
+                for category in allowed_categories:
+                    self._allowed_by_category.setdefault(category, set()).add(code)
+            # Same default DiscountService._create_voucher_discount applies
+            max_discount = Decimal(str(config.get("max_discount", Decimal("100"))))
+            self._by_tier_level.setdefault(tier_level, []).append((-max_discount, position, code))
+
+        for entries in self._by_tier_level.values():
+            entries.sort()
+        self._size = len(discount_codes)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def excluded_codes(self, snapshot: CartSnapshot) -> FrozenSet[str]:
+        """Codes that exclude at least one brand in the cart"""
+        excluded = set()
+        for brand in snapshot.brands:
+            excluded.update(self._excluded_by_brand.get(brand, ()))
+        return frozenset(excluded)
+
+    def allowed_restricted_codes(self, snapshot: CartSnapshot) -> FrozenSet[str]:
+        """Category-restricted codes that allow at least one category in the cart"""
+        allowed = set()
+        for category in snapshot.categories:
+            allowed.update(self._allowed_by_category.get(category, ()))
+        return frozenset(allowed)
+
+    def candidates(self, snapshot: CartSnapshot, customer_tier: str) -> Iterator[Tuple[str, Decimal]]:
+        """
+        Yield (code, max_discount) for every code the index finds eligible,
+        in descending order of max_discount, ties in definition order.
+        Codes above the customer's tier are never visited.
+        """
+        customer_level = TIER_HIERARCHY.get(customer_tier.lower(), 0)
+        excluded = self.excluded_codes(snapshot)
+        allowed_restricted = self.allowed_restricted_codes(snapshot)
+        reachable = [entries for level, entries in self._by_tier_level.items() if level <= customer_level]
+
+        for negated_bound, _, code in heapq.merge(*reachable):
+            if code in excluded:
+                continue
+            if code in self._restricted and code not in allowed_restricted:
+                continue
+            if not snapshot.meets_minimum(self._min_cart_value[code]):
+                continue
+            yield code, -negated_bound
@@ -0,0 +1,134 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.services.bin_index import BankOffer, BinIndex, BinRange
+from src.services.discount_service import DiscountService
+from src.services.result_cache import PricingResultCache
+from src.models.pricing_request import CartPricingRequest
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+
+HDFC = BankOffer("HDFC10", "HDFC", Decimal("10"))
+HDFC_DEBIT = BankOffer("HDFC5", "HDFC", Decimal("5"))
+VISA = BankOffer("VISA7", "VISA Bank", Decimal("7.5"))
+
+
+class TestBinIndex:
+    """Test suite for the card BIN offer index"""
+
+    @pytest.fixture
+    def index(self):
+        return BinIndex([
+            BinRange("451450", "451459", HDFC, "CREDIT"),
+            BinRange("451450", "451459", HDFC_DEBIT, "DEBIT"),
+            BinRange("4514", "4514", VISA),  # Any card type
+        ])
+
+    @pytest.fixture
+    def cart_items(self):
+        product = Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Jeans",
+                          base_price=Decimal("2000"), current_price=Decimal("2000"))
+        return [CartItem(product=product, quantity=1, size="32", price=product.base_price)]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=0)
+
+    def test_lookup_by_prefix_and_card_type(self, index):
+        assert index.lookup("45145512", "CREDIT") == (HDFC, VISA)
+        assert index.lookup("4514551234567890", "debit") == (VISA, HDFC_DEBIT)  # Best first
+        assert index.lookup("451460", "CREDIT") == (VISA,)
+        assert index.lookup("45145512", None) == (VISA,)
+        assert index.lookup("45145512", "PREPAID") == (VISA,)  # Only untyped ranges
+        assert index.lookup("45150000", "CREDIT") == ()
+        assert index.lookup("11111111", "CREDIT") == ()
+        assert index.best_offer("45145512", "CREDIT") == HDFC
+        assert index.best_offer("99999999") is None
+        with pytest.raises(ValueError):
+            index.lookup("4514", "CREDIT")
+
+    @pytest.mark.parametrize("seed", range(5))
+    def test_matches_brute_force(self, seed):
+        """Property: overlapping ranges answer exactly like a scan of every range"""
+        rng = random.Random(seed)
+        offers = [BankOffer(f"O{i}", f"BANK{i % 4}", Decimal(rng.randrange(1, 30))) for i in range(12)]
+        ranges = []
+        for _ in range(60):
+            start = rng.randrange(100000, 100400)
+            end = start + rng.choice([0, 1, 5, 40, 200])
+            ranges.append(BinRange(str(start), str(end), rng.choice(offers), rng.choice([None, "CREDIT", "DEBIT"])))
+        index = BinIndex(ranges)
+
+        for prefix in range(99990, 100700):
+            for card_type in ["CREDIT", "DEBIT", None]:
+                key = f"{prefix}00"
+                expected = {
+                    bin_range.offer for bin_range in ranges
+                    if int(bin_range.bin_start + "00") <= int(key) <= int(bin_range.bin_end + "99")
+                    and bin_range.card_type in (None, card_type)
+                }
+                found = index.lookup(key, card_type)
+                assert set(found) == expected
+                assert [offer.discount_percentage for offer in found] == sorted(
+                    (offer.discount_percentage for offer in found), reverse=True
+                )
+
+    def test_from_file(self, tmp_path):
+        path = tmp_path / "bins.csv"
+        path.write_text(
+            "bin_start,bin_end,card_type,offer_id,bank_name,discount_percentage\n"
+            "45145000,45145999,CREDIT,HDFC10,HDFC,10\n"
+            "45147000,45147999,CREDIT,HDFC10,HDFC,10\n"
+            "4514,4514,,VISA7,VISA Bank,7.5\n"
+        )
+        index = BinIndex.from_file(str(path))
+
+        assert index.ranges == 3
+        assert index.lookup("45147123", "CREDIT") == (HDFC, VISA)
+        assert index.lookup("45146123", "CREDIT") == (VISA,)
+        assert index.lookup("45147123", "CREDIT")[0] is index.lookup("45145123", "CREDIT")[0]
+
+        for bad_row in ["4514,4513,,X,X,1", "4514,45x4,,X,X,1", "4514,4514,,X,X,200",
+                        "4514,4514,CREDIT,HDFC10,HDFC,12"]:
+            path.write_text("bin_start,bin_end,card_type,offer_id,bank_name,discount_percentage\n"
+                            "45145000,45145999,CREDIT,HDFC10,HDFC,10\n" + bad_row + "\n")
+            with pytest.raises(ValueError, match=":3:"):
+                BinIndex.from_file(str(path))
+
+    @pytest.mark.asyncio
+    async def test_service_prices_bin_offers(self, index, cart_items, customer):
+        service = DiscountService(bin_index=index, result_cache=PricingResultCache())
+        hdfc_credit = PaymentInfo(method="CARD", bank_name="HDFC", card_type="CREDIT", card_bin="45145512")
+        unknown_bin = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT", card_bin="52000000")
+        no_bin = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+
+        result = await service.calculate_cart_discounts(cart_items, customer, hdfc_credit)
+        assert result.applied_discounts == {"HDFC Bank Offer": Decimal("200")}
+        assert (await service.calculate_cart_discounts(cart_items, customer, unknown_bin)).applied_discounts == {}
+        # Payments without a BIN keep the flat bank offer
+        result = await service.calculate_cart_discounts(cart_items, customer, no_bin)
+        assert result.applied_discounts == {"ICICI Bank Offer": Decimal("200")}
+
+        requests = [CartPricingRequest(cart_items, customer, payment) for payment in [hdfc_credit, unknown_bin, no_bin]]
+        batch = await service.calculate_cart_discounts_batch(requests)
+        single = [await DiscountService(bin_index=index).calculate_cart_discounts(cart_items, customer, payment)
+                  for payment in [hdfc_credit, unknown_bin, no_bin]]
+        assert batch == single
+        session = service.pricing_session(customer, payment_info=hdfc_credit)
+        for item in cart_items:
+            session.add_item(item)
+        assert session.price() == single[0]
+
+        # A new index is a new config_version: cached results are not reused
+        service.bin_index = BinIndex([BinRange("451455", "451455", HDFC_DEBIT, "CREDIT")])
+        result = await service.calculate_cart_discounts(cart_items, customer, hdfc_credit)
+        assert result.applied_discounts == {"HDFC Bank Offer": Decimal("100")}
+        assert session.price().applied_discounts == {"HDFC Bank Offer": Decimal("100")}
+
+        with pytest.raises(ValueError):
+            PaymentInfo(method="CARD", bank_name="HDFC", card_type="CREDIT", card_bin="4514551234567890")
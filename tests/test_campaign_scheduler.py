@@ -0,0 +1,149 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.services.campaign_scheduler import CampaignScheduler
+from src.services.discount_service import DiscountService
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+
+class FakeClock:
+    """Clock returning a settable date"""
+
+    def __init__(self, today: date):
+        self.today = today
+
+    def __call__(self) -> date:
+        return self.today
+
+
+START = date(2024, 11, 1)
+
+
+def campaign(name: str, start_offset: int, days: int, clock=None, **kwargs) -> SeasonalDiscount:
+    start = START + timedelta(days=start_offset)
+    return SeasonalDiscount(name, start, start + timedelta(days=days - 1), Decimal("10"), clock=clock, **kwargs)
+
+
+class TestCampaignScheduler:
+    """Test suite for the seasonal campaign scheduler"""
+
+    def test_transitions(self):
+        clock = FakeClock(START)
+        diwali = campaign("Diwali", 0, 5)
+        black_friday = campaign("BlackFriday", 3, 1)
+        winter = campaign("Winter", 10, 30)
+        scheduler = CampaignScheduler([diwali, black_friday, winter], clock=clock)
+
+        assert scheduler.active() == (diwali,)
+        assert scheduler.next_transition == START + timedelta(days=3)
+        clock.today = START + timedelta(days=3)
+        assert scheduler.active() == (diwali, black_friday)
+        clock.today = START + timedelta(days=4)
+        assert scheduler.active() == (diwali,)
+        clock.today = START + timedelta(days=5)
+        assert scheduler.active() == ()
+        clock.today = START + timedelta(days=39)
+        assert scheduler.active() == (winter,)
+        clock.today = START + timedelta(days=40)
+        assert scheduler.active() == ()
+        assert scheduler.next_transition is None
+
+    def test_refreshes_only_at_transitions(self):
+        clock = FakeClock(START)
+        scheduler = CampaignScheduler([campaign("Long", 0, 30), campaign("Later", 20, 5)], clock=clock)
+
+        for offset in range(20):
+            clock.today = START + timedelta(days=offset)
+            for _ in range(10):
+                scheduler.active()
+
+        assert scheduler.refreshes == 1
+        clock.today = START + timedelta(days=20)
+        scheduler.active()
+        assert scheduler.refreshes == 2
+
+    def test_clock_moving_backwards_rebuilds(self):
+        clock = FakeClock(START + timedelta(days=10))
+        early = campaign("Early", 0, 5)
+        scheduler = CampaignScheduler([early], clock=clock)
+
+        assert scheduler.active() == ()
+        clock.today = START
+        assert scheduler.active() == (early,)
+
+    def test_add_and_remove(self):
+        clock = FakeClock(START)
+        first = campaign("First", 0, 10)
+        scheduler = CampaignScheduler([first], clock=clock)
+        assert scheduler.active() == (first,)
+
+        second = campaign("Second", 0, 3)
+        upcoming = campaign("Upcoming", 2, 3)
+        scheduler.add(second)
+        scheduler.add(upcoming)
+        assert scheduler.active() == (first, second)
+        scheduler.remove(first)
+        assert first not in scheduler and len(scheduler) == 2
+        assert scheduler.active() == (second,)
+
+        clock.today = START + timedelta(days=2)
+        assert scheduler.active() == (second, upcoming)
+        assert scheduler.active_on(START) == (second,)
+
+        with pytest.raises(ValueError):
+            scheduler.add(SeasonalDiscount("Backwards", START, START - timedelta(days=1), Decimal("5")))
+
+    def test_matches_brute_force(self):
+        rng = random.Random(11)
+        clock = FakeClock(START)
+        campaigns = [campaign(f"C{i}", rng.randrange(0, 120), rng.randrange(1, 30)) for i in range(400)]
+        scheduler = CampaignScheduler(campaigns[:300], clock=clock)
+        scheduled = list(campaigns[:300])
+
+        for step in range(300):
+            if step % 20 == 10:
+                scheduler.remove(scheduled.pop(rng.randrange(len(scheduled))))
+            if step % 20 == 0 and len(scheduled) < len(campaigns):
+                added = next(c for c in campaigns if c not in scheduler and c not in scheduled)
+                scheduler.add(added)
+                scheduled.append(added)
+            # Mostly forward, sometimes jumping back
+            clock.today = START + timedelta(days=rng.randrange(-5, 160) if step % 25 == 0 else step // 2)
+            expected = [c for c in scheduled if c.is_active(clock.today)]
+            assert sorted(scheduler.active(), key=id) == sorted(expected, key=id)
+            probe = START + timedelta(days=rng.randrange(0, 150))
+            assert sorted(scheduler.active_on(probe), key=id) == sorted(
+                (c for c in scheduled if c.is_active(probe)), key=id
+            )
+
+    @pytest.mark.asyncio
+    async def test_service_applies_active_campaigns(self):
+        clock = FakeClock(START + timedelta(days=1))
+        product = Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                          base_price=Decimal('1000'), current_price=Decimal('1000'))
+        cart_items = [CartItem(product=product, quantity=1, size="9", price=product.base_price)]
+        customer = CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                                   tier="regular", loyalty_points=0)
+        scheduler = CampaignScheduler([
+            campaign("Diwali", 0, 5, clock=clock),
+            campaign("Jackets", 0, 5, clock=clock, applicable_categories=["Jackets"]),
+            campaign("Winter", 30, 30, clock=clock)
+        ], clock=clock)
+        service = DiscountService(campaign_scheduler=scheduler)
+
+        result = await service.apply_advanced_discounts(cart_items, customer)
+        assert result.applied_discounts == {"Diwali Seasonal Discount": Decimal("100")}
+
+        clock.today = START + timedelta(days=30)
+        result = await service.apply_advanced_discounts(cart_items, customer)
+        assert result.applied_discounts == {"Winter Seasonal Discount": Decimal("100")}
+
+        result = await DiscountService().apply_advanced_discounts(cart_items, customer)
+        assert result.applied_discounts == {}
+
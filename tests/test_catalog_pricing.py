@@ -0,0 +1,126 @@
+import random
+from dataclasses import replace
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.money import MoneyMode
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.category_discount import CategoryDiscount
+from src.discount_types.discount_factory import DiscountFactory
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.discount_types.tier_discount import TierDiscount
+from src.discount_types.voucher_discount import VoucherDiscount
+from src.services.catalog_pricing import CatalogPricingEngine
+from src.models.product_table import ProductTable
+
+
+BRANDS = ["PUMA", "Nike", "ADIDAS", "ZARA", "H&M"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Accessories", "Jackets"]
+
+
+def random_products(rng, count):
+    products = []
+    for i in range(count):
+        base_price = Decimal(rng.randrange(100, 900000)).scaleb(-2)
+        current_price = base_price - Decimal(rng.randrange(0, 5000)).scaleb(-2)
+        products.append(Product(
+            id=f"P{i}",
+            brand=rng.choice(BRANDS),
+            brand_tier=rng.choice(list(BrandTier)),
+            category=rng.choice(CATEGORIES),
+            base_price=base_price,
+            current_price=max(current_price, Decimal("1"))
+        ))
+    return products
+
+
+def listing_rules():
+    today = date.today()
+    return [
+        CategoryDiscount("Shoes", Decimal("12.5")),
+        BrandDiscount("PUMA", Decimal("40")),
+        BrandDiscount("nike", Decimal("15"), max_discount=Decimal("300")),
+        TierDiscount("premium", Decimal("7.5"), max_discount=Decimal("250"), min_cart_value=Decimal("1500")),
+        TierDiscount("platinum", Decimal("20")),
+        SeasonalDiscount("Summer", today - timedelta(days=1), today + timedelta(days=1),
+                         Decimal("10"), applicable_categories=["Shoes", "Jackets"], max_discount=Decimal("400")),
+        SeasonalDiscount("Winter", today + timedelta(days=30), today + timedelta(days=60), Decimal("50"))
+    ]
+
+
+class TestCatalogPricingEngine:
+    """Test suite for CatalogPricingEngine"""
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="premium", loyalty_points=1500)
+
+    @pytest.mark.asyncio
+    async def test_matches_one_unit_cart_pricing(self, customer):
+        rng = random.Random(19)
+        products = random_products(rng, 300)
+        rules = listing_rules()
+        cart_rules = [rule for rule in rules if not isinstance(rule, CategoryDiscount)]
+        factory = DiscountFactory()
+
+        prices = CatalogPricingEngine(rules).price(ProductTable.from_products(products), customer)
+
+        for position, product in enumerate(products):
+            product = replace(product)
+            for rule in rules:
+                if isinstance(rule, CategoryDiscount):
+                    rule.apply_discount_paise([product])
+            cart_items = [CartItem(product=product, quantity=1, size="M", price=product.current_price)]
+            applied = await factory.apply_multiple_discounts(
+                cart_rules, cart_items, customer, money_mode=MoneyMode.FIXED_POINT
+            )
+            expected = max(product.current_price_paise - sum(applied.values()), 0)
+            assert prices.display_price_paise[position] == expected
+
+    def test_badges(self, customer):
+        products = [
+            Product(id="A", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                    base_price=Decimal("1000"), current_price=Decimal("1000")),
+            Product(id="B", brand="PUMA", brand_tier=BrandTier.REGULAR, category="Shoes",
+                    base_price=Decimal("2000"), current_price=Decimal("1500")),
+            Product(id="C", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Shoes",
+                    base_price=Decimal("800"), current_price=Decimal("800"))
+        ]
+        engine = CatalogPricingEngine([BrandDiscount("PUMA", Decimal("40"))])
+
+        prices = engine.price(ProductTable.from_products(products), customer)
+
+        assert prices.display_price_paise.tolist() == [60000, 90000, 80000]
+        assert prices.percent_off.tolist() == [40, 55, 0]
+        assert prices.product_badges() == ["40% off", "55% off", ""]
+        assert prices.brand_badges() == {"PUMA": "Min 40% off on PUMA"}
+        assert prices.category_badges() == {"T-shirts": "Min 40% off on T-shirts"}
+
+    def test_seasonal_rules_follow_pricing_date(self, customer):
+        products = random_products(random.Random(3), 20)
+        start = date(2025, 12, 1)
+        engine = CatalogPricingEngine([SeasonalDiscount("Winter", start, start + timedelta(days=30), Decimal("50"))])
+        columns = ProductTable.from_products(products)
+
+        before = engine.price(columns, customer, on_date=start - timedelta(days=1))
+        during = engine.price(columns, customer, on_date=start)
+
+        assert (before.display_price_paise == columns.current_price_paise).all()
+        assert (during.display_price_paise < columns.current_price_paise).all()
+
+        # Without a pricing date, each rule's injected clock decides, as in cart pricing
+        clocked = SeasonalDiscount("Winter", start, start + timedelta(days=30), Decimal("50"), clock=lambda: start)
+        assert (CatalogPricingEngine([clocked]).price(columns, customer).display_price_paise
+                == during.display_price_paise).all()
+
+    def test_unsupported_discount(self):
+        with pytest.raises(ValueError):
+            CatalogPricingEngine([VoucherDiscount("SUPER69", Decimal("69"), Decimal("1000"))])
@@ -0,0 +1,128 @@
+import os
+import random
+import struct
+from decimal import Decimal
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.models.product import Product, BrandTier
+from src.models.customer import CustomerProfile
+from src.models.product_table import ProductTable
+from src.models.catalog_snapshot import (
+    FORMAT_VERSION,
+    MappedCatalog,
+    open_catalog_snapshot,
+    write_catalog_snapshot,
+)
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.category_discount import CategoryDiscount
+from src.services.catalog_pricing import CatalogPricingEngine
+
+
+def random_products(rng, count, prefix="P"):
+    return [
+        Product(
+            id=f"{prefix}{i}",
+            brand=rng.choice(["PUMA", "Nike", "ZARA", "Hé&M"]),
+            brand_tier=rng.choice(list(BrandTier)),
+            category=rng.choice(["T-shirts", "Jeans", "Shoes"]),
+            base_price=Decimal(rng.randrange(100, 900000)).scaleb(-2),
+            current_price=Decimal(rng.randrange(100, 900000)).scaleb(-2)
+        )
+        for i in range(count)
+    ]
+
+
+class TestCatalogSnapshot:
+    """Test suite for memory-mapped catalog snapshots"""
+
+    @pytest.fixture
+    def products(self):
+        return random_products(random.Random(13), 500)
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        return str(tmp_path / "catalog.snapshot")
+
+    def test_round_trip(self, products, path):
+        write_catalog_snapshot(ProductTable.from_products(products), path, version=7)
+
+        snapshot = open_catalog_snapshot(path)
+
+        assert snapshot.version == 7
+        assert snapshot.table.to_products() == products
+        # Columns are read-only views of the mapping, not copies
+        assert not snapshot.table.current_price_paise.flags.writeable
+        assert not snapshot.table.current_price_paise.flags.owndata
+
+    def test_id_lookups(self, products, path):
+        write_catalog_snapshot(ProductTable.from_products(products), path, version=1)
+        table = open_catalog_snapshot(path).table
+
+        assert all(table.row(product.id) == row for row, product in enumerate(products))
+        assert table.get("P99") == products[99]
+        assert table.get("missing") is None
+        assert "P3" in table and 3 not in table
+        with pytest.raises(KeyError):
+            table.row("P500")
+
+    def test_mapped_table_prices_like_built_table(self, products, path):
+        write_catalog_snapshot(ProductTable.from_products(products), path, version=1)
+        customer = CustomerProfile(id="C1", name="John Doe", email="john@example.com", tier="premium", loyalty_points=0)
+        engine = CatalogPricingEngine([CategoryDiscount("Shoes", Decimal("10")), BrandDiscount("nike", Decimal("30"))])
+
+        mapped = engine.price(open_catalog_snapshot(path).table, customer)
+        built = engine.price(ProductTable.from_products(products), customer)
+
+        assert (mapped.display_price_paise == built.display_price_paise).all()
+
+    def test_atomic_swap(self, products, path, tmp_path):
+        write_catalog_snapshot(ProductTable.from_products(products), path, version=1)
+        catalog = MappedCatalog(path)
+        old_table = catalog.table
+        assert catalog.refresh() is False
+
+        replacement = random_products(random.Random(29), 50, prefix="Q")
+        write_catalog_snapshot(ProductTable.from_products(replacement), path, version=2)
+
+        # Readers keep the snapshot they mapped until they refresh
+        assert old_table.to_products() == products
+        assert catalog.version == 1
+        assert catalog.refresh() is True
+        assert catalog.version == 2
+        assert catalog.table.to_products() == replacement
+        assert old_table.get("P1") == products[1]
+        assert os.listdir(tmp_path) == ["catalog.snapshot"]
+
+    def test_file_mode(self, products, path):
+        umask = os.umask(0o022)
+        try:
+            write_catalog_snapshot(ProductTable.from_products(products), path, version=1)
+            assert os.stat(path).st_mode & 0o777 == 0o644
+            write_catalog_snapshot(ProductTable.from_products(products), path, version=2, mode=0o660)
+            assert os.stat(path).st_mode & 0o777 == 0o640
+        finally:
+            os.umask(umask)
+
+    def test_empty_catalog(self, path):
+        write_catalog_snapshot(ProductTable.from_products([]), path, version=1)
+
+        table = open_catalog_snapshot(path).table
+
+        assert len(table) == 0
+        assert table.get("P1") is None
+
+    def test_rejects_other_files(self, products, path):
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(b"not a snapshot at all")
+        with pytest.raises(ValueError):
+            open_catalog_snapshot(path)
+
+        write_catalog_snapshot(ProductTable.from_products(products), path, version=1)
+        with open(path, "r+b") as snapshot_file:
+            snapshot_file.seek(8)
+            snapshot_file.write(struct.pack("=I", FORMAT_VERSION + 1))
+        with pytest.raises(ValueError):
+            open_catalog_snapshot(path)
@@ -0,0 +1,127 @@
+import dataclasses
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import Cart, CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.discount import DiscountedPrice
+from src.models.money import MoneyMode
+from src.models.compact import (
+    CompactCartItem,
+    CompactProduct,
+    FrozenCart,
+    FrozenCartItem,
+    FrozenCustomerProfile,
+    FrozenDiscountedPrice,
+    FrozenPaymentInfo,
+    FrozenProduct,
+)
+from src.discount_types.category_discount import CategoryDiscount, calculate_category_discount
+
+
+def products():
+    return [
+        Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                base_price=Decimal('5000'), current_price=Decimal('4500')),
+        Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                base_price=Decimal('999.99'), current_price=Decimal('999.99'))
+    ]
+
+
+def cart_items():
+    return [CartItem(product=product, quantity=2, size="M", price=product.base_price) for product in products()]
+
+
+class TestCompactModels:
+    """Test suite for the slotted and frozen model variants"""
+
+    def test_round_trip(self):
+        customer = CustomerProfile(id="C1", name="John Doe", email="john@example.com", tier="premium", loyalty_points=10)
+        payment_info = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+        result = DiscountedPrice(Decimal("100"), Decimal("90"), {"Offer": Decimal("10")}, "ok")
+        cart = Cart(cart_items())
+
+        for product in products():
+            assert CompactProduct.from_model(product).to_model() == product
+            assert FrozenProduct.from_model(product).to_model() == product
+        for item in cart.items:
+            assert CompactCartItem.from_model(item).to_model() == item
+            assert FrozenCartItem.from_model(item).to_model() == item
+        assert FrozenCart.from_model(cart).to_model() == cart
+        assert FrozenCart.from_model(cart).total_price() == cart.total_price()
+        assert FrozenCustomerProfile.from_model(customer).to_model() == customer
+        assert FrozenPaymentInfo.from_model(payment_info).to_model() == payment_info
+        assert FrozenDiscountedPrice.from_model(result).to_model() == result
+
+    def test_no_instance_dict(self):
+        item = cart_items()[0]
+        for compact in [CompactProduct.from_model(item.product), FrozenProduct.from_model(item.product),
+                        CompactCartItem.from_model(item), FrozenCartItem.from_model(item)]:
+            assert not hasattr(compact, "__dict__")
+
+    def test_frozen_and_hashed(self):
+        product = FrozenProduct.from_model(products()[0])
+        same = FrozenProduct.from_model(products()[0])
+
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            product.current_price = Decimal("1")
+        assert product == same and hash(product) == hash(same)
+        assert len({product, same, product.with_current_price(Decimal("1"))}) == 2
+
+        result = FrozenDiscountedPrice(Decimal("100"), Decimal("80"), {"A": Decimal("10"), "B": Decimal("10")}, "ok")
+        reordered = FrozenDiscountedPrice(Decimal("100"), Decimal("80"), {"B": Decimal("10"), "A": Decimal("10")}, "ok")
+        assert result == reordered and hash(result) == hash(reordered)
+        with pytest.raises(TypeError):
+            result.applied_discounts["C"] = Decimal("1")
+
+    def test_paise_prices_follow_assignment(self):
+        product = CompactProduct.from_model(products()[1])
+        item = CompactCartItem(product, 1, "M", Decimal("10.50"))
+        assert (product.base_price_paise, product.current_price_paise, item.price_paise) == (99999, 99999, 1050)
+
+        product.current_price = Decimal("12.34")
+        item.price = Decimal("7.05")
+
+        assert product.current_price_paise == 1234
+        assert item.price_paise == 705
+        assert FrozenProduct.from_model(products()[1]).base_price_paise == 99999
+
+    def test_strings_are_interned(self):
+        brand = "".join(["NI", "KE"])
+        first = FrozenProduct("A", brand, BrandTier.PREMIUM, "Shoes", Decimal("1"), Decimal("1"))
+        second = CompactProduct("B", "".join(["NI", "KE"]), BrandTier.PREMIUM, "Shoes", Decimal("1"), Decimal("1"))
+
+        assert first.brand is second.brand
+
+    @pytest.mark.parametrize("convert", [CompactProduct.from_model, FrozenProduct.from_model])
+    def test_category_discount_reprices_compact_products(self, convert):
+        expected = calculate_category_discount(products(), [CategoryDiscount("Shoes", Decimal("10"))])
+        compact = [convert(product) for product in products()]
+
+        result = calculate_category_discount(compact, [CategoryDiscount("Shoes", Decimal("10"))])
+
+        assert result == expected
+        assert compact[0].current_price == Decimal("4000")
+        assert compact[0].current_price_paise == 400000
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("money_mode", [MoneyMode.DECIMAL, MoneyMode.FIXED_POINT])
+    @pytest.mark.parametrize("convert", [CompactCartItem.from_model, FrozenCartItem.from_model])
+    async def test_pricing_compact_carts(self, money_mode, convert):
+        service = DiscountService(money_mode=money_mode)
+        customer = CustomerProfile(id="C1", name="John Doe", email="john@example.com", tier="premium", loyalty_points=10)
+        payment_info = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+
+        expected = await service.calculate_cart_discounts(cart_items(), customer, payment_info, "SUPER69")
+        result = await service.calculate_cart_discounts(
+            [convert(item) for item in cart_items()],
+            FrozenCustomerProfile.from_model(customer),
+            FrozenPaymentInfo.from_model(payment_info),
+            "SUPER69"
+        )
+
+        assert result == expected
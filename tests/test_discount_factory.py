@@ -0,0 +1,218 @@
+import asyncio
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.money import MoneyMode
+from src.discount_types.base_discount import BaseDiscount
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.discount_factory import DiscountFactory
+from src.discount_types.loyalty_discount import LoyaltyDiscount
+from src.discount_types.tier_discount import TierDiscount
+
+
+class RemoteDiscount(BaseDiscount):
+    """Discount whose checks wait on a simulated remote store"""
+
+    in_flight = 0
+    peak_in_flight = 0
+
+    def __init__(self, name: str, amount: Decimal, delay: float, applicable: bool = True):
+        super().__init__(discount_id=name.upper(), discount_name=name)
+        self.amount = amount
+        self.delay = delay
+        self.applicable = applicable
+        self.applicability_checks = 0
+
+    async def is_applicable(self, cart_items, customer, payment_info=None, **kwargs) -> bool:
+        self.applicability_checks += 1
+        RemoteDiscount.in_flight += 1
+        RemoteDiscount.peak_in_flight = max(RemoteDiscount.peak_in_flight, RemoteDiscount.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            RemoteDiscount.in_flight -= 1
+        return self.applicable
+
+    async def calculate_discount(self, cart_items, customer, payment_info=None, **kwargs) -> Decimal:
+        if not await self.check_applicable(cart_items, customer, payment_info, **kwargs):
+            return Decimal("0")
+        return self.amount
+
+
+class TestApplyMultipleDiscounts:
+    """Test suite for DiscountFactory.apply_multiple_discounts"""
+
+    @pytest.fixture(autouse=True)
+    def reset_in_flight(self):
+        RemoteDiscount.in_flight = 0
+        RemoteDiscount.peak_in_flight = 0
+
+    @pytest.fixture
+    def factory(self):
+        return DiscountFactory()
+
+    @pytest.fixture
+    def cart_items(self):
+        products = [
+            Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                    base_price=Decimal('5000'), current_price=Decimal('5000')),
+            Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                    base_price=Decimal('1000'), current_price=Decimal('1000'))
+        ]
+        return [CartItem(product=product, quantity=1, size="M", price=product.base_price) for product in products]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="premium", loyalty_points=1500)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("money_mode", [MoneyMode.DECIMAL, MoneyMode.FIXED_POINT])
+    async def test_concurrent_matches_serial(self, factory, cart_items, customer, money_mode):
+        discounts = [
+            BrandDiscount("PUMA", Decimal("40")),
+            TierDiscount("gold", Decimal("20")),
+            LoyaltyDiscount(1000, Decimal("5")),
+            BrandDiscount("NIKE", Decimal("10"), Decimal("200"))
+        ]
+
+        serial = await factory.apply_multiple_discounts(discounts, cart_items, customer, money_mode=money_mode)
+        concurrent = await factory.apply_multiple_discounts(
+            discounts, cart_items, customer, money_mode=money_mode, concurrent=True, max_concurrency=2
+        )
+
+        assert concurrent == serial
+        assert list(concurrent) == ["PUMA Brand Discount", "Loyalty Points Discount", "NIKE Brand Discount"]
+
+    @pytest.mark.asyncio
+    async def test_results_keep_input_order(self, factory, cart_items, customer):
+        # Later discounts finish first
+        discounts = [RemoteDiscount(f"Offer {i}", Decimal(i + 1), delay=0.01 * (5 - i)) for i in range(5)]
+
+        result = await factory.apply_multiple_discounts(discounts, cart_items, customer, concurrent=True)
+
+        assert list(result) == [f"Offer {i}" for i in range(5)]
+
+    @pytest.mark.asyncio
+    async def test_applicability_checked_once(self, factory, cart_items, customer):
+        discounts = [
+            RemoteDiscount("Applicable", Decimal("10"), delay=0),
+            RemoteDiscount("Not applicable", Decimal("10"), delay=0, applicable=False)
+        ]
+
+        for concurrent in [False, True]:
+            await factory.apply_multiple_discounts(discounts, cart_items, customer, concurrent=concurrent)
+
+        assert [discount.applicability_checks for discount in discounts] == [2, 2]
+
+    @pytest.mark.asyncio
+    async def test_concurrency_limit(self, factory, cart_items, customer):
+        discounts = [RemoteDiscount(f"Offer {i}", Decimal("1"), delay=0.01) for i in range(10)]
+
+        result = await factory.apply_multiple_discounts(
+            discounts, cart_items, customer, concurrent=True, max_concurrency=3
+        )
+
+        assert len(result) == 10
+        # Round-trips overlapped, but never more than three at a time
+        assert RemoteDiscount.peak_in_flight == 3
+
+    @pytest.mark.asyncio
+    async def test_timeout_skips_slow_discount(self, factory, cart_items, customer):
+        discounts = [
+            RemoteDiscount("Fast", Decimal("10"), delay=0),
+            RemoteDiscount("Slow", Decimal("20"), delay=1)
+        ]
+
+        for concurrent in [False, True]:
+            result = await factory.apply_multiple_discounts(
+                discounts, cart_items, customer, concurrent=concurrent, timeout=0.05
+            )
+            assert result == {"Fast": Decimal("10")}
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency_limit(self, factory, cart_items, customer):
+        with pytest.raises(ValueError):
+            await factory.apply_multiple_discounts([], cart_items, customer, concurrent=True, max_concurrency=0)
+
+
+class TestDiscountPool:
+    """Test suite for DiscountFactory instance interning"""
+
+    def test_equal_parameters_share_an_instance(self):
+        factory = DiscountFactory()
+
+        first = factory.create_discount("brand", brand="PUMA", discount_percentage=Decimal("40"))
+        second = factory.create_discount("brand", discount_percentage=Decimal("40.0"), brand="PUMA")
+        other = factory.create_discount("brand", brand="PUMA", discount_percentage=Decimal("30"))
+
+        assert first is second
+        assert other is not first
+        assert (factory.pool_stats.hits, factory.pool_stats.misses) == (1, 2)
+
+    def test_parameter_types_are_kept_apart(self):
+        factory = DiscountFactory()
+
+        from_float = factory.create_discount("loyalty", points_threshold=100, discount_percentage=5.0)
+        from_decimal = factory.create_discount("loyalty", points_threshold=100, discount_percentage=Decimal("5"))
+
+        assert from_float is not from_decimal
+        assert from_float.discount_percentage == 5.0
+        assert isinstance(from_decimal.discount_percentage, Decimal)
+
+    def test_list_parameters_are_copied(self):
+        factory = DiscountFactory()
+        categories = ["Shoes"]
+        today = date.today()
+
+        seasonal = factory.create_discount(
+            "seasonal", season_name="Summer", start_date=today, end_date=today,
+            discount_percentage=Decimal("10"), applicable_categories=categories
+        )
+        categories.append("Jeans")
+
+        assert seasonal.applicable_categories == ["Shoes"]
+        assert factory.create_discount(
+            "seasonal", season_name="Summer", start_date=today, end_date=today,
+            discount_percentage=Decimal("10"), applicable_categories=["Shoes"]
+        ) is seasonal
+
+    def test_pool_is_bounded(self):
+        factory = DiscountFactory(pool_size=2)
+
+        first = factory.create_discount("brand", brand="A", discount_percentage=Decimal("10"))
+        factory.create_discount("brand", brand="B", discount_percentage=Decimal("10"))
+        factory.create_discount("brand", brand="C", discount_percentage=Decimal("10"))
+
+        assert factory.pool_stats.evictions == 1
+        assert factory.create_discount("brand", brand="A", discount_percentage=Decimal("10")) is not first
+
+    def test_pooling_can_be_disabled(self):
+        factory = DiscountFactory(pool_size=0)
+
+        assert factory.create_discount("brand", brand="A", discount_percentage=Decimal("10")) is not \
+            factory.create_discount("brand", brand="A", discount_percentage=Decimal("10"))
+
+    def test_registration_clears_pool(self):
+        factory = DiscountFactory()
+        tier = factory.create_discount("tier", required_tier="gold", discount_percentage=Decimal("10"))
+
+        factory.register_discount_type("tier", TierDiscount)
+
+        assert factory.create_discount("tier", required_tier="gold", discount_percentage=Decimal("10")) is not tier
+
+    def test_unhashable_parameters_are_not_pooled(self):
+        class Unhashable:
+            __hash__ = None
+
+        factory = DiscountFactory()
+        today = date.today()
+        kwargs = dict(season_name="Summer", start_date=today, end_date=today,
+                      discount_percentage=Decimal("10"), applicable_categories=[Unhashable()])
+
+        assert factory.create_discount("seasonal", **kwargs) is not factory.create_discount("seasonal", **kwargs)
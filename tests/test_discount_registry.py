@@ -0,0 +1,192 @@
+import json
+import os
+from dataclasses import FrozenInstanceError
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_registry import (
+    DiscountCodeRegistry, VoucherRule, default_registry, load_discount_codes
+)
+from src.services.discount_service import DiscountService
+from src.services.result_cache import PricingResultCache
+from src.services.validation_service import ValidationService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+
+class FakeClock:
+    """Monotonic clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def write_codes(path, codes):
+    """Replace path atomically, as a deploy would"""
+    temporary = f"{path}.tmp"
+    with open(temporary, "w") as config_file:
+        json.dump({"codes": codes}, config_file)
+    os.replace(temporary, path)
+
+
+FLASH = {"discount_percentage": "40", "max_discount": "250", "min_cart_value": "100"}
+
+
+class TestDiscountRegistry:
+    """Test suite for the discount code registry"""
+
+    @pytest.fixture
+    def cart_items(self):
+        product = Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                          base_price=Decimal('1000'), current_price=Decimal('1000'))
+        return [CartItem(product=product, quantity=1, size="M", price=product.base_price)]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=0)
+
+    def test_builtin_codes(self):
+        rules = default_registry().rules
+
+        assert list(rules) == [
+            "SUPER69", "PREMIUM20", "NEWUSER15", "BRAND_EXCLUSION", "CATEGORY_RESTRICTION", "TIER_DISCOUNT"
+        ]
+        assert rules["PREMIUM20"] == VoucherRule(
+            code="PREMIUM20", discount_percentage=Decimal("20"), max_discount=Decimal("500"),
+            tier_requirement="premium", min_cart_value=Decimal("1000")
+        )
+        assert rules["BRAND_EXCLUSION"]["excluded_brands"] == ("PUMA", "NIKE")
+        assert DiscountService().discount_codes["SUPER69"] is rules["SUPER69"]
+
+    def test_rules_are_immutable_mappings(self):
+        rule = default_registry().rules["SUPER69"]
+
+        assert dict(rule)["max_discount"] == Decimal("1000")
+        assert rule.get("missing", 1) == 1
+        with pytest.raises(FrozenInstanceError):
+            rule.max_discount = Decimal("1")
+        with pytest.raises(TypeError):
+            default_registry().rules["NEW"] = rule
+
+    def test_toml(self, tmp_path):
+        pytest.importorskip("tomllib")
+        path = tmp_path / "codes.toml"
+        path.write_text(
+            '[codes.FLASH]\n'
+            'discount_percentage = 12.5\n'
+            'max_discount = 250\n'
+            'tier_requirement = "premium"\n'
+            'allowed_categories = ["Shoes"]\n'
+        )
+
+        rule = load_discount_codes(str(path))["FLASH"]
+
+        assert rule.discount_percentage == Decimal("12.5")
+        assert rule.max_discount == Decimal("250")
+        assert rule.allowed_categories == ("Shoes",)
+        assert rule.min_cart_value == Decimal("0")
+
+    @pytest.mark.parametrize("rules", [
+        {"discount_percentage": "10"},
+        {"discount_percentage": "110", "max_discount": "5"},
+        {"discount_percentage": "10", "max_discount": "-5"},
+        {"discount_percentage": "10", "max_discount": "5", "tier_requirement": "diamond"},
+        {"discount_percentage": "10", "max_discount": "5", "excluded_brands": "NIKE"},
+        {"discount_percentage": "10", "max_discount": "5", "max_discunt": "5"},
+        {"discount_percentage": True, "max_discount": "5"},
+    ])
+    def test_invalid_rules(self, rules):
+        with pytest.raises(ValueError):
+            DiscountCodeRegistry({"BAD": rules})
+
+    def test_hot_reload(self, tmp_path):
+        path = str(tmp_path / "codes.json")
+        write_codes(path, {"FLASH": FLASH})
+        clock = FakeClock()
+        registry = DiscountCodeRegistry(path=path, poll_interval=5, clock=clock)
+        first = registry.current()
+
+        write_codes(path, {"FLASH": dict(FLASH, max_discount="300"), "EXTRA": FLASH})
+        assert registry.current() is first  # Not polled yet
+        clock.now = 5
+        second = registry.current()
+
+        assert second.version == first.version + 1
+        assert list(second.rules) == ["FLASH", "EXTRA"]
+        # A snapshot taken before the reload is unchanged
+        assert list(first.rules) == ["FLASH"]
+        assert first.rules["FLASH"].max_discount == Decimal("250")
+
+        clock.now = 10
+        assert registry.current() is second  # File unchanged
+        assert not registry.refresh()
+
+    def test_invalid_reload_keeps_snapshot(self, tmp_path):
+        path = str(tmp_path / "codes.json")
+        write_codes(path, {"FLASH": FLASH})
+        registry = DiscountCodeRegistry.from_file(path, poll_interval=None)
+        snapshot = registry.current()
+
+        write_codes(path, {"FLASH": {"discount_percentage": "40"}})
+        assert not registry.refresh()
+        assert registry.current() is snapshot
+        assert "max_discount" in str(registry.last_error)
+        with pytest.raises(ValueError):
+            registry.reload()
+
+        write_codes(path, {"FLASH": dict(FLASH, discount_percentage="45")})
+        assert registry.refresh()
+        assert registry.last_error is None
+        assert registry.current().rules["FLASH"].discount_percentage == Decimal("45")
+
+    @pytest.mark.asyncio
+    async def test_services_follow_registry(self, tmp_path, cart_items, customer):
+        path = str(tmp_path / "codes.json")
+        write_codes(path, {"FLASH": FLASH})
+        registry = DiscountCodeRegistry.from_file(path, poll_interval=None)
+        cache = PricingResultCache()
+        service = DiscountService(result_cache=cache, discount_registry=registry)
+
+        assert service.validation_service.registry is registry
+        assert await service.validate_discount_code("FLASH", cart_items, customer)
+        assert not await service.validate_discount_code("SUPER69", cart_items, customer)
+        before = await service.calculate_cart_discounts(cart_items, customer, voucher_code="FLASH")
+        assert before.applied_discounts == {"Voucher FLASH": Decimal("250")}
+
+        write_codes(path, {"FLASH": dict(FLASH, max_discount="100")})
+        registry.refresh()
+        after = await service.calculate_cart_discounts(cart_items, customer, voucher_code="FLASH")
+
+        assert after.applied_discounts == {"Voucher FLASH": Decimal("100")}
+        assert cache.stats.invalidations == 1
+        assert await service.rank_vouchers(cart_items, customer) == [("FLASH", Decimal("100"))]
+
+    def test_validation_service_reads_registry(self, cart_items, customer):
+        registry = DiscountCodeRegistry({"FLASH": FLASH, "BIG": dict(FLASH, min_cart_value="5000")})
+        validation_service = ValidationService(registry)
+
+        assert validation_service.validate_discount_code("FLASH", cart_items, customer)
+        assert not validation_service.validate_discount_code("BIG", cart_items, customer)
+        assert not validation_service.validate_discount_code("SUPER69", cart_items, customer)
+        assert ValidationService().validate_discount_code("SUPER69", cart_items, customer)
+        # Called on the class, as when it was a static method: the built-in codes
+        assert ValidationService.validate_discount_code("SUPER69", cart_items, customer)
+        assert not ValidationService.validate_discount_code("FLASH", cart_items, customer)
+
+    @pytest.mark.asyncio
+    async def test_assigned_codes_override_registry(self, cart_items, customer):
+        registry = DiscountCodeRegistry({"FLASH": FLASH})
+        service = DiscountService(discount_registry=registry)
+
+        service.discount_codes = {"LOCAL": dict(registry.rules["FLASH"], max_discount=Decimal("50"))}
+        registry.replace({"OTHER": FLASH})
+
+        assert list(service.discount_codes) == ["LOCAL"]
+        result = await service.calculate_cart_discounts(cart_items, customer, voucher_code="LOCAL")
+        assert result.applied_discounts == {"Voucher LOCAL": Decimal("50")}
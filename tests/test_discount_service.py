@@ -1,5 +1,7 @@
 import pytest
 import asyncio
+import random
+from datetime import date, timedelta
 from decimal import Decimal
 from unittest.mock import Mock, patch
 
@@ -9,6 +11,12 @@ from src.models.cart import CartItem
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
 from src.models.discount import DiscountedPrice
+from src.models.pricing_request import CartPricingRequest
+from src.models.cart_snapshot import CartSnapshot
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.tier_discount import TierDiscount
+from src.discount_types.voucher_discount import VoucherDiscount
+from src.discount_types.seasonal_discount import SeasonalDiscount
 
 
 class TestDiscountService:
@@ -177,6 +185,35 @@ class TestDiscountService:
         assert result.final_price < result.original_price
         assert len(result.applied_discounts) > 0
 
+    @pytest.mark.asyncio
+    async def test_apply_advanced_discounts_keeps_configs(
+        self, discount_service, sample_cart_items, sample_customer
+    ):
+        """Test that discount configs are left intact and can be reused"""
+        discount_configs = [{"type": "brand", "brand": "NIKE", "discount_percentage": Decimal("25")}]
+
+        first = await discount_service.apply_advanced_discounts(
+            sample_cart_items, sample_customer, discount_configs=discount_configs
+        )
+        second = await discount_service.apply_advanced_discounts(
+            sample_cart_items, sample_customer, discount_configs=discount_configs
+        )
+
+        assert discount_configs == [{"type": "brand", "brand": "NIKE", "discount_percentage": Decimal("25")}]
+        assert first == second
+
+    @pytest.mark.asyncio
+    async def test_repeated_pricing_reuses_discount_instances(
+        self, discount_service, sample_cart_items, sample_customer, sample_payment_info
+    ):
+        """Test that steady-state pricing builds no new discount objects"""
+        await discount_service.calculate_cart_discounts(sample_cart_items, sample_customer, sample_payment_info, "SUPER69")
+        misses = discount_service.discount_factory.pool_stats.misses
+
+        await discount_service.calculate_cart_discounts(sample_cart_items, sample_customer, sample_payment_info, "SUPER69")
+
+        assert discount_service.discount_factory.pool_stats.misses == misses
+
     @pytest.mark.asyncio
     async def test_validate_discount_code_valid(
         self, discount_service, sample_cart_items, sample_customer
@@ -364,4 +401,144 @@ class TestDiscountService:
         assert hasattr(service, 'discount_factory')
         assert hasattr(service, 'discount_codes')
         assert service.discount_factory is not None
-        assert service.discount_codes is not None
\ No newline at end of file
+        assert service.discount_codes is not None
+
+    @pytest.mark.asyncio
+    async def test_calculate_cart_discounts_batch_matches_single_cart(
+        self, discount_service, sample_products, sample_cart_items, sample_customer, sample_payment_info
+    ):
+        """Test that batch pricing matches the single-cart path in input order"""
+        regular_customer = CustomerProfile(
+            id="CUST002",
+            name="Jane Smith",
+            email="jane@example.com",
+            tier="regular",
+            loyalty_points=0
+        )
+        upi_payment = PaymentInfo(method="UPI")
+        requests = [
+            CartPricingRequest(sample_cart_items, sample_customer),
+            CartPricingRequest(sample_cart_items, sample_customer, sample_payment_info, "SUPER69"),
+            CartPricingRequest(sample_cart_items[:1], regular_customer, upi_payment, "PREMIUM20"),
+            CartPricingRequest(sample_cart_items, regular_customer, sample_payment_info, "TIER_DISCOUNT"),
+            CartPricingRequest(sample_cart_items, sample_customer, sample_payment_info, "BRAND_EXCLUSION"),
+            CartPricingRequest([], sample_customer, sample_payment_info, "SUPER69"),
+            CartPricingRequest(
+                [CartItem(product=sample_products[2], quantity=3, size="30", price=sample_products[2].base_price)],
+                sample_customer,
+                voucher_code="INVALID123"
+            ),
+            CartPricingRequest(sample_cart_items, sample_customer, sample_payment_info, "SUPER69"),
+        ]
+
+        results = await discount_service.calculate_cart_discounts_batch(requests)
+
+        assert len(results) == len(requests)
+        for request, result in zip(requests, results):
+            expected = await discount_service.calculate_cart_discounts(
+                cart_items=request.cart_items,
+                customer=request.customer,
+                payment_info=request.payment_info,
+                voucher_code=request.voucher_code
+            )
+            assert result == expected
+
+    @pytest.mark.asyncio
+    async def test_calculate_cart_discounts_batch_empty(self, discount_service):
+        """Test batch pricing with no requests"""
+        assert await discount_service.calculate_cart_discounts_batch([]) == []
+
+
+    @pytest.mark.asyncio
+    async def test_discount_types_read_cart_snapshot(self, sample_cart_items, sample_customer):
+        """Test that discount types give the same amounts for a snapshot and a plain list"""
+        today = date.today()
+        discounts = [
+            BrandDiscount("puma", Decimal("40")),
+            TierDiscount("regular", Decimal("10"), min_cart_value=Decimal("5000")),
+            VoucherDiscount("SUPER69", Decimal("69"), Decimal("1000")),
+            SeasonalDiscount("Summer", today - timedelta(days=1), today + timedelta(days=1),
+                             Decimal("15"), applicable_categories=["Shoes", "Jeans"])
+        ]
+        snapshot = CartSnapshot.from_items(sample_cart_items)
+
+        for discount in discounts:
+            from_list = await discount.calculate_discount(sample_cart_items, sample_customer, voucher_code="SUPER69")
+            from_snapshot = await discount.calculate_discount(snapshot, sample_customer, voucher_code="SUPER69")
+            assert from_list == from_snapshot
+            assert from_snapshot > 0
+
+    async def _rank_vouchers_brute_force(self, service, cart_items, customer):
+        """Rank every discount code by validating and pricing each one"""
+        ranked = []
+        for position, code in enumerate(service.discount_codes):
+            if await service.validate_discount_code(code, cart_items, customer):
+                result = await service.calculate_cart_discounts(cart_items, customer, voucher_code=code)
+                savings = result.applied_discounts.get(f"Voucher {code}", Decimal("0"))
+                max_discount = service.discount_codes[code].get("max_discount", Decimal("100"))
+                ranked.append((-savings, -max_discount, position, code, savings))
+        return [(code, savings) for *_, code, savings in sorted(ranked)]
+
+    @pytest.mark.asyncio
+    async def test_rank_vouchers(self, discount_service, sample_cart_items, sample_customer):
+        """Test that every eligible code is ranked by its voucher savings"""
+        ranking = await discount_service.rank_vouchers(sample_cart_items, sample_customer, top_k=10)
+
+        assert ranking == [
+            ("SUPER69", Decimal("1000")),
+            ("TIER_DISCOUNT", Decimal("800")),
+            ("CATEGORY_RESTRICTION", Decimal("600")),
+            ("PREMIUM20", Decimal("500")),
+            ("NEWUSER15", Decimal("300"))
+        ]
+        assert ranking == await self._rank_vouchers_brute_force(
+            discount_service, sample_cart_items, sample_customer
+        )
+
+    @pytest.mark.asyncio
+    async def test_rank_vouchers_top_k(self, discount_service, sample_cart_items, sample_customer):
+        """Test that rank_vouchers returns at most top_k codes"""
+        ranking = await discount_service.rank_vouchers(sample_cart_items, sample_customer, top_k=2)
+
+        assert [code for code, _ in ranking] == ["SUPER69", "TIER_DISCOUNT"]
+        assert await discount_service.rank_vouchers(sample_cart_items, sample_customer, top_k=0) == []
+
+    @pytest.mark.asyncio
+    async def test_rank_vouchers_excludes_ineligible_codes(self, discount_service, sample_products):
+        """Test that codes failing tier, brand, category or minimum rules are not ranked"""
+        budget_customer = CustomerProfile(
+            id="CUST002", name="Jane Doe", email="jane.doe@example.com", tier="budget", loyalty_points=0
+        )
+        cart_items = [CartItem(product=sample_products[0], quantity=1, size="M", price=Decimal("1000"))]
+
+        ranking = await discount_service.rank_vouchers(cart_items, budget_customer, top_k=10)
+
+        # PUMA excludes BRAND_EXCLUSION, T-shirts miss CATEGORY_RESTRICTION, the
+        # budget tier misses PREMIUM20 and TIER_DISCOUNT
+        assert ranking == [("SUPER69", Decimal("690")), ("NEWUSER15", Decimal("150"))]
+
+    @pytest.mark.asyncio
+    async def test_rank_vouchers_matches_brute_force_over_many_codes(self, discount_service, sample_cart_items):
+        """Test the pruned ranking against pricing every code, across tiers and cap ties"""
+        rng = random.Random(7)
+        tiers = [None, "budget", "regular", "premium", "gold", "platinum"]
+        discount_service.discount_codes = {
+            f"CODE{i:03d}": {
+                "discount_percentage": Decimal(rng.choice([5, 10, 12.5, 20, 35])),
+                "max_discount": Decimal(rng.choice([100, 250, 400, 1500])),
+                "tier_requirement": rng.choice(tiers),
+                "excluded_brands": rng.sample(["PUMA", "NIKE", "ZARA", "H&M"], rng.randint(0, 1)),
+                "allowed_categories": rng.sample(["Shoes", "Jeans", "Jackets"], rng.randint(0, 2)),
+                "min_cart_value": Decimal(rng.choice([0, 1000, 5000, 9000]))
+            }
+            for i in range(300)
+        }
+
+        for tier in ["budget", "regular", "premium", "platinum"]:
+            customer = CustomerProfile(
+                id="CUST003", name="Sam Doe", email="sam.doe@example.com", tier=tier, loyalty_points=0
+            )
+            expected = await self._rank_vouchers_brute_force(discount_service, sample_cart_items, customer)
+            for top_k in [1, 5, 40, 300]:
+                ranking = await discount_service.rank_vouchers(sample_cart_items, customer, top_k=top_k)
+                assert ranking == expected[:top_k]
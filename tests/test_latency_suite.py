@@ -0,0 +1,58 @@
+import copy
+import json
+
+import pytest
+
+from benchmarks.latency_suite import compare, percentile, run_suite
+from src.discount_types.base_discount import BaseDiscount
+
+
+def document(**latencies):
+    return {"scenarios": [
+        {"name": name, "p50_us": p50, "p95_us": p95, "p99_us": p99}
+        for name, (p50, p95, p99) in latencies.items()
+    ]}
+
+
+class TestLatencySuite:
+    """Test suite for the latency benchmark suite"""
+
+    def test_percentile(self):
+        samples = sorted(float(value) for value in range(1, 101))
+
+        assert percentile(samples, 50) == 50
+        assert percentile(samples, 95) == 95
+        assert percentile(samples, 99) == 99
+        assert percentile([7.0], 99) == 7.0
+        with pytest.raises(ValueError):
+            percentile([], 50)
+
+    def test_compare_flags_regressions(self):
+        baseline = document(a=(100, 200, 300), b=(10, 20, 30), gone=(1, 1, 1))
+        current = document(a=(130, 210, 300), b=(14, 20, 30), new=(1, 1, 1))
+
+        report = compare(current, baseline, tolerance=0.15, min_delta_us=5)
+
+        # a's p50 is 30% slower; b's p50 is 40% slower but only by 4us
+        assert [(r.name, r.metric) for r in report["regressions"]] == [("a", "p50_us")]
+        assert report["regressions"][0].ratio == pytest.approx(1.3)
+        assert report["missing"] == ["gone"]
+        assert report["new"] == ["new"]
+        assert compare(copy.deepcopy(baseline), baseline)["regressions"] == []
+
+    @pytest.mark.asyncio
+    async def test_run_suite_covers_entry_points(self):
+        results = await run_suite(sizes=[1, 3], min_time=0, min_calls=3, max_calls=3, warmup=1)
+
+        scenarios = results["scenarios"]
+        entry_points = {scenario["entry_point"] for scenario in scenarios}
+        builtin_discounts = {cls.__name__ for cls in BaseDiscount.__subclasses__() if cls.__module__.startswith("src.")}
+        assert {"calculate_cart_discounts", "apply_advanced_discounts", "validate_discount_code"} <= entry_points
+        assert builtin_discounts <= entry_points
+        variants = {(s["payment"], s["voucher"]) for s in scenarios if s["entry_point"] == "calculate_cart_discounts"}
+        assert variants == {(False, False), (False, True), (True, False), (True, True)}
+        assert {scenario["lines"] for scenario in scenarios} == {1, 3}
+        for scenario in scenarios:
+            assert scenario["calls"] == 3
+            assert scenario["p50_us"] <= scenario["p95_us"] <= scenario["p99_us"]
+        json.dumps(results)
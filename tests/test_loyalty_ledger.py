@@ -0,0 +1,170 @@
+import os
+from decimal import Decimal
+
+import pytest
+
+from src.discount_types.loyalty_discount import LoyaltyDiscount
+from src.services.discount_service import DiscountService
+from src.services.loyalty_ledger import COMPACTING_NAME, LOG_NAME, SNAPSHOT_NAME, InsufficientPoints, LoyaltyLedger
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+
+class TestLoyaltyLedger:
+    """Test suite for the loyalty points ledger"""
+
+    @pytest.fixture
+    def cart_items(self):
+        product = Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Jeans",
+                          base_price=Decimal("2000"), current_price=Decimal("2000"))
+        return [CartItem(product=product, quantity=1, size="32", price=product.base_price)]
+
+    @pytest.fixture
+    def customer(self):
+        # The profile's points are a stale snapshot; the ledger has the balance
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=5000)
+
+    def test_earn_burn_and_replay(self, tmp_path):
+        ledger = LoyaltyLedger(str(tmp_path), snapshot_every=None)
+        ledger.earn("A", 500)
+        ledger.earn("B", "120.5")
+        assert ledger.burn("A", 200) == Decimal("300")
+        with pytest.raises(InsufficientPoints) as error:
+            ledger.burn("B", 121)
+        assert error.value.available == Decimal("120.5")
+        with pytest.raises(ValueError):
+            ledger.earn("A", -5)
+        ledger.close()
+
+        restarted = LoyaltyLedger(str(tmp_path))
+        assert (restarted.balance("A"), restarted.balance("B"), restarted.balance("C")) == (300, Decimal("120.5"), 0)
+        assert (restarted.sequence, restarted.replayed) == (3, 3)
+        restarted.close()
+
+    def test_compaction_bounds_replay(self, tmp_path):
+        ledger = LoyaltyLedger(str(tmp_path), snapshot_every=100)
+        for i in range(250):
+            ledger.earn(f"C{i % 7}", 10)
+        ledger.burn("C0", 5)
+        ledger.close()
+
+        assert os.listdir(str(tmp_path)).count(COMPACTING_NAME) == 0  # close() waited for compaction
+
+        restarted = LoyaltyLedger(str(tmp_path), snapshot_every=100)
+        # Only the events after the last snapshot: at least the compaction
+        # due at event 100 has run; the one due at 200 may still have been
+        # waiting for it
+        assert restarted.replayed <= 51 or restarted.replayed == 151
+        assert restarted.sequence == 251
+        assert restarted.balance("C0") == 36 * 10 - 5
+        assert sum(restarted.balance(f"C{i}") for i in range(7)) == 2495
+        restarted.close()
+
+    def test_crash_recovery(self, tmp_path):
+        ledger = LoyaltyLedger(str(tmp_path), snapshot_every=None)
+        ledger.earn("A", 100)
+        ledger.earn("A", 50)
+        log_path = os.path.join(str(tmp_path), LOG_NAME)
+        with open(log_path) as log_file:
+            logged = log_file.read()
+        ledger.snapshot()
+        ledger.earn("A", 1)
+        ledger.close()
+
+        # A crash after writing the snapshot but before emptying the log,
+        # then a torn append
+        with open(log_path, "w") as log_file:
+            log_file.write(logged + "3\tearn\tA\t1\n4\tearn\tA\t7")
+        restarted = LoyaltyLedger(str(tmp_path))
+        assert restarted.balance("A") == 151
+        assert restarted.replayed == 1
+        restarted.earn("A", 2)  # Appends after the dropped torn line
+        restarted.close()
+        assert LoyaltyLedger(str(tmp_path)).balance("A") == 153
+
+        with open(os.path.join(str(tmp_path), SNAPSHOT_NAME), "w") as snapshot_file:
+            snapshot_file.write('{"sequence": 0, "balances": {}}')
+        with open(log_path, "w") as log_file:
+            log_file.write("1\tearn\tA\t1\nnot an event\n2\tearn\tA\t1\n")
+        with pytest.raises(ValueError):
+            LoyaltyLedger(str(tmp_path))
+
+    def test_crash_during_background_compaction(self, tmp_path):
+        ledger = LoyaltyLedger(str(tmp_path), snapshot_every=None)
+        for _ in range(3):
+            ledger.earn("A", 10)
+        ledger.close()
+
+        # A crash after rotating the log but before the snapshot was written
+        os.replace(os.path.join(str(tmp_path), LOG_NAME), os.path.join(str(tmp_path), COMPACTING_NAME))
+        with open(os.path.join(str(tmp_path), LOG_NAME), "w") as log_file:
+            log_file.write("4\tburn\tA\t5\n")
+        restarted = LoyaltyLedger(str(tmp_path))
+        assert (restarted.balance("A"), restarted.sequence, restarted.replayed) == (25, 4, 4)
+        assert sorted(os.listdir(str(tmp_path))) == [LOG_NAME, SNAPSHOT_NAME]  # Compaction finished
+        restarted.close()
+        assert LoyaltyLedger(str(tmp_path)).replayed == 0
+
+    def test_reservations(self, tmp_path):
+        ledger = LoyaltyLedger(str(tmp_path))
+        ledger.earn("A", 1000)
+        held = ledger.reserve("A", 600)
+        assert (ledger.balance("A"), ledger.available("A")) == (1000, 400)
+        with pytest.raises(InsufficientPoints):
+            ledger.reserve("A", 500)
+        with pytest.raises(InsufficientPoints):
+            ledger.burn("A", 500)
+
+        ledger.release(held)
+        assert ledger.available("A") == 1000
+        assert ledger.commit(ledger.reserve("A", 700)) == 300
+        with pytest.raises(ValueError):
+            ledger.release(held)
+        ledger.close()
+        assert LoyaltyLedger(str(tmp_path)).balance("A") == 300
+
+    def test_commit_failure_keeps_reservation(self, tmp_path):
+        ledger = LoyaltyLedger(str(tmp_path))
+        ledger.earn("A", 1000)
+        for bad_id in ["", "A\tB", "A\n", None]:
+            with pytest.raises(ValueError):
+                ledger.reserve(bad_id, 10)
+
+        held = ledger.reserve("A", 600)
+        ledger._log.close()  # The append fails
+        with pytest.raises(ValueError):
+            ledger.commit(held)
+        assert (ledger.balance("A"), ledger.available("A")) == (1000, 400)
+        ledger._log = open(os.path.join(str(tmp_path), LOG_NAME), "a", encoding="utf-8")
+        assert ledger.commit(held) == 400
+        ledger.close()
+
+    @pytest.mark.asyncio
+    async def test_loyalty_discount_reads_ledger(self, tmp_path, cart_items, customer):
+        ledger = LoyaltyLedger(str(tmp_path))
+        discount = LoyaltyDiscount(1000, Decimal("5"), ledger=ledger, points_cost=Decimal("800"))
+        assert not await discount.is_applicable(cart_items, customer)  # Ignores the stale 5000
+
+        ledger.earn(customer.id, 1200)
+        assert await discount.is_applicable(cart_items, customer)
+        reservation = discount.reserve_points(customer)
+        assert not await discount.is_applicable(cart_items, customer)  # 400 left available
+        ledger.commit(reservation)
+        assert ledger.balance(customer.id) == 400
+        with pytest.raises(ValueError):
+            LoyaltyDiscount(1000, Decimal("5")).reserve_points(customer)
+
+    @pytest.mark.asyncio
+    async def test_service_passes_ledger_to_loyalty_configs(self, tmp_path, cart_items, customer):
+        ledger = LoyaltyLedger(str(tmp_path))
+        service = DiscountService(loyalty_ledger=ledger)
+        configs = [{"type": "loyalty", "points_threshold": 1000, "discount_percentage": Decimal("5")}]
+
+        result = await service.apply_advanced_discounts(cart_items, customer, discount_configs=configs)
+        assert result.applied_discounts == {}
+        ledger.earn(customer.id, 1000)
+        result = await service.apply_advanced_discounts(cart_items, customer, discount_configs=configs)
+        assert result.applied_discounts == {"Loyalty Points Discount": Decimal("100")}
+        assert configs == [{"type": "loyalty", "points_threshold": 1000, "discount_percentage": Decimal("5")}]
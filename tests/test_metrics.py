@@ -0,0 +1,147 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.services.metrics import DiscountMetrics, MetricsRegistry
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.discount_types.base_discount import BaseDiscount
+
+
+class SlowDiscount(BaseDiscount):
+    """Discount that takes delay seconds to check"""
+
+    def __init__(self, delay: float):
+        super().__init__(discount_id="SLOW", discount_name="Slow Discount")
+        self.delay = delay
+
+    async def is_applicable(self, cart_items, customer, payment_info=None, **kwargs) -> bool:
+        await asyncio.sleep(self.delay)
+        return True
+
+    async def calculate_discount(self, cart_items, customer, payment_info=None, **kwargs) -> Decimal:
+        return Decimal("10")
+
+
+class TestMetrics:
+    """Test suite for the metrics registry and pricing instrumentation"""
+
+    @pytest.fixture
+    def cart_items(self):
+        products = [
+            Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                    base_price=Decimal('5000'), current_price=Decimal('5000')),
+            Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                    base_price=Decimal('1000'), current_price=Decimal('1000'))
+        ]
+        return [CartItem(product=products[0], quantity=1, size="9", price=products[0].base_price),
+                CartItem(product=products[1], quantity=3, size="M", price=products[1].base_price)]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=1500)
+
+    def test_prometheus_text_format(self):
+        registry = MetricsRegistry()
+        requests = registry.counter("requests_total", "Requests\nserved", ("path",))
+        latency = registry.histogram("latency_seconds", "Latency", ("path",), buckets=(0.1, 1.0))
+
+        requests.inc(('/a"b',))
+        requests.inc(('/a"b',), 2)
+        for value in (0.05, 0.1, 0.5, 3):
+            latency.observe(("/",), value)
+
+        assert registry.render() == "\n".join([
+            "# HELP requests_total Requests\\nserved",
+            "# TYPE requests_total counter",
+            'requests_total{path="/a\\"b"} 3',
+            "# HELP latency_seconds Latency",
+            "# TYPE latency_seconds histogram",
+            'latency_seconds_bucket{path="/",le="0.1"} 2',
+            'latency_seconds_bucket{path="/",le="1.0"} 3',
+            'latency_seconds_bucket{path="/",le="+Inf"} 4',
+            'latency_seconds_sum{path="/"} 3.65',
+            'latency_seconds_count{path="/"} 4',
+        ]) + "\n"
+        with pytest.raises(ValueError):
+            registry.counter("requests_total", "Duplicate")
+
+    @pytest.mark.asyncio
+    async def test_calculate_cart_discounts_metrics(self, cart_items, customer):
+        metrics = DiscountMetrics()
+        service = DiscountService(metrics=metrics)
+        payment_info = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+
+        result = await service.calculate_cart_discounts(cart_items, customer, payment_info, "SUPER69")
+
+        assert result == await DiscountService().calculate_cart_discounts(cart_items, customer, payment_info, "SUPER69")
+        assert metrics.evaluations.value(("BrandDiscount", "applied")) == 2
+        assert metrics.evaluations.value(("BankDiscount", "applied")) == 1
+        assert metrics.evaluations.value(("VoucherDiscount", "applied")) == 1
+        assert metrics.evaluation_seconds.count(("BrandDiscount",)) == 2
+        assert metrics.hit_rate("BrandDiscount") == 1.0
+        assert metrics.request_seconds.count(("calculate_cart_discounts",)) == 1
+        assert metrics.cart_lines.total(("calculate_cart_discounts",)) == 2
+        assert metrics.cart_units.total(("calculate_cart_discounts",)) == 4
+        assert 'voucher_validations_total{code="SUPER69",result="valid"} 1' in metrics.render()
+
+    @pytest.mark.asyncio
+    async def test_validation_failure_reasons(self, cart_items, customer):
+        metrics = DiscountMetrics()
+        service = DiscountService(metrics=metrics)
+
+        assert not await service.validate_discount_code("NOPE", cart_items, customer)
+        assert not await service.validate_discount_code("PREMIUM20", cart_items, customer)
+        assert not await service.validate_discount_code("BRAND_EXCLUSION", cart_items, customer)
+        assert not await service.validate_discount_code("CATEGORY_RESTRICTION", cart_items[1:], customer)
+        assert await service.validate_discount_code("TIER_DISCOUNT", cart_items, customer)
+
+        assert metrics.voucher_validations.value(("unknown", "unknown_code")) == 1
+        assert metrics.voucher_validations.value(("PREMIUM20", "tier_requirement")) == 1
+        assert metrics.voucher_validations.value(("BRAND_EXCLUSION", "excluded_brand")) == 1
+        assert metrics.voucher_validations.value(("CATEGORY_RESTRICTION", "category_restriction")) == 1
+        assert metrics.voucher_validations.value(("TIER_DISCOUNT", "valid")) == 1
+
+    @pytest.mark.asyncio
+    async def test_factory_evaluations(self, cart_items, customer):
+        metrics = DiscountMetrics()
+        service = DiscountService(metrics=metrics)
+        configs = [
+            {"type": "brand", "brand": "ZARA", "discount_percentage": Decimal("10")},
+            {"type": "tier", "required_tier": "regular", "discount_percentage": Decimal("5")}
+        ]
+
+        await service.apply_advanced_discounts(cart_items, customer, discount_configs=configs)
+        await service.discount_factory.apply_multiple_discounts(
+            [SlowDiscount(delay=1)], cart_items, customer, concurrent=True, timeout=0.01
+        )
+
+        assert metrics.evaluations.value(("BrandDiscount", "not_applicable")) == 1
+        assert metrics.evaluations.value(("TierDiscount", "applied")) == 1
+        assert metrics.evaluations.value(("SlowDiscount", "timeout")) == 1
+        assert metrics.evaluation_seconds.count(("SlowDiscount",)) == 1
+        assert metrics.hit_rate("BrandDiscount") == 0.0
+        assert metrics.request_seconds.count(("apply_advanced_discounts",)) == 1
+
+    @pytest.mark.asyncio
+    async def test_batch_metrics(self, cart_items, customer):
+        from src.models.pricing_request import CartPricingRequest
+        metrics = DiscountMetrics()
+        service = DiscountService(metrics=metrics)
+        requests = [CartPricingRequest(cart_items=cart_items, customer=customer) for _ in range(3)]
+
+        await service.calculate_cart_discounts_batch(requests)
+
+        assert metrics.request_seconds.count(("calculate_cart_discounts_batch",)) == 1
+        assert metrics.cart_lines.count(("calculate_cart_discounts_batch",)) == 3
+
+    def test_disabled_by_default(self):
+        service = DiscountService()
+
+        assert service.metrics is None
+        assert service.discount_factory.metrics is None
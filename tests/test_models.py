@@ -1,6 +1,8 @@
+import pytest
 from decimal import Decimal
 from src.models.product import Product, BrandTier
 from src.models.cart import CartItem
+from src.models.cart_snapshot import CartSnapshot
 from src.models.customer import CustomerProfile
 from src.models.payment import PaymentInfo
 from src.models.discount import DiscountedPrice
@@ -95,6 +97,77 @@ class TestCartItem:
         assert expected_total == Decimal('2400')
 
 
+class TestCartSnapshot:
+    """Test suite for CartSnapshot aggregates"""
+
+    def _cart_items(self):
+        puma = Product(
+            id="PUMA001",
+            brand="PUMA",
+            brand_tier=BrandTier.REGULAR,
+            category="T-shirts",
+            base_price=Decimal('1000'),
+            current_price=Decimal('800')
+        )
+        puma_lower = Product(
+            id="PUMA002",
+            brand="Puma",
+            brand_tier=BrandTier.REGULAR,
+            category="Shoes",
+            base_price=Decimal('3000'),
+            current_price=Decimal('2500')
+        )
+        nike = Product(
+            id="NIKE001",
+            brand="NIKE",
+            brand_tier=BrandTier.PREMIUM,
+            category="Shoes",
+            base_price=Decimal('5000'),
+            current_price=Decimal('5000')
+        )
+        return [
+            CartItem(product=puma, quantity=2, size="M", price=puma.base_price),
+            CartItem(product=puma_lower, quantity=1, size="9", price=puma_lower.base_price),
+            CartItem(product=nike, quantity=1, size="10", price=nike.base_price)
+        ]
+
+    def test_snapshot_aggregates(self):
+        """Test totals, subtotals and key sets computed from the cart"""
+        cart_items = self._cart_items()
+        snapshot = CartSnapshot.from_items(cart_items)
+
+        assert snapshot.total == Decimal('9100')
+        assert snapshot.listed_total == Decimal('10000')
+        assert snapshot.brand_totals == {"PUMA": Decimal('4100'), "NIKE": Decimal('5000')}
+        assert snapshot.category_totals == {"T-shirts": Decimal('1600'), "Shoes": Decimal('7500')}
+        assert snapshot.brands == {"PUMA", "Puma", "NIKE"}
+        assert snapshot.normalized_brands == {"PUMA", "NIKE"}
+        assert snapshot.categories == {"T-shirts", "Shoes"}
+        assert snapshot.brand_total("puma") == Decimal('4100')
+        assert snapshot.brand_total("ZARA") == Decimal('0')
+        assert snapshot.categories_total(["Shoes", "Jeans"]) == Decimal('7500')
+        assert list(snapshot) == cart_items
+        assert len(snapshot) == 3
+
+    def test_snapshot_is_immutable_and_reused(self):
+        """Test that a snapshot cannot be modified and is not rebuilt"""
+        snapshot = CartSnapshot.from_items(self._cart_items())
+
+        assert CartSnapshot.of(snapshot) is snapshot
+        with pytest.raises(Exception):
+            snapshot.total = Decimal('0')
+        with pytest.raises(TypeError):
+            snapshot.brand_totals["ZARA"] = Decimal('1')
+
+    def test_empty_snapshot(self):
+        """Test snapshot of an empty cart"""
+        snapshot = CartSnapshot.from_items([])
+
+        assert snapshot.total == Decimal('0')
+        assert snapshot.brands == frozenset()
+        assert len(snapshot) == 0
+
+
 class TestCustomerProfile:
     """Test suite for CustomerProfile model"""
 
@@ -0,0 +1,180 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.discount import DiscountedPrice
+from src.models.pricing_request import CartPricingRequest
+from src.models.money import MoneyMode, apply_bps, from_paise, round_to_paisa, to_bps, to_paise
+from src.discount_types.category_discount import CategoryDiscount
+
+
+BRANDS = ["PUMA", "NIKE", "ADIDAS", "ZARA", "H&M"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Accessories", "Jackets"]
+VOUCHERS = [None, "SUPER69", "PREMIUM20", "NEWUSER15", "BRAND_EXCLUSION", "CATEGORY_RESTRICTION", "TIER_DISCOUNT"]
+
+
+def random_cart(rng):
+    """Random cart with prices in whole paise"""
+    cart_items = []
+    for i in range(rng.randint(0, 6)):
+        price = Decimal(rng.randrange(100, 900000)).scaleb(-2)
+        product = Product(
+            id=f"P{i}",
+            brand=rng.choice(BRANDS),
+            brand_tier=BrandTier.REGULAR,
+            category=rng.choice(CATEGORIES),
+            base_price=price,
+            current_price=price
+        )
+        cart_items.append(CartItem(product=product, quantity=rng.randint(1, 4), size="M", price=price))
+    return cart_items
+
+
+def assert_equivalent(decimal_result: DiscountedPrice, fixed_result: DiscountedPrice):
+    """Fixed-point amounts equal the Decimal amounts rounded half-up to the paisa"""
+    assert fixed_result.original_price == decimal_result.original_price
+    assert fixed_result.applied_discounts == {
+        name: round_to_paisa(amount) for name, amount in decimal_result.applied_discounts.items()
+    }
+    expected_final = max(fixed_result.original_price - sum(fixed_result.applied_discounts.values()), Decimal('0'))
+    assert fixed_result.final_price == expected_final
+    assert abs(fixed_result.final_price - decimal_result.final_price) <= Decimal('0.01') * len(decimal_result.applied_discounts)
+
+
+class TestMoneyHelpers:
+    """Test suite for fixed-point money helpers"""
+
+    def test_paise_conversion(self):
+        assert to_paise(Decimal('1234.56')) == 123456
+        assert to_paise(Decimal('0.005')) == 1
+        assert to_paise(Decimal('0.004')) == 0
+        assert to_paise(10.0) == 1000
+        assert from_paise(123456) == Decimal('1234.56')
+
+    def test_product_paise_is_lazy(self):
+        product = Product(id="P1", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Jeans",
+                          base_price=Decimal("NaN"), current_price=Decimal("999.99"))
+        assert product.current_price_paise == 99999
+        product.current_price = Decimal("899.99")
+        assert product.current_price_paise == 89999
+
+    def test_basis_points(self):
+        assert to_bps(Decimal('69')) == 6900
+        assert to_bps(12.5) == 1250
+        assert apply_bps(10000, 1000) == 1000
+        assert apply_bps(5, 1000) == 1  # 0.5 paise rounds half-up
+        assert apply_bps(4, 1000) == 0
+        assert apply_bps(-5, 1000) == -1
+
+
+class TestFixedPointEquivalence:
+    """Fixed-point money mode against the Decimal path"""
+
+    @pytest.fixture
+    def customers(self):
+        return [
+            CustomerProfile(id=f"C_{tier}", name=tier, email=f"{tier}@example.com", tier=tier, loyalty_points=1500)
+            for tier in ["premium", "regular", "budget"]
+        ]
+
+    @pytest.mark.asyncio
+    async def test_calculate_cart_discounts_equivalence(self, customers):
+        rng = random.Random(3)
+        decimal_service = DiscountService()
+        fixed_service = DiscountService(money_mode=MoneyMode.FIXED_POINT)
+        payments = [None, PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT"), PaymentInfo(method="UPI")]
+
+        for _ in range(300):
+            cart_items = random_cart(rng)
+            kwargs = dict(
+                cart_items=cart_items,
+                customer=rng.choice(customers),
+                payment_info=rng.choice(payments),
+                voucher_code=rng.choice(VOUCHERS)
+            )
+            decimal_result = await decimal_service.calculate_cart_discounts(**kwargs)
+            fixed_result = await fixed_service.calculate_cart_discounts(**kwargs)
+            assert_equivalent(decimal_result, fixed_result)
+
+    @pytest.mark.asyncio
+    async def test_batch_equivalence(self, customers):
+        rng = random.Random(5)
+        fixed_service = DiscountService(money_mode=MoneyMode.FIXED_POINT)
+        payment = PaymentInfo(method="CARD", bank_name="HDFC", card_type="DEBIT")
+        requests = [
+            CartPricingRequest(random_cart(rng), rng.choice(customers), payment, rng.choice(VOUCHERS))
+            for _ in range(100)
+        ]
+
+        batch_results = await fixed_service.calculate_cart_discounts_batch(requests)
+
+        for request, result in zip(requests, batch_results):
+            assert result == await fixed_service.calculate_cart_discounts(
+                request.cart_items, request.customer, request.payment_info, request.voucher_code
+            )
+
+    @pytest.mark.asyncio
+    async def test_apply_advanced_discounts_equivalence(self, customers):
+        rng = random.Random(11)
+        decimal_service = DiscountService()
+        fixed_service = DiscountService(money_mode=MoneyMode.FIXED_POINT)
+        today = date.today()
+
+        def configs():
+            return [
+                {"type": "brand", "brand": "nike", "discount_percentage": Decimal("33.33"), "max_discount": Decimal("1500.50")},
+                {"type": "tier", "required_tier": "regular", "discount_percentage": Decimal("7.5"),
+                 "max_discount": Decimal("999.99"), "min_cart_value": Decimal("2500")},
+                {"type": "seasonal", "season_name": "Monsoon", "start_date": today - timedelta(days=1),
+                 "end_date": today + timedelta(days=1), "discount_percentage": Decimal("12.25"),
+                 "applicable_categories": ["Shoes", "Jackets"]},
+                {"type": "loyalty", "points_threshold": 1000, "discount_percentage": Decimal("2.5")},
+            ]
+
+        for _ in range(200):
+            cart_items = random_cart(rng)
+            customer = rng.choice(customers)
+            decimal_result = await decimal_service.apply_advanced_discounts(cart_items, customer, discount_configs=configs())
+            fixed_result = await fixed_service.apply_advanced_discounts(cart_items, customer, discount_configs=configs())
+            assert_equivalent(decimal_result, fixed_result)
+
+    @pytest.mark.asyncio
+    async def test_rank_vouchers_equivalence(self, customers):
+        rng = random.Random(13)
+        decimal_service = DiscountService()
+        fixed_service = DiscountService(money_mode=MoneyMode.FIXED_POINT)
+
+        for _ in range(100):
+            cart_items = random_cart(rng)
+            customer = rng.choice(customers)
+            decimal_ranking = await decimal_service.rank_vouchers(cart_items, customer, top_k=10)
+            fixed_ranking = await fixed_service.rank_vouchers(cart_items, customer, top_k=10)
+            assert dict(fixed_ranking) == {code: round_to_paisa(savings) for code, savings in decimal_ranking}
+
+    def test_category_discount_equivalence(self):
+        def products():
+            return [
+                Product(id="A", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                        base_price=Decimal('999.99'), current_price=Decimal('999.99')),
+                Product(id="B", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Jeans",
+                        base_price=Decimal('1999.00'), current_price=Decimal('1999.00')),
+            ]
+
+        discount = CategoryDiscount(category="T-shirts", discount_percentage=Decimal("10"))
+        decimal_products = products()
+        fixed_products = products()
+
+        decimal_amounts = discount.apply_discount(decimal_products)
+        fixed_amounts = discount.apply_discount_paise(fixed_products)
+
+        assert fixed_amounts == {name: to_paise(amount) for name, amount in decimal_amounts.items()}
+        assert fixed_products[0].current_price == Decimal('899.99')
+        assert fixed_products[0].current_price_paise == 89999
+        assert fixed_products[1].current_price == decimal_products[1].current_price
@@ -0,0 +1,280 @@
+import asyncio
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.services.order_repricing import Checkpoint, cart_request_from_dict, main, reprice_order_log
+from src.models.pricing_request import CartPricingRequest
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+BRANDS = ["PUMA", "NIKE", "ZARA", "H&M"]
+
+
+def order(rng: random.Random, i: int):
+    data = {
+        "order_id": f"O{i}",
+        "customer": {"id": f"C{i}", "tier": rng.choice(["regular", "premium"])},
+        "items": [
+            {"product": {"id": f"P{j}", "brand": rng.choice(BRANDS), "category": rng.choice(["Shoes", "T-shirts"]),
+                         "base_price": str(rng.randrange(100, 3000)), "current_price": str(rng.randrange(100, 3000))},
+             "quantity": rng.randrange(1, 3), "size": "M"}
+            for j in range(rng.randrange(1, 4))
+        ],
+        "voucher_code": rng.choice([None, "SUPER69", "PREMIUM20"])
+    }
+    if rng.random() < 0.3:
+        data["payment"] = {"method": "CARD", "bank_name": "ICICI", "card_type": "CREDIT"}
+    return data
+
+
+@pytest.fixture
+def order_log(tmp_path):
+    rng = random.Random(19)
+    lines = [json.dumps(order(rng, i)) for i in range(300)]
+    lines[40] = "not json"
+    lines[41] = ""
+    lines[42] = json.dumps({"order_id": "BAD", "customer": {"id": "C", "tier": "regular"}})
+    path = tmp_path / "orders.jsonl"
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class FailingService(DiscountService):
+    """Crashes when it reaches the cart of order fail_at"""
+
+    def __init__(self, fail_at: str):
+        super().__init__()
+        self.fail_at = fail_at
+
+    async def calculate_cart_discounts(self, cart_items, customer, payment_info=None, voucher_code=None,
+                                       explain=False):
+        if customer.id == self.fail_at:
+            raise RuntimeError("crash")
+        return await super().calculate_cart_discounts(cart_items, customer, payment_info, voucher_code, explain)
+
+
+class CrashingFile:
+    """Binary output file that fails, like a full disk, when asked to write the record of crash_at"""
+
+    def __init__(self, output_file, crash_at: bytes):
+        self.output_file = output_file
+        self.crash_at = crash_at
+
+    def write(self, data: bytes) -> int:
+        if self.crash_at in data:
+            raise OSError("No space left on device")
+        return self.output_file.write(data)
+
+    def flush(self):
+        self.output_file.flush()
+
+    def fileno(self) -> int:
+        return self.output_file.fileno()
+
+
+class TestStreamCartDiscounts:
+    """Test suite for DiscountService.stream_cart_discounts"""
+
+    @pytest.fixture
+    def requests(self):
+        rng = random.Random(5)
+        return [cart_request_from_dict(order(rng, i)) for i in range(50)]
+
+    @pytest.mark.asyncio
+    async def test_results_in_order(self, requests):
+        service = DiscountService()
+
+        async def source():
+            for request in requests:
+                await asyncio.sleep(0)
+                yield request
+
+        streamed = [result async for result in service.stream_cart_discounts(source(), concurrency=4)]
+
+        expected = [
+            await service.calculate_cart_discounts(r.cart_items, r.customer, r.payment_info, r.voucher_code)
+            for r in requests
+        ]
+        assert streamed == expected
+        assert [result async for result in service.stream_cart_discounts(requests)] == expected
+
+    @pytest.mark.asyncio
+    async def test_backpressure(self, requests):
+        pulled = 0
+
+        def source():
+            nonlocal pulled
+            for request in requests:
+                pulled += 1
+                yield request
+
+        stream = DiscountService().stream_cart_discounts(source(), concurrency=3)
+        for taken in range(1, 6):
+            await stream.__anext__()
+            # Only the carts in flight are read ahead of the consumer
+            assert pulled <= taken + 3
+        await stream.aclose()
+        assert pulled <= 8
+
+    @pytest.mark.asyncio
+    async def test_error_propagates(self, requests):
+        service = FailingService(fail_at=requests[10].customer.id)
+        results = []
+
+        with pytest.raises(RuntimeError):
+            async for result in service.stream_cart_discounts(requests, concurrency=4):
+                results.append(result)
+        assert len(results) == 10
+
+    @pytest.mark.asyncio
+    async def test_return_exceptions(self, requests):
+        service = FailingService(fail_at=requests[10].customer.id)
+
+        results = [result async for result in service.stream_cart_discounts(
+            requests, concurrency=4, return_exceptions=True
+        )]
+
+        assert len(results) == 50
+        assert isinstance(results[10], RuntimeError)
+        assert not any(isinstance(result, Exception) for result in results[:10] + results[11:])
+
+    @pytest.mark.asyncio
+    async def test_invalid_concurrency(self, requests):
+        with pytest.raises(ValueError):
+            await DiscountService().stream_cart_discounts(requests, concurrency=0).__anext__()
+
+
+class TestOrderRepricing:
+    """Test suite for the order log repricing CLI"""
+
+    def test_cart_request_from_dict(self):
+        request = cart_request_from_dict(json.loads(
+            '{"customer": {"id": "C1", "tier": "premium"}, "voucher_code": "SUPER69",'
+            ' "items": [{"product": {"id": "P1", "brand": "PUMA", "brand_tier": "premium",'
+            ' "category": "Shoes", "base_price": 1000.50}, "quantity": 2, "size": "9"}]}',
+            parse_float=Decimal
+        ))
+
+        product = Product(id="P1", brand="PUMA", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                          base_price=Decimal("1000.50"), current_price=Decimal("1000.50"))
+        assert request == CartPricingRequest(
+            cart_items=[CartItem(product=product, quantity=2, size="9", price=Decimal("1000.50"))],
+            customer=CustomerProfile(id="C1", name="", email="", tier="premium", loyalty_points=Decimal("0")),
+            voucher_code="SUPER69"
+        )
+        with pytest.raises(ValueError, match="customer"):
+            cart_request_from_dict({"items": []})
+
+    @pytest.mark.parametrize("path, value", [
+        (("customer", "tier"), None),
+        (("customer", "id"), 7),
+        (("items", 0, "product", "brand"), ["PUMA"]),
+        (("items", 0, "product", "category"), None),
+        (("items", 0, "product", "id"), 1),
+        (("items", 0, "quantity"), "2"),
+        (("items", 0, "quantity"), 0),
+        (("items", 0, "quantity"), True),
+        (("voucher_code",), 69),
+    ])
+    def test_cart_request_field_types(self, path, value):
+        data = order(random.Random(1), 0)
+        target = data
+        for key in path[:-1]:
+            target = target[key]
+        target[path[-1]] = value
+
+        with pytest.raises(ValueError):
+            cart_request_from_dict(data)
+
+    @pytest.mark.parametrize("value, message", [
+        ("abc", "base_price must be a decimal amount, got 'abc'"),
+        (None, "base_price must be a decimal amount"),
+        (Decimal("1E+400"), "base_price must be a decimal amount"),
+        ("NaN", "base_price must be a finite, non-negative amount"),
+        ("-Infinity", "base_price must be a finite, non-negative amount"),
+        (float("inf"), "base_price must be a finite, non-negative amount"),
+        ("-1", "base_price must be a finite, non-negative amount"),
+    ])
+    def test_cart_request_amounts(self, value, message):
+        data = order(random.Random(1), 0)
+        data["items"][0]["product"]["base_price"] = value
+
+        with pytest.raises(ValueError) as error:
+            cart_request_from_dict(data)
+        assert str(error.value).startswith(message)
+
+    @pytest.mark.asyncio
+    async def test_reprice(self, order_log, tmp_path):
+        output = tmp_path / "prices.jsonl"
+        reports = []
+
+        with open(order_log, "rb") as input_file, open(output, "wb") as output_file:
+            stats = await reprice_order_log(DiscountService(), input_file, output_file, concurrency=4,
+                                            progress=reports.append, progress_interval=0)
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert (stats.records, stats.priced, stats.errors) == (300, 297, 2)
+        assert len(records) == 299  # The blank line has no output
+        assert records[40] == {"order_id": None, "line": 41, "error": "Expecting value: line 1 column 1 (char 0)"}
+        assert records[41] == {"order_id": "BAD", "line": 43, "error": "missing field 'items'"}
+        assert [record["order_id"] for record in records[:3]] == ["O0", "O1", "O2"]
+        assert records[-1]["order_id"] == "O299"
+        assert Decimal(records[0]["final_price"]) <= Decimal(records[0]["original_price"])
+        assert reports and reports[-1].records == 300
+
+    def test_malformed_orders_become_error_records(self, tmp_path):
+        rng = random.Random(3)
+        lines = [order(rng, i) for i in range(5)]
+        lines[1]["customer"]["tier"] = None
+        lines[1]["voucher_code"] = "PREMIUM20"
+        order_log = tmp_path / "orders.jsonl"
+        order_log.write_text("\n".join(json.dumps(line) for line in lines) + "\n")
+        output = tmp_path / "prices.jsonl"
+
+        assert main([str(order_log), "-o", str(output), "--progress-interval", "0"]) == 0
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert len(records) == 5
+        assert records[1] == {"order_id": "O1", "line": 2, "error": "tier must be a string, got None"}
+        assert all("final_price" in record for record in records[:1] + records[2:])
+
+    @pytest.mark.asyncio
+    async def test_pricing_errors_become_error_records(self, order_log, tmp_path):
+        output = tmp_path / "prices.jsonl"
+
+        with open(order_log, "rb") as input_file, open(output, "wb") as output_file:
+            stats = await reprice_order_log(FailingService(fail_at="C250"), input_file, output_file, concurrency=4)
+
+        records = [json.loads(line) for line in output.read_text().splitlines()]
+        assert (stats.records, stats.priced, stats.errors) == (300, 296, 3)
+        assert records[249] == {"order_id": "O250", "line": 251, "error": "pricing failed: RuntimeError: crash"}
+        assert records[-1]["order_id"] == "O299"
+
+    def test_resume_after_crash(self, order_log, tmp_path):
+        expected = tmp_path / "expected.jsonl"
+        assert main([str(order_log), "-o", str(expected), "--progress-interval", "0"]) == 0
+
+        output = tmp_path / "prices.jsonl"
+        checkpoint = str(tmp_path / "prices.ckpt")
+
+        async def crash():
+            with open(order_log, "rb") as input_file, open(output, "wb") as output_file:
+                await reprice_order_log(DiscountService(), input_file, CrashingFile(output_file, b'"O250"'),
+                                        concurrency=4, checkpoint_path=checkpoint, checkpoint_every=100)
+
+        with pytest.raises(OSError):
+            asyncio.run(crash())
+        saved = Checkpoint.load(checkpoint)
+        assert saved.records == 200
+        assert output.stat().st_size > saved.output_offset  # Written past the checkpoint
+
+        assert main([str(order_log), "-o", str(output), "--checkpoint", checkpoint,
+                     "--checkpoint-every", "100", "--progress-interval", "0"]) == 0
+
+        assert output.read_bytes() == expected.read_bytes()
+        assert Checkpoint.load(checkpoint).records == 300
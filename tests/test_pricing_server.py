@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.services.order_repricing import cart_request_from_dict, discounted_price_to_dict
+from src.services.pricing_server import MicroBatcher, PricingClient, PricingServer
+
+
+def order_body(brand="PUMA", tier="regular", voucher_code=None, price="2000"):
+    return {
+        "customer": {"id": "C1", "tier": tier},
+        "items": [{"product": {"id": "P1", "brand": brand, "brand_tier": "premium", "category": "T-shirts",
+                               "base_price": price, "current_price": price}, "quantity": 1, "size": "M"}],
+        "voucher_code": voucher_code
+    }
+
+
+class TestMicroBatcher:
+    """Test suite for MicroBatcher"""
+
+    @pytest.mark.asyncio
+    async def test_batches_concurrent_submits(self):
+        calls = []
+
+        async def handler(items):
+            calls.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(handler, max_batch_size=4, max_wait=0.01)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(10)))
+
+        assert results == [i * 2 for i in range(10)]
+        assert calls == [[0, 1, 2, 3], [4, 5, 6, 7], [8, 9]]
+        assert (batcher.batches, batcher.items) == (3, 10)
+
+    @pytest.mark.asyncio
+    async def test_failing_item_does_not_fail_batch(self):
+        async def handler(items):
+            if 3 in items:
+                raise ValueError("bad item")
+            return items
+
+        batcher = MicroBatcher(handler, max_batch_size=8, max_wait=0.01)
+        results = await asyncio.gather(*(batcher.submit(i) for i in range(5)), return_exceptions=True)
+
+        assert results[:3] == [0, 1, 2] and results[4] == 4
+        assert isinstance(results[3], ValueError)
+
+
+class TestPricingServer:
+    """Test suite for the HTTP pricing server"""
+
+    @pytest.mark.asyncio
+    async def test_cart_discounts_match_service(self):
+        service = DiscountService()
+        bodies = [order_body(), order_body("ZARA", voucher_code="SUPER69"), order_body(price="500")]
+
+        async with PricingServer(service, port=0, max_batch_size=8, max_wait=0.01) as server:
+            async def call(body):
+                async with PricingClient(port=server.port) as client:
+                    return await client.request("POST", "/v1/cart-discounts", body)
+
+            responses = await asyncio.gather(*(call(body) for body in bodies))
+
+        for body, (status, payload) in zip(bodies, responses):
+            request = cart_request_from_dict(body)
+            expected = await service.calculate_cart_discounts(
+                request.cart_items, request.customer, request.payment_info, request.voucher_code
+            )
+            assert status == 200
+            assert payload == discounted_price_to_dict(expected)
+
+    @pytest.mark.asyncio
+    async def test_internal_errors_are_not_exposed(self, caplog):
+        class FailingService(DiscountService):
+            def explain_discount_code(self, code, cart_items, customer):
+                raise RuntimeError("database password is hunter2")
+
+        async with PricingServer(FailingService(), port=0) as server:
+            async with PricingClient(port=server.port) as client:
+                status, payload = await client.request(
+                    "POST", "/v1/validate-discount-code", dict(order_body(), code="SUPER69")
+                )
+
+        assert (status, payload) == (500, {"error": "internal server error"})
+        assert "hunter2" in caplog.text
+
+    @pytest.mark.asyncio
+    async def test_keep_alive(self):
+        async with PricingServer(DiscountService(), port=0) as server:
+            async with PricingClient(port=server.port) as client:
+                writer = client._writer
+                for _ in range(3):
+                    status, payload = await client.request("POST", "/v1/cart-discounts", order_body())
+                    assert status == 200
+                assert client._writer is writer  # Same connection throughout
+                assert await client.request("GET", "/health") == (200, {"status": "ok"})
+
+    @pytest.mark.asyncio
+    async def test_validate_and_advanced(self):
+        async with PricingServer(DiscountService(), port=0) as server:
+            async with PricingClient(port=server.port) as client:
+                status, payload = await client.request(
+                    "POST", "/v1/validate-discount-code", dict(order_body(tier="regular"), code="PREMIUM20")
+                )
+                assert (status, payload) == (200, {"code": "PREMIUM20", "valid": False, "reason": "tier_requirement"})
+
+                status, payload = await client.request("POST", "/v1/advanced-discounts", dict(
+                    order_body("NIKE"),
+                    discount_configs=[{"type": "brand", "brand": "NIKE", "discount_percentage": 25,
+                                       "max_discount": 1000}]
+                ))
+                assert status == 200
+                assert payload["applied_discounts"] == {"NIKE Brand Discount": "500.00"}
+
+    @pytest.mark.asyncio
+    async def test_errors(self):
+        async with PricingServer(DiscountService(), port=0) as server:
+            async with PricingClient(port=server.port) as client:
+                assert (await client.request("POST", "/v1/cart-discounts", {"items": []}))[0] == 400
+                assert await client.request("POST", "/v1/cart-discounts", order_body(price="NaN")) == (
+                    400, {"error": "base_price must be a finite, non-negative amount, got 'NaN'"}
+                )
+                assert await client.request("POST", "/v1/cart-discounts", order_body(price="abc")) == (
+                    400, {"error": "base_price must be a decimal amount, got 'abc'"}
+                )
+                assert (await client.request("GET", "/v1/cart-discounts"))[0] == 405
+                assert (await client.request("GET", "/nowhere"))[0] == 404
+                # The connection survives request errors
+                assert (await client.request("POST", "/v1/cart-discounts", order_body()))[0] == 200
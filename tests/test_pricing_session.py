@@ -0,0 +1,114 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.models.money import MoneyMode
+from src.models.product import Product, BrandTier
+from src.models.cart import Cart, CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+
+BRANDS = ["PUMA", "NIKE", "ADIDAS", "ZARA", "H&M", "puma"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Jackets"]
+VOUCHERS = [None, "SUPER69", "PREMIUM20", "NEWUSER15", "BRAND_EXCLUSION", "CATEGORY_RESTRICTION", "TIER_DISCOUNT",
+            "NOPE"]
+PAYMENTS = [None, PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT"), PaymentInfo(method="UPI")]
+
+
+def random_item(rng: random.Random, i: int) -> CartItem:
+    base_price = Decimal(rng.randrange(10000, 500000)) / 100
+    current_price = base_price * rng.choice([Decimal("1"), Decimal("0.6"), Decimal("0.85")])
+    product = Product(id=f"P{i}", brand=rng.choice(BRANDS), brand_tier=BrandTier.REGULAR,
+                      category=rng.choice(CATEGORIES), base_price=base_price, current_price=current_price)
+    return CartItem(product=product, quantity=rng.randrange(1, 4), size="M", price=base_price)
+
+
+class TestCartPricingSession:
+    """Test suite for incremental cart repricing"""
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="premium", loyalty_points=0)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("money_mode", [MoneyMode.DECIMAL, MoneyMode.FIXED_POINT])
+    @pytest.mark.parametrize("seed", range(8))
+    async def test_matches_full_recompute(self, customer, money_mode, seed):
+        """Property: after any sequence of changes the price equals a full recompute"""
+        rng = random.Random(seed)
+        service = DiscountService(money_mode=money_mode)
+        session = service.pricing_session(customer, Cart(items=[random_item(rng, i) for i in range(3)]))
+
+        for step in range(120):
+            items = session.cart.items
+            operation = rng.random()
+            if operation < 0.35 or not items:
+                session.add_item(random_item(rng, step + 10))
+            elif operation < 0.55:
+                session.remove_item(rng.choice(items))
+            elif operation < 0.8:
+                session.set_quantity(rng.choice(items), rng.randrange(0, 5))
+            elif operation < 0.9:
+                session.set_voucher_code(rng.choice(VOUCHERS))
+            else:
+                session.set_payment_info(rng.choice(PAYMENTS))
+
+            expected = await service.calculate_cart_discounts(
+                list(session.cart.items), customer, session.payment_info, session.voucher_code
+            )
+            assert session.price() == expected, f"step {step}"
+
+    def test_only_affected_discounts_recomputed(self, customer):
+        service = DiscountService()
+        lines = []
+        for i, brand in enumerate(["PUMA", "NIKE", "ADIDAS"] * 20):
+            product = Product(id=f"P{i}", brand=brand, brand_tier=BrandTier.PREMIUM, category="Shoes",
+                              base_price=Decimal("1000"), current_price=Decimal("1000"))
+            lines.append(CartItem(product=product, quantity=1, size="9", price=product.base_price))
+        session = service.pricing_session(customer, Cart(items=lines), voucher_code="SUPER69")
+        session.price()
+
+        evaluations = session.evaluations
+        session.set_quantity(lines[0], 3)  # A PUMA line
+        result = session.price()
+
+        # The PUMA brand discount and the voucher, not NIKE's or ADIDAS's
+        assert session.evaluations - evaluations == 2
+        assert session.price() == result
+        assert session.evaluations - evaluations == 2  # Unchanged cart, nothing recomputed
+
+    @pytest.mark.asyncio
+    async def test_picks_up_discount_code_changes(self, customer):
+        service = DiscountService()
+        product = Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Jeans",
+                          base_price=Decimal("3000"), current_price=Decimal("3000"))
+        cart = Cart(items=[CartItem(product=product, quantity=1, size="32", price=product.base_price)])
+        session = service.pricing_session(customer, cart, voucher_code="FLASH")
+        assert session.price().applied_discounts == {}
+
+        service.discount_codes["FLASH"] = {
+            "discount_percentage": Decimal("10"), "max_discount": Decimal("1000"), "tier_requirement": None,
+            "excluded_brands": [], "allowed_categories": [], "min_cart_value": Decimal("0")
+        }
+
+        assert session.price() == await service.calculate_cart_discounts(cart.items, customer, voucher_code="FLASH")
+        assert session.price().applied_discounts == {"Voucher FLASH": Decimal("300")}
+
+    def test_totals(self, customer):
+        rng = random.Random(1)
+        session = DiscountService().pricing_session(customer)
+        items = [random_item(rng, i) for i in range(10)]
+        for item in items:
+            session.add_item(item)
+        for item in items[:5]:
+            session.remove_item(item)
+
+        expected = Cart(items=items[5:])
+        assert session.cart.items == expected.items
+        assert session.totals.total == sum(item.product.current_price * item.quantity for item in items[5:])
+        assert session.totals.category_totals.keys() == {item.product.category for item in items[5:]}
+        with pytest.raises(ValueError):
+            session.remove_item(items[0])
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode
+from src.models.pricing_trace import PricingTrace, TraceSampler
+from src.discount_types.base_discount import BaseDiscount
+from src.discount_types.stacking_solver import ExclusivityGroup, StackingSolver
+
+
+class SlowDiscount(BaseDiscount):
+    """Discount that takes delay seconds to check"""
+
+    def __init__(self, delay: float):
+        super().__init__(discount_id="SLOW", discount_name="Slow Discount")
+        self.delay = delay
+
+    async def is_applicable(self, cart_items, customer, payment_info=None, **kwargs) -> bool:
+        await asyncio.sleep(self.delay)
+        return True
+
+    async def calculate_discount(self, cart_items, customer, payment_info=None, **kwargs) -> Decimal:
+        return Decimal("10")
+
+
+class TestPricingTrace:
+    """Test suite for pricing decision traces"""
+
+    @pytest.fixture
+    def cart_items(self):
+        nike = Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                       base_price=Decimal('5000'), current_price=Decimal('5000'))
+        zara = Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                       base_price=Decimal('1000'), current_price=Decimal('1000'))
+        return [CartItem(product=nike, quantity=1, size="9", price=nike.base_price),
+                CartItem(product=zara, quantity=1, size="M", price=zara.base_price)]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=1500)
+
+    @pytest.fixture
+    def payment_info(self):
+        return PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+
+    @pytest.mark.asyncio
+    async def test_explain_records_rules_and_caps(self, cart_items, customer, payment_info):
+        service = DiscountService()
+
+        result = await service.calculate_cart_discounts(cart_items, customer, payment_info, "PREMIUM20", explain=True)
+        trace = result.trace
+
+        assert [step.rule for step in trace.steps] == ["NIKE Brand Discount", "ICICI Bank Offer", "Voucher PREMIUM20"]
+        brand = trace.step("NIKE Brand Discount")
+        assert brand.outcome == "applied"
+        assert brand.base == Decimal("5000")
+        assert brand.uncapped == Decimal("500")
+        assert brand.cap == brand.amount == Decimal("200")
+        bank = trace.step("ICICI Bank Offer")
+        assert bank.amount == Decimal("600") and bank.cap is None
+        voucher = trace.step("Voucher PREMIUM20")
+        assert voucher.outcome == "rejected"
+        assert voucher.reason == "tier_requirement"
+        assert trace.original_price == result.original_price
+        assert trace.final_price == result.final_price
+        assert "Voucher PREMIUM20: rejected (tier_requirement)" in trace.explain()
+
+    @pytest.mark.asyncio
+    async def test_trace_does_not_change_results(self, cart_items, customer, payment_info):
+        for money_mode in MoneyMode:
+            service = DiscountService(money_mode=money_mode)
+            plain = await service.calculate_cart_discounts(cart_items, customer, payment_info, "SUPER69")
+            traced = await service.calculate_cart_discounts(cart_items, customer, payment_info, "SUPER69", explain=True)
+
+            assert plain.trace is None
+            assert traced == plain
+            assert traced.trace.money_mode is money_mode
+            assert traced.trace.to_dict()["final_price"] == str(plain.final_price)
+
+    @pytest.mark.asyncio
+    async def test_fixed_point_trace_in_paise(self, cart_items, customer):
+        service = DiscountService(money_mode=MoneyMode.FIXED_POINT)
+
+        result = await service.calculate_cart_discounts(cart_items, customer, voucher_code="SUPER69", explain=True)
+        voucher = result.trace.step("Voucher SUPER69")
+
+        assert voucher.base == 600000
+        assert voucher.uncapped == 414000
+        assert voucher.cap == voucher.amount == 100000
+        assert json.loads(json.dumps(result.trace.to_dict()))["steps"][1]["cap"] == "1000.00"
+
+    @pytest.mark.asyncio
+    async def test_sampler_sink_and_rate(self, cart_items, customer):
+        traces = []
+        service = DiscountService(tracer=TraceSampler(rate=0.5, sink=traces.append, attach=False,
+                                                      rng=random.Random(3)))
+
+        results = [await service.calculate_cart_discounts(cart_items, customer) for _ in range(200)]
+
+        assert 60 < len(traces) < 140
+        assert all(result.trace is None for result in results)
+        assert all(trace.entry_point == "calculate_cart_discounts" for trace in traces)
+
+        never = DiscountService(tracer=TraceSampler(rate=0.0, sink=traces.append))
+        count = len(traces)
+        result = await never.calculate_cart_discounts(cart_items, customer)
+        assert result.trace is None and len(traces) == count
+
+        with pytest.raises(ValueError):
+            TraceSampler(rate=1.5)
+
+    @pytest.mark.asyncio
+    async def test_traced_calls_bypass_cache(self, cart_items, customer):
+        from src.services.result_cache import PricingResultCache
+        service = DiscountService(result_cache=PricingResultCache())
+
+        await service.calculate_cart_discounts(cart_items, customer)
+        traced = await service.calculate_cart_discounts(cart_items, customer, explain=True)
+        cached = await service.calculate_cart_discounts(cart_items, customer)
+
+        assert traced.trace is not None
+        assert cached.trace is None
+
+    @pytest.mark.asyncio
+    async def test_advanced_discounts_trace(self, cart_items, customer):
+        service = DiscountService()
+        configs = [
+            {"type": "brand", "brand": "NIKE", "discount_percentage": Decimal("10")},
+            {"type": "brand", "brand": "ZARA", "discount_percentage": Decimal("20")},
+            {"type": "tier", "required_tier": "premium", "discount_percentage": Decimal("5")},
+            {"type": "tier", "required_tier": "regular", "discount_percentage": Decimal("50"),
+             "max_discount": Decimal("300")}
+        ]
+        solver = StackingSolver(
+            groups=[ExclusivityGroup("brands", ("BRAND_NIKE", "BRAND_ZARA"))],
+            max_total_discount=Decimal("700")
+        )
+
+        result = await service.apply_advanced_discounts(
+            cart_items, customer, discount_configs=configs, stacking_solver=solver, explain=True
+        )
+        trace = result.trace
+
+        assert trace.step("Premium Tier Discount").outcome == "not_applicable"
+        regular = trace.step("Regular Tier Discount")
+        assert regular.outcome == "applied" and regular.cap == Decimal("300")
+        assert trace.step("ZARA Brand Discount").outcome == "not_selected"
+        stacking = trace.step("Stacking caps")
+        assert stacking.uncapped == Decimal("800")
+        assert stacking.amount == Decimal("700")
+        assert trace.final_price == result.final_price == Decimal("5300")
+
+    @pytest.mark.asyncio
+    async def test_factory_timeout_traced(self, cart_items, customer):
+        service = DiscountService()
+        trace = PricingTrace("apply_multiple_discounts")
+
+        applied = await service.discount_factory.apply_multiple_discounts(
+            [SlowDiscount(delay=1)], cart_items, customer, concurrent=True, timeout=0.01, trace=trace
+        )
+
+        assert applied == {}
+        assert trace.step("Slow Discount").outcome == "timeout"
+
+    def test_final_price_floor(self):
+        trace = PricingTrace("calculate_cart_discounts")
+
+        trace.finish(Decimal("100"), Decimal("150"), Decimal("0"))
+
+        assert trace.step("Final price").uncapped == Decimal("-50")
+
+    def test_explain_discount_code(self, cart_items, customer):
+        service = DiscountService()
+
+        assert service.explain_discount_code("SUPER69", cart_items, customer) is None
+        assert service.explain_discount_code("NOPE", cart_items, customer) == "unknown_code"
+        assert service.explain_discount_code("BRAND_EXCLUSION", cart_items, customer) == "excluded_brand"
@@ -0,0 +1,121 @@
+import random
+from datetime import date, timedelta
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.money import MoneyMode
+from src.models.product_table import ProductTable
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.loyalty_discount import LoyaltyDiscount
+from src.discount_types.seasonal_discount import SeasonalDiscount
+from src.discount_types.tier_discount import TierDiscount
+
+
+BRANDS = ["PUMA", "Nike", "NIKE", "ZARA", "H&M"]
+CATEGORIES = ["T-shirts", "Jeans", "Shoes", "Accessories"]
+
+
+def random_products(rng, count):
+    return [
+        Product(
+            id=f"P{i}",
+            brand=rng.choice(BRANDS),
+            brand_tier=rng.choice(list(BrandTier)),
+            category=rng.choice(CATEGORIES),
+            base_price=Decimal(rng.randrange(100, 900000)).scaleb(-2),
+            current_price=Decimal(rng.randrange(100, 900000)).scaleb(-rng.choice([0, 1, 2]))
+        )
+        for i in range(count)
+    ]
+
+
+def discounts():
+    today = date.today()
+    return [
+        BrandDiscount("nike", Decimal("15"), max_discount=Decimal("700")),
+        BrandDiscount("PUMA", Decimal("40")),
+        TierDiscount("premium", Decimal("7.5"), min_cart_value=Decimal("1500")),
+        SeasonalDiscount("Summer", today - timedelta(days=1), today + timedelta(days=1),
+                         Decimal("10"), applicable_categories=["Shoes", "Jeans"], max_discount=Decimal("400")),
+        LoyaltyDiscount(points_threshold=100, discount_percentage=Decimal("3"))
+    ]
+
+
+class TestProductTable:
+    """Test suite for ProductTable"""
+
+    @pytest.fixture
+    def products(self):
+        return random_products(random.Random(11), 200)
+
+    def test_round_trip(self, products):
+        table = ProductTable.from_products(products)
+
+        assert table.to_products() == products
+        assert len(table) == len(products)
+        assert table.brand_codes.dtype == np.int32
+        assert table.base_price_paise.dtype == np.int64
+        assert len(table.brands) == len(set(BRANDS))
+
+    def test_lookup_by_id(self, products):
+        table = ProductTable.from_products(products)
+
+        assert table.row("P42") == 42
+        assert table.get("P42") == products[42]
+        assert table.get("missing") is None
+        assert "P7" in table and "missing" not in table
+        with pytest.raises(KeyError):
+            table.row("missing")
+
+    def test_filters(self, products):
+        table = ProductTable.from_products(products)
+
+        assert table.brand_mask("nike").tolist() == [product.brand.upper() == "NIKE" for product in products]
+        assert table.category_mask(["Shoes", "Jeans"]).tolist() == \
+            [product.category in ("Shoes", "Jeans") for product in products]
+        assert table.brand_tier_mask(BrandTier.PREMIUM).tolist() == \
+            [product.brand_tier is BrandTier.PREMIUM for product in products]
+
+    def test_rejects_lossy_prices_and_duplicate_ids(self, products):
+        with pytest.raises(ValueError):
+            ProductTable.from_products([Product("A", "PUMA", BrandTier.REGULAR, "Jeans", Decimal("10.005"), Decimal("10"))])
+        with pytest.raises(ValueError):
+            ProductTable.from_products([products[0], products[0]])
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("money_mode", [MoneyMode.DECIMAL, MoneyMode.FIXED_POINT])
+    async def test_discounts_evaluate_table_carts(self, products, money_mode):
+        rng = random.Random(5)
+        table = ProductTable.from_products(products)
+        customer = CustomerProfile(id="C1", name="John Doe", email="john@example.com", tier="premium", loyalty_points=500)
+        payment_info = PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+
+        for _ in range(30):
+            lines = rng.sample(products, rng.randint(1, 6))
+            quantities = [rng.randint(1, 3) for _ in lines]
+            cart_items = [CartItem(product=product, quantity=quantity, size="M", price=product.base_price)
+                          for product, quantity in zip(lines, quantities)]
+            expected = [await discount.evaluate(cart_items, customer, payment_info, money_mode) for discount in discounts()]
+
+            with patch.object(ProductTable, "product", side_effect=AssertionError("materialized a Product")):
+                cart = table.cart([product.id for product in lines], quantities, money_mode)
+                result = [await discount.evaluate(cart, customer, payment_info, money_mode) for discount in discounts()]
+
+            assert result == expected
+            assert len(cart) == len(lines)
+
+    def test_table_cart_lines_materialize_on_iteration(self, products):
+        table = ProductTable.from_products(products)
+
+        cart = table.cart(["P3", "P9"], [2, 1])
+
+        assert [(item.product, item.quantity, item.price) for item in cart] == \
+            [(products[3], 2, products[3].base_price), (products[9], 1, products[9].base_price)]
@@ -0,0 +1,140 @@
+import asyncio
+import sqlite3
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_registry import DiscountCodeRegistry, VoucherRule
+from src.services.discount_service import DiscountService
+from src.services.redemption_limits import (
+    CUSTOMER_LIMIT, GLOBAL_LIMIT, RedemptionLimiter, RedemptionLimitReached, SQLiteRedemptionStore
+)
+from src.models.customer import CustomerProfile
+
+
+class TestRedemptionLimits:
+    """Test suite for voucher redemption limits"""
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="premium", loyalty_points=0)
+
+    def test_global_and_customer_caps(self):
+        limiter = RedemptionLimiter(shards=4)
+
+        first = limiter.reserve("SUPER69", "A", max_total=3, max_per_customer=1)
+        with pytest.raises(RedemptionLimitReached) as error:
+            limiter.reserve("SUPER69", "A", max_total=3, max_per_customer=1)
+        assert error.value.reason == CUSTOMER_LIMIT
+
+        limiter.reserve("SUPER69", "B", max_total=3, max_per_customer=1)
+        limiter.commit(limiter.reserve("SUPER69", "C", max_total=3, max_per_customer=1))
+        assert limiter.check("SUPER69", "D", max_total=3) == GLOBAL_LIMIT
+        with pytest.raises(RedemptionLimitReached) as error:
+            limiter.reserve("SUPER69", "D", max_total=3, max_per_customer=1)
+        assert error.value.reason == GLOBAL_LIMIT
+
+        # A released reservation frees its redemption for anyone
+        limiter.release(first)
+        assert limiter.check("SUPER69", "D", max_total=3, max_per_customer=1) is None
+        assert limiter.redemptions("SUPER69") == (1, 1)
+        assert limiter.redemptions("SUPER69", "C") == (1, 0)
+        # Uncapped codes are only counted
+        assert limiter.check("PREMIUM20", "A") is None
+
+    def test_reservation_settles_once(self):
+        limiter = RedemptionLimiter()
+        reservation = limiter.reserve("SUPER69", "A", max_total=1)
+        limiter.commit(reservation)
+
+        with pytest.raises(ValueError):
+            limiter.commit(reservation)
+        with pytest.raises(ValueError):
+            limiter.release(reservation)
+        assert limiter.redemptions("SUPER69") == (1, 0)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_checkouts_never_exceed_cap(self):
+        limiter = RedemptionLimiter(shards=8)
+        outcomes = []
+
+        async def checkout(i):
+            try:
+                reservation = limiter.reserve("FLASH", f"C{i % 50}", max_total=100, max_per_customer=3)
+            except RedemptionLimitReached as error:
+                outcomes.append(error.reason)
+                return
+            await asyncio.sleep(0)
+            if i % 4 == 0:
+                limiter.release(reservation)
+                outcomes.append("released")
+            else:
+                limiter.commit(reservation)
+                outcomes.append("committed")
+
+        await asyncio.gather(*(checkout(i) for i in range(1000)))
+
+        # The first 100 reserve before any settles; a quarter are released
+        assert outcomes.count("committed") == 75
+        assert outcomes.count(GLOBAL_LIMIT) == 900
+        assert limiter.redemptions("FLASH") == (75, 0)
+        assert all(limiter.redemptions("FLASH", f"C{i}")[0] <= 3 for i in range(50))
+
+    def test_sqlite_store_persists_batched_commits(self, tmp_path):
+        path = str(tmp_path / "redemptions.db")
+        limiter = RedemptionLimiter(SQLiteRedemptionStore(path, flush_interval=60))
+        for customer_id in ["A", "A", "B"]:
+            limiter.commit(limiter.reserve("SUPER69", customer_id))
+        limiter.reserve("SUPER69", "C")  # Reservations are not persisted
+
+        assert limiter.store.pending == 3
+        limiter.store.flush()
+        assert (limiter.store.pending, limiter.store.flushes) == (0, 1)
+        limiter.commit(limiter.reserve("PREMIUM20", "A"))
+        limiter.close()  # Writes the rest
+
+        with sqlite3.connect(path) as connection:
+            rows = connection.execute("SELECT code, customer_id, count FROM redemptions ORDER BY 1, 2").fetchall()
+        assert rows == [("PREMIUM20", "A", 1), ("SUPER69", "A", 2), ("SUPER69", "B", 1)]
+
+        restarted = RedemptionLimiter(SQLiteRedemptionStore(path))
+        assert restarted.redemptions("SUPER69") == (3, 0)
+        assert restarted.check("SUPER69", "A", max_per_customer=2) == CUSTOMER_LIMIT
+        restarted.close()
+
+    def test_background_writer_flushes(self, tmp_path):
+        store = SQLiteRedemptionStore(str(tmp_path / "redemptions.db"), flush_interval=0.01)
+        store.record("SUPER69", "A")
+        for _ in range(200):
+            if store.flushes:
+                break
+            store._closed.wait(0.01)
+        assert store.flushes == 1
+        assert list(store.load()) == [("SUPER69", "A", 1)]
+        store.close()
+
+    def test_service_reserves_with_code_rules(self, customer):
+        rules = {
+            "LIMITED": VoucherRule.from_config("LIMITED", {
+                "discount_percentage": "10", "max_discount": "500",
+                "max_redemptions": 2, "max_redemptions_per_customer": 1
+            })
+        }
+        service = DiscountService(discount_registry=DiscountCodeRegistry(rules),
+                                  redemption_limiter=RedemptionLimiter())
+
+        reservation = service.reserve_discount_code("LIMITED", customer)
+        with pytest.raises(RedemptionLimitReached):
+            service.reserve_discount_code("LIMITED", customer)
+        service.commit_redemption(reservation)
+        other = CustomerProfile(id="CUST002", name="Jane", email="jane@example.com", tier="regular",
+                                loyalty_points=0)
+        service.release_redemption(service.reserve_discount_code("LIMITED", other))
+        with pytest.raises(ValueError):
+            service.reserve_discount_code("NOPE", customer)
+
+        with pytest.raises(ValueError):
+            VoucherRule.from_config("BAD", {"discount_percentage": "10", "max_discount": "5",
+                                            "max_redemptions": -1})
+        assert rules["LIMITED"].max_discount == Decimal("500")
@@ -0,0 +1,165 @@
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.services.discount_codes import DiscountCodes
+from src.services.result_cache import PricingResultCache, cart_fingerprint
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.payment import PaymentInfo
+from src.models.discount import DiscountedPrice
+from src.discount_types.tier_discount import TierDiscount
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def result(amount: str) -> DiscountedPrice:
+    return DiscountedPrice(Decimal(amount), Decimal(amount), {}, "ok")
+
+
+class TestPricingResultCache:
+    """Test suite for PricingResultCache"""
+
+    def test_lru_eviction(self):
+        cache = PricingResultCache(max_entries=2)
+        cache.put("a", 1, result("1"))
+        cache.put("b", 1, result("2"))
+        assert cache.get("a", 1) == result("1")
+
+        cache.put("c", 1, result("3"))
+
+        assert cache.get("b", 1) is None
+        assert cache.get("a", 1) == result("1")
+        assert cache.get("c", 1) == result("3")
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.evictions) == (3, 1, 1)
+
+    def test_ttl(self):
+        clock = FakeClock()
+        cache = PricingResultCache(ttl_seconds=10, clock=clock)
+        cache.put("a", 1, result("1"))
+
+        clock.now = 9.9
+        assert cache.get("a", 1) is not None
+        clock.now = 10
+        assert cache.get("a", 1) is None
+        assert cache.stats.expirations == 1
+        assert len(cache) == 0
+
+    def test_version_change_invalidates(self):
+        cache = PricingResultCache()
+        cache.put("a", 1, result("1"))
+
+        assert cache.get("a", 2) is None
+        assert cache.stats.invalidations == 1
+        assert len(cache) == 0
+
+    def test_cached_results_are_copies(self):
+        cache = PricingResultCache()
+        cache.put("a", 1, result("1"))
+
+        cache.get("a", 1).applied_discounts["tampered"] = Decimal("1")
+
+        assert cache.get("a", 1).applied_discounts == {}
+
+    def test_invalid_size(self):
+        with pytest.raises(ValueError):
+            PricingResultCache(max_entries=0)
+
+
+class TestDiscountCodes:
+    """Test suite for DiscountCodes versioning"""
+
+    def test_changes_take_new_versions(self):
+        codes = DiscountCodes({"A": {}})
+        versions = [codes.version]
+        codes["B"] = {}
+        versions.append(codes.version)
+        del codes["A"]
+        versions.append(codes.version)
+        codes.update(C={})
+        versions.append(codes.version)
+        codes.pop("C")
+        versions.append(codes.version)
+        codes.touch()
+        versions.append(codes.version)
+
+        assert versions == sorted(set(versions))
+        assert DiscountCodes(codes).version > codes.version
+
+
+class TestDiscountServiceResultCache:
+    """Test suite for calculate_cart_discounts with a result cache"""
+
+    @pytest.fixture
+    def cart_items(self):
+        products = [
+            Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                    base_price=Decimal('5000'), current_price=Decimal('5000')),
+            Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                    base_price=Decimal('1000'), current_price=Decimal('1000'))
+        ]
+        return [CartItem(product=product, quantity=1, size="M", price=product.base_price) for product in products]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="premium", loyalty_points=1500)
+
+    @pytest.fixture
+    def payment_info(self):
+        return PaymentInfo(method="CARD", bank_name="ICICI", card_type="CREDIT")
+
+    def test_fingerprint_ignores_line_order(self, cart_items, customer, payment_info):
+        assert cart_fingerprint(cart_items, customer, payment_info, "SUPER69") == \
+            cart_fingerprint(list(reversed(cart_items)), customer, payment_info, "SUPER69")
+        assert cart_fingerprint(cart_items, customer, payment_info, "SUPER69") != \
+            cart_fingerprint(cart_items, customer, None, "SUPER69")
+
+    @pytest.mark.asyncio
+    async def test_repeated_request_hits_cache(self, cart_items, customer, payment_info):
+        cache = PricingResultCache()
+        service = DiscountService(result_cache=cache)
+        uncached = await DiscountService().calculate_cart_discounts(cart_items, customer, payment_info, "SUPER69")
+
+        first = await service.calculate_cart_discounts(cart_items, customer, payment_info, "SUPER69")
+        second = await service.calculate_cart_discounts(list(reversed(cart_items)), customer, payment_info, "SUPER69")
+
+        assert first == second == uncached
+        assert (cache.stats.hits, cache.stats.misses) == (1, 1)
+
+    @pytest.mark.asyncio
+    async def test_discount_code_change_invalidates(self, cart_items, customer):
+        cache = PricingResultCache()
+        service = DiscountService(result_cache=cache)
+        before = await service.calculate_cart_discounts(cart_items, customer, voucher_code="SUPER69")
+
+        service.discount_codes["SUPER69"] = dict(service.discount_codes["SUPER69"], max_discount=Decimal("50"))
+        after = await service.calculate_cart_discounts(cart_items, customer, voucher_code="SUPER69")
+
+        assert before.applied_discounts["Voucher SUPER69"] == Decimal("1000")
+        assert after.applied_discounts["Voucher SUPER69"] == Decimal("50")
+        assert cache.stats.invalidations == 1
+
+        service.discount_codes["SUPER69"]["max_discount"] = Decimal("60")
+        service.refresh_voucher_index()
+        refreshed = await service.calculate_cart_discounts(cart_items, customer, voucher_code="SUPER69")
+        assert refreshed.applied_discounts["Voucher SUPER69"] == Decimal("60")
+
+    @pytest.mark.asyncio
+    async def test_registration_invalidates(self, cart_items, customer):
+        cache = PricingResultCache()
+        service = DiscountService(result_cache=cache)
+        await service.calculate_cart_discounts(cart_items, customer)
+
+        service.add_discount_type("tier_v2", TierDiscount)
+        await service.calculate_cart_discounts(cart_items, customer)
+
+        assert (cache.stats.hits, cache.stats.misses, cache.stats.invalidations) == (0, 2, 1)
@@ -0,0 +1,124 @@
+import asyncio
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.services.metrics import DiscountMetrics
+from src.services.result_cache import PricingResultCache
+from src.services.single_flight import SingleFlight
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+
+class CountingService(DiscountService):
+    """Counts full cart evaluations, each of which yields to the event loop once"""
+
+    evaluations = 0
+
+    async def _calculate_cart_discounts(self, *args, **kwargs):
+        self.evaluations += 1
+        await asyncio.sleep(0.01)
+        return await super()._calculate_cart_discounts(*args, **kwargs)
+
+
+class TestSingleFlight:
+    """Test suite for single-flight request coalescing"""
+
+    @pytest.fixture
+    def cart_items(self):
+        products = [
+            Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.PREMIUM, category="T-shirts",
+                    base_price=Decimal('1000'), current_price=Decimal('1000')),
+            Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="Jeans",
+                    base_price=Decimal('2000'), current_price=Decimal('1500'))
+        ]
+        return [CartItem(product=product, quantity=1, size="M", price=product.base_price) for product in products]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=0)
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_evaluation(self):
+        single_flight = SingleFlight()
+        calls = 0
+
+        async def evaluate():
+            nonlocal calls
+            calls += 1
+            await asyncio.sleep(0.01)
+            return calls
+
+        results = await asyncio.gather(*(single_flight.do("hot", evaluate) for _ in range(20)))
+
+        assert results == [1] * 20
+        assert (single_flight.stats.evaluations, single_flight.stats.coalesced) == (1, 19)
+        assert len(single_flight) == 0
+        # Nothing is kept once the evaluation finishes
+        assert await single_flight.do("hot", evaluate) == 2
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        single_flight = SingleFlight()
+
+        async def evaluate():
+            await asyncio.sleep(0.01)
+            raise ValueError("pricing failed")
+
+        results = await asyncio.gather(*(single_flight.do("hot", evaluate) for _ in range(3)),
+                                       return_exceptions=True)
+
+        assert all(isinstance(result, ValueError) for result in results)
+        assert len(single_flight) == 0
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_others(self):
+        single_flight = SingleFlight()
+
+        async def evaluate():
+            await asyncio.sleep(0.02)
+            return "done"
+
+        first = asyncio.ensure_future(single_flight.do("hot", evaluate))
+        second = asyncio.ensure_future(single_flight.do("hot", evaluate))
+        await asyncio.sleep(0)
+        first.cancel()
+
+        assert await second == "done"
+        assert first.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_service_coalesces_identical_carts(self, cart_items, customer):
+        metrics = DiscountMetrics()
+        service = CountingService(metrics=metrics, single_flight=SingleFlight())
+        reordered = list(reversed(cart_items))
+
+        results = await asyncio.gather(
+            *(service.calculate_cart_discounts(cart_items, customer, voucher_code="SUPER69") for _ in range(10)),
+            service.calculate_cart_discounts(reordered, customer, voucher_code="SUPER69"),
+            service.calculate_cart_discounts(cart_items, customer)
+        )
+
+        expected = await DiscountService().calculate_cart_discounts(cart_items, customer, voucher_code="SUPER69")
+        assert results[:11] == [expected] * 11
+        assert service.evaluations == 2  # One per distinct cart
+        assert metrics.single_flight_requests.value(("evaluated",)) == 2
+        assert metrics.single_flight_requests.value(("coalesced",)) == 10
+        # Every caller gets its own result
+        results[0].applied_discounts.clear()
+        assert results[1] == expected
+
+    @pytest.mark.asyncio
+    async def test_with_result_cache(self, cart_items, customer):
+        cache = PricingResultCache()
+        service = CountingService(result_cache=cache, single_flight=SingleFlight())
+
+        await asyncio.gather(*(service.calculate_cart_discounts(cart_items, customer) for _ in range(5)))
+        await service.calculate_cart_discounts(cart_items, customer)
+
+        assert service.evaluations == 1
+        assert len(cache) == 1
+        assert cache.stats.hits == 1
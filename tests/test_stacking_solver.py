@@ -0,0 +1,225 @@
+import itertools
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_service import DiscountService
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+from src.models.money import MoneyMode
+from src.discount_types.base_discount import BaseDiscount
+from src.discount_types.brand_discount import BrandDiscount
+from src.discount_types.voucher_discount import VoucherDiscount
+from src.discount_types.tier_discount import TierDiscount
+from src.discount_types.stacking_solver import ExclusivityGroup, StackingSolver
+
+
+class FlatDiscount(BaseDiscount):
+    """Discount of a fixed amount, for exercising the solver"""
+
+    def __init__(self, discount_id: str, amount: Decimal):
+        super().__init__(discount_id=discount_id, discount_name=f"{discount_id} Discount")
+        self.amount = amount
+
+    async def is_applicable(self, cart_items, customer, payment_info=None, **kwargs) -> bool:
+        return True
+
+    async def calculate_discount(self, cart_items, customer, payment_info=None, **kwargs) -> Decimal:
+        return self.amount
+
+
+def brute_force(solver, candidates, cart_total):
+    """Best (savings, discount count) over every feasible subset"""
+    cap = solver._cap(cart_total)
+    best = (Decimal("0"), 0)
+    for size in range(len(candidates) + 1):
+        if solver.max_discounts is not None and size > solver.max_discounts:
+            break
+        for subset in itertools.combinations(candidates, size):
+            ids = [discount.discount_id for discount, _ in subset]
+            if any(sum(discount_id in group.discount_ids for discount_id in ids) > group.max_selected
+                   for group in solver.groups):
+                continue
+            savings = sum((amount for _, amount in subset), Decimal("0"))
+            if cap is not None:
+                savings = min(savings, cap)
+            if savings > best[0] or (savings == best[0] and size < best[1]):
+                best = (savings, size)
+    return best
+
+
+class TestStackingSolver:
+    """Test suite for StackingSolver"""
+
+    @pytest.fixture
+    def cart_items(self):
+        products = [
+            Product(id="NIKE001", brand="NIKE", brand_tier=BrandTier.PREMIUM, category="Shoes",
+                    base_price=Decimal('5000'), current_price=Decimal('5000')),
+            Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                    base_price=Decimal('1000'), current_price=Decimal('1000'))
+        ]
+        return [CartItem(product=product, quantity=1, size="M", price=product.base_price) for product in products]
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="premium", loyalty_points=1500)
+
+    def test_exclusivity_group_keeps_best_member(self):
+        solver = StackingSolver(groups=[ExclusivityGroup("one brand offer", ("A", "B", "C"))])
+        candidates = [
+            (FlatDiscount("A", Decimal("100")), Decimal("100")),
+            (FlatDiscount("B", Decimal("300")), Decimal("300")),
+            (FlatDiscount("C", Decimal("200")), Decimal("200")),
+            (FlatDiscount("D", Decimal("50")), Decimal("50"))
+        ]
+
+        result = solver.choose(candidates, Decimal("10000"))
+
+        assert result.selected_ids == ["B", "D"]
+        assert result.applied_discounts == {"B Discount": Decimal("300"), "D Discount": Decimal("50")}
+        assert result.total_discount == Decimal("350")
+        assert result.rejected == {"A Discount": Decimal("100"), "C Discount": Decimal("200")}
+
+    def test_voucher_or_bank_prefers_larger_combination(self):
+        # Taking the single largest discount (V) blocks W and X, which together save more
+        solver = StackingSolver(groups=[
+            ExclusivityGroup("voucher or bank", ("V", "W")),
+            ExclusivityGroup("voucher or loyalty", ("V", "X"))
+        ])
+        candidates = [
+            (FlatDiscount("V", Decimal("500")), Decimal("500")),
+            (FlatDiscount("W", Decimal("300")), Decimal("300")),
+            (FlatDiscount("X", Decimal("250")), Decimal("250"))
+        ]
+
+        result = solver.choose(candidates, Decimal("10000"))
+
+        assert result.selected_ids == ["W", "X"]
+        assert result.total_discount == Decimal("550")
+
+    def test_global_caps_trim_smallest_discount(self):
+        solver = StackingSolver(max_total_discount=Decimal("450"), max_discount_percentage=Decimal("50"))
+        candidates = [
+            (FlatDiscount("A", Decimal("300")), Decimal("300")),
+            (FlatDiscount("B", Decimal("200")), Decimal("200")),
+            (FlatDiscount("C", Decimal("100")), Decimal("100"))
+        ]
+
+        result = solver.choose(candidates, Decimal("10000"))
+
+        # A and B already reach the cap, so C is not needed
+        assert result.selected_ids == ["A", "B"]
+        assert result.uncapped_discount == Decimal("500")
+        assert result.total_discount == Decimal("450")
+        assert result.applied_discounts == {"A Discount": Decimal("300"), "B Discount": Decimal("150")}
+
+        percentage_capped = solver.choose(candidates, Decimal("400"))
+        assert percentage_capped.total_discount == Decimal("200")
+        assert percentage_capped.selected_ids == ["A"]
+
+    def test_max_discounts(self):
+        solver = StackingSolver(max_discounts=2)
+        candidates = [(FlatDiscount(name, Decimal(amount)), Decimal(amount))
+                      for name, amount in [("A", 10), ("B", 40), ("C", 30), ("D", 20)]]
+
+        result = solver.choose(candidates, Decimal("1000"))
+
+        assert result.selected_ids == ["B", "C"]
+
+    def test_invalid_group(self):
+        with pytest.raises(ValueError):
+            ExclusivityGroup("empty", ("A",), max_selected=0)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(17)
+        for _ in range(150):
+            ids = [f"D{i}" for i in range(rng.randint(0, 11))]
+            amounts = [Decimal(rng.choice([0, 50, 100, 150, 400])) for _ in ids]
+            candidates = [(FlatDiscount(discount_id, amount), amount) for discount_id, amount in zip(ids, amounts)]
+            groups = [
+                ExclusivityGroup(f"G{g}", tuple(rng.sample(ids, min(len(ids), rng.randint(2, 4)))),
+                                 max_selected=rng.randint(1, 2))
+                for g in range(rng.randint(0, 4))
+            ]
+            solver = StackingSolver(
+                groups=groups,
+                max_total_discount=rng.choice([None, Decimal("300"), Decimal("700")]),
+                max_discount_percentage=rng.choice([None, Decimal("10"), Decimal("40")]),
+                max_discounts=rng.choice([None, 1, 3])
+            )
+            cart_total = Decimal(rng.choice([1000, 5000]))
+
+            result = solver.choose(candidates, cart_total)
+
+            assert (result.total_discount, len(result.selected_ids)) == brute_force(solver, candidates, cart_total)
+            assert sum(result.applied_discounts.values(), Decimal("0")) == result.total_discount
+
+    def test_many_candidates_are_pruned(self):
+        # 36 offers in 12 mutually exclusive families, of which 8 may stack
+        rng = random.Random(23)
+        candidates = []
+        groups = []
+        for family in range(12):
+            ids = [f"F{family}_{offer}" for offer in range(3)]
+            groups.append(ExclusivityGroup(f"family {family}", tuple(ids)))
+            for discount_id in ids:
+                amount = Decimal(rng.randrange(10, 1000))
+                candidates.append((FlatDiscount(discount_id, amount), amount))
+        solver = StackingSolver(groups=groups, max_discounts=8)
+
+        result = solver.choose(candidates, Decimal("100000"))
+
+        family_best = sorted((max(amount for _, amount in candidates[3 * f:3 * f + 3]) for f in range(12)),
+                             reverse=True)
+        assert result.total_discount == sum(family_best[:8])
+        assert len(result.selected_ids) == 8
+        assert result.nodes_explored < 2000
+
+    @pytest.mark.asyncio
+    async def test_solve_with_real_discounts(self, cart_items, customer):
+        solver = StackingSolver(groups=[
+            ExclusivityGroup("one brand offer", ("BRAND_NIKE", "BRAND_PUMA")),
+            ExclusivityGroup("voucher or tier", ("VOUCHER_SUPER69", "TIER_PREMIUM"))
+        ])
+        discounts = [
+            BrandDiscount("NIKE", Decimal("10"), Decimal("200")),
+            BrandDiscount("PUMA", Decimal("50")),
+            VoucherDiscount("SUPER69", Decimal("69"), Decimal("1000")),
+            TierDiscount("premium", Decimal("20"))
+        ]
+
+        result = await solver.solve(discounts, cart_items, customer)
+
+        # PUMA 500 beats NIKE 200; premium tier 1200 beats SUPER69, which needs a voucher_code anyway
+        assert result.applied_discounts == {
+            "PUMA Brand Discount": Decimal("500"),
+            "Premium Tier Discount": Decimal("1200")
+        }
+        assert result.total_discount == Decimal("1700")
+
+        fixed_result = await solver.solve(discounts, cart_items, customer, money_mode=MoneyMode.FIXED_POINT)
+        assert fixed_result.applied_discounts == {"PUMA Brand Discount": 50000, "Premium Tier Discount": 120000}
+
+    @pytest.mark.asyncio
+    async def test_apply_advanced_discounts_with_solver(self, cart_items, customer):
+        service = DiscountService()
+        configs = [
+            {"type": "brand", "brand": "NIKE", "discount_percentage": Decimal("10")},
+            {"type": "brand", "brand": "PUMA", "discount_percentage": Decimal("30")},
+            {"type": "tier", "required_tier": "premium", "discount_percentage": Decimal("5")}
+        ]
+        solver = StackingSolver(
+            groups=[ExclusivityGroup("one brand offer", ("BRAND_NIKE", "BRAND_PUMA"))],
+            max_total_discount=Decimal("700")
+        )
+
+        result = await service.apply_advanced_discounts(cart_items, customer, discount_configs=configs,
+                                                        stacking_solver=solver)
+
+        # NIKE 500 + tier 300 = 800, capped at 700
+        assert result.applied_discounts == {"NIKE Brand Discount": Decimal("500"), "Premium Tier Discount": Decimal("200")}
+        assert result.final_price == Decimal("5300")
@@ -0,0 +1,130 @@
+import random
+from decimal import Decimal
+
+import pytest
+
+from src.services.discount_registry import DiscountCodeRegistry
+from src.services.discount_service import DiscountService
+from src.services.voucher_eligibility import VoucherEligibility
+from src.models.cart_snapshot import CartSnapshot
+from src.models.money import MoneyMode
+from src.models.product import Product, BrandTier
+from src.models.cart import CartItem
+from src.models.customer import CustomerProfile
+
+BRANDS = ["PUMA", "NIKE", "ZARA", "H&M", "LEVIS"]
+CATEGORIES = ["Shoes", "Jackets", "T-shirts", "Jeans", "Shirts"]
+TIERS = [None, "budget", "regular", "premium", "gold", "platinum"]
+
+
+def random_rules(rng: random.Random, count: int):
+    return {
+        f"CODE{i}": {
+            "discount_percentage": str(rng.randrange(5, 50)),
+            "max_discount": str(rng.randrange(100, 1000)),
+            "tier_requirement": rng.choice(TIERS),
+            "excluded_brands": rng.sample(BRANDS, rng.choice([0, 0, 1, 2])),
+            "allowed_categories": rng.sample(CATEGORIES, rng.choice([0, 0, 1, 2])),
+            "min_cart_value": rng.choice(["0", "500", "999.99", "1000", "2500.50", "4000"])
+        }
+        for i in range(count)
+    }
+
+
+def random_cart(rng: random.Random):
+    items = []
+    for i in range(rng.randrange(1, 5)):
+        base_price = Decimal(rng.randrange(20000, 200000)) / 100
+        product = Product(id=f"P{i}", brand=rng.choice(BRANDS), brand_tier=BrandTier.REGULAR,
+                          category=rng.choice(CATEGORIES), base_price=base_price,
+                          current_price=base_price * rng.choice([Decimal("1"), Decimal("0.7")]))
+        items.append(CartItem(product=product, quantity=rng.randrange(1, 3), size="M", price=base_price))
+    return items
+
+
+class TestVoucherEligibility:
+    """Test suite for bulk voucher eligibility"""
+
+    @pytest.fixture
+    def customer(self):
+        return CustomerProfile(id="CUST001", name="John Doe", email="john.doe@example.com",
+                               tier="regular", loyalty_points=0)
+
+    def test_builtin_codes(self, customer):
+        product = Product(id="PUMA001", brand="PUMA", brand_tier=BrandTier.PREMIUM, category="T-shirts",
+                          base_price=Decimal("1500"), current_price=Decimal("900"))
+        cart_items = [CartItem(product=product, quantity=1, size="M", price=product.base_price)]
+
+        result = DiscountService().check_discount_codes(cart_items, customer)
+
+        assert result.eligible_codes() == ["SUPER69", "NEWUSER15"]
+        assert result.reasons() == {
+            "SUPER69": None,
+            "PREMIUM20": "tier_requirement",
+            "NEWUSER15": None,
+            "BRAND_EXCLUSION": "excluded_brand",
+            "CATEGORY_RESTRICTION": "category_restriction",
+            "TIER_DISCOUNT": "validation_service"
+        }
+        assert result.is_eligible("SUPER69")
+        assert not result.is_eligible("PREMIUM20")
+        assert result.reason("NEWUSER15") is None
+
+    @pytest.mark.parametrize("money_mode", [MoneyMode.DECIMAL, MoneyMode.FIXED_POINT])
+    def test_matches_per_code_validation(self, money_mode):
+        rng = random.Random(18)
+        registry = DiscountCodeRegistry(random_rules(rng, 60))
+        service = DiscountService(money_mode=money_mode, discount_registry=registry)
+
+        for _ in range(150):
+            cart_items = random_cart(rng)
+            customer = CustomerProfile(id="C", name="C", email="c@example.com",
+                                       tier=rng.choice(TIERS[1:] + ["unknown"]), loyalty_points=0)
+
+            result = service.check_discount_codes(cart_items, customer)
+
+            expected = {code: service.explain_discount_code(code, cart_items, customer) for code in registry.rules}
+            assert result.reasons() == expected
+            assert result.eligible_codes() == [code for code, reason in expected.items() if reason is None]
+
+    def test_compiled_masks(self):
+        eligibility = VoucherEligibility(DiscountCodeRegistry(random_rules(random.Random(3), 40)).rules)
+        rng = random.Random(4)
+
+        for _ in range(50):
+            snapshot = CartSnapshot.of(random_cart(rng))
+            tier = rng.choice(TIERS[1:])
+            masks = eligibility.masks(snapshot, tier)
+            result = eligibility.evaluate(snapshot, tier)
+
+            for code, compiled in eligibility.compiled.items():
+                reason = result.reason(code)
+                if reason in (None, "min_cart_value"):
+                    assert compiled.mask_failure(masks) is None
+                elif reason != "validation_service":
+                    assert compiled.mask_failure(masks) == reason
+
+    def test_recompiled_on_registry_change(self, customer):
+        registry = DiscountCodeRegistry({"FLASH": {"discount_percentage": "40", "max_discount": "250"}})
+        service = DiscountService(discount_registry=registry)
+        product = Product(id="ZARA001", brand="ZARA", brand_tier=BrandTier.REGULAR, category="T-shirts",
+                          base_price=Decimal("1000"), current_price=Decimal("1000"))
+        cart_items = [CartItem(product=product, quantity=1, size="M", price=product.base_price)]
+
+        assert service.check_discount_codes(cart_items, customer).eligible_codes() == ["FLASH"]
+
+        registry.replace({
+            "FLASH": {"discount_percentage": "40", "max_discount": "250", "excluded_brands": ["ZARA"]},
+            "EXTRA": {"discount_percentage": "10", "max_discount": "100", "min_cart_value": "1000"}
+        })
+        result = service.check_discount_codes(cart_items, customer)
+
+        assert result.codes == ("FLASH", "EXTRA")
+        assert result.reasons() == {"FLASH": "excluded_brand", "EXTRA": None}
+
+    def test_no_codes(self, customer):
+        result = VoucherEligibility({}).evaluate(CartSnapshot.of([]), customer.tier)
+
+        assert len(result) == 0
+        assert result.eligible == 0
+        assert result.eligible_codes() == []